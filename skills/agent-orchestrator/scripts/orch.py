@@ -8,8 +8,11 @@ import os
 import sys
 import json
 import time
+import heapq
+import sqlite3
 import psutil
 import argparse
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 from collections import deque
@@ -20,6 +23,23 @@ ORCH_DIR.mkdir(parents=True, exist_ok=True)
 POOLS_FILE = ORCH_DIR / "pools.json"
 AGENTS_FILE = ORCH_DIR / "agents.json"
 TASKS_FILE = ORCH_DIR / "tasks.json"
+DISPATCH_DB = ORCH_DIR / "dispatch.db"
+AUTOSCALE_LOG = ORCH_DIR / "autoscale.jsonl"
+
+PRIORITIES = {'critical': 0, 'high': 1, 'normal': 2, 'low': 3}
+AGENT_CAPACITY = 10  # concurrent tasks per agent (health check marks > 10 as overloaded)
+
+# Autoscaler
+AUTOSCALE_INTERVAL = 5       # seconds between samples
+EWMA_ALPHA = 0.3             # weight of the newest sample
+TARGET_DRAIN_SECONDS = 30    # scale up if the queue would take longer than this to drain
+SCALE_UP_QUEUE = 2.0         # ...or if more than this many tasks wait per agent
+SCALE_DOWN_QUEUE = 0.5       # scale down only below this queue per agent
+SCALE_DOWN_LOAD = 0.5        # ...and below this in-flight load per agent
+SCALE_DOWN_STABLE = 3        # consecutive calm samples required before scaling down
+SCALE_UP_COOLDOWN = 30       # seconds after any scaling before scaling up again
+SCALE_DOWN_COOLDOWN = 120    # seconds after any scaling before scaling down
+MAX_STEP_UP = 2
 
 # Strategy functions
 def strategy_round_robin(agents, task):
@@ -84,6 +104,321 @@ def save_agents(agents):
     AGENTS_FILE.write_text(json.dumps(agents, indent=2))
 
 
+# Agent ordering per strategy, used by the ready-agent index and dispatch heap
+STRATEGY_ORDER = {
+    'round-robin': ('task_count', 'load', 'id'),
+    'least-loaded': ('load', 'task_count', 'id'),
+    'priority': ('id',)
+}
+
+
+class Dispatcher:
+    """
+    Persistent task dispatcher backed by SQLite (WAL).
+    
+    Pool and agent membership still live in pools.json / agents.json and are
+    synced in when those files change. Runtime state - agent load, task
+    counts and the task queue - lives in the database:
+    
+    - tasks(pool, status, priority, id) index: per-pool priority queue
+    - agents(pool, status, load, task_count) index: ready agents by load
+    - every assignment runs in one BEGIN IMMEDIATE transaction, so
+      concurrent submitters never lose load updates
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS pools (
+            name TEXT PRIMARY KEY,
+            strategy TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS agents (
+            id TEXT PRIMARY KEY,
+            pool TEXT,
+            status TEXT NOT NULL,
+            load INTEGER NOT NULL DEFAULT 0,
+            task_count INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS agents_ready ON agents(pool, status, load, task_count);
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY,
+            pool TEXT NOT NULL,
+            type TEXT NOT NULL,
+            data TEXT,
+            priority INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            agent TEXT,
+            submitted TEXT NOT NULL,
+            assigned TEXT,
+            completed TEXT
+        );
+        CREATE INDEX IF NOT EXISTS tasks_queue ON tasks(pool, status, priority, id);
+        CREATE INDEX IF NOT EXISTS tasks_agent ON tasks(agent, status);
+        CREATE INDEX IF NOT EXISTS tasks_completed ON tasks(pool, completed);
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+    
+    def __init__(self, db_path=None, pools_file=None, agents_file=None, capacity=AGENT_CAPACITY):
+        self.db_path = Path(db_path or DISPATCH_DB)
+        self.pools_file = Path(pools_file or POOLS_FILE)
+        self.agents_file = Path(agents_file or AGENTS_FILE)
+        self.capacity = capacity
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(self.SCHEMA)
+        self.sync()
+    
+    def close(self):
+        self.conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    @contextmanager
+    def _write(self):
+        """Serialized write transaction"""
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield self.conn
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+        else:
+            self.conn.execute('COMMIT')
+    
+    def _json_stamp(self):
+        stamps = []
+        for path in (self.pools_file, self.agents_file):
+            try:
+                stamps.append(str(path.stat().st_mtime_ns))
+            except OSError:
+                stamps.append('-')
+        return ':'.join(stamps)
+    
+    def _read_json(self, path, default):
+        try:
+            return json.loads(path.read_text())
+        except (OSError, ValueError):
+            return default
+    
+    def sync(self, force=False):
+        """Pull pool/agent membership from the JSON files if they changed"""
+        stamp = self._json_stamp()
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'json_stamp'").fetchone()
+        if row and row[0] == stamp and not force:
+            return False
+        
+        with self._write() as c:
+            pools = self._read_json(self.pools_file, {})
+            agents = self._read_json(self.agents_file, [])
+            now = datetime.now().isoformat()
+            
+            c.execute("DELETE FROM pools")
+            c.executemany("INSERT INTO pools (name, strategy) VALUES (?, ?)",
+                          [(name, pool.get('strategy', 'round-robin')) for name, pool in pools.items()])
+            
+            # Load/task_count are owned by the database once an agent is known
+            c.executemany(
+                """INSERT INTO agents (id, pool, status, load, task_count) VALUES (?, ?, ?, ?, ?)
+                   ON CONFLICT(id) DO UPDATE SET pool = excluded.pool, status = excluded.status""",
+                [(a['id'], a.get('pool'), a.get('status', 'ready'), a.get('load', 0), a.get('task_count', 0))
+                 for a in agents]
+            )
+            known = {a['id'] for a in agents}
+            stale = [(aid,) for (aid,) in c.execute("SELECT id FROM agents").fetchall() if aid not in known]
+            c.executemany("UPDATE agents SET status = 'stopped' WHERE id = ?", stale)
+            # Work held by stopped agents (e.g. after a scale-down) goes back to the queue
+            c.execute("UPDATE tasks SET status = 'queued', agent = NULL, assigned = NULL "
+                      "WHERE status = 'assigned' AND agent IN (SELECT id FROM agents WHERE status = 'stopped')")
+            c.execute("UPDATE agents SET load = 0 WHERE status = 'stopped'")
+            c.execute("UPDATE tasks SET status = 'cancelled', completed = ? "
+                      "WHERE status = 'queued' AND pool NOT IN (SELECT name FROM pools)", (now,))
+            
+            # Import tasks queued by older versions into pools.json
+            legacy = [(name, pool['queue']) for name, pool in pools.items() if pool.get('queue')]
+            for name, queue in legacy:
+                c.executemany(
+                    "INSERT INTO tasks (pool, type, data, priority, status, submitted) VALUES (?, ?, ?, ?, 'queued', ?)",
+                    [(name, t['type'], t.get('data'), PRIORITIES.get(t.get('priority'), PRIORITIES['normal']),
+                      t.get('submitted', now)) for t in queue]
+                )
+            if legacy:
+                for pool in pools.values():
+                    pool['queue'] = []
+                self.pools_file.write_text(json.dumps(pools, indent=2))
+            
+            for name in pools:
+                self._drain(c, name)
+            c.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('json_stamp', ?)", (self._json_stamp(),))
+        return True
+    
+    def _strategy(self, c, pool_name, strategy):
+        row = c.execute("SELECT strategy FROM pools WHERE name = ?", (pool_name,)).fetchone()
+        if row is None:
+            raise KeyError(f"Pool '{pool_name}' not found")
+        strategy = strategy or row[0]
+        return strategy if strategy in STRATEGY_ORDER else 'round-robin'
+    
+    def _drain(self, c, pool_name, strategy=None):
+        """Assign queued tasks of a pool, highest priority first, to free agents"""
+        strategy = self._strategy(c, pool_name, strategy)
+        columns = STRATEGY_ORDER[strategy]
+        ready = c.execute(
+            f"SELECT id, load, task_count FROM agents WHERE pool = ? AND status = 'ready' AND load < ? "
+            f"ORDER BY {', '.join(columns)}",
+            (pool_name, self.capacity)
+        ).fetchall()
+        if not ready:
+            return []
+        
+        slots = sum(self.capacity - load for _, load, _ in ready)
+        queued = c.execute(
+            "SELECT id FROM tasks WHERE pool = ? AND status = 'queued' ORDER BY priority, id LIMIT ?",
+            (pool_name, slots)
+        ).fetchall()
+        if not queued:
+            return []
+        
+        def key(rank, load, task_count):
+            values = {'id': rank, 'load': load, 'task_count': task_count}
+            return tuple(values[col] for col in columns)
+        
+        heap = [(key(rank, load, count), rank, aid, load, count)
+                for rank, (aid, load, count) in enumerate(ready)]
+        heapq.heapify(heap)
+        now = datetime.now().isoformat()
+        assignments = []
+        touched = {}
+        for (task_id,) in queued:
+            _, rank, aid, load, count = heapq.heappop(heap)
+            load += 1
+            count += 1
+            assignments.append((aid, now, task_id))
+            touched[aid] = (load, count)
+            if load < self.capacity:
+                heapq.heappush(heap, (key(rank, load, count), rank, aid, load, count))
+        
+        c.executemany("UPDATE tasks SET status = 'assigned', agent = ?, assigned = ? WHERE id = ?", assignments)
+        c.executemany("UPDATE agents SET load = ?, task_count = ? WHERE id = ?",
+                      [(load, count, aid) for aid, (load, count) in touched.items()])
+        return assignments
+    
+    def submit_many(self, pool_name, tasks, strategy=None):
+        """
+        Submit a batch of tasks in one transaction.
+        
+        tasks: iterable of dicts with type, data and priority.
+        Returns task rows as dicts (id, status, agent) in input order.
+        """
+        self.sync()
+        now = datetime.now().isoformat()
+        with self._write() as c:
+            self._strategy(c, pool_name, strategy)
+            ids = []
+            for task in tasks:
+                cur = c.execute(
+                    "INSERT INTO tasks (pool, type, data, priority, status, submitted) VALUES (?, ?, ?, ?, 'queued', ?)",
+                    (pool_name, task['type'], task.get('data'),
+                     PRIORITIES.get(task.get('priority', 'normal'), PRIORITIES['normal']), now)
+                )
+                ids.append(cur.lastrowid)
+            assigned = {task_id: aid for aid, _, task_id in self._drain(c, pool_name, strategy)}
+        return [{'id': task_id, 'status': 'assigned' if task_id in assigned else 'queued',
+                 'agent': assigned.get(task_id)} for task_id in ids]
+    
+    def submit(self, pool_name, task_type, task_data=None, priority='normal', strategy=None):
+        """Submit one task; it is assigned now or queued by priority"""
+        return self.submit_many(pool_name, [{'type': task_type, 'data': task_data, 'priority': priority}],
+                                strategy)[0]
+    
+    def complete(self, task_id, success=True):
+        """Mark a task finished, release its agent and dispatch queued work"""
+        self.sync()
+        with self._write() as c:
+            row = c.execute("SELECT pool, agent, status FROM tasks WHERE id = ?", (task_id,)).fetchone()
+            if row is None or row[2] != 'assigned':
+                return None
+            pool_name, agent_id, _ = row
+            c.execute("UPDATE tasks SET status = ?, completed = ? WHERE id = ?",
+                      ('done' if success else 'failed', datetime.now().isoformat(), task_id))
+            c.execute("UPDATE agents SET load = MAX(load - 1, 0) WHERE id = ?", (agent_id,))
+            if c.execute("SELECT 1 FROM pools WHERE name = ?", (pool_name,)).fetchone():
+                self._drain(c, pool_name)
+        return {'id': task_id, 'pool': pool_name, 'agent': agent_id}
+    
+    def dispatch(self, pool_name=None):
+        """Assign queued tasks for one pool (or all pools), returning the count"""
+        self.sync()
+        with self._write() as c:
+            names = [pool_name] if pool_name else [n for (n,) in c.execute("SELECT name FROM pools").fetchall()]
+            return sum(len(self._drain(c, name)) for name in names)
+    
+    def queue_depth(self, pool_name=None):
+        """Queued task count for a pool, or a dict for all pools"""
+        depths = dict(self.conn.execute(
+            "SELECT pool, COUNT(*) FROM tasks WHERE status = 'queued' GROUP BY pool"
+        ).fetchall())
+        return depths.get(pool_name, 0) if pool_name else depths
+    
+    def queued(self, pool_name, limit=5):
+        """Next queued tasks of a pool in dispatch order"""
+        names = {v: k for k, v in PRIORITIES.items()}
+        rows = self.conn.execute(
+            "SELECT id, type, priority FROM tasks WHERE pool = ? AND status = 'queued' ORDER BY priority, id LIMIT ?",
+            (pool_name, limit)
+        ).fetchall()
+        return [{'id': tid, 'type': ttype, 'priority': names.get(prio, 'normal')} for tid, ttype, prio in rows]
+    
+    def pool_metrics(self, pool_name, since):
+        """
+        Raw load signals for a pool.
+        
+        Returns queue depth, in-flight tasks, age of the oldest queued task and
+        completions (count, mean service seconds) since the ISO timestamp since.
+        """
+        c = self.conn
+        queue_depth, oldest = c.execute(
+            "SELECT COUNT(*), MIN(submitted) FROM tasks WHERE pool = ? AND status = 'queued'", (pool_name,)
+        ).fetchone()
+        inflight = c.execute(
+            "SELECT COALESCE(SUM(load), 0) FROM agents WHERE pool = ? AND status != 'stopped'", (pool_name,)
+        ).fetchone()[0]
+        completed, service = c.execute(
+            "SELECT COUNT(*), AVG((julianday(completed) - julianday(assigned)) * 86400) FROM tasks "
+            "WHERE pool = ? AND completed > ? AND status IN ('done', 'failed')",
+            (pool_name, since)
+        ).fetchone()
+        oldest_wait = (datetime.now() - datetime.fromisoformat(oldest)).total_seconds() if oldest else 0.0
+        return {
+            'queue_depth': queue_depth,
+            'inflight': inflight,
+            'oldest_wait': oldest_wait,
+            'completed': completed,
+            'service_seconds': service
+        }
+    
+    def agent_stats(self):
+        """Runtime load and task count per agent id"""
+        return {aid: {'load': load, 'task_count': count}
+                for aid, load, count in self.conn.execute("SELECT id, load, task_count FROM agents")}
+
+
+def load_runtime_agents():
+    """Agent definitions with load/task_count from the dispatcher"""
+    agents = load_agents()
+    with Dispatcher() as dispatcher:
+        stats = dispatcher.agent_stats()
+    for agent in agents:
+        agent.update(stats.get(agent['id'], {}))
+    return agents
+
+
 def get_system_resources():
     """Get current system resource usage."""
     cpu_percent = psutil.cpu_percent(interval=0.5)
@@ -176,6 +511,9 @@ def list_pools():
         print("\n[INFO] No pools created yet.\n")
         return
     
+    with Dispatcher() as dispatcher:
+        depths = dispatcher.queue_depth()
+    
     print("\n[Agent Pools]\n")
     print(f"{'Name':<20} {'Size':<8} {'Strategy':<15} {'Queue':<8} {'Status'}")
     print("-" * 70)
@@ -183,7 +521,7 @@ def list_pools():
     for name, pool in pools.items():
         # Count active agents
         active = sum(1 for aid in pool['agents'] if agents.get(aid, {}).get('status') == 'ready')
-        queue_len = len(pool.get('queue', []))
+        queue_len = depths.get(name, 0)
         status = f"{active}/{pool['size']} ready"
         
         print(f"{name:<20} {pool['size']:<8} {pool['strategy']:<15} {queue_len:<8} {status}")
@@ -214,34 +552,40 @@ def scale_pool(name, new_size):
         new_size = max_allowed
     
     agents = load_agents()
+    by_id = {a['id']: a for a in agents}
     
     if new_size > current_size:
-        # Scale up - add agents
-        for i in range(current_size, new_size):
-            agent_id = f"{name}-{i+1}"
-            agent = {
-                'id': agent_id,
-                'pool': name,
-                'status': 'ready',
-                'load': 0,
-                'task_count': 0,
-                'created': datetime.now().isoformat()
-            }
+        # Scale up - add agents, reusing the records of previously stopped ones
+        members = set(pool['agents'])
+        i = 0
+        while len(pool['agents']) < new_size:
+            i += 1
+            agent_id = f"{name}-{i}"
+            if agent_id in members:
+                continue
+            agent = by_id.get(agent_id)
+            if agent is None:
+                agent = {'id': agent_id, 'created': datetime.now().isoformat()}
+                agents.append(agent)
+            agent.update({'pool': name, 'status': 'ready', 'load': 0, 'task_count': 0})
             pool['agents'].append(agent_id)
-            agents.append(agent)
         
         print(f"[OK] Scaled up: {current_size} → {new_size}")
         
     elif new_size < current_size:
-        # Scale down - remove agents (prefer idle ones)
-        to_remove = pool['agents'][new_size:]
-        pool['agents'] = pool['agents'][:new_size]
+        # Scale down - stop the least loaded agents (newest first on ties);
+        # their in-flight tasks are requeued by Dispatcher.sync()
+        with Dispatcher() as dispatcher:
+            stats = dispatcher.agent_stats()
+        order = sorted(enumerate(pool['agents']),
+                       key=lambda item: (stats.get(item[1], {}).get('load', 0), -item[0]))
+        to_remove = {agent_id for _, agent_id in order[:current_size - new_size]}
+        pool['agents'] = [aid for aid in pool['agents'] if aid not in to_remove]
         
         # Mark agents as stopped
         for agent_id in to_remove:
-            for a in agents:
-                if a['id'] == agent_id:
-                    a['status'] = 'stopped'
+            if agent_id in by_id:
+                by_id[agent_id]['status'] = 'stopped'
         
         print(f"[OK] Scaled down: {current_size} → {new_size}")
     else:
@@ -282,84 +626,72 @@ def delete_pool(name):
 
 def submit_task(pool_name, task_type, task_data=None, strategy=None, priority='normal'):
     """Submit a task to a pool."""
-    pools = load_pools()
-    agents = {a['id']: a for a in load_agents()}
-    
-    if pool_name not in pools:
-        print(f"[X] Pool '{pool_name}' not found")
-        return
-    
-    pool = pools[pool_name]
-    use_strategy = strategy or pool['strategy']
-    
-    # Get pool agents
-    pool_agents = [agents[aid] for aid in pool['agents'] if aid in agents]
-    ready_agents = [a for a in pool_agents if a['status'] == 'ready']
-    
-    if not ready_agents:
-        # Queue the task
-        task = {
-            'type': task_type,
-            'data': task_data,
-            'priority': priority,
-            'submitted': datetime.now().isoformat(),
-            'status': 'queued'
-        }
-        pool['queue'].append(task)
-        save_pools(pools)
-        print(f"[!] No ready agents. Task queued (#{len(pool['queue'])})")
-        return
+    with Dispatcher() as dispatcher:
+        try:
+            task = dispatcher.submit(pool_name, task_type, task_data, priority, strategy)
+        except KeyError:
+            print(f"[X] Pool '{pool_name}' not found")
+            return
+        
+        if task['status'] == 'queued':
+            print(f"[!] No ready agents. Task queued (#{dispatcher.queue_depth(pool_name)}, id {task['id']})")
+            return
+        
+        load = dispatcher.agent_stats()[task['agent']]['load']
     
-    # Select agent using strategy
-    strategy_fn = STRATEGIES.get(use_strategy, strategy_round_robin)
-    selected = strategy_fn(ready_agents, {'type': task_type, 'priority': priority})
+    print(f"[OK] Task {task['id']} assigned to {task['agent']}")
+    print(f"   Type: {task_type}")
+    print(f"   Strategy: {strategy or 'pool default'}")
+    print(f"   Agent load: {load}")
+
+
+def submit_batch(pool_name, tasks_file, strategy=None):
+    """Submit tasks from a JSON list of {type, data, priority} in one transaction."""
+    tasks = json.loads(Path(tasks_file).read_text())
+    start = time.time()
+    with Dispatcher() as dispatcher:
+        try:
+            results = dispatcher.submit_many(pool_name, tasks, strategy)
+        except KeyError:
+            print(f"[X] Pool '{pool_name}' not found")
+            return
+    elapsed = time.time() - start
+    
+    assigned = sum(1 for r in results if r['status'] == 'assigned')
+    print(f"[OK] Submitted {len(results)} tasks in {elapsed:.2f}s")
+    print(f"   Assigned: {assigned}")
+    print(f"   Queued: {len(results) - assigned}")
+
+
+def complete_task(task_id, failed=False):
+    """Mark a task finished and dispatch queued work to the freed agent."""
+    with Dispatcher() as dispatcher:
+        result = dispatcher.complete(task_id, success=not failed)
     
-    if not selected:
-        print(f"[X] Could not select agent")
+    if result is None:
+        print(f"[X] Task {task_id} is not assigned")
         return
-    
-    # Assign task
-    task = {
-        'type': task_type,
-        'data': task_data,
-        'agent': selected['id'],
-        'priority': priority,
-        'submitted': datetime.now().isoformat(),
-        'status': 'assigned'
-    }
-    
-    selected['load'] = selected.get('load', 0) + 1
-    selected['task_count'] = selected.get('task_count', 0) + 1
-    
-    # Save updated agents
-    all_agents = load_agents()
-    for a in all_agents:
-        if a['id'] == selected['id']:
-            a['load'] = selected['load']
-            a['task_count'] = selected['task_count']
-    save_agents(all_agents)
-    
-    print(f"[OK] Task assigned to {selected['id']}")
-    print(f"   Type: {task_type}")
-    print(f"   Strategy: {use_strategy}")
-    print(f"   Agent load: {selected['load']}")
+    print(f"[OK] Task {task_id} {'failed' if failed else 'completed'} on {result['agent']}")
 
 
 def show_pool_status(name):
     """Show detailed pool status."""
     pools = load_pools()
-    agents = {a['id']: a for a in load_agents()}
+    agents = {a['id']: a for a in load_runtime_agents()}
     
     if name not in pools:
         print(f"[X] Pool '{name}' not found")
         return
     
     pool = pools[name]
+    with Dispatcher() as dispatcher:
+        queue_depth = dispatcher.queue_depth(name)
+        queue = dispatcher.queued(name, limit=5)
     
     print(f"\n[Pool: {name}]\n")
     print(f"Size: {pool['size']} (min: {pool['min_size']}, max: {pool['max_size']})")
     print(f"Strategy: {pool['strategy']}")
-    print(f"Queue depth: {len(pool.get('queue', []))}")
+    print(f"Queue depth: {queue_depth}")
     print(f"Created: {pool['created'][:19]}")
     print(f"\n[Agents]")
     
@@ -370,19 +702,19 @@ def show_pool_status(name):
         tasks = agent.get('task_count', 0)
         print(f"  {agent_id}: {status} (load: {load}, tasks: {tasks})")
     
-    if pool.get('queue'):
-        print(f"\n[Queue ({len(pool['queue'])} tasks)]")
-        for i, task in enumerate(pool['queue'][:5], 1):
-            print(f"  {i}. {task['type']} [{task['priority']}]")
-        if len(pool['queue']) > 5:
-            print(f"  ... and {len(pool['queue']) - 5} more")
+    if queue:
+        print(f"\n[Queue ({queue_depth} tasks)]")
+        for i, task in enumerate(queue, 1):
+            print(f"  {i}. {task['type']} [{task['priority']}] (id {task['id']})")
+        if queue_depth > len(queue):
+            print(f"  ... and {queue_depth - len(queue)} more")
     
     print()
 
 
 def list_agents():
     """List all agents."""
-    agents = load_agents()
+    agents = load_runtime_agents()
     
     if not agents:
         print("\n[INFO] No agents created yet.\n")
@@ -401,7 +733,7 @@ def list_agents():
 
 def health_check():
     """Run health checks on all agents."""
-    agents = load_agents()
+    agents = load_runtime_agents()
     pools = load_pools()
     
     if not agents:
@@ -450,8 +782,11 @@ def auto_scale_dry_run():
     print(f"Max agents: {resources['max_agents']}")
     print()
     
+    with Dispatcher() as dispatcher:
+        depths = dispatcher.queue_depth()
+    
     for name, pool in pools.items():
-        queue_depth = len(pool.get('queue', []))
+        queue_depth = depths.get(name, 0)
         per_agent = queue_depth / pool['size'] if pool['size'] > 0 else 0
         
         print(f"Pool: {name}")
@@ -470,6 +805,187 @@ def auto_scale_dry_run():
         print()
 
 
+class EWMA:
+    """Exponentially weighted moving average"""
+    
+    def __init__(self, alpha=EWMA_ALPHA):
+        self.alpha = alpha
+        self.value = None
+    
+    def update(self, sample):
+        if sample is None:
+            return self.value
+        self.value = sample if self.value is None else self.alpha * sample + (1 - self.alpha) * self.value
+        return self.value
+
+
+class Autoscaler:
+    """
+    Continuous, metrics-driven pool autoscaler.
+    
+    Each interval it samples queue depth, in-flight load, oldest queue wait,
+    per-agent throughput and service latency from the dispatcher, smooths them
+    with EWMA and decides per pool:
+    
+    - up when the queue would take longer than TARGET_DRAIN_SECONDS to drain
+      or more than SCALE_UP_QUEUE tasks wait per agent
+    - down by one agent after SCALE_DOWN_STABLE calm samples (hysteresis band
+      between SCALE_DOWN_QUEUE and SCALE_UP_QUEUE)
+    - never inside the cooldown after a previous change, never past the pool
+      min/max, and every added agent must pass can_create_agent()
+    
+    Decisions are appended to autoscale.jsonl.
+    """
+    
+    def __init__(self, pools=None, interval=AUTOSCALE_INTERVAL, dry_run=False,
+                 log_file=None, clock=time.time):
+        self.pools = pools
+        self.interval = interval
+        self.dry_run = dry_run
+        self.log_file = Path(log_file or AUTOSCALE_LOG)
+        self.clock = clock
+        self.state = {}
+    
+    def _pool_state(self, name):
+        if name not in self.state:
+            self.state[name] = {
+                'queue': EWMA(), 'inflight': EWMA(), 'wait': EWMA(),
+                'throughput': EWMA(), 'latency': EWMA(),
+                'calm': 0, 'last_change': 0.0,
+                'since': datetime.now().isoformat(), 'sampled': self.clock()
+            }
+        return self.state[name]
+    
+    def sample(self, dispatcher, name, size):
+        """Update the EWMA series of a pool and return the smoothed values"""
+        st = self._pool_state(name)
+        now = self.clock()
+        raw = dispatcher.pool_metrics(name, st['since'])
+        elapsed = max(now - st['sampled'], 1e-6)
+        st['since'] = datetime.now().isoformat()
+        st['sampled'] = now
+        
+        return {
+            'queue_now': raw['queue_depth'],
+            'queue': st['queue'].update(raw['queue_depth']),
+            'inflight': st['inflight'].update(raw['inflight']),
+            'wait': st['wait'].update(raw['oldest_wait']),
+            'throughput': st['throughput'].update(raw['completed'] / elapsed / max(size, 1)),
+            'latency': st['latency'].update(raw['service_seconds'])
+        }
+    
+    def decide(self, name, pool, metrics):
+        """Return (target_size, reason) for a pool given smoothed metrics"""
+        st = self._pool_state(name)
+        size = pool['size']
+        now = self.clock()
+        since_change = now - st['last_change']
+        per_agent_queue = metrics['queue'] / max(size, 1)
+        per_agent_load = metrics['inflight'] / max(size, 1)
+        service_rate = metrics['throughput'] * size
+        drain = metrics['queue'] / service_rate if service_rate > 0 else float('inf')
+        drain_text = f"{drain:.0f}s to drain" if service_rate > 0 else "no completions yet"
+        
+        # The smoothed queue must be confirmed by the current sample so a
+        # decaying average never triggers a scale-up on an empty queue
+        backlog = metrics['queue'] >= 1 and metrics['queue_now'] > 0
+        if backlog and (drain > TARGET_DRAIN_SECONDS or per_agent_queue > SCALE_UP_QUEUE):
+            st['calm'] = 0
+            if size >= pool['max_size']:
+                return size, f"at max_size ({drain_text})"
+            if since_change < SCALE_UP_COOLDOWN:
+                return size, f"scale-up cooldown ({SCALE_UP_COOLDOWN - since_change:.0f}s left)"
+            if metrics['throughput'] > 0:
+                needed = int(-(-metrics['queue'] // (metrics['throughput'] * TARGET_DRAIN_SECONDS)))
+            else:
+                needed = int(-(-metrics['queue'] // SCALE_UP_QUEUE))
+            step = max(1, min(needed - size, MAX_STEP_UP))
+            return min(size + step, pool['max_size']), f"queue {metrics['queue']:.1f}, {drain_text}"
+        
+        if per_agent_queue < SCALE_DOWN_QUEUE and per_agent_load < SCALE_DOWN_LOAD:
+            st['calm'] += 1
+            if size <= pool['min_size']:
+                return size, "at min_size"
+            if st['calm'] < SCALE_DOWN_STABLE:
+                return size, f"calm {st['calm']}/{SCALE_DOWN_STABLE}"
+            if since_change < SCALE_DOWN_COOLDOWN:
+                return size, f"scale-down cooldown ({SCALE_DOWN_COOLDOWN - since_change:.0f}s left)"
+            return size - 1, f"idle: queue {per_agent_queue:.2f}/agent, load {per_agent_load:.2f}/agent"
+        
+        st['calm'] = 0
+        return size, "within band"
+    
+    def _apply(self, name, size, target):
+        """Scale toward target, one agent at a time within can_create_agent()"""
+        if target < size:
+            scale_pool(name, target)
+            return target, None
+        applied = size
+        while applied < target:
+            ok, reason = can_create_agent()
+            if not ok:
+                return applied, reason
+            scale_pool(name, applied + 1)
+            applied += 1
+        return applied, None
+    
+    def _log(self, entry):
+        with open(self.log_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+    
+    def step(self):
+        """Run one sample/decide/apply round over all pools"""
+        decisions = []
+        pools = load_pools()
+        with Dispatcher() as dispatcher:
+            for name, pool in pools.items():
+                if self.pools and name not in self.pools:
+                    continue
+                metrics = self.sample(dispatcher, name, pool['size'])
+                target, reason = self.decide(name, pool, metrics)
+                entry = {
+                    'time': datetime.now().isoformat(),
+                    'pool': name,
+                    'size': pool['size'],
+                    'target': target,
+                    'reason': reason,
+                    'metrics': {k: round(v, 3) for k, v in metrics.items() if v is not None}
+                }
+                
+                if target != pool['size']:
+                    if self.dry_run:
+                        entry['action'] = 'dry-run'
+                    else:
+                        applied, blocked = self._apply(name, pool['size'], target)
+                        entry['action'] = 'scaled' if applied != pool['size'] else 'blocked'
+                        entry['applied'] = applied
+                        if blocked:
+                            entry['blocked'] = blocked
+                        if applied != pool['size']:
+                            self.state[name]['last_change'] = self.clock()
+                            self.state[name]['calm'] = 0
+                    self._log(entry)
+                else:
+                    entry['action'] = 'hold'
+                decisions.append(entry)
+            
+            if not self.dry_run and any(d['action'] == 'scaled' for d in decisions):
+                dispatcher.dispatch()
+        return decisions
+    
+    def run(self, duration=None, verbose=False):
+        """Loop until duration elapses or Ctrl+C"""
+        end = self.clock() + duration if duration else None
+        try:
+            while end is None or self.clock() < end:
+                for d in self.step():
+                    if d['action'] != 'hold' or verbose:
+                        print(f"[{d['action'].upper()}] {d['pool']}: {d['size']} -> {d.get('applied', d['target'])} ({d['reason']})")
+                time.sleep(self.interval)
+        except KeyboardInterrupt:
+            print("\n[OK] Autoscaler stopped")
+
+
 def main():
     parser = argparse.ArgumentParser(description='Agent orchestrator')
     subparsers = parser.add_subparsers(dest='command', help='Command')
@@ -503,6 +1019,16 @@ def main():
     submit_parser.add_argument('--priority', default='normal',
                               choices=['critical', 'high', 'normal', 'low'])
     
+    batch_parser = subparsers.add_parser('submit-batch', help='Submit tasks from a JSON file')
+    batch_parser.add_argument('--pool', required=True, help='Pool name')
+    batch_parser.add_argument('--file', required=True, help='JSON list of {type, data, priority}')
+    batch_parser.add_argument('--strategy', choices=list(STRATEGIES.keys()),
+                              help='Override pool strategy')
+    
+    complete_parser = subparsers.add_parser('complete', help='Mark task finished')
+    complete_parser.add_argument('--task-id', type=int, required=True, help='Task id')
+    complete_parser.add_argument('--failed', action='store_true', help='Mark as failed')
+    
     # Status commands
     status_parser = subparsers.add_parser('status', help='Show pool status')
     status_parser.add_argument('--pool', help='Pool name (omit for all)')
@@ -511,6 +1037,13 @@ def main():
     subparsers.add_parser('health', help='Run health checks')
     subparsers.add_parser('auto-scale-dry-run', help='Show auto-scale recommendations')
     
+    autoscale_parser = subparsers.add_parser('autoscale', help='Run the continuous autoscaler')
+    autoscale_parser.add_argument('--pool', action='append', help='Pool to manage (repeatable, default all)')
+    autoscale_parser.add_argument('--interval', type=float, default=AUTOSCALE_INTERVAL, help='Seconds between samples')
+    autoscale_parser.add_argument('--duration', type=float, help='Stop after N seconds')
+    autoscale_parser.add_argument('--dry-run', action='store_true', help='Log decisions without scaling')
+    autoscale_parser.add_argument('--verbose', action='store_true', help='Print hold decisions too')
+    
     args = parser.parse_args()
     
     if args.command == 'pool-create':
@@ -523,6 +1056,10 @@ def main():
         delete_pool(args.name)
     elif args.command == 'submit':
         submit_task(args.pool, args.task, args.data, args.strategy, args.priority)
+    elif args.command == 'submit-batch':
+        submit_batch(args.pool, args.file, args.strategy)
+    elif args.command == 'complete':
+        complete_task(args.task_id, args.failed)
     elif args.command == 'status':
         if args.pool:
             show_pool_status(args.pool)
@@ -534,6 +1071,8 @@ def main():
         health_check()
     elif args.command == 'auto-scale-dry-run':
         auto_scale_dry_run()
+    elif args.command == 'autoscale':
+        Autoscaler(args.pool, args.interval, args.dry_run).run(args.duration, args.verbose)
     else:
         list_pools()
 
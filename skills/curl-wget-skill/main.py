@@ -16,14 +16,16 @@ import sys
 import json
 import hashlib
 import asyncio
+import threading
 import aiohttp
 import aiofiles
 from pathlib import Path
 from typing import Dict, List, Optional, Union, Any, Callable
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from urllib.parse import urlparse, unquote
 from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
 from tqdm import tqdm
 import time
 
@@ -65,6 +67,12 @@ class DownloadProgress:
         self.downloaded += chunk_size
         if self.pbar:
             self.pbar.update(chunk_size)
+
+    def set_initial(self, downloaded: int):
+        """Account for bytes already on disk (resume)."""
+        self.downloaded = downloaded
+        if self.pbar:
+            self.pbar.update(downloaded)
     
     def close(self):
         """Close progress bar."""
@@ -80,6 +88,115 @@ class DownloadProgress:
         return 0.0
 
 
+@dataclass
+class Segment:
+    """Byte range of a segmented download (end is inclusive)."""
+    index: int
+    start: int
+    end: int
+    done: int = 0
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start + 1
+
+    @property
+    def complete(self) -> bool:
+        return self.done >= self.length
+
+
+@dataclass
+class SegmentCheckpoint:
+    """Per-segment progress persisted next to a partial download."""
+    url: str
+    total_size: int
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    segments: List[Segment] = field(default_factory=list)
+
+    @staticmethod
+    def path_for(output_file: Path) -> Path:
+        """Checkpoint sidecar path for an output file."""
+        return output_file.with_name(output_file.name + ".parts.json")
+
+    def save(self, path: Path):
+        """Atomically write checkpoint to disk."""
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(json.dumps(asdict(self)))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["SegmentCheckpoint"]:
+        """Load checkpoint, or None if missing or unreadable."""
+        try:
+            data = json.loads(path.read_text())
+            data["segments"] = [Segment(**seg) for seg in data.get("segments", [])]
+            return cls(**data)
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def matches(self, url: str, total_size: int, etag: Optional[str],
+                last_modified: Optional[str]) -> bool:
+        """Check whether the checkpoint belongs to the same remote file."""
+        return (self.url == url and self.total_size == total_size
+                and self.etag == etag and self.last_modified == last_modified)
+
+
+class IncrementalHasher:
+    """
+    Hash a file while it is written out of order by parallel segments.
+
+    Chunks written exactly at the hash frontier are hashed straight from
+    memory; data that arrived ahead of the frontier is read back (from the
+    page cache) once the bytes before it are complete.
+    """
+
+    def __init__(self, filepath: Path, segments: List[Segment],
+                 algorithm: str = "sha256", read_size: int = 1024 * 1024):
+        self.filepath = filepath
+        self.segments = segments
+        self.hash_obj = hashlib.new(algorithm)
+        self.read_size = read_size
+        self.frontier = 0
+        self._lock = threading.Lock()
+
+    def _contiguous_end(self) -> int:
+        """Offset up to which every byte has been written."""
+        end = 0
+        for seg in self.segments:
+            end = seg.start + min(seg.done, seg.length)
+            if not seg.complete:
+                break
+        return end
+
+    def feed(self, offset: int, data: bytes):
+        """Hash a just-written chunk if it sits at the frontier."""
+        with self._lock:
+            if offset == self.frontier:
+                self.hash_obj.update(data)
+                self.frontier += len(data)
+
+    def catch_up(self):
+        """Hash any completed bytes behind the frontier from disk."""
+        with self._lock:
+            end = self._contiguous_end()
+            if end <= self.frontier:
+                return
+            with open(self.filepath, "rb") as f:
+                f.seek(self.frontier)
+                while self.frontier < end:
+                    chunk = f.read(min(self.read_size, end - self.frontier))
+                    if not chunk:
+                        break
+                    self.hash_obj.update(chunk)
+                    self.frontier += len(chunk)
+
+    def hexdigest(self) -> str:
+        """Finish hashing and return the digest."""
+        self.catch_up()
+        return self.hash_obj.hexdigest()
+
+
 class CurlWgetSkill:
     """
     cURL/wget Download Skill class.
@@ -91,6 +208,7 @@ class CurlWgetSkill:
     - Progress tracking
     - Checksum verification
     - Concurrent downloads
+    - Segmented parallel range downloads
     """
 
     def __init__(self, config: Optional[Dict[str, Any]] = None):
@@ -108,10 +226,31 @@ class CurlWgetSkill:
             "user_agent",
             "curl-wget-skill/1.0.0"
         )
+        self.pool_size = self.config.get("pool_size", 16)
+        self.segments = self.config.get("segments", 8)
+        self.min_segment_size = self.config.get(
+            "min_segment_size",
+            4 * 1024 * 1024
+        )
+        self.segment_chunk_size = self.config.get(
+            "segment_chunk_size",
+            256 * 1024
+        )
+        self.checkpoint_interval = self.config.get(
+            "checkpoint_interval",
+            8 * 1024 * 1024
+        )
         self.session = requests.Session()
         self.session.headers.update({
             "User-Agent": self.user_agent
         })
+        # One keep-alive pool shared by all threads and segments
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_size,
+            pool_maxsize=self.pool_size
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
     def _get_filename_from_url(self, url: str) -> str:
         """Extract filename from URL."""
@@ -307,12 +446,232 @@ class CurlWgetSkill:
             error="Max retries exceeded"
         )
 
+    def _probe(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Fetch size, range support and validators with one HEAD request."""
+        response = self.session.head(
+            url,
+            headers=headers,
+            allow_redirects=True,
+            timeout=timeout or self.default_timeout
+        )
+        response.raise_for_status()
+        return {
+            "size": int(response.headers.get("Content-Length", 0)),
+            "accept_ranges": "bytes" in response.headers.get("Accept-Ranges", ""),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+
+    def _plan_segments(self, total_size: int, segments: int) -> List[Segment]:
+        """Split a file into contiguous byte ranges."""
+        count = max(1, min(segments, total_size // max(1, self.min_segment_size)))
+        base = total_size // count
+        plan = []
+        start = 0
+        for index in range(count):
+            end = total_size - 1 if index == count - 1 else start + base - 1
+            plan.append(Segment(index=index, start=start, end=end))
+            start = end + 1
+        return plan
+
+    def _fetch_segment(
+        self,
+        url: str,
+        fd: int,
+        segment: Segment,
+        headers: Dict[str, str],
+        timeout: int,
+        on_chunk: Callable[[Segment, int, bytes], None]
+    ):
+        """Download one byte range into its slot of the output file."""
+        retries = 0
+        while not segment.complete:
+            offset = segment.start + segment.done
+            request_headers = dict(headers)
+            request_headers["Range"] = f"bytes={offset}-{segment.end}"
+            try:
+                response = self.session.get(
+                    url,
+                    headers=request_headers,
+                    stream=True,
+                    timeout=timeout
+                )
+                response.raise_for_status()
+                if response.status_code != 206:
+                    raise IOError(f"Server ignored range request (HTTP {response.status_code})")
+                for chunk in response.iter_content(chunk_size=self.segment_chunk_size):
+                    if not chunk:
+                        continue
+                    chunk = chunk[:segment.length - segment.done]
+                    _write_at(fd, chunk, offset)
+                    segment.done += len(chunk)
+                    on_chunk(segment, offset, chunk)
+                    offset += len(chunk)
+                    if segment.complete:
+                        break
+                response.close()
+                if not segment.complete:
+                    raise IOError(f"Segment {segment.index} ended early")
+            except (requests.exceptions.RequestException, IOError):
+                retries += 1
+                if retries >= self.max_retries:
+                    raise
+                time.sleep(1)
+
+    def segmented_download(
+        self,
+        url: str,
+        output_path: Optional[str] = None,
+        segments: Optional[int] = None,
+        resume: bool = True,
+        verify_checksum: Optional[str] = None,
+        checksum_algorithm: str = "sha256",
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[int] = None
+    ) -> DownloadResult:
+        """
+        Download a large file as concurrent byte ranges.
+        
+        The file is preallocated and each segment writes into its own slot.
+        Per-segment progress is checkpointed to ``<output>.parts.json`` so an
+        interrupted download resumes every segment where it stopped. The
+        checksum is computed while writing. Servers without range support,
+        or files too small to split, fall back to ``download``.
+        
+        Args:
+            url: URL to download
+            output_path: Local save path
+            segments: Number of concurrent ranges (default from config)
+            resume: Resume from an existing checkpoint
+            verify_checksum: Expected checksum for verification
+            checksum_algorithm: Checksum algorithm
+            headers: Additional HTTP headers
+            timeout: Request timeout
+            
+        Returns:
+            DownloadResult object
+        """
+        if not self._validate_url(url):
+            return DownloadResult(url=url, status="error", error="Invalid URL")
+
+        output_file = Path(output_path or self._get_filename_from_url(url))
+        request_headers = dict(headers or {})
+        request_headers["User-Agent"] = self.user_agent
+        timeout = timeout or self.default_timeout
+        segments = segments or self.segments
+
+        try:
+            info = self._probe(url, request_headers, timeout)
+        except requests.exceptions.RequestException:
+            info = {"size": 0, "accept_ranges": False}
+
+        total_size = info["size"]
+        if not info["accept_ranges"] or total_size < 2 * self.min_segment_size:
+            return self.download(
+                url,
+                output_path=str(output_file),
+                resume=resume,
+                verify_checksum=verify_checksum,
+                checksum_algorithm=checksum_algorithm,
+                headers=headers,
+                timeout=timeout
+            )
+
+        checkpoint_file = SegmentCheckpoint.path_for(output_file)
+        checkpoint = SegmentCheckpoint.load(checkpoint_file) if resume else None
+        if (checkpoint is None or not output_file.exists()
+                or not checkpoint.matches(url, total_size, info["etag"], info["last_modified"])):
+            checkpoint = SegmentCheckpoint(
+                url=url,
+                total_size=total_size,
+                etag=info["etag"],
+                last_modified=info["last_modified"],
+                segments=self._plan_segments(total_size, segments)
+            )
+            with open(output_file, "wb") as f:
+                f.truncate(total_size)
+        checkpoint.save(checkpoint_file)
+
+        already = sum(min(seg.done, seg.length) for seg in checkpoint.segments)
+        progress = DownloadProgress(total_size, output_file.name)
+        progress.set_initial(already)
+        hasher = IncrementalHasher(output_file, checkpoint.segments, checksum_algorithm)
+        lock = threading.Lock()
+        unsaved = [0]
+        start_time = time.time()
+
+        def on_chunk(segment: Segment, offset: int, chunk: bytes):
+            hasher.feed(offset, chunk)
+            with lock:
+                progress.update(len(chunk))
+                unsaved[0] += len(chunk)
+                if unsaved[0] >= self.checkpoint_interval or segment.complete:
+                    unsaved[0] = 0
+                    checkpoint.save(checkpoint_file)
+            if segment.complete:
+                hasher.catch_up()
+
+        pending = [seg for seg in checkpoint.segments if not seg.complete]
+        fd = os.open(str(output_file), os.O_RDWR | getattr(os, "O_BINARY", 0))
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, len(pending))) as executor:
+                futures = [
+                    executor.submit(
+                        self._fetch_segment, url, fd, seg,
+                        request_headers, timeout, on_chunk
+                    )
+                    for seg in pending
+                ]
+                for future in futures:
+                    future.result()
+        except Exception as e:
+            with lock:
+                checkpoint.save(checkpoint_file)
+            progress.close()
+            return DownloadResult(
+                url=url,
+                status="error",
+                local_path=str(output_file),
+                file_size=total_size,
+                downloaded_size=sum(min(seg.done, seg.length) for seg in checkpoint.segments),
+                error=f"Segmented download interrupted (resumable): {e}"
+            )
+        finally:
+            os.close(fd)
+
+        progress.close()
+        checksum = hasher.hexdigest()
+        checkpoint_file.unlink(missing_ok=True)
+        time_elapsed = time.time() - start_time
+        fetched = total_size - already
+
+        result = DownloadResult(
+            url=url,
+            status="success",
+            local_path=str(output_file),
+            file_size=total_size,
+            downloaded_size=total_size,
+            speed=fetched / time_elapsed if time_elapsed > 0 else 0.0,
+            time_elapsed=time_elapsed,
+            checksum=checksum
+        )
+        if verify_checksum and checksum != verify_checksum:
+            result.status = "checksum_mismatch"
+            result.error = "Checksum verification failed"
+        return result
+
     def batch_download(
         self,
         urls: List[str],
         output_dir: str = ".",
         max_concurrent: int = 3,
-        resume: bool = True
+        resume: bool = True,
+        segments: int = 1
     ) -> Dict[str, Any]:
         """
         Download multiple files concurrently.
@@ -322,6 +681,7 @@ class CurlWgetSkill:
             output_dir: Output directory
             max_concurrent: Maximum concurrent downloads
             resume: Enable resume capability
+            segments: Byte ranges per file (>1 uses segmented_download)
             
         Returns:
             Dictionary with batch results
@@ -338,12 +698,21 @@ class CurlWgetSkill:
             for url in urls:
                 filename = self._get_filename_from_url(url)
                 filepath = output_path / filename
-                future = executor.submit(
-                    self.download,
-                    url=url,
-                    output_path=str(filepath),
-                    resume=resume
-                )
+                if segments > 1:
+                    future = executor.submit(
+                        self.segmented_download,
+                        url=url,
+                        output_path=str(filepath),
+                        segments=segments,
+                        resume=resume
+                    )
+                else:
+                    future = executor.submit(
+                        self.download,
+                        url=url,
+                        output_path=str(filepath),
+                        resume=resume
+                    )
                 futures.append(future)
             
             for future in futures:
@@ -366,7 +735,8 @@ class CurlWgetSkill:
         self,
         url: str,
         output_path: Optional[str] = None,
-        resume: bool = True
+        resume: bool = True,
+        session: Optional[aiohttp.ClientSession] = None
     ) -> DownloadResult:
         """
         Async download using aiohttp.
@@ -375,6 +745,7 @@ class CurlWgetSkill:
             url: URL to download
             output_path: Local save path
             resume: Enable resume capability
+            session: Shared ClientSession to reuse its connection pool
             
         Returns:
             DownloadResult object
@@ -394,36 +765,39 @@ class CurlWgetSkill:
         
         start_time = time.time()
         
+        own_session = session is None
+        if own_session:
+            session = aiohttp.ClientSession()
+        
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as response:
-                    if response.status not in [200, 206]:
-                        return DownloadResult(
-                            url=url,
-                            status="error",
-                            error=f"HTTP {response.status}"
-                        )
-                    
-                    mode = "ab" if downloaded_size > 0 and resume else "wb"
-                    
-                    async with aiofiles.open(output_file, mode) as f:
-                        async for chunk in response.content.iter_chunked(
-                            self.chunk_size
-                        ):
-                            await f.write(chunk)
-                            downloaded_size += len(chunk)
-                    
-                    time_elapsed = time.time() - start_time
-                    
+            async with session.get(url, headers=headers) as response:
+                if response.status not in [200, 206]:
                     return DownloadResult(
                         url=url,
-                        status="success",
-                        local_path=str(output_file),
-                        file_size=output_file.stat().st_size,
-                        downloaded_size=downloaded_size,
-                        speed=downloaded_size / time_elapsed if time_elapsed > 0 else 0,
-                        time_elapsed=time_elapsed
+                        status="error",
+                        error=f"HTTP {response.status}"
                     )
+                
+                mode = "ab" if downloaded_size > 0 and resume else "wb"
+                
+                async with aiofiles.open(output_file, mode) as f:
+                    async for chunk in response.content.iter_chunked(
+                        self.chunk_size
+                    ):
+                        await f.write(chunk)
+                        downloaded_size += len(chunk)
+                
+                time_elapsed = time.time() - start_time
+                
+                return DownloadResult(
+                    url=url,
+                    status="success",
+                    local_path=str(output_file),
+                    file_size=output_file.stat().st_size,
+                    downloaded_size=downloaded_size,
+                    speed=downloaded_size / time_elapsed if time_elapsed > 0 else 0,
+                    time_elapsed=time_elapsed
+                )
                     
         except Exception as e:
             return DownloadResult(
@@ -431,6 +805,53 @@ class CurlWgetSkill:
                 status="error",
                 error=str(e)
             )
+        finally:
+            if own_session:
+                await session.close()
+
+    async def async_batch_download(
+        self,
+        urls: List[str],
+        output_dir: str = ".",
+        max_concurrent: int = 8,
+        resume: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Download multiple files concurrently over one aiohttp session.
+        
+        Args:
+            urls: List of URLs to download
+            output_dir: Output directory
+            max_concurrent: Maximum concurrent downloads
+            resume: Enable resume capability
+            
+        Returns:
+            Dictionary with batch results
+        """
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+        gate = asyncio.Semaphore(max_concurrent)
+        connector = aiohttp.TCPConnector(limit=max_concurrent)
+        
+        async with aiohttp.ClientSession(connector=connector) as session:
+            async def run(url):
+                async with gate:
+                    return await self.async_download(
+                        url,
+                        output_path=str(output_path / self._get_filename_from_url(url)),
+                        resume=resume,
+                        session=session
+                    )
+            results = await asyncio.gather(*(run(url) for url in urls))
+        
+        success_count = sum(1 for r in results if r.status == "success")
+        return {
+            "success": True,
+            "total": len(urls),
+            "successful": success_count,
+            "failed": len(urls) - success_count,
+            "results": [r.to_dict() for r in results]
+        }
 
     def mirror(
         self,
@@ -461,6 +882,25 @@ class CurlWgetSkill:
         }
 
 
+def _write_at(fd: int, data: bytes, offset: int):
+    """Positional write that does not move a shared file offset."""
+    if hasattr(os, "pwrite"):
+        while data:
+            written = os.pwrite(fd, data, offset)
+            data = data[written:]
+            offset += written
+        return
+    # Windows has no pwrite; serialise seek+write on the shared descriptor
+    with _WRITE_LOCK:
+        os.lseek(fd, offset, os.SEEK_SET)
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+
+
+_WRITE_LOCK = threading.Lock()
+
+
 # Entry points for Kimi Skills Framework
 def download(url: str, **kwargs) -> Dict[str, Any]:
     """
@@ -478,6 +918,22 @@ def download(url: str, **kwargs) -> Dict[str, Any]:
     return result.to_dict()
 
 
+def segmented_download(url: str, **kwargs) -> Dict[str, Any]:
+    """
+    Segmented (multi-connection) download entry point.
+    
+    Args:
+        url: URL to download
+        **kwargs: Additional parameters
+        
+    Returns:
+        Download result dictionary
+    """
+    skill = CurlWgetSkill()
+    result = skill.segmented_download(url, **kwargs)
+    return result.to_dict()
+
+
 def batch_download(urls: List[str], **kwargs) -> Dict[str, Any]:
     """
     Batch download entry point.
@@ -503,11 +959,16 @@ if __name__ == "__main__":
                        action="store_true", help="Resume download")
     parser.add_argument("-b", "--batch", nargs="+",
                        help="Multiple URLs for batch download")
+    parser.add_argument("-s", "--segments", type=int, default=1,
+                       help="Parallel byte-range segments per file")
     
     args = parser.parse_args()
     
     if args.batch:
-        result = batch_download(args.batch)
+        result = batch_download(args.batch, segments=args.segments)
+    elif args.segments > 1:
+        result = segmented_download(args.url, output_path=args.output,
+                                    segments=args.segments, resume=args.resume)
     else:
         result = download(args.url, output_path=args.output, resume=args.resume)
     
@@ -3,16 +3,19 @@
 Tests for curl-wget-skill
 """
 
+import hashlib
 import unittest
 from unittest.mock import Mock, patch, MagicMock
 import sys
 import os
 import tempfile
+from pathlib import Path
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from main import CurlWgetSkill, DownloadResult, download, batch_download
+from main import (CurlWgetSkill, DownloadResult, SegmentCheckpoint,
+                  download, batch_download)
 
 
 class TestCurlWgetSkill(unittest.TestCase):
@@ -152,6 +155,100 @@ class TestCurlWgetSkill(unittest.TestCase):
             self.assertEqual(result.status, "checksum_mismatch")
 
 
+class TestSegmentedDownload(unittest.TestCase):
+    """Test cases for segmented range downloads."""
+
+    def setUp(self):
+        """Set up a skill with small segments and a fake ranged server."""
+        self.skill = CurlWgetSkill({
+            "min_segment_size": 1024,
+            "segment_chunk_size": 300,
+            "checkpoint_interval": 512
+        })
+        self.payload = bytes(range(256)) * 40  # 10240 bytes
+        self.requested_ranges = []
+
+        head_response = Mock()
+        head_response.headers = {
+            "Content-Length": str(len(self.payload)),
+            "Accept-Ranges": "bytes",
+            "ETag": '"v1"'
+        }
+        self.head_patch = patch('main.requests.Session.head', return_value=head_response)
+        self.get_patch = patch('main.requests.Session.get', side_effect=self._ranged_get)
+        self.head_patch.start()
+        self.get_patch.start()
+
+    def tearDown(self):
+        """Stop patches."""
+        self.head_patch.stop()
+        self.get_patch.stop()
+
+    def _ranged_get(self, url, headers=None, **kwargs):
+        start, end = headers["Range"].split("=")[1].split("-")
+        start, end = int(start), int(end)
+        self.requested_ranges.append((start, end))
+        body = self.payload[start:end + 1]
+        response = Mock()
+        response.status_code = 206
+        response.iter_content.side_effect = lambda chunk_size: (
+            body[i:i + chunk_size] for i in range(0, len(body), chunk_size)
+        )
+        return response
+
+    def test_plan_segments_covers_file(self):
+        """Test segment planning covers every byte exactly once."""
+        plan = self.skill._plan_segments(10240, 4)
+        self.assertEqual(len(plan), 4)
+        self.assertEqual(plan[0].start, 0)
+        self.assertEqual(plan[-1].end, 10239)
+        for prev, nxt in zip(plan, plan[1:]):
+            self.assertEqual(prev.end + 1, nxt.start)
+
+    def test_segmented_download_assembles_file(self):
+        """Test segments are written into place and hashed incrementally."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = os.path.join(tmpdir, "big.bin")
+            result = self.skill.segmented_download(
+                "https://example.com/big.bin",
+                output_path=output_path,
+                segments=4
+            )
+
+            self.assertEqual(result.status, "success")
+            with open(output_path, "rb") as f:
+                self.assertEqual(f.read(), self.payload)
+            self.assertEqual(result.checksum, hashlib.sha256(self.payload).hexdigest())
+            self.assertEqual(len(self.requested_ranges), 4)
+            self.assertFalse(os.path.exists(output_path + ".parts.json"))
+
+    def test_segmented_download_resumes_from_checkpoint(self):
+        """Test only missing byte ranges are fetched on resume."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = os.path.join(tmpdir, "big.bin")
+            plan = self.skill._plan_segments(len(self.payload), 2)
+            plan[0].done = plan[0].length
+            plan[1].done = 1000
+            with open(output_path, "wb") as f:
+                f.write(self.payload[:plan[1].start + 1000])
+                f.truncate(len(self.payload))
+            SegmentCheckpoint(
+                url="https://example.com/big.bin",
+                total_size=len(self.payload),
+                etag='"v1"',
+                segments=plan
+            ).save(SegmentCheckpoint.path_for(Path(output_path)))
+
+            result = self.skill.segmented_download(
+                "https://example.com/big.bin",
+                output_path=output_path
+            )
+
+            self.assertEqual(result.status, "success")
+            self.assertEqual(self.requested_ranges, [(plan[1].start + 1000, plan[1].end)])
+            self.assertEqual(result.checksum, hashlib.sha256(self.payload).hexdigest())
+
+
 class TestIntegration(unittest.TestCase):
     """Integration tests."""
 
@@ -10,13 +10,21 @@ import json
 import argparse
 import subprocess
 import re
-from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass, asdict
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Set, Tuple, Any
+from dataclasses import dataclass, asdict, field
 from pathlib import Path
 from enum import Enum
 import tempfile
 import shutil
 
+# Parallel job runner defaults
+DEFAULT_JOB_THREADS = 4      # libx264/libx265 frame threading scales well up to ~4 threads per job
+PROBE_WORKERS = 8            # ffprobe is I/O bound; probe this many inputs at once
+MIN_SEGMENT_SECONDS = 10.0   # shorter segments cost more in encoder warm-up and rate control than they gain
+
 # ============================================================================
 # Enums and Data Classes
 # ============================================================================
@@ -120,6 +128,123 @@ class MediaInfo:
     format_name: str = ""
     size_bytes: int = 0
 
+class JobStatus(Enum):
+    """Lifecycle of a queued transcode job"""
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+@dataclass
+class TranscodeJob:
+    """One ffmpeg invocation in a TranscodeQueue, with live progress"""
+    input_file: str
+    output_file: str
+    video_config: Optional[VideoConfig] = None
+    audio_config: Optional[AudioConfig] = None
+    extra_args: List[str] = field(default_factory=list)  # output options inserted before -threads
+    status: JobStatus = JobStatus.PENDING
+    attempts: int = 0
+    error: str = ""
+    duration: float = 0.0    # input duration from ffprobe (0 if unknown)
+    out_time: float = 0.0    # seconds of output written so far
+    fps: float = 0.0
+    speed: float = 0.0       # realtime multiple reported by ffmpeg (e.g. 4.2x)
+    elapsed: float = 0.0
+    
+    @property
+    def percent(self) -> float:
+        """Completion percentage, or 0 when the duration is unknown"""
+        if self.status in (JobStatus.DONE, JobStatus.SKIPPED):
+            return 100.0
+        if self.duration <= 0:
+            return 0.0
+        return min(100.0, 100.0 * self.out_time / self.duration)
+
+# ============================================================================
+# Progress parsing and scheduling
+# ============================================================================
+
+def parse_progress_time(value: str) -> float:
+    """Parse an ffmpeg out_time value ("HH:MM:SS.micro") into seconds"""
+    try:
+        hours, minutes, seconds = value.strip().split(":")
+        return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+    except ValueError:
+        return 0.0
+
+def apply_progress(job: TranscodeJob, block: Dict[str, str]) -> None:
+    """Update a job from one `-progress` key=value block"""
+    if "out_time_us" in block or "out_time_ms" in block:
+        # out_time_ms is also in microseconds (historical ffmpeg naming)
+        raw = block.get("out_time_us") or block.get("out_time_ms")
+        try:
+            job.out_time = max(0.0, int(raw) / 1_000_000)
+        except ValueError:
+            pass
+    elif "out_time" in block:
+        job.out_time = parse_progress_time(block["out_time"])
+    try:
+        job.fps = float(block.get("fps", job.fps))
+    except ValueError:
+        pass
+    speed = block.get("speed", "").rstrip("x").strip()
+    if speed and speed != "N/A":
+        try:
+            job.speed = float(speed)
+        except ValueError:
+            pass
+
+def iter_progress_blocks(stream) -> Any:
+    """Yield dicts from an ffmpeg `-progress` stream, one per `progress=` line"""
+    block: Dict[str, str] = {}
+    for line in stream:
+        key, sep, value = line.strip().partition("=")
+        if not sep:
+            continue
+        block[key] = value
+        if key == "progress":
+            yield block
+            block = {}
+
+def plan_segments(keyframes: List[float], duration: float,
+                  segment_seconds: float) -> List[float]:
+    """
+    Choose keyframe timestamps to cut at, at least segment_seconds apart.
+    
+    A cut is skipped if it would leave a tail shorter than half a segment.
+    """
+    cuts: List[float] = []
+    last = 0.0
+    for t in sorted(keyframes):
+        if t - last >= segment_seconds and duration - t >= segment_seconds / 2:
+            cuts.append(t)
+            last = t
+    return cuts
+
+def plan_concurrency(num_jobs: int, threads_per_job: Optional[int] = None,
+                     cpu_count: Optional[int] = None,
+                     workers: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Choose (parallel jobs, -threads per job) so that jobs x threads ~= cores.
+    
+    Encoders stop scaling well past a few threads per stream, so several
+    narrower jobs keep more cores busy than one wide one. An explicit
+    ``workers`` count fixes the number of jobs and the cores are split
+    between them.
+    """
+    cores = cpu_count or os.cpu_count() or 1
+    threads = max(1, threads_per_job or min(DEFAULT_JOB_THREADS, cores))
+    if workers:
+        workers = max(1, min(workers, num_jobs))
+    else:
+        workers = max(1, min(num_jobs, cores // threads))
+    if not threads_per_job:
+        # Fewer jobs than slots: give the spare cores to the running jobs
+        threads = max(1, cores // workers)
+    return workers, threads
+
 # ============================================================================
 # FFmpeg Manager
 # ============================================================================
@@ -226,17 +351,80 @@ class FFmpegManager:
         print(f"Video: {info.width}x{info.height} @ {info.fps:.2f} fps ({info.video_codec})")
         print(f"Audio: {info.audio_codec}, {info.audio_channels} channels @ {info.audio_sample_rate} Hz")
     
+    def probe_many(self, input_files: List[str],
+                   workers: int = PROBE_WORKERS) -> Dict[str, Optional[MediaInfo]]:
+        """Run get_media_info over many files concurrently"""
+        if not input_files:
+            return {}
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(input_files)))) as pool:
+            return dict(zip(input_files, pool.map(self.get_media_info, input_files)))
+    
+    def _probe_packets(self, input_file: str, stream: str = "v:0") -> List[Tuple[float, bool]]:
+        """(pts_time, is_keyframe) for every packet of a stream, read without decoding"""
+        cmd = [
+            self.ffprobe_path,
+            "-v", "error",
+            "-select_streams", stream,
+            "-show_entries", "packet=pts_time,flags",
+            "-of", "csv=p=0",
+            input_file
+        ]
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True)
+        except FileNotFoundError:
+            return []
+        if result.returncode != 0:
+            return []
+        
+        packets = []
+        for line in result.stdout.splitlines():
+            pts, _, flags = line.partition(",")
+            try:
+                packets.append((float(pts), "K" in flags))
+            except ValueError:
+                continue  # pts_time=N/A
+        return packets
+    
+    def probe_keyframes(self, input_file: str) -> List[float]:
+        """Timestamps of the video keyframes (GOP starts) in a file"""
+        return sorted(pts for pts, key in self._probe_packets(input_file) if key)
+    
+    def validate_output(self, input_file: str, output_file: str,
+                        tolerance: float = 0.5) -> Tuple[bool, str]:
+        """
+        Check an output against its source: duration within tolerance,
+        audio present if the source had audio, and no holes in the video
+        timeline (gaps over 3 frame intervals).
+        """
+        source = self.get_media_info(input_file)
+        output = self.get_media_info(output_file)
+        if not output:
+            return False, f"Cannot probe output: {output_file}"
+        if source and source.duration and abs(source.duration - output.duration) > tolerance:
+            return False, f"Duration mismatch: {source.duration:.3f}s -> {output.duration:.3f}s"
+        if source and source.audio_codec and not output.audio_codec:
+            return False, "Audio stream missing from output"
+        
+        fps = output.fps or (source.fps if source else 0)
+        timestamps = sorted(pts for pts, _ in self._probe_packets(output_file))
+        if fps and len(timestamps) > 1:
+            limit = 3.0 / fps
+            for prev, cur in zip(timestamps, timestamps[1:]):
+                if cur - prev > limit:
+                    return False, f"Video gap of {cur - prev:.3f}s at {prev:.3f}s"
+        return True, ""
+    
     # ========================================================================
     # Video Conversion
     # ========================================================================
     
-    def convert_video(self, input_file: str, output_file: str,
-                      video_config: VideoConfig = None,
-                      audio_config: AudioConfig = None,
-                      start_time: Optional[float] = None,
-                      duration: Optional[float] = None,
-                      overwrite: bool = False) -> bool:
-        """Convert video file with specified configuration"""
+    def _build_convert_args(self, input_file: str, output_file: str,
+                            video_config: VideoConfig = None,
+                            audio_config: AudioConfig = None,
+                            start_time: Optional[float] = None,
+                            duration: Optional[float] = None,
+                            overwrite: bool = False) -> List[str]:
+        """FFmpeg arguments for convert_video (output file last)"""
         args = ["-i", input_file]
         
         # Time options
@@ -261,12 +449,111 @@ class FFmpegManager:
         if overwrite:
             args.append("-y")
         args.append(output_file)
+        return args
+    
+    def convert_video(self, input_file: str, output_file: str,
+                      video_config: VideoConfig = None,
+                      audio_config: AudioConfig = None,
+                      start_time: Optional[float] = None,
+                      duration: Optional[float] = None,
+                      overwrite: bool = False,
+                      segmented: bool = False) -> bool:
+        """Convert video file with specified configuration (segmented: see convert_video_segmented)"""
+        if segmented and start_time is None and duration is None:
+            return self.convert_video_segmented(input_file, output_file, video_config,
+                                                audio_config, overwrite=overwrite)
+        args = self._build_convert_args(input_file, output_file, video_config, audio_config,
+                                        start_time, duration, overwrite)
         
         success, error = self._run_command(args)
         if not success:
             print(f"Conversion failed: {error}")
         return success
     
+    def convert_video_segmented(self, input_file: str, output_file: str,
+                                video_config: VideoConfig = None,
+                                audio_config: AudioConfig = None,
+                                segment_seconds: Optional[float] = None,
+                                workers: Optional[int] = None,
+                                threads_per_job: Optional[int] = None,
+                                overwrite: bool = False,
+                                validate: bool = True,
+                                on_progress: Optional[Callable[[TranscodeJob], None]] = None) -> bool:
+        """
+        Transcode one long video as GOP-aligned segments in parallel.
+        
+        The video stream is split at keyframes by stream copy, the segments
+        are encoded concurrently through a TranscodeQueue (audio is encoded
+        once, alongside them, to avoid priming gaps at every boundary), then
+        joined losslessly with concatenate_videos and muxed with the audio.
+        Falls back to convert_video when there is nothing to split.
+        """
+        if os.path.exists(output_file) and not overwrite:
+            print(f"Conversion failed: {output_file} already exists")
+            return False
+        
+        info = self.get_media_info(input_file)
+        cuts: List[float] = []
+        if info and info.duration and video_config and video_config.codec != VideoCodec.COPY:
+            if segment_seconds is None:
+                segment_seconds = max(MIN_SEGMENT_SECONDS, info.duration / (2 * (os.cpu_count() or 1)))
+            cuts = plan_segments(self.probe_keyframes(input_file), info.duration, segment_seconds)
+        if not cuts:
+            return self.convert_video(input_file, output_file, video_config, audio_config,
+                                      overwrite=overwrite)
+        
+        work_dir = tempfile.mkdtemp(prefix=".segments-", dir=os.path.dirname(os.path.abspath(output_file)))
+        try:
+            # 1. Split the video stream at the chosen keyframes (no re-encode)
+            split_times = ",".join(f"{max(0.0, t - 0.001):.6f}" for t in cuts)
+            success, error = self._run_command([
+                "-i", input_file, "-map", "0:v:0", "-c", "copy",
+                "-f", "segment", "-segment_times", split_times, "-reset_timestamps", "1",
+                os.path.join(work_dir, "src_%05d.mkv")
+            ])
+            pieces = sorted(str(p) for p in Path(work_dir).glob("src_*.mkv"))
+            if not success or len(pieces) != len(cuts) + 1:
+                print(f"Segment split failed: {error or f'{len(pieces)} of {len(cuts) + 1} segments'}")
+                return False
+            
+            # 2. Encode all segments (and the audio track) concurrently
+            queue = TranscodeQueue(self, workers=workers, threads_per_job=threads_per_job,
+                                   on_progress=on_progress)
+            encoded = [os.path.join(work_dir, f"enc_{i:05d}.mkv") for i in range(len(pieces))]
+            for piece, target in zip(pieces, encoded):
+                queue.add(TranscodeJob(piece, target, video_config))
+            audio_file = None
+            if info.audio_codec:
+                audio_file = os.path.join(work_dir, "audio.mka")
+                queue.add(TranscodeJob(input_file, audio_file, None, audio_config, extra_args=["-vn"]))
+            for job in queue.run():
+                if job.status != JobStatus.DONE:
+                    print(f"Segment failed: {job.input_file}: {job.error}")
+                    return False
+            
+            # 3. Lossless join through the concat demuxer, then mux the audio back in
+            joined = os.path.join(work_dir, "joined.mkv")
+            if not self.concatenate_videos(encoded, joined):
+                print("Segment concat failed")
+                return False
+            args = ["-i", joined]
+            if audio_file:
+                args += ["-i", audio_file, "-map", "0:v:0", "-map", "1:a:0"]
+            args += ["-c", "copy", "-y", output_file]
+            success, error = self._run_command(args)
+            if not success:
+                print(f"Conversion failed: {error}")
+                return False
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        
+        if validate:
+            valid, reason = self.validate_output(input_file, output_file)
+            if not valid:
+                print(f"Output validation failed: {reason}")
+                return False
+        return True
+    
     def convert_format(self, input_file: str, output_file: str,
                        container: ContainerFormat = None,
                        video_codec: VideoCodec = VideoCodec.COPY,
@@ -378,20 +665,81 @@ class FFmpegManager:
     # Batch Processing
     # ========================================================================
     
+    def run_job(self, job: TranscodeJob, threads: Optional[int] = None,
+                on_progress: Optional[Callable[[TranscodeJob], None]] = None) -> bool:
+        """
+        Run one job, streaming `-progress pipe:1` updates into the job.
+        
+        Output goes to a `.part` file that is renamed on success, so an
+        interrupted run never leaves a complete-looking output behind.
+        """
+        output = Path(job.output_file)
+        part_file = str(output.with_name(f"{output.stem}.part{output.suffix}"))
+        args = self._build_convert_args(job.input_file, part_file,
+                                        job.video_config, job.audio_config)[:-1]
+        args += job.extra_args
+        if threads:
+            args += ["-threads", str(threads)]
+        cmd = ([self.ffmpeg_path, "-hide_banner", "-nostats", "-loglevel", "error",
+                "-progress", "pipe:1"] + args + ["-y", part_file])
+        
+        job.out_time = job.fps = job.speed = 0.0
+        started = time.monotonic()
+        # stderr goes to a temp file: a full stderr pipe would stall ffmpeg
+        with tempfile.TemporaryFile(mode="w+") as err:
+            try:
+                proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=err,
+                                        stdin=subprocess.DEVNULL, text=True)
+            except FileNotFoundError:
+                job.error = f"Command not found: {self.ffmpeg_path}"
+                return False
+            for block in iter_progress_blocks(proc.stdout):
+                apply_progress(job, block)
+                job.elapsed = time.monotonic() - started
+                if on_progress:
+                    on_progress(job)
+            returncode = proc.wait()
+            err.seek(0)
+            job.error = err.read().strip()[-2000:]
+        job.elapsed = time.monotonic() - started
+        
+        if returncode == 0 and os.path.exists(part_file):
+            os.replace(part_file, job.output_file)
+            return True
+        if os.path.exists(part_file):
+            os.unlink(part_file)
+        job.error = job.error or f"ffmpeg exited with code {returncode}"
+        return False
+    
     def batch_convert(self, input_files: List[str], output_dir: str,
-                      output_ext: str, video_config: VideoConfig = None) -> List[str]:
-        """Batch convert multiple files"""
-        output_files = []
+                      output_ext: str, video_config: VideoConfig = None,
+                      audio_config: AudioConfig = None,
+                      workers: Optional[int] = None,
+                      threads_per_job: Optional[int] = None,
+                      retries: int = 1,
+                      manifest: Optional[str] = None,
+                      on_progress: Optional[Callable[[TranscodeJob], None]] = None) -> List[str]:
+        """
+        Batch convert multiple files, several ffmpeg processes at a time.
         
+        Outputs are named after the input stem; inputs that would map to the
+        same output (a/clip.mov, b/clip.mov) raise ValueError before any job runs.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        queue = TranscodeQueue(self, workers=workers, threads_per_job=threads_per_job,
+                               retries=retries, manifest=manifest, on_progress=on_progress)
         for input_file in input_files:
             base_name = Path(input_file).stem
             output_file = os.path.join(output_dir, f"{base_name}.{output_ext}")
-            
-            if self.convert_video(input_file, output_file, video_config):
-                output_files.append(output_file)
-                print(f"Converted: {input_file} -> {output_file}")
+            queue.add(TranscodeJob(input_file, output_file, video_config, audio_config))
+        
+        output_files = []
+        for job in queue.run():
+            if job.status in (JobStatus.DONE, JobStatus.SKIPPED):
+                output_files.append(job.output_file)
+                print(f"Converted: {job.input_file} -> {job.output_file}")
             else:
-                print(f"Failed: {input_file}")
+                print(f"Failed: {job.input_file}")
         
         return output_files
     
@@ -433,6 +781,139 @@ class FFmpegManager:
         
         return success
 
+# ============================================================================
+# Parallel Job Queue
+# ============================================================================
+
+class TranscodeQueue:
+    """
+    Runs TranscodeJobs concurrently with per-job -threads sized to the machine.
+    
+    A JSON manifest (output path -> status and input size/mtime) makes runs
+    resumable: jobs recorded as done whose output still exists and whose
+    input is unchanged are skipped.
+    """
+    
+    def __init__(self, manager: FFmpegManager, workers: Optional[int] = None,
+                 threads_per_job: Optional[int] = None, retries: int = 1,
+                 manifest: Optional[str] = None,
+                 on_progress: Optional[Callable[[TranscodeJob], None]] = None):
+        self.manager = manager
+        self.workers = workers
+        self.threads_per_job = threads_per_job
+        self.retries = retries
+        self.manifest = manifest
+        self.on_progress = on_progress
+        self.jobs: List[TranscodeJob] = []
+        self._outputs: Set[str] = set()
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+    
+    def add(self, job: TranscodeJob) -> TranscodeJob:
+        """Queue a job; two jobs writing the same output would share one .part file"""
+        output = os.path.abspath(job.output_file)
+        if output in self._outputs:
+            raise ValueError(f"{job.input_file}: output {job.output_file} is already queued")
+        self._outputs.add(output)
+        self.jobs.append(job)
+        return job
+    
+    def _load_manifest(self) -> None:
+        if self.manifest and os.path.exists(self.manifest):
+            try:
+                with open(self.manifest, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f).get("jobs", {})
+            except (OSError, ValueError):
+                self._entries = {}
+    
+    def _save_manifest(self) -> None:
+        if not self.manifest:
+            return
+        tmp = f"{self.manifest}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "jobs": self._entries}, f, indent=2)
+        os.replace(tmp, self.manifest)
+    
+    @staticmethod
+    def _input_stamp(path: str) -> Dict[str, int]:
+        try:
+            st = os.stat(path)
+            return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        except OSError:
+            return {}
+    
+    def _is_done(self, job: TranscodeJob) -> bool:
+        entry = self._entries.get(os.path.abspath(job.output_file))
+        return bool(entry and entry.get("status") == JobStatus.DONE.value
+                    and os.path.exists(job.output_file)
+                    and entry.get("input") == os.path.abspath(job.input_file)
+                    and entry.get("stamp") == self._input_stamp(job.input_file))
+    
+    def _record(self, job: TranscodeJob) -> None:
+        with self._lock:
+            self._entries[os.path.abspath(job.output_file)] = {
+                "input": os.path.abspath(job.input_file),
+                "stamp": self._input_stamp(job.input_file),
+                "status": job.status.value,
+                "attempts": job.attempts,
+                "elapsed": round(job.elapsed, 3),
+                "error": job.error,
+            }
+            self._save_manifest()
+    
+    def _report(self, job: TranscodeJob) -> None:
+        if self.on_progress:
+            with self._lock:
+                self.on_progress(job)
+    
+    def _run_one(self, job: TranscodeJob, threads: int) -> TranscodeJob:
+        while job.attempts <= self.retries:
+            job.attempts += 1
+            job.status = JobStatus.RUNNING
+            self._report(job)
+            if self.manager.run_job(job, threads, self._report):
+                job.status = JobStatus.DONE
+                job.error = ""
+                break
+            job.status = JobStatus.FAILED
+        self._record(job)
+        self._report(job)
+        return job
+    
+    def run(self) -> List[TranscodeJob]:
+        """Run all pending jobs; returns the jobs in the order they were added"""
+        self._load_manifest()
+        pending = []
+        for job in self.jobs:
+            if self._is_done(job):
+                job.status = JobStatus.SKIPPED
+                self._report(job)
+            else:
+                pending.append(job)
+        if not pending:
+            return self.jobs
+        
+        # Durations give per-job percentages; probing runs concurrently
+        infos = self.manager.probe_many([job.input_file for job in pending])
+        for job in pending:
+            info = infos.get(job.input_file)
+            job.duration = info.duration if info else 0.0
+        
+        workers, threads = plan_concurrency(len(pending), self.threads_per_job, workers=self.workers)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(self._run_one, job, threads) for job in pending]
+            for future in as_completed(futures):
+                future.result()
+        return self.jobs
+
+def format_job_progress(job: TranscodeJob) -> str:
+    """One-line status for a job, e.g. 'clip.mp4  42.0%  118.3 fps  4.10x'"""
+    name = os.path.basename(job.input_file)
+    if job.status in (JobStatus.RUNNING, JobStatus.PENDING):
+        return f"{name}  {job.percent:5.1f}%  {job.fps:6.1f} fps  {job.speed:5.2f}x"
+    detail = f" ({job.error.splitlines()[-1]})" if job.error and job.status == JobStatus.FAILED else ""
+    return f"{name}  {job.status.value}{detail}"
+
 # ============================================================================
 # CLI Interface
 # ============================================================================
@@ -456,6 +937,10 @@ def main():
     convert_parser.add_argument("--preset", default="medium", help="Encoding preset")
     convert_parser.add_argument("--crf", type=int, default=23, help="CRF quality")
     convert_parser.add_argument("--resolution", help="Resolution (e.g., 1920x1080)")
+    convert_parser.add_argument("--segments", action="store_true",
+                                help="Encode GOP-aligned segments in parallel and concat losslessly")
+    convert_parser.add_argument("--segment-seconds", type=float, help="Target segment length")
+    convert_parser.add_argument("--workers", type=int, help="Parallel segment encodes")
     
     # Extract audio
     extract_parser = subparsers.add_parser("extract-audio", help="Extract audio")
@@ -484,6 +969,19 @@ def main():
     thumb_parser.add_argument("output", help="Output file")
     thumb_parser.add_argument("--time", type=float, default=0, help="Time position")
     
+    # Batch
+    batch_parser = subparsers.add_parser("batch", help="Convert many files in parallel")
+    batch_parser.add_argument("inputs", nargs="+", help="Input files")
+    batch_parser.add_argument("--output-dir", required=True, help="Output directory")
+    batch_parser.add_argument("--ext", default="mp4", help="Output extension")
+    batch_parser.add_argument("--codec", default="libx264", help="Video codec")
+    batch_parser.add_argument("--preset", default="medium", help="Encoding preset")
+    batch_parser.add_argument("--crf", type=int, default=23, help="CRF quality")
+    batch_parser.add_argument("--workers", type=int, help="Parallel ffmpeg processes (default: from core count)")
+    batch_parser.add_argument("--threads", type=int, help="-threads per job (default: cores / workers)")
+    batch_parser.add_argument("--retries", type=int, default=1, help="Retries per failed job")
+    batch_parser.add_argument("--manifest", help="JSON manifest for resumable batches")
+    
     args = parser.parse_args()
     
     if not args.command:
@@ -513,7 +1011,13 @@ def main():
             w, h = map(int, args.resolution.split("x"))
             video_config.resolution = (w, h)
         
-        if manager.convert_video(args.input, args.output, video_config):
+        if args.segments:
+            success = manager.convert_video_segmented(args.input, args.output, video_config,
+                                                      segment_seconds=args.segment_seconds,
+                                                      workers=args.workers)
+        else:
+            success = manager.convert_video(args.input, args.output, video_config)
+        if success:
             print(f"Converted: {args.output}")
     
     elif args.command == "extract-audio":
@@ -535,6 +1039,28 @@ def main():
     elif args.command == "thumbnail":
         if manager.create_thumbnail(args.input, args.output, args.time):
             print(f"Created thumbnail: {args.output}")
+    
+    elif args.command == "batch":
+        video_config = VideoConfig(
+            codec=VideoCodec(args.codec),
+            preset=args.preset,
+            crf=args.crf
+        )
+        last_print = {}
+        
+        def show(job: TranscodeJob) -> None:
+            # Throttle running updates to about 2 per second per job
+            now = time.monotonic()
+            if job.status == JobStatus.RUNNING and now - last_print.get(job.output_file, 0) < 0.5:
+                return
+            last_print[job.output_file] = now
+            print(format_job_progress(job), flush=True)
+        
+        outputs = manager.batch_convert(args.inputs, args.output_dir, args.ext, video_config,
+                                        workers=args.workers, threads_per_job=args.threads,
+                                        retries=args.retries, manifest=args.manifest,
+                                        on_progress=show)
+        print(f"{len(outputs)}/{len(args.inputs)} files converted")
 
 if __name__ == "__main__":
     main()
@@ -15,7 +15,10 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from scripts.main import (
     FFmpegManager, VideoConfig, AudioConfig, MediaInfo,
-    VideoCodec, AudioCodec, ContainerFormat
+    VideoCodec, AudioCodec, ContainerFormat,
+    TranscodeJob, TranscodeQueue, JobStatus,
+    apply_progress, iter_progress_blocks, parse_progress_time, plan_concurrency,
+    plan_segments
 )
 
 class TestVideoConfig(unittest.TestCase):
@@ -264,6 +267,180 @@ class TestFFmpegManager(unittest.TestCase):
         self.assertTrue(result)
         mock_run.assert_called_once()
 
+class TestProgressParsing(unittest.TestCase):
+    
+    def test_parse_progress_time(self):
+        """Test HH:MM:SS.micro parsing"""
+        self.assertAlmostEqual(parse_progress_time("01:02:03.500000"), 3723.5)
+        self.assertEqual(parse_progress_time("N/A"), 0.0)
+    
+    def test_progress_blocks(self):
+        """Test -progress pipe:1 output is split into blocks and applied"""
+        output = [
+            "frame=120\n", "fps=59.8\n", "out_time_us=4800000\n", "speed=2.39x\n", "progress=continue\n",
+            "frame=250\n", "fps=60.1\n", "out_time_us=N/A\n", "speed=N/A\n", "progress=end\n",
+        ]
+        blocks = list(iter_progress_blocks(output))
+        self.assertEqual(len(blocks), 2)
+        self.assertEqual(blocks[1]["progress"], "end")
+        
+        job = TranscodeJob("in.mp4", "out.mp4", duration=9.6)
+        apply_progress(job, blocks[0])
+        self.assertEqual(job.out_time, 4.8)
+        self.assertEqual(job.fps, 59.8)
+        self.assertEqual(job.speed, 2.39)
+        self.assertEqual(job.percent, 50.0)
+        
+        apply_progress(job, blocks[1])
+        self.assertEqual(job.out_time, 4.8)
+        self.assertEqual(job.speed, 2.39)
+
+class TestPlanConcurrency(unittest.TestCase):
+    
+    def test_jobs_times_threads_fill_cores(self):
+        """Test default sizing from core count"""
+        self.assertEqual(plan_concurrency(10, cpu_count=16), (4, 4))
+        self.assertEqual(plan_concurrency(2, cpu_count=16), (2, 8))
+        self.assertEqual(plan_concurrency(10, cpu_count=1), (1, 1))
+    
+    def test_explicit_threads(self):
+        """Test explicit -threads per job"""
+        self.assertEqual(plan_concurrency(10, threads_per_job=2, cpu_count=16), (8, 2))
+        self.assertEqual(plan_concurrency(10, threads_per_job=32, cpu_count=16), (1, 32))
+    
+    def test_explicit_workers(self):
+        """Test a fixed worker count splits the cores between jobs"""
+        self.assertEqual(plan_concurrency(10, cpu_count=16, workers=8), (8, 2))
+        self.assertEqual(plan_concurrency(3, cpu_count=16, workers=8), (3, 5))
+        self.assertEqual(plan_concurrency(10, threads_per_job=4, cpu_count=16, workers=8), (8, 4))
+
+class TestTranscodeQueue(unittest.TestCase):
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.ffmpeg = FFmpegManager()
+        self.inputs = []
+        for name in ("a.mp4", "b.mp4", "bad.mp4"):
+            path = os.path.join(self.temp_dir, name)
+            Path(path).write_bytes(b"data")
+            self.inputs.append(path)
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def _fake_run_job(self, job, threads=None, on_progress=None):
+        if "bad" in job.input_file:
+            job.error = "Invalid data found when processing input"
+            return False
+        Path(job.output_file).write_bytes(b"out")
+        return True
+    
+    @patch('scripts.main.FFmpegManager.get_media_info', return_value=None)
+    def test_batch_convert_retries_and_resumes(self, mock_probe):
+        """Test retries, manifest recording and resume skipping"""
+        out_dir = os.path.join(self.temp_dir, "out")
+        manifest = os.path.join(self.temp_dir, "manifest.json")
+        
+        with patch.object(FFmpegManager, 'run_job', autospec=True,
+                          side_effect=lambda mgr, *a, **kw: self._fake_run_job(*a, **kw)) as mock_run:
+            outputs = self.ffmpeg.batch_convert(self.inputs, out_dir, "mkv",
+                                                workers=2, retries=2, manifest=manifest)
+            self.assertEqual(sorted(os.path.basename(p) for p in outputs), ["a.mkv", "b.mkv"])
+            self.assertEqual(mock_run.call_count, 2 + 3)
+            self.assertEqual(mock_probe.call_count, 3)
+            
+            with open(manifest) as f:
+                entries = json.load(f)["jobs"]
+            bad = entries[os.path.join(out_dir, "bad.mkv")]
+            self.assertEqual(bad["status"], "failed")
+            self.assertEqual(bad["attempts"], 3)
+            
+            mock_run.reset_mock()
+            queue = TranscodeQueue(self.ffmpeg, manifest=manifest)
+            jobs = [queue.add(TranscodeJob(path, os.path.join(out_dir, Path(path).stem + ".mkv")))
+                    for path in self.inputs]
+            queue.run()
+            self.assertEqual([job.status for job in jobs],
+                             [JobStatus.SKIPPED, JobStatus.SKIPPED, JobStatus.FAILED])
+            self.assertEqual(mock_run.call_count, 2)
+    
+    def test_duplicate_outputs_rejected(self):
+        """Test inputs with the same stem cannot write one output concurrently"""
+        other = os.path.join(self.temp_dir, "sub")
+        os.makedirs(other)
+        clash = os.path.join(other, "a.mp4")
+        Path(clash).write_bytes(b"data")
+        with patch.object(FFmpegManager, 'run_job') as mock_run:
+            with self.assertRaises(ValueError):
+                self.ffmpeg.batch_convert([self.inputs[0], clash], os.path.join(self.temp_dir, "out"), "mkv")
+            mock_run.assert_not_called()
+    
+    @patch('scripts.main.FFmpegManager.get_media_info', return_value=None)
+    def test_changed_input_is_redone(self, mock_probe):
+        """Test that a modified input invalidates its manifest entry"""
+        out_dir = os.path.join(self.temp_dir, "out")
+        manifest = os.path.join(self.temp_dir, "manifest.json")
+        
+        with patch.object(FFmpegManager, 'run_job', autospec=True,
+                          side_effect=lambda mgr, *a, **kw: self._fake_run_job(*a, **kw)) as mock_run:
+            self.ffmpeg.batch_convert(self.inputs[:1], out_dir, "mkv", manifest=manifest)
+            Path(self.inputs[0]).write_bytes(b"new data")
+            self.ffmpeg.batch_convert(self.inputs[:1], out_dir, "mkv", manifest=manifest)
+            self.assertEqual(mock_run.call_count, 2)
+
+class TestSegmentedTranscode(unittest.TestCase):
+    
+    def setUp(self):
+        self.ffmpeg = FFmpegManager()
+    
+    def test_plan_segments(self):
+        """Test GOP-aligned cut selection"""
+        keyframes = [0.0, 2.0, 4.0, 6.0, 8.0, 10.0, 12.0, 14.0]
+        self.assertEqual(plan_segments(keyframes, 16.0, 5.0), [6.0, 12.0])
+        # A cut leaving a tail under half a segment is dropped
+        self.assertEqual(plan_segments(keyframes, 15.0, 7.0), [8.0])
+        self.assertEqual(plan_segments([0.0], 100.0, 10.0), [])
+    
+    @patch('scripts.main.subprocess.run')
+    def test_probe_keyframes(self, mock_run):
+        """Test keyframe parsing from ffprobe packet output"""
+        mock_run.return_value = Mock(
+            returncode=0, stdout="0.000000,K__\n0.040000,___\nN/A,___\n2.000000,K_\n", stderr="")
+        self.assertEqual(self.ffmpeg.probe_keyframes("in.mp4"), [0.0, 2.0])
+    
+    @patch.object(FFmpegManager, '_probe_packets')
+    @patch.object(FFmpegManager, 'get_media_info')
+    def test_validate_output(self, mock_info, mock_packets):
+        """Test duration, audio and continuity checks"""
+        source = MediaInfo("in.mp4", duration=10.0, fps=25.0, audio_codec="aac")
+        good = MediaInfo("out.mp4", duration=10.02, fps=25.0, audio_codec="aac")
+        mock_info.side_effect = lambda path: source if path == "in.mp4" else good
+        mock_packets.return_value = [(i / 25, i % 50 == 0) for i in range(250)]
+        self.assertEqual(self.ffmpeg.validate_output("in.mp4", "out.mp4"), (True, ""))
+        
+        mock_packets.return_value = [(i / 25, False) for i in range(250) if not 100 <= i < 110]
+        valid, reason = self.ffmpeg.validate_output("in.mp4", "out.mp4")
+        self.assertFalse(valid)
+        self.assertIn("gap", reason)
+        
+        good.audio_codec = ""
+        self.assertEqual(self.ffmpeg.validate_output("in.mp4", "out.mp4"),
+                         (False, "Audio stream missing from output"))
+        
+        good.duration = 8.0
+        self.assertFalse(self.ffmpeg.validate_output("in.mp4", "out.mp4")[0])
+    
+    @patch.object(FFmpegManager, 'convert_video', return_value=True)
+    @patch.object(FFmpegManager, 'probe_keyframes', return_value=[0.0])
+    @patch.object(FFmpegManager, 'get_media_info')
+    def test_falls_back_without_cut_points(self, mock_info, mock_keyframes, mock_convert):
+        """Test single-pass fallback when the input has one GOP"""
+        mock_info.return_value = MediaInfo("in.mp4", duration=120.0)
+        result = self.ffmpeg.convert_video_segmented("in.mp4", "missing-out.mp4", VideoConfig())
+        
+        self.assertTrue(result)
+        mock_convert.assert_called_once()
+
 import json
 
 if __name__ == "__main__":
@@ -4,16 +4,270 @@ File Converter Skill - File format conversion utility
 Supports CSV/JSON/XML/Excel conversion and encoding transformation
 """
 
+import os
 import json
 import csv
+import codecs
+import threading
 import xml.etree.ElementTree as ET
 from xml.dom import minidom
 from pathlib import Path
-from typing import Union, List, Dict, Optional, Any
+from typing import Union, List, Dict, Optional, Any, Iterator, Iterable, TextIO, Callable, Tuple
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 import pandas as pd
 import chardet
 
 
+READ_CHUNK = 1024 * 1024
+SCHEMA_SAMPLE_SIZE = 1000
+ENCODING_SAMPLE_SIZE = 10000
+ENCODING_CACHE_PATH = Path.home() / '.cache' / 'file-converter' / 'encodings.json'
+
+# Format aliases and extensions used by batch_convert
+FORMAT_ALIASES = {'excel': 'xlsx'}
+FORMAT_EXTENSIONS = {'csv': '.csv', 'json': '.json', 'xml': '.xml', 'xlsx': '.xlsx'}
+
+# (from_format, to_format) -> FileConverterSkill method name
+CONVERTERS = {
+    ('csv', 'json'): 'convert_csv_to_json',
+    ('csv', 'xlsx'): 'convert_csv_to_excel',
+    ('json', 'csv'): 'convert_json_to_csv',
+    ('json', 'xlsx'): 'convert_json_to_excel',
+    ('json', 'xml'): 'convert_json_to_xml',
+    ('xlsx', 'csv'): 'convert_excel_to_csv',
+    ('xlsx', 'json'): 'convert_excel_to_json',
+    ('xml', 'json'): 'convert_xml_to_json',
+}
+
+
+def sniff_encoding(sample: bytes) -> Optional[str]:
+    """
+    Fast encoding check without chardet
+    
+    BOMs first, then pure ASCII (bytes.isascii runs in C) and a strict
+    incremental UTF-8 decode that tolerates a character cut at the sample end.
+    Pure ASCII reports 'utf-8' since bytes past the sample may not be ASCII.
+    
+    Returns:
+        Encoding name, or None when chardet is needed
+    """
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if sample.startswith((codecs.BOM_UTF32_LE, codecs.BOM_UTF32_BE)):
+        return 'utf-32'
+    if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return 'utf-16'
+    if sample.isascii():
+        return 'utf-8'
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return None
+
+
+class EncodingCache:
+    """
+    Persistent detected-encoding cache keyed by (path, size, mtime)
+    
+    Stored as one JSON file; entries for files that changed are simply
+    missed and overwritten on the next save.
+    """
+    
+    def __init__(self, path: Optional[Union[str, Path]] = ENCODING_CACHE_PATH):
+        self.path = Path(path) if path else None
+        self._entries: Dict[str, List] = {}
+        self._new: Dict[str, List] = {}
+        self._lock = threading.Lock()
+        if self.path and self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+    
+    @staticmethod
+    def _key(file_path: str) -> Tuple[str, List[int]]:
+        st = os.stat(file_path)
+        return os.path.abspath(file_path), [st.st_size, st.st_mtime_ns]
+    
+    def get(self, file_path: str) -> Optional[str]:
+        key, stamp = self._key(file_path)
+        entry = self._entries.get(key)
+        return entry[2] if entry and entry[:2] == stamp else None
+    
+    def put(self, file_path: str, encoding: str) -> None:
+        key, stamp = self._key(file_path)
+        with self._lock:
+            self._entries[key] = self._new[key] = stamp + [encoding]
+    
+    def take_new(self) -> Dict[str, List]:
+        """Entries added since the last call (shipped back from worker processes)"""
+        with self._lock:
+            new, self._new = self._new, {}
+        return new
+    
+    def merge(self, entries: Dict[str, List]) -> None:
+        with self._lock:
+            self._entries.update(entries)
+            self._new.update(entries)
+    
+    def save(self) -> None:
+        if not self.path or not self.take_new():
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f'{self.path.name}.{os.getpid()}.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f)
+        os.replace(tmp, self.path)
+
+
+_worker_skill = None
+
+
+def _init_batch_worker(cache_path: Optional[str]) -> None:
+    global _worker_skill
+    _worker_skill = FileConverterSkill(encoding_cache=cache_path)
+
+
+def _convert_atomic(skill: 'FileConverterSkill', method: str, input_file: str, output_file: str,
+                    kwargs: Dict) -> None:
+    """Convert into a temp file next to the output and move it into place on success,
+    so a failed conversion never leaves a partial output that looks up to date"""
+    output = Path(output_file)
+    tmp = output.with_name(f'.{output.stem}.part{output.suffix}')
+    try:
+        getattr(skill, method)(input_file, str(tmp), **kwargs)
+        os.replace(tmp, output)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def _batch_convert_one(method: str, input_file: str, output_file: str, kwargs: Dict) -> Tuple[str, Dict]:
+    """Process-pool entry point: run one conversion, return new cache entries"""
+    _convert_atomic(_worker_skill, method, input_file, output_file, kwargs)
+    return output_file, _worker_skill._encoding_cache.take_new()
+
+
+def iter_json_array(fp: TextIO, chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """
+    Incrementally yield the elements of a top-level JSON array
+    
+    Only the current element (plus one read chunk) is held in memory.
+    
+    Args:
+        fp: Text file object positioned at the start of the document
+        chunk_size: Characters read per refill
+        
+    Yields:
+        Decoded array elements
+    """
+    decoder = json.JSONDecoder()
+    buf, pos, eof = '', 0, False
+    
+    def refill(buf, pos):
+        # Drop consumed text; read at least as much as is buffered so one huge
+        # element is re-parsed O(log n) times rather than once per chunk
+        rest = buf[pos:]
+        chunk = fp.read(max(chunk_size, len(rest)))
+        return rest + chunk, 0, not chunk
+    
+    def next_char(buf, pos, eof):
+        while True:
+            while pos < len(buf) and buf[pos] in ' \t\r\n':
+                pos += 1
+            if pos < len(buf) or eof:
+                return buf, pos, eof
+            buf, pos, eof = refill(buf, pos)
+    
+    buf, pos, eof = next_char(buf, pos, eof)
+    if pos >= len(buf) or buf[pos] != '[':
+        raise ValueError("JSON must contain an array of objects")
+    pos += 1
+    
+    buf, pos, eof = next_char(buf, pos, eof)
+    if pos < len(buf) and buf[pos] == ']':
+        return
+    
+    while True:
+        buf, pos, eof = next_char(buf, pos, eof)
+        try:
+            value, end = decoder.raw_decode(buf, pos)
+            # A number cut at the buffer end ("12" of "12.5") may continue in the next chunk
+            complete = eof or (end < len(buf) and buf[end] not in '0123456789.eE+-')
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            complete = False
+        if not complete:
+            buf, pos, eof = refill(buf, pos)
+            continue
+        yield value
+        
+        buf, pos, eof = next_char(buf, end, eof)
+        if pos >= len(buf):
+            raise ValueError("Unexpected end of JSON array")
+        if buf[pos] == ']':
+            return
+        if buf[pos] != ',':
+            raise ValueError(f"Expected ',' or ']' in JSON array, got {buf[pos]!r}")
+        pos += 1
+        if pos > chunk_size:
+            buf, pos = buf[pos:], 0
+
+
+def iter_ndjson(fp: TextIO) -> Iterator[Any]:
+    """Yield one decoded value per non-empty line (NDJSON / JSON Lines)"""
+    for line_no, line in enumerate(fp, 1):
+        line = line.strip()
+        if line:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON on line {line_no}: {e}") from None
+
+
+def write_json_array(fp: TextIO, items: Iterable[Any], indent: Optional[int] = 2) -> int:
+    """
+    Write items as a JSON array one element at a time
+    
+    Output is byte-identical to json.dump(list(items), fp, indent=indent, ensure_ascii=False).
+    
+    Returns:
+        Number of items written
+    """
+    count = 0
+    encode = json.JSONEncoder(indent=indent, ensure_ascii=False).encode
+    if indent is None:
+        sep, open_, close = ', ', '[', ']'
+        render = encode
+    else:
+        pad = ' ' * indent if isinstance(indent, int) else indent
+        sep, open_, close = ',\n', '[\n', '\n]'
+        newline = '\n' + pad
+        inner = ',\n' + pad + pad
+        escape = json.encoder.encode_basestring
+        
+        def render(item):
+            # Flat str -> str dicts (every CSV row) skip the pure-Python indenting encoder
+            if type(item) is dict and item and all(type(k) is str and type(v) is str for k, v in item.items()):
+                body = inner.join([escape(k) + ': ' + escape(v) for k, v in item.items()])
+                return pad + '{\n' + pad + pad + body + newline + '}'
+            return pad + encode(item).replace('\n', newline)
+    batch = []
+    for item in items:
+        batch.append(render(item))
+        count += 1
+        if len(batch) >= 1000:
+            fp.write((open_ if count == len(batch) else sep) + sep.join(batch))
+            batch = []
+    if batch:
+        fp.write((open_ if count == len(batch) else sep) + sep.join(batch))
+    fp.write(close if count else '[]')
+    return count
+
+
 class FileConverterSkill:
     """
     A comprehensive file format converter supporting:
@@ -23,17 +277,23 @@ class FileConverterSkill:
     - Schema validation
     """
     
-    def __init__(self):
-        """Initialize the FileConverterSkill"""
+    def __init__(self, encoding_cache: Optional[Union[str, Path]] = ENCODING_CACHE_PATH):
+        """
+        Initialize the FileConverterSkill
+        
+        Args:
+            encoding_cache: Path of the persistent encoding cache (None disables persistence)
+        """
         self._supported_encodings = [
             'utf-8', 'utf-16', 'utf-32', 'ascii',
             'latin-1', 'iso-8859-1', 'windows-1252',
             'gbk', 'gb2312', 'big5', 'shift_jis', 'euc-jp'
         ]
+        self._encoding_cache = EncodingCache(encoding_cache)
     
     def _detect_encoding(self, file_path: str) -> str:
         """
-        Detect file encoding
+        Detect file encoding (cached by path/size/mtime, chardet only as fallback)
         
         Args:
             file_path: Path to file
@@ -41,40 +301,52 @@ class FileConverterSkill:
         Returns:
             Detected encoding
         """
+        cached = self._encoding_cache.get(file_path)
+        if cached:
+            return cached
+        
         with open(file_path, 'rb') as f:
-            raw_data = f.read(10000)
+            raw_data = f.read(ENCODING_SAMPLE_SIZE)
+        encoding = sniff_encoding(raw_data)
+        if encoding is None:
             result = chardet.detect(raw_data)
-            return result.get('encoding', 'utf-8') or 'utf-8'
+            encoding = result.get('encoding', 'utf-8') or 'utf-8'
+        
+        self._encoding_cache.put(file_path, encoding)
+        return encoding
     
     def convert_csv_to_json(
         self, 
         csv_path: str, 
         json_path: str,
         encoding: Optional[str] = None,
-        indent: int = 2
+        indent: int = 2,
+        lines: bool = False
     ) -> str:
         """
-        Convert CSV file to JSON
+        Convert CSV file to JSON (streamed row by row)
         
         Args:
             csv_path: Path to input CSV file
             json_path: Path to output JSON file
             encoding: File encoding (auto-detected if None)
             indent: JSON indentation level
+            lines: Write NDJSON (one object per line) instead of an array
             
         Returns:
             Path to output file
         """
         enc = encoding or self._detect_encoding(csv_path)
         
-        data = []
-        with open(csv_path, 'r', encoding=enc, errors='replace') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                data.append(dict(row))
-        
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=indent, ensure_ascii=False)
+        with open(csv_path, 'r', encoding=enc, errors='replace', newline='') as src, \
+                open(json_path, 'w', encoding='utf-8') as dst:
+            reader = csv.DictReader(src)
+            if lines:
+                encode = json.JSONEncoder(ensure_ascii=False).encode
+                for row in reader:
+                    dst.write(encode(row) + '\n')
+            else:
+                write_json_array(dst, reader, indent=indent)
         
         return json_path
     
@@ -82,34 +354,51 @@ class FileConverterSkill:
         self, 
         json_path: str, 
         csv_path: str,
-        encoding: str = 'utf-8'
+        encoding: str = 'utf-8',
+        sample_size: int = SCHEMA_SAMPLE_SIZE
     ) -> str:
         """
-        Convert JSON file to CSV
+        Convert JSON file to CSV (streamed; .ndjson/.jsonl read line by line)
+        
+        Columns are the union of keys over the first ``sample_size`` records,
+        in first-seen order; keys that only appear later are dropped.
         
         Args:
             json_path: Path to input JSON file
             csv_path: Path to output CSV file
             encoding: Output file encoding
+            sample_size: Records inspected for schema discovery
             
         Returns:
             Path to output file
         """
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        if not isinstance(data, list):
-            raise ValueError("JSON must contain an array of objects")
-        
-        if len(data) == 0:
-            raise ValueError("JSON array is empty")
-        
-        fieldnames = list(data[0].keys())
-        
-        with open(csv_path, 'w', encoding=encoding, newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(data)
+        with open(json_path, 'r', encoding='utf-8') as src:
+            if Path(json_path).suffix.lower() in ('.ndjson', '.jsonl'):
+                records = iter_ndjson(src)
+            else:
+                records = iter_json_array(src)
+            
+            sample = []
+            for record in records:
+                if not isinstance(record, dict):
+                    raise ValueError("JSON must contain an array of objects")
+                sample.append(record)
+                if len(sample) >= sample_size:
+                    break
+            
+            if not sample:
+                raise ValueError("JSON array is empty")
+            
+            fieldnames = list(dict.fromkeys(key for record in sample for key in record))
+            
+            with open(csv_path, 'w', encoding=encoding, newline='') as dst:
+                writer = csv.DictWriter(dst, fieldnames=fieldnames, extrasaction='ignore')
+                writer.writeheader()
+                writer.writerows(sample)
+                for record in records:
+                    if not isinstance(record, dict):
+                        raise ValueError("JSON must contain an array of objects")
+                    writer.writerow(record)
         
         return csv_path
     
@@ -353,11 +642,10 @@ class FileConverterSkill:
         """
         source_enc = from_encoding or self._detect_encoding(input_path)
         
-        with open(input_path, 'r', encoding=source_enc, errors=errors) as f:
-            content = f.read()
-        
-        with open(output_path, 'w', encoding=to_encoding, errors=errors) as f:
-            f.write(content)
+        with open(input_path, 'r', encoding=source_enc, errors=errors, newline='') as src, \
+                open(output_path, 'w', encoding=to_encoding, errors=errors, newline='') as dst:
+            for chunk in iter(lambda: src.read(READ_CHUNK), ''):
+                dst.write(chunk)
         
         return output_path
     
@@ -367,59 +655,93 @@ class FileConverterSkill:
         output_dir: str,
         from_format: str,
         to_format: str,
+        workers: Optional[int] = None,
+        force: bool = False,
+        progress: Optional[Callable[[int, int, str], None]] = None,
         **kwargs
     ) -> List[str]:
         """
         Batch convert files in a directory
         
+        Files are spread across a process pool; outputs newer than their
+        input are skipped unless ``force`` is set. Each output is written to
+        a temp file and only moved into place once its conversion succeeds.
+        
         Args:
             input_dir: Input directory path
             output_dir: Output directory path
             from_format: Source format (csv, json, xml, xlsx)
             to_format: Target format (csv, json, xml, xlsx)
+            workers: Worker processes (CPU count if None, 1 = in-process)
+            force: Convert even when the output is up to date
+            progress: Callback progress(done, total, output_path) after each file
             **kwargs: Additional arguments for conversion
             
         Returns:
-            List of output file paths
+            List of output file paths (converted and already up to date)
         """
+        src_fmt = FORMAT_ALIASES.get(from_format.lower(), from_format.lower())
+        dst_fmt = FORMAT_ALIASES.get(to_format.lower(), to_format.lower())
+        method = CONVERTERS.get((src_fmt, dst_fmt))
+        if method is None:
+            return []
+        
         input_path = Path(input_dir)
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
         
-        # Map extensions
-        ext_map = {
-            'csv': '.csv', 'json': '.json', 
-            'xml': '.xml', 'xlsx': '.xlsx', 'excel': '.xlsx'
-        }
-        
-        input_ext = ext_map.get(from_format.lower(), f'.{from_format}')
-        output_ext = ext_map.get(to_format.lower(), f'.{to_format}')
-        
-        converted_files = []
+        input_ext = FORMAT_EXTENSIONS.get(src_fmt, f'.{src_fmt}')
+        output_ext = FORMAT_EXTENSIONS.get(dst_fmt, f'.{dst_fmt}')
         
-        for input_file in input_path.glob(f'*{input_ext}'):
+        outputs = []
+        tasks = []
+        for input_file in sorted(input_path.glob(f'*{input_ext}')):
             output_file = output_path / input_file.with_suffix(output_ext).name
-            
-            # Route to appropriate converter
-            converter_map = {
-                ('csv', 'json'): self.convert_csv_to_json,
-                ('csv', 'xlsx'): self.convert_csv_to_excel,
-                ('json', 'csv'): self.convert_json_to_csv,
-                ('json', 'xlsx'): self.convert_json_to_excel,
-                ('json', 'xml'): self.convert_json_to_xml,
-                ('xlsx', 'csv'): self.convert_excel_to_csv,
-                ('xlsx', 'json'): self.convert_excel_to_json,
-                ('excel', 'csv'): self.convert_excel_to_csv,
-                ('excel', 'json'): self.convert_excel_to_json,
-                ('xml', 'json'): self.convert_xml_to_json,
-            }
-            
-            converter = converter_map.get((from_format.lower(), to_format.lower()))
-            if converter:
-                converter(str(input_file), str(output_file), **kwargs)
-                converted_files.append(str(output_file))
-        
-        return converted_files
+            outputs.append(str(output_file))
+            if not force and self._is_up_to_date(input_file, output_file):
+                continue
+            tasks.append((str(input_file), str(output_file)))
+        
+        total = len(tasks)
+        done = 0
+        workers = workers or os.cpu_count() or 1
+        
+        if workers == 1 or total <= 1:
+            for input_file, output_file in tasks:
+                _convert_atomic(self, method, input_file, output_file, kwargs)
+                done += 1
+                if progress:
+                    progress(done, total, output_file)
+        else:
+            cache_path = str(self._encoding_cache.path) if self._encoding_cache.path else None
+            with ProcessPoolExecutor(max_workers=min(workers, total), initializer=_init_batch_worker,
+                                     initargs=(cache_path,)) as pool:
+                pending = set()
+                for input_file, output_file in tasks:
+                    pending.add(pool.submit(_batch_convert_one, method, input_file, output_file, kwargs))
+                    if len(pending) >= workers * 4:
+                        finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        done = self._collect_batch(finished, done, total, progress)
+                self._collect_batch(pending, done, total, progress)
+        
+        self._encoding_cache.save()
+        return outputs
+    
+    def _collect_batch(self, futures, done: int, total: int, progress: Optional[Callable]) -> int:
+        for future in futures:
+            output_file, cache_entries = future.result()
+            self._encoding_cache.merge(cache_entries)
+            done += 1
+            if progress:
+                progress(done, total, output_file)
+        return done
+    
+    @staticmethod
+    def _is_up_to_date(input_file: Path, output_file: Path) -> bool:
+        try:
+            return output_file.stat().st_mtime_ns >= input_file.stat().st_mtime_ns
+        except OSError:
+            return False
     
     def validate_json(self, json_path: str) -> bool:
         """
@@ -461,7 +783,10 @@ class FileConverterSkill:
         encoding: str = 'utf-8'
     ) -> str:
         """
-        Merge multiple CSV files
+        Merge multiple CSV files (each input streamed straight to the writer)
+        
+        The output header is the union of all input headers in first-seen
+        order; columns missing from a file are left empty.
         
         Args:
             csv_paths: List of CSV file paths
@@ -474,25 +799,20 @@ class FileConverterSkill:
         if not csv_paths:
             raise ValueError("No input files provided")
         
-        # Read first file to get headers
-        first_enc = self._detect_encoding(csv_paths[0])
-        with open(csv_paths[0], 'r', encoding=first_enc) as f:
-            reader = csv.DictReader(f)
-            fieldnames = reader.fieldnames
-            all_rows = list(reader)
-        
-        # Read remaining files
-        for csv_path in csv_paths[1:]:
-            enc = self._detect_encoding(csv_path)
-            with open(csv_path, 'r', encoding=enc) as f:
-                reader = csv.DictReader(f)
-                all_rows.extend(reader)
+        # Header pass: only the first row of each file is read
+        encodings = [self._detect_encoding(csv_path) for csv_path in csv_paths]
+        fieldnames: Dict[str, None] = {}
+        for csv_path, enc in zip(csv_paths, encodings):
+            with open(csv_path, 'r', encoding=enc, newline='') as f:
+                fieldnames.update(dict.fromkeys(next(csv.reader(f), [])))
         
         # Write merged file
-        with open(output_path, 'w', encoding=encoding, newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
+        with open(output_path, 'w', encoding=encoding, newline='') as out:
+            writer = csv.DictWriter(out, fieldnames=list(fieldnames), restval='')
             writer.writeheader()
-            writer.writerows(all_rows)
+            for csv_path, enc in zip(csv_paths, encodings):
+                with open(csv_path, 'r', encoding=enc, newline='') as f:
+                    writer.writerows(csv.DictReader(f))
         
         return output_path
 
@@ -505,7 +825,7 @@ if __name__ == '__main__':
     
     if len(sys.argv) < 2:
         print("Usage: python main.py <command> [args...]")
-        print("Commands: csv2json, json2csv, csv2xlsx, xlsx2csv, json2xml, xml2json, encode")
+        print("Commands: csv2json, csv2ndjson, json2csv, csv2xlsx, xlsx2csv, json2xml, xml2json, encode, merge, batch")
         sys.exit(1)
     
     command = sys.argv[1]
@@ -514,6 +834,19 @@ if __name__ == '__main__':
         if command == 'csv2json' and len(sys.argv) >= 4:
             result = skill.convert_csv_to_json(sys.argv[2], sys.argv[3])
             print(f"Converted: {result}")
+        elif command == 'csv2ndjson' and len(sys.argv) >= 4:
+            result = skill.convert_csv_to_json(sys.argv[2], sys.argv[3], lines=True)
+            print(f"Converted: {result}")
+        elif command == 'batch' and len(sys.argv) >= 6:
+            # batch <input_dir> <output_dir> <from> <to> [workers]
+            workers = int(sys.argv[6]) if len(sys.argv) > 6 else None
+            report = lambda done, total, path: print(f"[{done}/{total}] {path}")
+            results = skill.batch_convert(sys.argv[2], sys.argv[3], sys.argv[4], sys.argv[5],
+                                          workers=workers, progress=report)
+            print(f"Converted: {len(results)} files")
+        elif command == 'merge' and len(sys.argv) >= 4:
+            result = skill.merge_csv_files(sys.argv[3:], sys.argv[2])
+            print(f"Merged: {result}")
         elif command == 'json2csv' and len(sys.argv) >= 4:
             result = skill.convert_json_to_csv(sys.argv[2], sys.argv[3])
             print(f"Converted: {result}")
@@ -15,8 +15,8 @@ class TestFileConverterSkill(unittest.TestCase):
     
     def setUp(self):
         """Set up test fixtures"""
-        self.skill = FileConverterSkill()
         self.temp_dir = tempfile.mkdtemp()
+        self.skill = FileConverterSkill(encoding_cache=os.path.join(self.temp_dir, 'encodings.json'))
     
     def tearDown(self):
         """Clean up test files"""
@@ -152,6 +152,125 @@ class TestFileConverterSkill(unittest.TestCase):
             reader = csv.DictReader(f)
             rows = list(reader)
         self.assertEqual(len(rows), 2)
+    
+    def test_merge_csv_files_header_union(self):
+        """Test CSV merge reconciles differing headers"""
+        csv1 = self._create_test_csv('file1.csv', [['name', 'value'], ['A', '1']])
+        csv2 = self._create_test_csv('file2.csv', [['value', 'extra'], ['2', 'x']])
+        
+        output = os.path.join(self.temp_dir, 'merged.csv')
+        self.skill.merge_csv_files([csv1, csv2], output)
+        
+        with open(output, 'r', newline='') as f:
+            import csv
+            reader = csv.DictReader(f)
+            rows = list(reader)
+        self.assertEqual(reader.fieldnames, ['name', 'value', 'extra'])
+        self.assertEqual(rows[1], {'name': '', 'value': '2', 'extra': 'x'})
+    
+    def test_csv_to_json_stream_matches_json_dump(self):
+        """Test streamed CSV to JSON output equals json.dump of all rows"""
+        csv_data = [['name', 'note']] + [[f'n{i}', 'quote " and 中文'] for i in range(2500)]
+        csv_path = self._create_test_csv('big.csv', csv_data)
+        json_path = os.path.join(self.temp_dir, 'big.json')
+        
+        self.skill.convert_csv_to_json(csv_path, json_path, encoding='utf-8')
+        
+        expected = [dict(zip(csv_data[0], row)) for row in csv_data[1:]]
+        with open(json_path, 'r', encoding='utf-8') as f:
+            self.assertEqual(f.read(), json.dumps(expected, indent=2, ensure_ascii=False))
+    
+    def test_ndjson_round_trip(self):
+        """Test CSV -> NDJSON -> CSV"""
+        csv_path = self._create_test_csv('in.csv', [['a', 'b'], ['1', '2'], ['3', '4']])
+        ndjson_path = os.path.join(self.temp_dir, 'out.ndjson')
+        back_path = os.path.join(self.temp_dir, 'back.csv')
+        
+        self.skill.convert_csv_to_json(csv_path, ndjson_path, encoding='utf-8', lines=True)
+        self.skill.convert_json_to_csv(ndjson_path, back_path)
+        
+        with open(ndjson_path, 'r', encoding='utf-8') as f:
+            self.assertEqual(f.read().splitlines(), ['{"a": "1", "b": "2"}', '{"a": "3", "b": "4"}'])
+        with open(csv_path, newline='') as a, open(back_path, newline='') as b:
+            self.assertEqual(a.read(), b.read())
+    
+    def test_iter_json_array_small_chunks(self):
+        """Test incremental JSON array parser across chunk boundaries"""
+        import io
+        from skills.file_converter_skill.main import iter_json_array
+        data = [1, 2.5e3, "a]b,\"c", None, True, {"x": [1, {"y": "}"}]}]
+        for chunk_size in (1, 3, 64):
+            items = list(iter_json_array(io.StringIO(json.dumps(data)), chunk_size))
+            self.assertEqual(items, data)
+        with self.assertRaises(ValueError):
+            list(iter_json_array(io.StringIO('{"a": 1}')))
+    
+    def test_json_to_csv_schema_from_sample(self):
+        """Test JSON to CSV column discovery over sampled records"""
+        json_path = self._create_test_json('rows.json', [{'a': 1}, {'a': 2, 'b': 3}])
+        csv_path = os.path.join(self.temp_dir, 'rows.csv')
+        
+        self.skill.convert_json_to_csv(json_path, csv_path)
+        
+        with open(csv_path, 'r', newline='') as f:
+            import csv
+            rows = list(csv.DictReader(f))
+        self.assertEqual(rows, [{'a': '1', 'b': ''}, {'a': '2', 'b': '3'}])
+
+    
+    def test_sniff_encoding_fast_path(self):
+        """Test BOM/ASCII/UTF-8 detection without chardet"""
+        from skills.file_converter_skill.main import sniff_encoding
+        self.assertEqual(sniff_encoding(b'plain ascii'), 'utf-8')
+        self.assertEqual(sniff_encoding('中文'.encode('utf-8')[:-1]), 'utf-8')
+        self.assertEqual(sniff_encoding(b'\xef\xbb\xbfdata'), 'utf-8-sig')
+        self.assertIsNone(sniff_encoding('中文内容'.encode('gbk')))
+    
+    def test_encoding_cache_persisted(self):
+        """Test detected encodings are cached by path, size and mtime"""
+        csv_path = self._create_test_csv('a.csv', [['x'], ['1']])
+        self.skill.batch_convert(self.temp_dir, os.path.join(self.temp_dir, 'out'), 'csv', 'json', workers=1)
+        
+        fresh = FileConverterSkill(encoding_cache=os.path.join(self.temp_dir, 'encodings.json'))
+        self.assertEqual(fresh._encoding_cache.get(csv_path), 'utf-8')
+        with open(csv_path, 'a') as f:
+            f.write('2\n')
+        self.assertIsNone(fresh._encoding_cache.get(csv_path))
+    
+    def test_batch_convert_skips_up_to_date(self):
+        """Test batch conversion progress and mtime-based skipping"""
+        for i in range(3):
+            self._create_test_csv(f'in{i}.csv', [['k'], [str(i)]])
+        out_dir = os.path.join(self.temp_dir, 'out')
+        
+        ticks = []
+        outputs = self.skill.batch_convert(self.temp_dir, out_dir, 'csv', 'json', workers=2,
+                                           progress=lambda done, total, path: ticks.append((done, total)))
+        self.assertEqual(len(outputs), 3)
+        self.assertEqual(ticks[-1], (3, 3))
+        
+        ticks.clear()
+        outputs = self.skill.batch_convert(self.temp_dir, out_dir, 'csv', 'json', workers=1,
+                                           progress=lambda done, total, path: ticks.append((done, total)))
+        self.assertEqual(len(outputs), 3)
+        self.assertEqual(ticks, [])
+    
+    def test_batch_convert_failure_leaves_no_output(self):
+        """Test a conversion failing midway is retried instead of skipped"""
+        records = ',\n'.join(json.dumps({'n': i}) for i in range(1500))
+        with open(os.path.join(self.temp_dir, 'bad.json'), 'w', encoding='utf-8') as f:
+            f.write('[' + records + ', junk')
+        out_dir = os.path.join(self.temp_dir, 'out')
+        
+        with self.assertRaises(ValueError):
+            self.skill.batch_convert(self.temp_dir, out_dir, 'json', 'csv', workers=1)
+        self.assertEqual(os.listdir(out_dir), [])
+        
+        ticks = []
+        with self.assertRaises(ValueError):
+            self.skill.batch_convert(self.temp_dir, out_dir, 'json', 'csv', workers=1,
+                                     progress=lambda done, total, path: ticks.append(path))
+        self.assertEqual(os.listdir(out_dir), [])
 
 
 if __name__ == '__main__':
@@ -1,6 +1,6 @@
 """HTTP Client Skill - A powerful HTTP client for API testing and requests."""
 
-from .main import HTTPClient, Response
+from .main import AsyncHTTPClient, HTTPClient, Response
 
 __version__ = "1.0.0"
-__all__ = ["HTTPClient", "Response"]
+__all__ = ["AsyncHTTPClient", "HTTPClient", "Response"]
@@ -4,19 +4,35 @@ HTTP Client Skill - Main module for HTTP requests and API testing.
 
 Supports GET, POST, PUT, DELETE, PATCH methods with headers,
 query parameters, JSON body, and response analysis.
+
+High-throughput use (fan-out polling) is covered by configurable
+connection pools, batch APIs with a concurrency limit and the optional
+httpx-based AsyncHTTPClient with HTTP/2 multiplexing.
 """
 
 import argparse
+import asyncio
 import json
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Union
 from urllib.parse import urlencode, parse_qs, urlparse, urlunparse
 
 import requests
 from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
 
+try:
+    import httpx
+except ImportError:  # Optional: only needed for AsyncHTTPClient
+    httpx = None
+
+
+RESPONSE_TYPES = ("text", "bytes", "stream")
+STREAM_CHUNK_SIZE = 64 * 1024
+
 
 @dataclass
 class Response:
@@ -27,14 +43,24 @@ class Response:
     body: str = ""
     url: str = ""
     elapsed_ms: float = 0.0
+    content: Optional[bytes] = None
+    stream: Optional[Iterator[bytes]] = field(default=None, repr=False)
     
     def json(self) -> Any:
         """Parse response body as JSON."""
         try:
-            return json.loads(self.body)
-        except json.JSONDecodeError as e:
+            return json.loads(self.content if self.content is not None and not self.body else self.body)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
             raise ValueError(f"Response is not valid JSON: {e}")
     
+    def iter_content(self) -> Iterator[bytes]:
+        """Iterate over the body in chunks (streamed or already buffered)."""
+        if self.stream is not None:
+            return self.stream
+        if self.content is not None:
+            return iter([self.content])
+        return iter([self.body.encode("utf-8")])
+    
     def is_success(self) -> bool:
         """Check if response status is 2xx."""
         return 200 <= self.status_code < 300
@@ -74,13 +100,18 @@ class HTTPClient:
     - JSON and form data body support
     - Response parsing and validation
     - Timeout configuration
+    - Configurable (per-host) connection pools
+    - Threaded batch requests with a concurrency limit
     """
     
     def __init__(
         self,
         timeout: int = 30,
         max_retries: int = 3,
-        default_headers: Optional[Dict[str, str]] = None
+        default_headers: Optional[Dict[str, str]] = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        host_pool_sizes: Optional[Dict[str, int]] = None
     ):
         """
         Initialize HTTP client.
@@ -89,6 +120,10 @@ class HTTPClient:
             timeout: Request timeout in seconds
             max_retries: Maximum number of retries for failed requests
             default_headers: Headers to include in all requests
+            pool_connections: Number of host pools to cache
+            pool_maxsize: Maximum keep-alive connections per host
+            host_pool_sizes: Per-host pool size overrides,
+                e.g. {"https://api.example.com": 100}
         """
         self.timeout = timeout
         self.default_headers = default_headers or {
@@ -99,14 +134,42 @@ class HTTPClient:
         self.session.headers.update(self.default_headers)
         
         # Configure retry strategy
-        retry_strategy = Retry(
+        self.retry_strategy = Retry(
             total=max_retries,
             backoff_factor=1,
             status_forcelist=[429, 500, 502, 503, 504],
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=self.retry_strategy
+        )
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
+        
+        for prefix, size in (host_pool_sizes or {}).items():
+            self.set_host_pool_size(prefix, size)
+    
+    def set_host_pool_size(self, prefix: str, size: int):
+        """Mount a dedicated connection pool for a host prefix (longest prefix wins)."""
+        if "://" not in prefix:
+            raise ValueError(f"Host prefix must include a scheme: {prefix}")
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=size,
+            max_retries=self.retry_strategy
+        )
+        self.session.mount(prefix.rstrip("/") + "/", adapter)
+    
+    def _ensure_pool_size(self, size: int):
+        """Grow mounted pools to ``size`` so concurrent requests never overflow them."""
+        for prefix, adapter in list(self.session.adapters.items()):
+            if isinstance(adapter, HTTPAdapter) and adapter._pool_maxsize < size:
+                self.session.mount(prefix, HTTPAdapter(
+                    pool_connections=adapter._pool_connections,
+                    pool_maxsize=size,
+                    max_retries=adapter.max_retries
+                ))
     
     def _build_url(self, url: str, params: Optional[Dict[str, Any]] = None) -> str:
         """Build URL with query parameters."""
@@ -128,33 +191,45 @@ class HTTPClient:
         params: Optional[Dict[str, Any]] = None,
         data: Optional[Union[Dict, str]] = None,
         json_data: Optional[Dict] = None,
+        response_type: str = "text",
         **kwargs
     ) -> Response:
-        """Execute HTTP request and return wrapped response."""
-        url = self._build_url(url, params)
+        """Execute HTTP request and return wrapped response.
         
-        request_headers = dict(self.session.headers)
-        if headers:
-            request_headers.update(headers)
+        ``response_type`` selects how the body is returned: ``"text"``
+        (decoded ``body``), ``"bytes"`` (raw ``content``, no decode) or
+        ``"stream"`` (chunk iterator in ``stream``, body never buffered).
+        """
+        if response_type not in RESPONSE_TYPES:
+            raise ValueError(f"response_type must be one of {RESPONSE_TYPES}")
+        url = self._build_url(url, params)
         
+        # Session headers are merged by requests itself; no per-call copy needed
         try:
             response = self.session.request(
                 method=method.upper(),
                 url=url,
-                headers=request_headers,
+                headers=headers,
                 data=data,
                 json=json_data,
                 timeout=self.timeout,
+                stream=response_type == "stream",
                 **kwargs
             )
             
-            return Response(
+            result = Response(
                 status_code=response.status_code,
                 headers=dict(response.headers),
-                body=response.text,
                 url=response.url,
                 elapsed_ms=response.elapsed.total_seconds() * 1000
             )
+            if response_type == "text":
+                result.body = response.text
+            elif response_type == "bytes":
+                result.content = response.content
+            else:
+                result.stream = response.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+            return result
         except requests.exceptions.Timeout:
             raise TimeoutError(f"Request to {url} timed out after {self.timeout}s")
         except requests.exceptions.ConnectionError as e:
@@ -238,6 +313,53 @@ class HTTPClient:
         """Execute OPTIONS request."""
         return self._make_request("OPTIONS", url, headers, params, **kwargs)
     
+    def request_many(
+        self,
+        requests_list: List[Union[str, Dict[str, Any]]],
+        concurrency: int = 10,
+        return_exceptions: bool = True
+    ) -> List[Union[Response, Exception]]:
+        """
+        Execute many requests concurrently over the pooled session.
+        
+        Args:
+            requests_list: URLs (GET) or dicts with ``method``, ``url`` and
+                optional ``headers``, ``params``, ``data``, ``json``,
+                ``response_type``
+            concurrency: Maximum requests in flight; connection pools smaller
+                than this are grown to match
+            return_exceptions: Return errors in place of responses instead of raising
+        
+        Returns:
+            Responses in the same order as ``requests_list``
+        """
+        specs = [_normalize_spec(spec) for spec in requests_list]
+        concurrency = max(1, concurrency)
+        self._ensure_pool_size(concurrency)
+        
+        def run(spec):
+            try:
+                return self._make_request(**spec)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                return e
+        
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            return list(executor.map(run, specs))
+    
+    def get_many(
+        self,
+        urls: List[str],
+        concurrency: int = 10,
+        **kwargs
+    ) -> List[Union[Response, Exception]]:
+        """Execute GET requests for many URLs concurrently."""
+        return self.request_many(
+            [dict(kwargs, method="GET", url=url) for url in urls],
+            concurrency=concurrency
+        )
+    
     def close(self):
         """Close the session."""
         self.session.close()
@@ -249,6 +371,190 @@ class HTTPClient:
         self.close()
 
 
+class AsyncHTTPClient:
+    """
+    Asynchronous HTTP client for high-throughput fan-out (requires httpx).
+    
+    Features:
+    - One shared connection pool, optionally multiplexed over HTTP/2
+    - Global and per-host concurrency limits
+    - Text, bytes or streamed-to-callback bodies
+    """
+    
+    def __init__(
+        self,
+        timeout: int = 30,
+        default_headers: Optional[Dict[str, str]] = None,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        http2: bool = False,
+        per_host_limit: Optional[int] = None,
+        **client_kwargs
+    ):
+        """
+        Initialize async HTTP client.
+        
+        Args:
+            timeout: Request timeout in seconds
+            default_headers: Headers to include in all requests
+            max_connections: Maximum open connections across all hosts
+            max_keepalive_connections: Idle connections kept for reuse
+            http2: Multiplex requests over HTTP/2 (requires the ``h2`` package)
+            per_host_limit: Maximum requests in flight per host
+            **client_kwargs: Passed through to ``httpx.AsyncClient``
+        """
+        if httpx is None:
+            raise ImportError("AsyncHTTPClient requires httpx: pip install 'httpx[http2]'")
+        
+        self.timeout = timeout
+        self.default_headers = default_headers or {
+            "User-Agent": "HTTPClient-Skill/1.0"
+        }
+        self.per_host_limit = per_host_limit
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.client = httpx.AsyncClient(
+            headers=self.default_headers,
+            timeout=timeout,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections
+            ),
+            **client_kwargs
+        )
+    
+    def _host_semaphore(self, url: str) -> Optional[asyncio.Semaphore]:
+        """Get the concurrency gate for the URL's host."""
+        if not self.per_host_limit:
+            return None
+        host = urlparse(url).netloc
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_semaphores[host]
+    
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Union[Dict, str]] = None,
+        json_data: Optional[Dict] = None,
+        response_type: str = "text",
+        on_chunk=None
+    ) -> Response:
+        """
+        Execute one HTTP request.
+        
+        With ``response_type="stream"`` each chunk is passed to
+        ``on_chunk`` as it arrives and nothing is buffered.
+        """
+        if response_type not in RESPONSE_TYPES:
+            raise ValueError(f"response_type must be one of {RESPONSE_TYPES}")
+        if response_type == "stream" and on_chunk is None:
+            raise ValueError("response_type='stream' requires an on_chunk callback")
+        
+        semaphore = self._host_semaphore(url)
+        if semaphore is not None:
+            await semaphore.acquire()
+        try:
+            request = self.client.build_request(
+                method.upper(), url, headers=headers, params=params,
+                data=data if isinstance(data, dict) else None,
+                content=data if isinstance(data, str) else None,
+                json=json_data
+            )
+            start = time.perf_counter()
+            response = await self.client.send(request, stream=True)
+            try:
+                result = Response(
+                    status_code=response.status_code,
+                    headers=dict(response.headers),
+                    url=str(response.url)
+                )
+                if response_type == "stream":
+                    async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+                        on_chunk(chunk)
+                else:
+                    content = await response.aread()
+                    if response_type == "bytes":
+                        result.content = content
+                    else:
+                        result.body = response.text
+                # response.elapsed is only available after a streamed response is closed
+                result.elapsed_ms = (time.perf_counter() - start) * 1000
+                return result
+            finally:
+                await response.aclose()
+        except httpx.TimeoutException:
+            raise TimeoutError(f"Request to {url} timed out after {self.timeout}s")
+        except httpx.ConnectError as e:
+            raise ConnectionError(f"Failed to connect to {url}: {e}")
+        except httpx.HTTPError as e:
+            raise RuntimeError(f"Request failed: {e}")
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+    
+    async def request_many(
+        self,
+        requests_list: List[Union[str, Dict[str, Any]]],
+        concurrency: int = 100,
+        return_exceptions: bool = True
+    ) -> List[Union[Response, Exception]]:
+        """Execute many requests with at most ``concurrency`` in flight.
+        
+        Accepts the same request specs as ``HTTPClient.request_many`` and
+        returns results in input order.
+        """
+        specs = [_normalize_spec(spec) for spec in requests_list]
+        gate = asyncio.Semaphore(max(1, concurrency))
+        
+        async def run(spec):
+            async with gate:
+                return await self.request(**spec)
+        
+        return await asyncio.gather(
+            *(run(spec) for spec in specs),
+            return_exceptions=return_exceptions
+        )
+    
+    async def get_many(
+        self,
+        urls: List[str],
+        concurrency: int = 100,
+        **kwargs
+    ) -> List[Union[Response, Exception]]:
+        """Execute GET requests for many URLs concurrently."""
+        return await self.request_many(
+            [dict(kwargs, method="GET", url=url) for url in urls],
+            concurrency=concurrency
+        )
+    
+    async def close(self):
+        """Close the connection pool."""
+        await self.client.aclose()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+
+def _normalize_spec(spec: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Turn a URL or request dict into keyword arguments for a request call."""
+    if isinstance(spec, str):
+        return {"method": "GET", "url": spec}
+    spec = dict(spec)
+    if "url" not in spec:
+        raise ValueError(f"Request spec is missing 'url': {spec}")
+    spec.setdefault("method", "GET")
+    if "json" in spec:
+        spec["json_data"] = spec.pop("json")
+    return spec
+
+
 def parse_headers(header_list: list) -> Dict[str, str]:
     """Parse header strings into dictionary."""
     headers = {}
@@ -5,6 +5,9 @@ import json
 import unittest
 from unittest.mock import Mock, patch
 
+import asyncio
+
+import main
 from main import HTTPClient, Response, parse_headers, parse_params
 
 
@@ -142,6 +145,94 @@ class TestHTTPClient(unittest.TestCase):
         
         call_args = mock_request.call_args
         self.assertIn("q=python", call_args[1]["url"])
+    
+    @patch("main.requests.Session.request")
+    def test_bytes_response_skips_decode(self, mock_request):
+        """Test bytes response type returns raw content."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.headers = {}
+        mock_response.content = b"\x89PNG"
+        mock_response.url = "https://api.example.com/image"
+        mock_response.elapsed.total_seconds.return_value = 0.1
+        mock_request.return_value = mock_response
+        
+        response = self.client.get("https://api.example.com/image", response_type="bytes")
+        
+        self.assertEqual(response.content, b"\x89PNG")
+        self.assertEqual(response.body, "")
+        self.assertEqual(list(response.iter_content()), [b"\x89PNG"])
+    
+    @patch("main.requests.Session.request")
+    def test_get_many_preserves_order(self, mock_request):
+        """Test batch GET returns responses in input order."""
+        def fake_request(method, url, **kwargs):
+            mock_response = Mock()
+            mock_response.status_code = 200
+            mock_response.headers = {}
+            mock_response.text = url
+            mock_response.url = url
+            mock_response.elapsed.total_seconds.return_value = 0.01
+            return mock_response
+        mock_request.side_effect = fake_request
+        
+        urls = [f"https://api.example.com/item/{i}" for i in range(20)]
+        responses = self.client.get_many(urls, concurrency=5)
+        
+        self.assertEqual([r.body for r in responses], urls)
+    
+    @patch("main.requests.Session.request")
+    def test_request_many_returns_exceptions(self, mock_request):
+        """Test batch errors are returned in place."""
+        mock_request.side_effect = main.requests.exceptions.Timeout()
+        
+        results = self.client.request_many([{"method": "POST", "url": "https://api.example.com/x", "json": {}}])
+        
+        self.assertIsInstance(results[0], TimeoutError)
+    
+    def test_host_pool_sizes(self):
+        """Test per-host connection pool is mounted."""
+        client = HTTPClient(host_pool_sizes={"https://api.example.com": 64})
+        try:
+            adapter = client.session.get_adapter("https://api.example.com/users")
+            self.assertEqual(adapter._pool_maxsize, 64)
+            default = client.session.get_adapter("https://other.example.com/")
+            self.assertNotEqual(default, adapter)
+        finally:
+            client.close()
+
+    
+    def test_request_many_grows_pools(self):
+        """Test pools are sized to the batch concurrency."""
+        client = HTTPClient(pool_maxsize=10, host_pool_sizes={"https://api.example.com": 64})
+        try:
+            client.request_many([], concurrency=32)
+            self.assertEqual(client.session.get_adapter("https://other.example.com/")._pool_maxsize, 32)
+            self.assertEqual(client.session.get_adapter("http://other.example.com/")._pool_maxsize, 32)
+            self.assertEqual(client.session.get_adapter("https://api.example.com/x")._pool_maxsize, 64)
+        finally:
+            client.close()
+
+
+@unittest.skipIf(main.httpx is None, "httpx not installed")
+class TestAsyncHTTPClient(unittest.TestCase):
+    """Test AsyncHTTPClient class."""
+    
+    def test_get_many(self):
+        """Test async batch GET with concurrency limits."""
+        def handler(request):
+            return main.httpx.Response(200, content=str(request.url).encode())
+        
+        async def run():
+            async with main.AsyncHTTPClient(
+                per_host_limit=2,
+                transport=main.httpx.MockTransport(handler)
+            ) as client:
+                urls = [f"https://api.example.com/{i}" for i in range(10)]
+                return urls, await client.get_many(urls, concurrency=4, response_type="bytes")
+        
+        urls, responses = asyncio.run(run())
+        self.assertEqual([r.content.decode() for r in responses], urls)
 
 
 class TestUtilityFunctions(unittest.TestCase):
@@ -8,6 +8,7 @@ Kanban Skill - 基于Markdown的看板管理工具
 import os
 import re
 import json
+import time
 import shutil
 from datetime import datetime
 from pathlib import Path
@@ -64,12 +65,45 @@ class KanbanBoard:
             self.updated_at = datetime.now().isoformat()
 
 
+@dataclass
+class BoardIndex:
+    """看板索引：卡片ID → 列/字节长度，用于增量改写Markdown文件"""
+    board_id: str
+    name: str
+    updated_at: str
+    columns: List[str]
+    header_len: int
+    sections: Dict[str, Dict[str, Any]]  # 列名 -> {"length": 字节数, "heading_len": 字节数, "cards": [卡片ID]}
+    cards: Dict[str, Dict[str, Any]]     # 卡片ID -> {"column", "len", "priority", "due_date"}
+    next_card: int = 0
+    mtime_ns: int = 0
+    size: int = 0
+
+
+INDEX_VERSION = 1
+META_CACHE_FILE = ".kanban_meta.json"
+INDEX_FLUSH_INTERVAL = 1.0  # 秒，索引sidecar最多每秒写一次
+
+_BLOCK_RE = re.compile(r'^(#{2,3})[ \t]+(.+?)[ \t]*$', re.M)
+_CARD_ID_RE = re.compile(r'_card_(\d+)$')
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
 class KanbanManager:
     """看板管理器"""
     
     def __init__(self, base_dir: str = "./kanban_boards"):
         self.base_dir = Path(base_dir)
         self.base_dir.mkdir(parents=True, exist_ok=True)
+        self._cache: Dict[str, Any] = {}  # board_id -> (BoardIndex, 文件内容bytes)
+        self._dirty = set()
+        self._last_flush = time.monotonic()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.flush()
     
     def _sanitize_filename(self, name: str) -> str:
         """清理文件名"""
@@ -79,6 +113,10 @@ class KanbanManager:
         """获取看板文件路径"""
         return self.base_dir / f"{board_id}.md"
     
+    def _get_index_path(self, board_id: str) -> Path:
+        """获取看板索引sidecar路径"""
+        return self.base_dir / f".{board_id}.index.json"
+    
     def _card_to_markdown(self, card: KanbanCard) -> str:
         """将卡片转换为Markdown格式"""
         lines = ["---"]
@@ -116,7 +154,7 @@ class KanbanManager:
         
         if yaml_match:
             try:
-                frontmatter = yaml.safe_load(yaml_match.group(1))
+                frontmatter = yaml.load(yaml_match.group(1), Loader=_YAML_LOADER) or {}
                 body = yaml_match.group(2).strip()
             except yaml.YAMLError:
                 frontmatter = {}
@@ -149,11 +187,8 @@ class KanbanManager:
             metadata=metadata
         )
     
-    def board_to_markdown(self, board: KanbanBoard) -> str:
-        """将看板转换为Markdown格式"""
-        lines = ["---"]
-        
-        # 看板YAML frontmatter
+    def _header_markdown(self, board: KanbanBoard) -> str:
+        """看板头部：YAML frontmatter + 描述"""
         frontmatter = {
             "id": board.id,
             "name": board.name,
@@ -162,88 +197,136 @@ class KanbanManager:
             "created_at": board.created_at,
             "updated_at": board.updated_at,
         }
-        lines.append(yaml.dump(frontmatter, allow_unicode=True, sort_keys=False))
-        lines.append("---")
-        
-        # 看板描述
+        header = "---\n" + yaml.dump(frontmatter, allow_unicode=True, sort_keys=False) + "\n---"
         if board.description:
-            lines.append(f"\n{board.description}\n")
-        
-        # 各列的卡片
-        for column in board.columns:
-            lines.append(f"\n## {column}\n")
-            column_cards = [c for c in board.cards if c.column == column]
-            for card in column_cards:
-                lines.append(f"\n### {card.title}\n")
-                lines.append(self._card_to_markdown(card))
-                lines.append("\n---\n")
-        
-        return "\n".join(lines)
+            header += f"\n\n{board.description}\n"
+        return header
     
-    def parse_board_markdown(self, content: str, board_id: str) -> KanbanBoard:
-        """解析Markdown格式的看板"""
+    def _column_block(self, column: str) -> str:
+        """列标题块"""
+        return f"\n\n## {column}\n"
+    
+    def _card_block(self, card: KanbanCard) -> str:
+        """卡片块：标题 + 卡片Markdown + 分隔线"""
+        return f"\n\n### {card.title}\n\n{self._card_to_markdown(card)}\n\n---\n"
+    
+    def board_to_markdown(self, board: KanbanBoard) -> str:
+        """将看板转换为Markdown格式"""
+        return self._render_board(board)[0]
+    
+    def _render_board(self, board: KanbanBoard):
+        """渲染看板，同时生成字节级索引"""
+        header = self._header_markdown(board)
+        parts = [header]
+        sections, cards = {}, {}
+        for column in board.columns:
+            heading = self._column_block(column)
+            parts.append(heading)
+            heading_len = len(heading.encode('utf-8'))
+            section = {"length": heading_len, "heading_len": heading_len, "cards": []}
+            for card in board.cards:
+                if card.column != column:
+                    continue
+                block = self._card_block(card)
+                parts.append(block)
+                block_len = len(block.encode('utf-8'))
+                section["cards"].append(card.id)
+                section["length"] += block_len
+                cards[card.id] = {"column": column, "len": block_len,
+                                  "priority": card.priority, "due_date": card.due_date}
+            sections[column] = section
+        
+        index = BoardIndex(
+            board_id=board.id, name=board.name, updated_at=board.updated_at,
+            columns=list(board.columns), header_len=len(header.encode('utf-8')),
+            sections=sections, cards=cards, next_card=self._next_card_number(cards)
+        )
+        return "".join(parts), index
+    
+    def _next_card_number(self, cards) -> int:
+        numbers = [int(m.group(1)) for m in map(_CARD_ID_RE.search, cards) if m]
+        return max(numbers) + 1 if numbers else len(cards)
+    
+    def _split_card_block(self, block: str) -> str:
+        """去掉卡片块的标题行和结尾分隔线，返回卡片Markdown"""
+        text = _BLOCK_RE.sub('', block, count=1).strip()
+        lines = text.split('\n')
+        if len(lines) > 1 and lines[-1].strip() == '---':
+            has_frontmatter = lines[0].strip() == '---'
+            if not has_frontmatter or sum(1 for line in lines if line.strip() == '---') >= 3:
+                lines = lines[:-1]
+        return '\n'.join(lines).strip()
+    
+    def _parse_with_index(self, content: str, board_id: str):
+        """解析看板Markdown，同时记录每个列/卡片块的字节长度"""
         # 提取看板YAML frontmatter
-        yaml_match = re.match(r'^---\n(.*?)\n---\n(.*)', content, re.DOTALL)
-        
+        yaml_match = re.match(r'^---\n(.*?)\n---\n', content, re.DOTALL)
+        frontmatter = {}
         if yaml_match:
             try:
-                frontmatter = yaml.safe_load(yaml_match.group(1))
-                body = yaml_match.group(2)
+                frontmatter = yaml.load(yaml_match.group(1), Loader=_YAML_LOADER) or {}
             except yaml.YAMLError:
                 frontmatter = {}
-                body = content
-        else:
-            frontmatter = {}
-            body = content
-        
-        columns = frontmatter.get("columns", ["待办", "进行中", "已完成"])
-        
-        # 解析卡片
-        cards = []
+        body_start = yaml_match.end() if yaml_match else 0
+        
+        columns = list(frontmatter.get("columns") or ["待办", "进行中", "已完成"])
+        
+        # 按 ## / ### 标题切分为连续的块；块从标题前的空行开始
+        blocks = []
+        for match in _BLOCK_RE.finditer(content, body_start):
+            start = match.start()
+            while start - 2 >= body_start and content[start - 1] == '\n' and content[start - 2] == '\n':
+                start -= 1
+            blocks.append((len(match.group(1)), match.group(2), start))
+        
+        header_end = blocks[0][2] if blocks else len(content)
+        sections: Dict[str, Dict[str, Any]] = {}
+        cards: List[KanbanCard] = []
+        card_entries: Dict[str, Dict[str, Any]] = {}
         current_column = columns[0] if columns else "待办"
         
-        lines = body.split('\n')
-        i = 0
-        while i < len(lines):
-            line = lines[i]
+        def section_for(column):
+            if column not in sections:
+                sections[column] = {"length": 0, "heading_len": 0, "cards": []}
+                if column not in columns:
+                    columns.append(column)
+            return sections[column]
+        
+        for i, (level, title, start) in enumerate(blocks):
+            end = blocks[i + 1][2] if i + 1 < len(blocks) else len(content)
+            text = content[start:end]
+            size = len(text.encode('utf-8'))
             
-            # 检测列标题
-            column_match = re.match(r'^##\s+(.+)$', line)
-            if column_match:
-                current_column = column_match.group(1).strip()
-                i += 1
+            if level == 2:
+                # 检测列标题
+                current_column = title
+                section = section_for(current_column)
+                section["heading_len"] += size
+                section["length"] += size
                 continue
             
             # 检测卡片标题
-            card_match = re.match(r'^###\s+(.+)$', line)
-            if card_match:
-                card_title = card_match.group(1).strip()
-                card_lines = []
-                i += 1
-                
-                # 收集卡片内容直到下一个卡片或列
-                while i < len(lines):
-                    next_line = lines[i]
-                    if re.match(r'^(###|##)\s+', next_line) or next_line.strip() == '---':
-                        if next_line.strip() == '---':
-                            i += 1
-                        break
-                    card_lines.append(next_line)
-                    i += 1
-                
-                card_content = '\n'.join(card_lines).strip()
-                if card_content:
-                    card = self._parse_card_markdown(card_content, current_column)
-                    if not card.id:
-                        card.id = f"card_{len(cards)}"
-                    if not card.title:
-                        card.title = card_title
-                    cards.append(card)
+            card_content = self._split_card_block(text)
+            section = section_for(current_column)
+            if not card_content:
+                section["heading_len"] += size
+                section["length"] += size
                 continue
-            
-            i += 1
+            card = self._parse_card_markdown(card_content + '\n', current_column)
+            if not card.id or card.id in card_entries:
+                card.id = f"card_{len(cards)}"
+            if not card.title:
+                card.title = title
+            cards.append(card)
+            section["cards"].append(card.id)
+            section["length"] += size
+            card_entries[card.id] = {"column": current_column, "len": size,
+                                     "priority": card.priority, "due_date": card.due_date}
+        
+        for column in columns:
+            section_for(column)
         
-        return KanbanBoard(
+        board = KanbanBoard(
             id=frontmatter.get("id", board_id),
             name=frontmatter.get("name", "Untitled Board"),
             description=frontmatter.get("description", ""),
@@ -252,6 +335,170 @@ class KanbanManager:
             created_at=frontmatter.get("created_at", ""),
             updated_at=frontmatter.get("updated_at", "")
         )
+        index = BoardIndex(
+            board_id=board.id, name=board.name, updated_at=board.updated_at, columns=columns,
+            header_len=len(content[:header_end].encode('utf-8')),
+            sections=sections, cards=card_entries, next_card=self._next_card_number(card_entries)
+        )
+        return board, index
+    
+    def parse_board_markdown(self, content: str, board_id: str) -> KanbanBoard:
+        """解析Markdown格式的看板"""
+        return self._parse_with_index(content, board_id)[0]
+    
+    # ---- 索引与缓存 ----
+    
+    def _stat(self, board_id: str):
+        try:
+            st = self._get_board_path(board_id).stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+    
+    def _load(self, board_id: str):
+        """返回 (BoardIndex, 文件内容bytes)；文件被外部修改时重建索引"""
+        stat = self._stat(board_id)
+        if stat is None:
+            self._cache.pop(board_id, None)
+            return None
+        
+        cached = self._cache.get(board_id)
+        if cached and (cached[0].mtime_ns, cached[0].size) == stat:
+            return cached
+        
+        content = self._get_board_path(board_id).read_bytes()
+        index = self._read_index_sidecar(board_id, stat)
+        if index is None:
+            _, index = self._parse_with_index(content.decode('utf-8'), board_id)
+            index.mtime_ns, index.size = stat
+            self._write_index_sidecar(board_id, index)
+        self._cache[board_id] = (index, content)
+        return self._cache[board_id]
+    
+    def _read_index_sidecar(self, board_id: str, stat) -> Optional[BoardIndex]:
+        try:
+            data = json.loads(self._get_index_path(board_id).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+        if data.pop("version", None) != INDEX_VERSION:
+            return None
+        index = BoardIndex(**data)
+        return index if (index.mtime_ns, index.size) == stat else None
+    
+    def _write_index_sidecar(self, board_id: str, index: BoardIndex) -> None:
+        data = asdict(index)
+        data["version"] = INDEX_VERSION
+        self._get_index_path(board_id).write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+    
+    def flush(self) -> None:
+        """写出有改动的看板索引和列表元数据缓存"""
+        if self._dirty:
+            meta = self._load_meta()
+            for board_id in self._dirty:
+                cached = self._cache.get(board_id)
+                if cached:
+                    self._write_index_sidecar(board_id, cached[0])
+                    meta[board_id] = self._meta_entry(cached[0])
+            self._save_meta(meta)
+            self._dirty.clear()
+        self._last_flush = time.monotonic()
+    
+    def _mark_dirty(self, board_id: str) -> None:
+        self._dirty.add(board_id)
+        if time.monotonic() - self._last_flush >= INDEX_FLUSH_INTERVAL:
+            self.flush()
+    
+    def _load_meta(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            return json.loads((self.base_dir / META_CACHE_FILE).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_meta(self, meta: Dict[str, Dict[str, Any]]) -> None:
+        (self.base_dir / META_CACHE_FILE).write_text(json.dumps(meta, ensure_ascii=False), encoding='utf-8')
+    
+    def _meta_entry(self, index: BoardIndex) -> Dict[str, Any]:
+        return {"id": index.board_id, "name": index.name, "card_count": len(index.cards),
+                "updated_at": index.updated_at, "mtime_ns": index.mtime_ns, "size": index.size}
+    
+    def _section_start(self, index: BoardIndex, column: str) -> int:
+        pos = index.header_len
+        for name in index.columns:
+            if name == column:
+                return pos
+            pos += index.sections[name]["length"]
+        raise KeyError(column)
+    
+    def _card_start(self, index: BoardIndex, card_id: str) -> int:
+        column = index.cards[card_id]["column"]
+        section = index.sections[column]
+        pos = self._section_start(index, column) + section["heading_len"]
+        for other in section["cards"]:
+            if other == card_id:
+                return pos
+            pos += index.cards[other]["len"]
+        raise KeyError(card_id)
+    
+    def _header_touch(self, index: BoardIndex, content: bytes, now: str):
+        """更新看板头部 updated_at 所在行（通常等长，原地覆盖）"""
+        header = content[:index.header_len]
+        match = re.search(rb'^updated_at: .*$', header, re.M)
+        index.updated_at = now
+        if not match:
+            return None
+        line = yaml.dump({"updated_at": now}, allow_unicode=True).rstrip('\n').encode('utf-8')
+        index.header_len += len(line) - (match.end() - match.start())
+        return (match.start(), match.end(), line)
+    
+    def _apply_edits(self, board_id: str, index: BoardIndex, content: bytes, edits) -> None:
+        """
+        将 (start, end, 新bytes) 编辑写入文件。
+        
+        等长编辑原地覆盖；从第一个改变长度的编辑起，只重写其后的部分。
+        """
+        edits = sorted(e for e in edits if e)
+        shift_at = next((s for s, e, r in edits if len(r) != e - s), None)
+        
+        pieces, pos = [], 0
+        for s, e, r in edits:
+            pieces.append(content[pos:s])
+            pieces.append(r)
+            pos = e
+        pieces.append(content[pos:])
+        new_content = b"".join(pieces)
+        
+        with open(self._get_board_path(board_id), 'r+b') as f:
+            for s, e, r in edits:
+                if shift_at is None or s < shift_at:
+                    f.seek(s)
+                    f.write(r)
+            if shift_at is not None:
+                f.seek(shift_at)
+                f.write(new_content[shift_at:])
+                f.truncate()
+        
+        index.mtime_ns, index.size = self._stat(board_id)
+        self._cache[board_id] = (index, new_content)
+        self._mark_dirty(board_id)
+    
+    def _patch_card_block(self, block: bytes, **fields) -> Optional[bytes]:
+        """原地替换卡片frontmatter中的单行字段；无法安全替换时返回None"""
+        text = block.decode('utf-8')
+        for key, value in fields.items():
+            line = yaml.dump({key: value}, allow_unicode=True, sort_keys=False).rstrip('\n')
+            match = re.search(rf'^{key}: .*\n(?=\S)', text, re.M)
+            if '\n' in line or not match:
+                return None
+            text = text[:match.start()] + line + '\n' + text[match.end():]
+        return text.encode('utf-8')
+    
+    def _render_card_from_block(self, block: bytes, column: str, **fields) -> bytes:
+        card = self._parse_card_markdown(self._split_card_block(block.decode('utf-8')) + '\n', column)
+        for key, value in fields.items():
+            setattr(card, key, value)
+        return self._card_block(card).encode('utf-8')
+    
+    # ---- 看板操作 ----
     
     def create_board(self, name: str, description: str = "", columns: List[str] = None) -> KanbanBoard:
         """创建新看板"""
@@ -267,101 +514,165 @@ class KanbanManager:
     
     def get_board(self, board_id: str) -> Optional[KanbanBoard]:
         """获取看板"""
-        board_path = self._get_board_path(board_id)
-        if not board_path.exists():
+        loaded = self._load(board_id)
+        if not loaded:
             return None
         
-        content = board_path.read_text(encoding='utf-8')
-        return self.parse_board_markdown(content, board_id)
+        return self.parse_board_markdown(loaded[1].decode('utf-8'), board_id)
     
     def save_board(self, board: KanbanBoard) -> None:
         """保存看板"""
-        board.updated_at = datetime.now().isoformat()
-        content = self.board_to_markdown(board)
+        board.updated_at = datetime.now().isoformat(timespec='microseconds')
+        content, index = self._render_board(board)
+        data = content.encode('utf-8')
         board_path = self._get_board_path(board.id)
-        board_path.write_text(content, encoding='utf-8')
+        board_path.write_bytes(data)
+        index.mtime_ns, index.size = self._stat(board.id)
+        self._cache[board.id] = (index, data)
+        self._mark_dirty(board.id)
     
     def delete_board(self, board_id: str) -> bool:
         """删除看板"""
         board_path = self._get_board_path(board_id)
+        self._cache.pop(board_id, None)
+        self._dirty.discard(board_id)
+        self._get_index_path(board_id).unlink(missing_ok=True)
         if board_path.exists():
             board_path.unlink()
             return True
         return False
     
     def list_boards(self) -> List[Dict[str, str]]:
-        """列出所有看板"""
-        boards = []
-        for md_file in self.base_dir.glob("*.md"):
+        """列出所有看板（按文件mtime/size校验的元数据缓存，未变化的看板不再解析）"""
+        meta = self._load_meta()
+        boards, seen, changed = [], set(), False
+        for md_file in sorted(self.base_dir.glob("*.md")):
             board_id = md_file.stem
-            board = self.get_board(board_id)
-            if board:
-                boards.append({
-                    "id": board.id,
-                    "name": board.name,
-                    "card_count": len(board.cards),
-                    "updated_at": board.updated_at
-                })
+            seen.add(board_id)
+            stat = self._stat(board_id)
+            entry = meta.get(board_id)
+            if not entry or (entry.get("mtime_ns"), entry.get("size")) != stat:
+                loaded = self._load(board_id)
+                if not loaded:
+                    continue
+                entry = meta[board_id] = self._meta_entry(loaded[0])
+                changed = True
+            boards.append({key: entry[key] for key in ("id", "name", "card_count", "updated_at")})
+        
+        for board_id in set(meta) - seen:
+            del meta[board_id]
+            changed = True
+        if changed:
+            self._save_meta(meta)
         return boards
     
     def add_card(self, board_id: str, title: str, column: str = None, **kwargs) -> Optional[KanbanCard]:
         """添加卡片"""
-        board = self.get_board(board_id)
-        if not board:
+        loaded = self._load(board_id)
+        if not loaded:
             return None
+        index, content = loaded
         
-        target_column = column or board.columns[0]
-        if target_column not in board.columns:
+        target_column = column or index.columns[0]
+        if target_column not in index.columns:
+            # 新列需要改写头部的列定义，走整板保存
+            board = self.get_board(board_id)
             board.columns.append(target_column)
+            card = KanbanCard(id=f"{board_id}_card_{index.next_card}", title=title,
+                              column=target_column, **kwargs)
+            board.cards.append(card)
+            self.save_board(board)
+            return card
         
         card = KanbanCard(
-            id=f"{board_id}_card_{len(board.cards)}",
+            id=f"{board_id}_card_{index.next_card}",
             title=title,
             column=target_column,
             **kwargs
         )
-        board.cards.append(card)
-        self.save_board(board)
+        block = self._card_block(card).encode('utf-8')
+        insert_at = self._section_start(index, target_column) + index.sections[target_column]["length"]
+        
+        index.next_card += 1
+        index.cards[card.id] = {"column": target_column, "len": len(block),
+                                "priority": card.priority, "due_date": card.due_date}
+        index.sections[target_column]["cards"].append(card.id)
+        index.sections[target_column]["length"] += len(block)
+        
+        header_edit = self._header_touch(index, content, datetime.now().isoformat(timespec='microseconds'))
+        self._apply_edits(board_id, index, content, [header_edit, (insert_at, insert_at, block)])
         return card
     
     def move_card(self, board_id: str, card_id: str, target_column: str) -> bool:
-        """移动卡片"""
-        board = self.get_board(board_id)
-        if not board:
+        """移动卡片（只改写涉及的卡片块，卡片追加到目标列末尾）"""
+        loaded = self._load(board_id)
+        if not loaded:
             return False
+        index, content = loaded
         
-        if target_column not in board.columns:
+        if target_column not in index.columns:
             return False
         
-        for card in board.cards:
-            if card.id == card_id:
-                card.column = target_column
-                card.updated_at = datetime.now().isoformat()
-                self.save_board(board)
-                return True
-        return False
+        entry = index.cards.get(card_id)
+        if entry is None:
+            return False
+        
+        now = datetime.now().isoformat(timespec='microseconds')
+        start = self._card_start(index, card_id)
+        old_len = entry["len"]
+        block = content[start:start + old_len]
+        new_block = (self._patch_card_block(block, column=target_column, updated_at=now)
+                     or self._render_card_from_block(block, target_column, updated_at=now))
+        insert_at = self._section_start(index, target_column) + index.sections[target_column]["length"]
+        
+        source = index.sections[entry["column"]]
+        source["cards"].remove(card_id)
+        source["length"] -= old_len
+        target = index.sections[target_column]
+        target["cards"].append(card_id)
+        target["length"] += len(new_block)
+        entry["column"] = target_column
+        entry["len"] = len(new_block)
+        
+        header_edit = self._header_touch(index, content, now)
+        if insert_at == start + old_len:
+            # 已在目标列末尾（含同列移动）：原位替换
+            edits = [header_edit, (start, start + old_len, new_block)]
+        else:
+            edits = [header_edit, (start, start + old_len, b""), (insert_at, insert_at, new_block)]
+        self._apply_edits(board_id, index, content, edits)
+        return True
     
     def delete_card(self, board_id: str, card_id: str) -> bool:
         """删除卡片"""
-        board = self.get_board(board_id)
-        if not board:
+        loaded = self._load(board_id)
+        if not loaded:
             return False
+        index, content = loaded
         
-        for i, card in enumerate(board.cards):
-            if card.id == card_id:
-                board.cards.pop(i)
-                self.save_board(board)
-                return True
-        return False
+        entry = index.cards.get(card_id)
+        if entry is None:
+            return False
+        
+        start = self._card_start(index, card_id)
+        section = index.sections[entry["column"]]
+        section["cards"].remove(card_id)
+        section["length"] -= entry["len"]
+        del index.cards[card_id]
+        
+        header_edit = self._header_touch(index, content, datetime.now().isoformat(timespec='microseconds'))
+        self._apply_edits(board_id, index, content, [header_edit, (start, start + entry["len"], b"")])
+        return True
     
     def get_statistics(self, board_id: str) -> Dict[str, Any]:
-        """获取看板统计信息"""
-        board = self.get_board(board_id)
-        if not board:
+        """获取看板统计信息（直接读取索引，无需解析看板）"""
+        loaded = self._load(board_id)
+        if not loaded:
             return {}
+        index = loaded[0]
         
         stats = {
-            "total_cards": len(board.cards),
+            "total_cards": len(index.cards),
             "by_column": {},
             "by_priority": {},
             "overdue": 0
@@ -369,17 +680,17 @@ class KanbanManager:
         
         now = datetime.now()
         
-        for card in board.cards:
+        for card in index.cards.values():
             # 按列统计
-            stats["by_column"][card.column] = stats["by_column"].get(card.column, 0) + 1
+            stats["by_column"][card["column"]] = stats["by_column"].get(card["column"], 0) + 1
             
             # 按优先级统计
-            stats["by_priority"][card.priority] = stats["by_priority"].get(card.priority, 0) + 1
+            stats["by_priority"][card["priority"]] = stats["by_priority"].get(card["priority"], 0) + 1
             
             # 检查逾期
-            if card.due_date:
+            if card["due_date"]:
                 try:
-                    due = datetime.fromisoformat(card.due_date.replace('Z', '+00:00'))
+                    due = datetime.fromisoformat(str(card["due_date"]).replace('Z', '+00:00'))
                     if due < now:
                         stats["overdue"] += 1
                 except:
@@ -464,7 +775,12 @@ def main():
         parser.print_help()
         return
     
-    manager = KanbanManager(args.dir)
+    with KanbanManager(args.dir) as manager:
+        run_command(manager, args)
+
+
+def run_command(manager: KanbanManager, args) -> None:
+    """执行命令行子命令"""
     
     if args.command == "create":
         board = manager.create_board(args.name, args.desc, args.columns)
@@ -252,6 +252,79 @@ class TestKanbanCard(unittest.TestCase):
         self.assertEqual(card.metadata["source"], "test")
 
 
+class TestBoardIndex(unittest.TestCase):
+    """看板索引与增量持久化测试类"""
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.manager = KanbanManager(base_dir=self.test_dir)
+        self.board = self.manager.create_board("索引看板", columns=["待办", "进行中", "已完成"])
+        self.card_ids = [
+            self.manager.add_card(self.board.id, f"卡片{i}", "待办", description=f"描述{i}").id
+            for i in range(10)
+        ]
+    
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+    
+    def _read(self):
+        return Path(self.test_dir, f"{self.board.id}.md").read_text(encoding='utf-8')
+    
+    def test_incremental_matches_full_render(self):
+        """测试增量移动/删除后文件与整板渲染一致"""
+        for i, card_id in enumerate(self.card_ids[:6]):
+            self.assertTrue(self.manager.move_card(self.board.id, card_id, ["进行中", "已完成"][i % 2]))
+        self.assertTrue(self.manager.delete_card(self.board.id, self.card_ids[7]))
+        
+        content = self._read()
+        board = self.manager.parse_board_markdown(content, self.board.id)
+        self.assertEqual(self.manager.board_to_markdown(board), content)
+        self.assertEqual(len(board.cards), 9)
+        columns = {card.id: card.column for card in board.cards}
+        self.assertEqual(columns[self.card_ids[0]], "进行中")
+        self.assertEqual(columns[self.card_ids[1]], "已完成")
+        self.assertEqual(columns[self.card_ids[9]], "待办")
+    
+    def test_moved_card_appended_to_target(self):
+        """测试移动的卡片追加到目标列末尾"""
+        self.manager.move_card(self.board.id, self.card_ids[3], "进行中")
+        self.manager.move_card(self.board.id, self.card_ids[1], "进行中")
+        board = self.manager.get_board(self.board.id)
+        doing = [card.id for card in board.cards if card.column == "进行中"]
+        self.assertEqual(doing, [self.card_ids[3], self.card_ids[1]])
+    
+    def test_card_ids_unique_after_delete(self):
+        """测试删除后新增卡片ID不冲突"""
+        self.manager.delete_card(self.board.id, self.card_ids[2])
+        card = self.manager.add_card(self.board.id, "新卡片")
+        self.assertNotIn(card.id, self.card_ids)
+    
+    def test_index_persisted_and_list_cached(self):
+        """测试索引sidecar与列表元数据缓存"""
+        self.manager.move_card(self.board.id, self.card_ids[0], "已完成")
+        self.manager.flush()
+        
+        manager = KanbanManager(base_dir=self.test_dir)
+        stats = manager.get_statistics(self.board.id)
+        self.assertEqual(stats["by_column"], {"待办": 9, "已完成": 1})
+        boards = manager.list_boards()
+        self.assertEqual(boards[0]["card_count"], 10)
+    
+    def test_external_edit_invalidates_index(self):
+        """测试外部修改文件后索引自动重建"""
+        self.manager.list_boards()
+        path = Path(self.test_dir, f"{self.board.id}.md")
+        content = self._read()
+        cut = content.index("\n\n### 卡片9")
+        path.write_text(content[:cut], encoding='utf-8')
+        
+        self.assertEqual(self.manager.list_boards()[0]["card_count"], 9)
+        self.assertTrue(self.manager.move_card(self.board.id, self.card_ids[8], "进行中"))
+        self.assertFalse(self.manager.move_card(self.board.id, self.card_ids[9], "进行中"))
+        board = self.manager.get_board(self.board.id)
+        self.assertEqual(len(board.cards), 9)
+
+
 def run_tests():
     """运行所有测试"""
     loader = unittest.TestLoader()
@@ -260,6 +333,7 @@ def run_tests():
     # 添加测试类
     suite.addTests(loader.loadTestsFromTestCase(TestKanbanManager))
     suite.addTests(loader.loadTestsFromTestCase(TestKanbanCard))
+    suite.addTests(loader.loadTestsFromTestCase(TestBoardIndex))
     
     # 运行测试
     runner = unittest.TextTestRunner(verbosity=2)
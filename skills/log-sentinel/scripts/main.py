@@ -7,9 +7,408 @@ import time
 import re
 import argparse
 import threading
+import ctypes
+import ctypes.util
+import fnmatch
+import select
+import struct
 from pathlib import Path
 from collections import deque
 
+READ_CHUNK = 64 * 1024          # bytes per read() call
+MAX_READ_PER_WAKE = 1024 * 1024  # bytes per file before yielding to other files
+MAX_LINE_BYTES = 1024 * 1024     # partial lines longer than this are flushed
+POLL_MIN_INTERVAL = 0.05         # adaptive polling bounds (seconds)
+POLL_MAX_INTERVAL = 1.0
+RESCAN_INTERVAL = 2.0            # polling mode: re-glob directories for new files
+DEDUP_WINDOW = 10.0              # seconds repeats of one fingerprint are collapsed
+RATE_LIMIT = 5.0                 # alerts per second per pattern
+RATE_BURST = 20                  # token bucket capacity per pattern
+MAX_FINGERPRINTS = 10000         # open dedup windows before the oldest is flushed
+
+
+class Inotify:
+    """Minimal ctypes binding for Linux inotify (no third-party dependency)"""
+    
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    DIR_MASK = IN_MODIFY | IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    _EVENT = struct.Struct('iIII')
+    
+    def __init__(self):
+        libc_name = ctypes.util.find_library('c') or 'libc.so.6'
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+    
+    @classmethod
+    def available(cls):
+        """Check whether inotify can be used on this platform"""
+        if not sys.platform.startswith('linux'):
+            return False
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6')
+            return hasattr(libc, 'inotify_init1')
+        except OSError:
+            return False
+    
+    def add_watch(self, path, mask=DIR_MASK):
+        """Watch a path, returning the watch descriptor"""
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(str(path)), mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f'inotify_add_watch failed: {path}')
+        return wd
+    
+    def read_events(self):
+        """Read pending events as (wd, mask, name) tuples"""
+        events = []
+        while True:
+            try:
+                buf = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(buf):
+                wd, mask, _cookie, length = self._EVENT.unpack_from(buf, offset)
+                offset += self._EVENT.size
+                name = buf[offset:offset + length].rstrip(b'\0').decode('utf-8', 'surrogateescape')
+                offset += length
+                events.append((wd, mask, name))
+    
+    def close(self):
+        os.close(self.fd)
+
+
+class FollowedFile:
+    """Tail state for one file: open handle, inode, offset and partial line"""
+    
+    def __init__(self, path, from_end=True):
+        self.path = Path(path)
+        self.handle = None
+        self.inode = None
+        self.offset = 0
+        self.partial = b''
+        self.pending = False
+        self._open(from_end)
+    
+    def _open(self, from_end):
+        try:
+            self.handle = open(self.path, 'rb')
+        except OSError:
+            self.handle = None
+            return
+        st = os.fstat(self.handle.fileno())
+        self.inode = (st.st_dev, st.st_ino)
+        self.offset = st.st_size if from_end else 0
+        self.handle.seek(self.offset)
+        self.partial = b''
+    
+    def _read(self, budget):
+        """Read up to budget bytes of new data, returning complete lines"""
+        lines = []
+        read = 0
+        while read < budget:
+            chunk = self.handle.read(READ_CHUNK)
+            if not chunk:
+                break
+            read += len(chunk)
+            self.offset += len(chunk)
+            data = self.partial + chunk
+            parts = data.split(b'\n')
+            self.partial = parts.pop()
+            lines.extend(parts)
+            if len(self.partial) > MAX_LINE_BYTES:
+                lines.append(self.partial)
+                self.partial = b''
+        self.pending = read >= budget
+        return lines
+    
+    def poll(self, budget=MAX_READ_PER_WAKE):
+        """Read new lines, following truncation and rotation (inode change)"""
+        lines = []
+        try:
+            st = os.stat(self.path)
+            current = (st.st_dev, st.st_ino)
+        except OSError:
+            current = None
+        
+        if self.handle is None:
+            if current is None:
+                return lines
+            self._open(from_end=False)
+            if self.handle is None:
+                return lines
+        
+        if current is not None and current != self.inode:
+            # Rotated: drain what is left of the old file, then follow the new one
+            lines.extend(self._read(budget))
+            if self.partial:
+                lines.append(self.partial)
+            self.handle.close()
+            self._open(from_end=False)
+            if self.handle is None:
+                return lines
+        elif current is not None and st.st_size < self.offset:
+            # Truncated in place (copytruncate)
+            self.handle.seek(0)
+            self.offset = 0
+            self.partial = b''
+        
+        lines.extend(self._read(budget))
+        return lines
+    
+    def close(self):
+        if self.handle:
+            self.handle.close()
+            self.handle = None
+
+
+class TailEngine:
+    """
+    Follow many log files from one process.
+    
+    Uses inotify directory watches on Linux (events for modify, create and
+    rename drive reads immediately) and adaptive polling elsewhere.
+    on_line(path, line) is called for every complete line, on_tick() once
+    per loop iteration (at least once a second).
+    """
+    
+    def __init__(self, on_line, use_inotify=None, on_tick=None):
+        self.on_line = on_line
+        self.on_tick = on_tick
+        self.files = {}    # str(path) -> FollowedFile
+        self.dirs = {}     # str(dir) -> [glob patterns]
+        self.wds = {}      # watch descriptor -> dir
+        self.running = False
+        if use_inotify is None:
+            use_inotify = Inotify.available()
+        self.inotify = Inotify() if use_inotify else None
+    
+    @property
+    def mode(self):
+        return 'inotify' if self.inotify else 'polling'
+    
+    def _watch_dir(self, directory, pattern):
+        key = str(directory)
+        if key not in self.dirs:
+            self.dirs[key] = []
+            if self.inotify:
+                self.wds[self.inotify.add_watch(directory)] = key
+        if pattern not in self.dirs[key]:
+            self.dirs[key].append(pattern)
+    
+    def _matches(self, directory, name):
+        return any(fnmatch.fnmatch(name, p) for p in self.dirs.get(directory, []))
+    
+    def add_file(self, path, from_end=True):
+        """Follow a single file"""
+        path = Path(path).resolve()
+        self._watch_dir(path.parent, path.name)
+        if str(path) not in self.files:
+            self.files[str(path)] = FollowedFile(path, from_end)
+    
+    def add_directory(self, directory, pattern='*.log', from_end=True):
+        """Follow all files matching pattern in directory, including new ones"""
+        directory = Path(directory).resolve()
+        self._watch_dir(directory, pattern)
+        for path in sorted(directory.glob(pattern)):
+            if path.is_file() and str(path) not in self.files:
+                self.files[str(path)] = FollowedFile(path, from_end)
+    
+    def _rescan(self):
+        for directory, patterns in self.dirs.items():
+            for pattern in patterns:
+                for path in Path(directory).glob(pattern):
+                    if str(path) not in self.files and path.is_file():
+                        self.files[str(path)] = FollowedFile(path, from_end=False)
+    
+    def _poll_file(self, followed):
+        lines = followed.poll()
+        for raw in lines:
+            self.on_line(followed.path, raw.decode('utf-8', 'replace').rstrip('\r'))
+        return bool(lines) or followed.pending
+    
+    def _handle_events(self, events):
+        touched = set()
+        for wd, mask, name in events:
+            if mask & Inotify.IN_Q_OVERFLOW:
+                self._rescan()
+                touched.update(self.files)
+                continue
+            directory = self.wds.get(wd)
+            if directory is None or not name:
+                continue
+            path = str(Path(directory) / name)
+            if path in self.files:
+                touched.add(path)
+            elif mask & (Inotify.IN_CREATE | Inotify.IN_MOVED_TO) and self._matches(directory, name):
+                self.files[path] = FollowedFile(path, from_end=False)
+                touched.add(path)
+        return touched
+    
+    def run(self, stop_after=None):
+        """Event loop; stop_after (seconds) is mainly for tests"""
+        self.running = True
+        deadline = time.time() + stop_after if stop_after else None
+        interval = POLL_MIN_INTERVAL
+        last_rescan = time.time()
+        pending = set()
+        try:
+            while self.running and (deadline is None or time.time() < deadline):
+                if self.inotify:
+                    timeout = 0 if pending else 1.0
+                    ready, _, _ = select.select([self.inotify.fd], [], [], timeout)
+                    touched = self._handle_events(self.inotify.read_events()) if ready else set()
+                    touched |= pending
+                    pending = set()
+                    for path in touched:
+                        followed = self.files.get(path)
+                        if followed is not None:
+                            self._poll_file(followed)
+                            if followed.pending:
+                                pending.add(path)
+                else:
+                    if time.time() - last_rescan > RESCAN_INTERVAL:
+                        self._rescan()
+                        last_rescan = time.time()
+                    active = False
+                    for followed in list(self.files.values()):
+                        active |= self._poll_file(followed)
+                    interval = POLL_MIN_INTERVAL if active else min(interval * 1.5, POLL_MAX_INTERVAL)
+                    time.sleep(interval)
+                if self.on_tick:
+                    self.on_tick()
+        finally:
+            self.running = False
+    
+    def stop(self):
+        self.running = False
+    
+    def close(self):
+        for followed in self.files.values():
+            followed.close()
+        if self.inotify:
+            self.inotify.close()
+
+class TokenBucket:
+    """Token bucket: rate tokens per second, up to burst"""
+    
+    __slots__ = ('rate', 'burst', 'tokens', 'updated', 'dropped')
+    
+    def __init__(self, rate, burst, now):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = now
+        self.dropped = 0
+    
+    def take(self, now):
+        if self.tokens < self.burst:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        self.dropped += 1
+        return False
+
+
+class AlertPipeline:
+    """
+    Alert stage between pattern matching and output.
+    
+    - Fingerprints lines by masking numbers, timestamps and hex/UUID ids
+    - The first emitted line of a fingerprint opens a window; repeats within it
+      are counted and reported as one summary when the window closes (a line
+      dropped by the rate limit opens no window)
+    - New alerts are rate limited per pattern with a token bucket
+    """
+    
+    # Any run of hex characters containing a digit: numbers, timestamps parts,
+    # hex/UUID ids and addresses. One character class keeps this cheap in storms.
+    MASK = re.compile(r'[0-9a-fA-F]*[0-9][0-9a-fA-F]*')
+    
+    def __init__(self, window=DEDUP_WINDOW, rate=RATE_LIMIT, burst=RATE_BURST,
+                 max_fingerprints=MAX_FINGERPRINTS, clock=time.monotonic):
+        self.window = window
+        self.rate = rate
+        self.burst = burst
+        self.max_fingerprints = max_fingerprints
+        self.clock = clock
+        self.open = {}      # fingerprint -> [opened_at, count, sample, pattern]; insertion order = age
+        self.buckets = {}   # pattern -> TokenBucket
+        self.pending = []   # summaries of windows closed by submit(), reported on the next flush
+        self.stats = {'matched': 0, 'emitted': 0, 'deduplicated': 0, 'rate_limited': 0}
+    
+    def fingerprint(self, line):
+        """Normalize variable parts of a line"""
+        return self.MASK.sub('#', line)
+    
+    def submit(self, pattern, line, now=None):
+        """Return True if the matched line should be emitted now"""
+        now = self.clock() if now is None else now
+        self.stats['matched'] += 1
+        
+        if self.window > 0:
+            fp = self.fingerprint(line)
+            entry = self.open.get(fp)
+            if entry is not None and now - entry[0] < self.window:
+                entry[1] += 1
+                self.stats['deduplicated'] += 1
+                return False
+            if entry is not None:
+                # Window expired before flush() saw it: keep its repeat count
+                del self.open[fp]
+                if entry[1] > 1:
+                    self.pending.append(self._summary(entry, now))
+        
+        if self.rate > 0:
+            bucket = self.buckets.get(pattern)
+            if bucket is None:
+                bucket = self.buckets[pattern] = TokenBucket(self.rate, self.burst, now)
+            if not bucket.take(now):
+                self.stats['rate_limited'] += 1
+                return False
+        
+        # Only an emitted line anchors a window; a rate-limited one has nothing to repeat
+        if self.window > 0:
+            self.open[fp] = [now, 1, line, pattern]
+        self.stats['emitted'] += 1
+        return True
+    
+    @staticmethod
+    def _summary(entry, now):
+        return f"repeated x{entry[1] - 1} in {now - entry[0]:.0f}s: {entry[2]}"
+    
+    def flush(self, now=None, force=False):
+        """Close expired windows, returning summary strings"""
+        now = self.clock() if now is None else now
+        summaries, self.pending = self.pending, []
+        # Windows are opened in time order, so expired ones are at the front
+        while self.open:
+            fp, entry = next(iter(self.open.items()))
+            expired = force or now - entry[0] >= self.window or len(self.open) > self.max_fingerprints
+            if not expired:
+                break
+            del self.open[fp]
+            if entry[1] > 1:
+                summaries.append(self._summary(entry, now))
+        
+        for pattern, bucket in self.buckets.items():
+            if bucket.dropped:
+                summaries.append(f"rate limited {bucket.dropped} alert(s) for pattern {pattern}")
+                bucket.dropped = 0
+        return summaries
+
+
 class LogSentinel:
     def __init__(self):
         self.keywords = ['ERROR', 'CRITICAL', 'FATAL', '超时', '连接失败', 'Exception']
@@ -26,7 +425,20 @@ class LogSentinel:
         self.alert_enabled = False
         self.alarm_cooldown = 30  # seconds between alarms
         self.last_alarm = 0
-        
+        self.engine = None
+        self.show_source = False
+        self.quiet = False
+        self.pipeline = AlertPipeline()
+        self._compile_patterns()
+    
+    def _compile_patterns(self):
+        """Combine alert patterns into one alternation with a named group per pattern"""
+        self.pattern_by_group = {f'p{i}': pattern for i, pattern in enumerate(self.alert_patterns)}
+        self.matcher = re.compile(
+            '|'.join(f'(?P<{name}>{pattern})' for name, pattern in self.pattern_by_group.items()),
+            re.IGNORECASE
+        )
+
     def test(self):
         """Self-test mode"""
         print("[LOG-SENTINEL] Self-test started...")
@@ -103,10 +515,49 @@ class LogSentinel:
     
     def check_patterns(self, line):
         """Check if line matches alert patterns"""
-        for pattern in self.alert_patterns:
-            if re.search(pattern, line, re.IGNORECASE):
-                return True
-        return False
+        return self.matcher.search(line) is not None
+    
+    def matched_pattern(self, line):
+        """Return the alert pattern that matched line, or None"""
+        m = self.matcher.search(line)
+        if m is None:
+            return None
+        return self.pattern_by_group[m.lastgroup]
+    
+    def handle_line(self, path, line):
+        """Process one new log line"""
+        prefix = f"{path.name}: " if self.show_source else ""
+        m = self.matcher.search(line)
+        if m:
+            # Alert pattern matched; repeats and storms are absorbed by the pipeline
+            pattern = self.pattern_by_group[m.lastgroup]
+            if not self.pipeline.submit(pattern, prefix + line):
+                return
+            highlighted = self.highlight_line(line)
+            print(f"[ALERT] {prefix}{highlighted}")
+            
+            if self.alert_enabled:
+                self.play_alarm()
+        elif not self.quiet:
+            print(f"[INFO] {prefix}{line}")
+    
+    def flush_alerts(self, force=False):
+        """Print summaries for closed dedup windows and rate-limited alerts"""
+        for summary in self.pipeline.flush(force=force):
+            print(f"[SUMMARY] {summary}")
+    
+    def _run_engine(self, engine):
+        """Run the tail engine until Ctrl+C"""
+        self.engine = engine
+        self.monitoring = True
+        try:
+            engine.run()
+        except KeyboardInterrupt:
+            print("\n[MONITOR] Stopped by user")
+        finally:
+            self.monitoring = False
+            self.flush_alerts(force=True)
+            engine.close()
     
     def monitor_file(self, file_path, alert=False):
         """Monitor a single log file"""
@@ -124,40 +575,11 @@ class LogSentinel:
         print("-" * 60)
         print("Press Ctrl+C to stop\n")
         
-        self.monitoring = True
-        
-        # Get initial file size
-        last_size = file_path.stat().st_size
-        
-        try:
-            while self.monitoring:
-                current_size = file_path.stat().st_size
-                
-                if current_size > last_size:
-                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        f.seek(last_size)
-                        new_lines = f.readlines()
-                    
-                    for line in new_lines:
-                        line = line.rstrip()
-                        if self.check_patterns(line):
-                            # Alert pattern matched
-                            highlighted = self.highlight_line(line)
-                            print(f"[ALERT] {highlighted}")
-                            
-                            if alert:
-                                self.play_alarm()
-                        else:
-                            print(f"[INFO] {line}")
-                    
-                    last_size = current_size
-                
-                time.sleep(0.5)  # Poll interval
-                
-        except KeyboardInterrupt:
-            print("\n[MONITOR] Stopped by user")
-            self.monitoring = False
+        engine = TailEngine(self.handle_line, on_tick=self.flush_alerts)
+        engine.add_file(file_path)
+        print(f"[CONFIG] Watch mode: {engine.mode}")
         
+        self._run_engine(engine)
         return True
     
     def monitor_directory(self, dir_path, pattern='*.log', alert=False):
@@ -179,11 +601,15 @@ class LogSentinel:
         
         print(f"[FILES] Found {len(files)} file(s)")
         
-        # For simplicity, monitor the most recently modified file
-        latest_file = max(files, key=lambda f: f.stat().st_mtime)
-        print(f"[ACTIVE] Monitoring: {latest_file.name}")
+        self.alert_enabled = alert
+        self.show_source = True
+        engine = TailEngine(self.handle_line, on_tick=self.flush_alerts)
+        engine.add_directory(dir_path, pattern)
+        print(f"[ACTIVE] Following {len(engine.files)} file(s) ({engine.mode}), new files are picked up automatically")
+        print("Press Ctrl+C to stop\n")
         
-        return self.monitor_file(latest_file, alert)
+        self._run_engine(engine)
+        return True
     
     def config(self, **kwargs):
         """Configure sentinel settings"""
@@ -211,10 +637,18 @@ def main():
     parser.add_argument('--pattern', default='*.log', help='File pattern')
     parser.add_argument('--alert', action='store_true', help='Enable audio alarm')
     parser.add_argument('--keywords', help='Comma-separated keywords')
+    parser.add_argument('--quiet', action='store_true', help='Only print alert lines')
+    parser.add_argument('--dedup-window', type=float, default=DEDUP_WINDOW,
+                        help='Seconds to collapse repeated alerts (0 disables)')
+    parser.add_argument('--rate', type=float, default=RATE_LIMIT,
+                        help='Max alerts per second per pattern (0 disables)')
+    parser.add_argument('--burst', type=int, default=RATE_BURST, help='Alert burst size per pattern')
     
     args = parser.parse_args()
     
     sentinel = LogSentinel()
+    sentinel.quiet = args.quiet
+    sentinel.pipeline = AlertPipeline(window=args.dedup_window, rate=args.rate, burst=args.burst)
     
     if args.test:
         sys.exit(0 if sentinel.test() else 1)
@@ -6,13 +6,109 @@ Memory Isolator - Implementation
 借鉴 MCP Memory Keeper Channel系统和Letta Agent隔离
 """
 
+import hashlib
 import json
 import os
+import shutil
+import stat
 import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
+HASH_CHUNK = 1024 * 1024
+
+
+class ObjectStore:
+    """内容寻址对象库: objects/<hash[:2]>/<hash>，只写一次、只读共享"""
+    
+    def __init__(self, root: Path):
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+        
+    def path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+        
+    @staticmethod
+    def hash_file(path: Path) -> str:
+        h = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+                h.update(chunk)
+        return h.hexdigest()
+        
+    def put_file(self, src: Path) -> str:
+        """存入文件内容，已存在的对象不再复制"""
+        digest = self.hash_file(src)
+        target = self.path(digest)
+        if not target.exists():
+            target.parent.mkdir(exist_ok=True)
+            tmp = target.with_name(f"{digest}.{os.getpid()}.tmp")
+            shutil.copyfile(src, tmp)
+            os.chmod(tmp, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+            os.replace(tmp, target)
+        return digest
+        
+    def link_to(self, digest: str, dest: Path):
+        """硬链接物化对象；文件系统不支持时退化为复制"""
+        try:
+            os.link(self.path(digest), dest)
+        except OSError:
+            shutil.copyfile(self.path(digest), dest)
+            
+    def gc(self, referenced: set) -> int:
+        """删除未被任何清单引用、也没有被物化链接的对象"""
+        removed = 0
+        for obj in self.root.glob("*/*"):
+            if obj.name in referenced or obj.suffix == ".tmp":
+                continue
+            if obj.stat().st_nlink == 1:
+                obj.unlink()
+                removed += 1
+        return removed
+
+
+def _make_writable(func, path, _exc_info):
+    """rmtree/替换的错误回调：只读的硬链接在Windows上需先去掉只读属性"""
+    os.chmod(path, stat.S_IWRITE | stat.S_IREAD)
+    func(path)
+
+
+class ChannelContext:
+    """Channel上下文，Block在首次访问时才读取"""
+    
+    def __init__(self, blocks_dir: Path):
+        self.blocks_dir = blocks_dir
+        self._values: Dict[str, object] = {}
+        
+    def keys(self) -> List[str]:
+        return sorted(f.stem for f in self.blocks_dir.glob("*.json"))
+        
+    def __contains__(self, name: str) -> bool:
+        return name in self._values or (self.blocks_dir / f"{name}.json").exists()
+        
+    def __getitem__(self, name: str):
+        if name not in self._values:
+            block_file = self.blocks_dir / f"{name}.json"
+            if not block_file.exists():
+                raise KeyError(name)
+            with open(block_file, 'r', encoding='utf-8') as f:
+                self._values[name] = json.load(f).get("value")
+        return self._values[name]
+        
+    def get(self, name: str, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            return default
+            
+    def invalidate(self, name: str = None):
+        if name is None:
+            self._values.clear()
+        else:
+            self._values.pop(name, None)
+
+
 class MemoryIsolator:
     """记忆隔离器"""
     
@@ -24,6 +120,8 @@ class MemoryIsolator:
         self.active_file = self.isolator_path / "active.json"
         
         self._ensure_structure()
+        self.store = ObjectStore(self.isolator_path / "objects")
+        self._contexts: Dict[str, ChannelContext] = {}
         
     def _ensure_structure(self):
         """确保目录结构存在"""
@@ -113,10 +211,11 @@ class MemoryIsolator:
         if not current_channel:
             return
             
-        # 保存会话数据
+        # 保存会话数据（Blocks只记录清单，内容在对象库中去重）
         session_data = {
             "ended_at": datetime.now().isoformat(),
-            "working_memory": {}  # 实际应用中这里会保存工作记忆
+            "working_memory": {},  # 实际应用中这里会保存工作记忆
+            "blocks": self._capture_blocks(current_channel)
         }
         
         sessions_dir = self.channels_path / current_channel / "sessions"
@@ -126,9 +225,38 @@ class MemoryIsolator:
             json.dump(session_data, f, indent=2, ensure_ascii=False)
             
     def _load_channel_context(self, name: str):
-        """加载Channel上下文"""
-        # 实际应用中这里会加载Channel的Blocks和状态
-        pass
+        """加载Channel上下文（惰性：此处不读取任何Block）"""
+        self._contexts[name] = ChannelContext(self.channels_path / name / "blocks")
+        
+    def _active_channel(self) -> Optional[str]:
+        if not self.active_file.exists():
+            return None
+        with open(self.active_file, 'r', encoding='utf-8') as f:
+            return json.load(f).get("channel")
+        
+    def get_context(self, channel: str = None) -> ChannelContext:
+        """获取Channel上下文，Block在首次访问时加载"""
+        channel = channel or self._active_channel() or "default"
+        if channel not in self._contexts:
+            self._load_channel_context(channel)
+        return self._contexts[channel]
+        
+    def write_block(self, name: str, value, channel: str = None):
+        """写入Block：临时文件 + 原子替换，不会改动检查点共享的对象（写时复制）"""
+        channel = channel or self._active_channel() or "default"
+        blocks_dir = self.channels_path / channel / "blocks"
+        blocks_dir.mkdir(parents=True, exist_ok=True)
+        tmp = blocks_dir / f".{name}.json.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({"value": value, "updated": datetime.now().isoformat()}, f, ensure_ascii=False)
+        target = blocks_dir / f"{name}.json"
+        try:
+            os.replace(tmp, target)
+        except PermissionError:
+            _make_writable(os.unlink, target, None)
+            os.replace(tmp, target)
+        if channel in self._contexts:
+            self._contexts[channel].invalidate(name)
         
     def create_checkpoint(self, name: str, description: str = "") -> str:
         """创建检查点"""
@@ -161,24 +289,98 @@ class MemoryIsolator:
         return checkpoint_id
         
     def _capture_blocks(self, channel: str) -> Dict:
-        """捕获当前Blocks状态"""
-        blocks_dir = self.channels_path / channel / "blocks"
+        """
+        捕获当前Blocks状态，返回清单 {block: {"hash", "size"}}。
+        
+        内容存入对象库；(inode, mtime, size) 未变的Block直接复用上次的hash，
+        不重新读取，也不占用额外空间。
+        """
+        channel_path = self.channels_path / channel
+        blocks_dir = channel_path / "blocks"
+        stat_file = channel_path / "blocks_index.json"
         snapshot = {}
         
+        cache = {}
+        if stat_file.exists():
+            try:
+                with open(stat_file, 'r', encoding='utf-8') as f:
+                    cache = json.load(f)
+            except (OSError, ValueError):
+                cache = {}
+                
+        new_cache = {}
         if blocks_dir.exists():
             for f in blocks_dir.glob("*.json"):
                 try:
-                    with open(f, 'r', encoding='utf-8') as fp:
-                        data = json.load(fp)
-                        snapshot[f.stem] = {
-                            "hash": hash(data.get("value", "")),
-                            "size": len(data.get("value", ""))
-                        }
-                except:
+                    st = f.stat()
+                    key = [st.st_ino, st.st_mtime_ns, st.st_size]
+                    cached = cache.get(f.stem)
+                    if cached and cached[:3] == key and self.store.path(cached[3]).exists():
+                        digest = cached[3]
+                    else:
+                        digest = self.store.put_file(f)
+                    new_cache[f.stem] = key + [digest]
+                    snapshot[f.stem] = {"hash": digest, "size": st.st_size}
+                except OSError:
                     pass
                     
+        if new_cache != cache:
+            with open(stat_file, 'w', encoding='utf-8') as f:
+                json.dump(new_cache, f)
         return snapshot
         
+    def _materialize(self, channel: str, manifest: Dict):
+        """按清单硬链接出新的blocks目录，再整体替换"""
+        channel_path = self.channels_path / channel
+        blocks_dir = channel_path / "blocks"
+        staging = channel_path / "blocks.restore"
+        old = channel_path / "blocks.old"
+        for leftover in (staging, old):
+            if leftover.exists():
+                shutil.rmtree(leftover, onerror=_make_writable)
+        staging.mkdir()
+        
+        stat_cache = {}
+        for name, entry in manifest.items():
+            dest = staging / f"{name}.json"
+            self.store.link_to(entry["hash"], dest)
+            st = dest.stat()
+            stat_cache[name] = [st.st_ino, st.st_mtime_ns, st.st_size, entry["hash"]]
+            
+        if blocks_dir.exists():
+            os.replace(blocks_dir, old)
+        os.replace(staging, blocks_dir)
+        if old.exists():
+            shutil.rmtree(old, onerror=_make_writable)
+        with open(channel_path / "blocks_index.json", 'w', encoding='utf-8') as f:
+            json.dump(stat_cache, f)
+        if channel in self._contexts:
+            self._contexts[channel].invalidate()
+            
+    def restore_checkpoint(self, checkpoint_id: str, channel: str = None) -> bool:
+        """恢复检查点：只创建硬链接，不复制Block内容"""
+        if channel is None:
+            found = list(self.channels_path.glob(f"*/checkpoints/{checkpoint_id}.json"))
+            channel = found[0].parent.parent.name if found else ""
+        checkpoint_file = self.channels_path / channel / "checkpoints" / f"{checkpoint_id}.json"
+        if not channel or not checkpoint_file.exists():
+            print(f"[ERROR] Checkpoint not found: {checkpoint_id}")
+            return False
+            
+        with open(checkpoint_file, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+            
+        manifest = checkpoint.get("blocks_snapshot", {})
+        missing = [name for name, entry in manifest.items()
+                   if not isinstance(entry.get("hash"), str) or not self.store.path(entry["hash"]).exists()]
+        if missing:
+            print(f"[ERROR] Checkpoint has no stored content for: {', '.join(sorted(missing))}")
+            return False
+            
+        self._materialize(channel, manifest)
+        print(f"[OK] Checkpoint restored: {checkpoint_id}")
+        return True
+        
     def list_checkpoints(self, channel: str = None) -> List[Dict]:
         """列出检查点"""
         if channel is None:
@@ -237,8 +439,26 @@ class MemoryIsolator:
                 active = json.load(f)
                 channel = active.get("channel", "default")
                 
-        # 清理逻辑
-        print(f"[OK] Cleaned temp data for Channel: {channel}")
+        # 清理逻辑：回收不再被任何检查点/会话清单引用的对象
+        removed = self.store.gc(self._referenced_objects())
+        print(f"[OK] Cleaned temp data for Channel: {channel} ({removed} unreferenced objects removed)")
+        
+    def _referenced_objects(self) -> set:
+        referenced = set()
+        for manifest_file in self.channels_path.glob("*/checkpoints/*.json"):
+            referenced.update(self._manifest_hashes(manifest_file, "blocks_snapshot"))
+        for manifest_file in self.channels_path.glob("*/sessions/*.json"):
+            referenced.update(self._manifest_hashes(manifest_file, "blocks"))
+        return referenced
+        
+    @staticmethod
+    def _manifest_hashes(manifest_file: Path, key: str) -> set:
+        try:
+            with open(manifest_file, 'r', encoding='utf-8') as f:
+                blocks = json.load(f).get(key, {})
+        except (OSError, ValueError):
+            return set()
+        return {entry["hash"] for entry in blocks.values() if isinstance(entry.get("hash"), str)}
 
 
 def main():
@@ -246,7 +466,7 @@ def main():
     
     if len(sys.argv) < 2:
         print("Usage: isolator.py <command> [args]")
-        print("Commands: create, switch, checkpoint, list, status, cleanup")
+        print("Commands: create, switch, checkpoint, restore, list, status, cleanup")
         return
         
     cmd = sys.argv[1]
@@ -262,6 +482,12 @@ def main():
         name = sys.argv[2] if len(sys.argv) > 2 else "manual"
         desc = sys.argv[3] if len(sys.argv) > 3 else ""
         isolator.create_checkpoint(name, desc)
+    elif cmd == "restore":
+        if len(sys.argv) < 3:
+            print("Usage: isolator.py restore <checkpoint_id> [channel]")
+            return
+        channel = sys.argv[3] if len(sys.argv) > 3 else None
+        isolator.restore_checkpoint(sys.argv[2], channel)
     elif cmd == "list":
         channel = sys.argv[2] if len(sys.argv) > 2 else None
         checkpoints = isolator.list_checkpoints(channel)
@@ -12,14 +12,548 @@ Version: 1.0.0
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Union, Callable, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Union, Callable, Any
 from pathlib import Path
+import hashlib
 import json
+import os
+import re
+import shutil
+import tempfile
+import time
 import warnings
 from datetime import datetime
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.feather as pa_feather
+    import pyarrow.parquet as pa_parquet
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 warnings.filterwarnings('ignore')
 
+# 分块（out-of-core）模式参数
+DEFAULT_CHUNK_SIZE = 100_000        # 每块行数
+DEFAULT_MEMORY_BUDGET_MB = 256      # 分组中间状态的内存预算，超出后溢写到磁盘
+QUANTILE_SAMPLE_SIZE = 10_000       # 每组用于近似分位数的 bottom-k 样本行数
+SPILL_PARTITIONS = 16               # 溢写时按分组键哈希分区的数量
+COMBINE_EVERY = 8                   # 累积多少个分块的部分状态后合并一次
+
+# 列式缓存参数
+DEFAULT_CACHE_DIR = './cache'
+DEFAULT_CACHE_FORMAT = 'feather'    # 未压缩 Feather 可零拷贝内存映射；'parquet' 体积更小
+HASH_BLOCK_SIZE = 1024 * 1024       # 计算源文件 sha256 时每次读取的字节数
+CATEGORICAL_MAX_RATIO = 0.5         # 唯一值占比不超过该值的字符串列转为 category
+
+_MOMENT_STATS = {'sum', 'mean', 'var', 'std'}
+_QUANTILE_RE = re.compile(r'^q(\d{1,2}(?:\.\d+)?)$')
+
+
+def _quantile_of(stat: str) -> Optional[float]:
+    """'median' -> 0.5, 'q90' -> 0.9, 其他 -> None"""
+    if stat == 'median':
+        return 0.5
+    match = _QUANTILE_RE.match(stat)
+    return float(match.group(1)) / 100 if match else None
+
+
+class ChunkedAggregator:
+    """
+    可合并的分块分组聚合器
+    
+    每个分块只计算部分状态（count/sum/M2/min/max/size 及分位数样本），
+    部分状态之间可以任意合并（方差使用 Chan 并行合并公式）。
+    中间状态超过内存预算时按分组键哈希分区溢写到磁盘，
+    最终逐个分区合并，峰值内存约为预算加单个分区。
+    
+    支持的聚合: sum, count, mean, var, std, min, max, size,
+    以及近似分位数 median / q25 / q90 等（基于每组 bottom-k 随机样本，可合并）。
+    """
+    
+    SUPPORTED = ('sum', 'count', 'mean', 'var', 'std', 'min', 'max', 'size', 'median', 'q<NN>')
+    
+    def __init__(self, by: Optional[Union[str, List[str]]],
+                 agg: Dict[str, Union[str, List[str]]],
+                 memory_budget_mb: float = DEFAULT_MEMORY_BUDGET_MB,
+                 spill_dir: Optional[str] = None,
+                 sample_size: int = QUANTILE_SAMPLE_SIZE,
+                 partitions: int = SPILL_PARTITIONS,
+                 seed: int = 0):
+        """
+        Args:
+            by: 分组列，None 表示对整体聚合
+            agg: 聚合规则字典，如 {'col': 'mean', 'col2': ['min', 'max', 'q90']}
+            memory_budget_mb: 中间状态内存预算（MB）
+            spill_dir: 溢写目录（在其中创建本次专用的子目录，结束后删除），默认系统临时目录
+            sample_size: 每组分位数样本行数
+            partitions: 溢写分区数
+            seed: 分位数抽样随机种子
+        """
+        self.keys = [by] if isinstance(by, str) else list(by or [])
+        self.grouped = bool(self.keys)
+        if not self.grouped:
+            self.keys = ['__all__']
+        self.agg = {col: [funcs] if isinstance(funcs, str) else list(funcs) for col, funcs in agg.items()}
+        self.multi = any(not isinstance(funcs, str) for funcs in agg.values())
+        
+        self.moment_cols, self.minmax_cols, self.quantile_cols, self.count_cols = [], [], [], []
+        for col, funcs in self.agg.items():
+            for func in funcs:
+                if func in _MOMENT_STATS:
+                    self._add(self.moment_cols, col)
+                elif func in ('min', 'max'):
+                    self._add(self.minmax_cols, col)
+                elif func == 'count':
+                    self._add(self.count_cols, col)
+                elif func == 'size':
+                    continue
+                elif _quantile_of(func) is not None:
+                    self._add(self.quantile_cols, col)
+                else:
+                    raise ValueError(f"分块模式不支持聚合 '{func}'，可用: {', '.join(self.SUPPORTED)}")
+        for col in self.moment_cols:
+            self._add(self.count_cols, col)
+        
+        self.budget = memory_budget_mb * 1024 * 1024
+        self.sample_size = sample_size
+        self.partitions = partitions
+        self.rng = np.random.default_rng(seed)
+        self.spill_root = spill_dir
+        self.spill_dir: Optional[str] = None
+        self._pending: List[pd.DataFrame] = []
+        self._samples: List[pd.DataFrame] = []
+        self._spills = 0
+        self.rows = 0
+    
+    @staticmethod
+    def _add(target: List[str], col: str):
+        if col not in target:
+            target.append(col)
+    
+    @property
+    def columns(self) -> List[str]:
+        """需要从数据源读取的列"""
+        cols = [] if not self.grouped else list(self.keys)
+        for col in self.agg:
+            self._add(cols, col)
+        return cols
+    
+    # ---------- 部分状态 ----------
+    
+    def _partial(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """单个分块的部分状态，列为 (统计量, 列名)"""
+        g = chunk.groupby(self.keys, sort=False)
+        # size 始终保留：它决定结果中有哪些分组（如仅求分位数时）
+        parts = {'size': g.size().to_frame('')}
+        if self.count_cols:
+            parts['count'] = g[self.count_cols].count()
+        if self.moment_cols:
+            parts['sum'] = g[self.moment_cols].sum()
+            parts['m2'] = (g[self.moment_cols].var(ddof=0) * parts['count'][self.moment_cols]).fillna(0.0)
+        if self.minmax_cols:
+            parts['min'] = g[self.minmax_cols].min()
+            parts['max'] = g[self.minmax_cols].max()
+        return pd.concat(parts, axis=1)
+    
+    def _combine(self, states: List[pd.DataFrame]) -> pd.DataFrame:
+        """合并多个部分状态（按分组键对齐）"""
+        if len(states) == 1:
+            return states[0]
+        df = pd.concat(states)
+        levels = list(range(df.index.nlevels))
+        
+        def by_group(frame):
+            return frame.groupby(level=levels, sort=False)
+        
+        parts = {'size': by_group(df[('size', '')]).sum().to_frame('')}
+        if self.count_cols:
+            parts['count'] = by_group(df['count']).sum()
+        if self.moment_cols:
+            n_i = df['count'][self.moment_cols]
+            total_n = by_group(n_i).transform('sum')
+            total_sum = by_group(df['sum']).transform('sum')
+            mean_i = df['sum'] / n_i.where(n_i > 0)
+            mean = total_sum / total_n.where(total_n > 0)
+            shift = (n_i * (mean_i - mean) ** 2).fillna(0.0)
+            parts['sum'] = by_group(df['sum']).sum()
+            parts['m2'] = by_group(df['m2'] + shift).sum()
+        if self.minmax_cols:
+            parts['min'] = by_group(df['min']).min()
+            parts['max'] = by_group(df['max']).max()
+        return pd.concat(parts, axis=1)
+    
+    def _sample(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """保留每组随机键最小的 sample_size 行（bottom-k 抽样，可合并）"""
+        rank = frame.groupby(self.keys, sort=False)['__k__'].rank(method='first')
+        return frame[rank <= self.sample_size]
+    
+    def update(self, chunk: pd.DataFrame) -> None:
+        """累加一个分块"""
+        if not self.grouped:
+            chunk = chunk.assign(__all__=0)
+        self.rows += len(chunk)
+        self._pending.append(self._partial(chunk))
+        if self.quantile_cols:
+            frame = chunk[self.keys + self.quantile_cols].dropna(subset=self.keys)
+            frame = frame.assign(__k__=self.rng.random(len(frame)))
+            self._samples.append(self._sample(frame))
+        if len(self._pending) >= COMBINE_EVERY:
+            self._compact()
+    
+    def _compact(self) -> None:
+        self._pending = [self._combine(self._pending)] if self._pending else []
+        if self._samples:
+            self._samples = [self._sample(pd.concat(self._samples, ignore_index=True))]
+        used = sum(int(df.memory_usage(deep=True).sum()) for df in self._pending + self._samples)
+        if used > self.budget:
+            self._spill()
+    
+    # ---------- 溢写 ----------
+    
+    def _partition_of(self, keys: pd.DataFrame) -> np.ndarray:
+        # read_csv 按块推断类型：含 NaN 的块里整数键会变成 float64，
+        # 数值键统一按 float64 哈希，保证 1 与 1.0 落在同一分区
+        keys = keys.apply(lambda s: s.astype(np.float64)
+                          if pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s) else s)
+        hashes = pd.util.hash_pandas_object(keys, index=False).to_numpy()
+        return hashes % np.uint64(self.partitions)
+    
+    def _spill(self) -> None:
+        """把当前状态按分组键哈希分区写到磁盘并清空内存"""
+        if self.spill_dir is None:
+            if self.spill_root:
+                os.makedirs(self.spill_root, exist_ok=True)
+            self.spill_dir = tempfile.mkdtemp(prefix='pandas-skill-spill-', dir=self.spill_root)
+        if self._pending:
+            state = self._combine(self._pending)
+            part = self._partition_of(state.index.to_frame(index=False))
+            for p in np.unique(part):
+                state[part == p].to_pickle(os.path.join(self.spill_dir, f'state-{p:03d}-{self._spills:05d}.pkl'))
+        if self._samples:
+            sample = pd.concat(self._samples, ignore_index=True)
+            part = self._partition_of(sample[self.keys])
+            for p in np.unique(part):
+                sample[part == p].to_pickle(os.path.join(self.spill_dir, f'sample-{p:03d}-{self._spills:05d}.pkl'))
+        self._spills += 1
+        self._pending, self._samples = [], []
+    
+    # ---------- 结果 ----------
+    
+    def _finalize(self, state: pd.DataFrame, samples: Optional[pd.DataFrame]) -> pd.DataFrame:
+        out = {}
+        quantiles = {}
+        for col, funcs in self.agg.items():
+            for func in funcs:
+                q = _quantile_of(func)
+                if func == 'size':
+                    value = state[('size', '')]
+                elif func == 'count':
+                    value = state[('count', col)]
+                elif func == 'sum':
+                    value = state[('sum', col)]
+                elif func == 'mean':
+                    value = state[('sum', col)] / state[('count', col)].where(state[('count', col)] > 0)
+                elif func in ('var', 'std'):
+                    n = state[('count', col)]
+                    value = state[('m2', col)] / (n - 1).where(n > 1)
+                    if func == 'std':
+                        value = np.sqrt(value)
+                elif func in ('min', 'max'):
+                    value = state[(func, col)]
+                else:
+                    if (col, q) not in quantiles:
+                        quantiles[(col, q)] = (samples.groupby(self.keys)[col].quantile(q)
+                                               if samples is not None else pd.Series(dtype=float))
+                    value = quantiles[(col, q)].reindex(state.index)
+                out[(col, func)] = value
+        result = pd.DataFrame(out, index=state.index)
+        if not self.multi:
+            result.columns = [col for col, _ in result.columns]
+        return result
+    
+    def _load(self, kind: str, p: int) -> List[pd.DataFrame]:
+        files = sorted(Path(self.spill_dir).glob(f'{kind}-{p:03d}-*.pkl'))
+        return [pd.read_pickle(f) for f in files]
+    
+    def result(self) -> pd.DataFrame:
+        """合并所有部分状态并返回与 groupby(by).agg(agg) 形状一致的结果"""
+        try:
+            if self._pending and not self._spills:
+                self._compact()  # 可能在这里首次超出预算并溢写
+            if self._spills:
+                self._spill()
+                pieces = []
+                for p in range(self.partitions):
+                    states = self._load('state', p)
+                    if not states:
+                        continue
+                    samples = self._load('sample', p)
+                    pieces.append(self._finalize(self._combine(states),
+                                                 self._sample(pd.concat(samples)) if samples else None))
+                result = pd.concat(pieces)
+            elif self._pending:
+                samples = self._samples[0] if self._samples else None
+                result = self._finalize(self._pending[0], samples)
+            else:
+                result = self._finalize(self._partial(pd.DataFrame(columns=self.keys + list(self.agg))), None)
+        finally:
+            if self.spill_dir:
+                shutil.rmtree(self.spill_dir, ignore_errors=True)
+                self.spill_dir = None
+        
+        result = result.sort_index()
+        if self.grouped:
+            result.index.names = self.keys
+        else:
+            result = result.reset_index(drop=True)
+        return result
+
+
+def _optimize_dtypes(df: pd.DataFrame, categorical_max_ratio: float = CATEGORICAL_MAX_RATIO,
+                     lossy_floats: bool = False):
+    """
+    整数向下转型、浮点转 float32（默认仅在无精度损失时）、低基数字符串转 category
+    
+    Returns:
+        (pd.DataFrame, Dict): 优化后的数据框与内存报告
+    """
+    before = int(df.memory_usage(deep=True).sum())
+    out = df.copy(deep=False)
+    converted = {}
+    for i, col in enumerate(df.columns):
+        series = df.iloc[:, i]
+        dtype = series.dtype
+        if isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(dtype):
+            continue
+        if dtype.kind in 'iu':
+            new = pd.to_numeric(series, downcast='integer')
+        elif dtype.kind == 'f' and dtype.itemsize > 4:
+            new = series.astype(np.float32)
+            if not lossy_floats and not np.array_equal(new.to_numpy(np.float64), series.to_numpy(),
+                                                       equal_nan=True):
+                continue
+        elif dtype == object or pd.api.types.is_string_dtype(dtype):
+            if len(series) == 0:
+                continue
+            try:
+                ratio = series.nunique(dropna=True) / len(series)
+            except TypeError:  # 不可哈希的值（如 JSON 中的嵌套对象）
+                continue
+            if ratio > categorical_max_ratio:
+                continue
+            new = series.astype('category')
+        else:
+            continue
+        if new.dtype != dtype:
+            out.isetitem(i, new)
+            converted[str(col)] = f'{dtype}->{new.dtype}'
+    after = int(out.memory_usage(deep=True).sum())
+    report = {
+        'memory_before': before,
+        'memory_after': after,
+        'saved_bytes': before - after,
+        'saved_pct': round((before - after) / before * 100, 2) if before else 0.0,
+        'converted': converted,
+    }
+    return out, report
+
+
+def _has_callable(value: Any) -> bool:
+    """参数中是否含函数（如 converters 中的 lambda），其 repr 每次不同，无法作为缓存键"""
+    if isinstance(value, dict):
+        return any(_has_callable(v) for v in value.values())
+    if isinstance(value, (list, tuple, set)):
+        return any(_has_callable(v) for v in value)
+    return callable(value) and not isinstance(value, type)
+
+
+def _select_columns(df: pd.DataFrame, columns: Optional[List[str]]) -> pd.DataFrame:
+    if not columns:
+        return df
+    missing = [col for col in columns if col not in df.columns]
+    if missing:
+        raise ValueError(f"列不存在: {missing}")
+    return df[list(columns)]
+
+
+class DataFrameCache:
+    """
+    列式数据缓存（Feather / Parquet）
+    
+    缓存键 = 源文件内容 sha256 + 读取器 + 读取参数 + 缓存格式 + pandas 版本，
+    源文件或参数变化后自动失效，同一来源的旧版本在写入新版本时删除。
+    index.json 记录文件指纹 (size, mtime_ns) 对应的 sha256，未改动的文件不会重复计算哈希；
+    已删除或不再有缓存条目的源文件记录会被清理。
+    读取时使用内存映射，并且只物化请求的列。
+    """
+    
+    FORMATS = ('feather', 'parquet')
+    
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, fmt: str = DEFAULT_CACHE_FORMAT):
+        """
+        Args:
+            cache_dir: 缓存目录
+            fmt: 'feather'（未压缩，可零拷贝内存映射）或 'parquet'
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("列式缓存需要安装 pyarrow: pip install pyarrow")
+        if fmt not in self.FORMATS:
+            raise ValueError(f"不支持的缓存格式: {fmt}，可用: {', '.join(self.FORMATS)}")
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.format = fmt
+        self.index_path = self.cache_dir / 'index.json'
+    
+    # ---------- 索引 ----------
+    
+    def _read_index(self) -> Dict:
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            index = {}
+        index.setdefault('files', {})
+        index.setdefault('entries', {})
+        return index
+    
+    def _write_index(self, index: Dict) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_name(f'index.json.{os.getpid()}.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, self.index_path)
+    
+    def file_hash(self, filepath: str) -> str:
+        """源文件内容 sha256；(size, mtime_ns) 未变化时直接使用索引中的记录"""
+        path = os.path.abspath(filepath)
+        st = os.stat(path)
+        index = self._read_index()
+        # 源文件已删除的指纹记录不再有用
+        index['files'] = {p: v for p, v in index['files'].items() if p == path or os.path.exists(p)}
+        known = index['files'].get(path)
+        if known and known['size'] == st.st_size and known['mtime_ns'] == st.st_mtime_ns:
+            return known['sha256']
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+                digest.update(block)
+        index['files'][path] = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': digest.hexdigest()}
+        self._write_index(index)
+        return digest.hexdigest()
+    
+    def variant(self, reader: str, options: Dict) -> str:
+        """读取方式的摘要（读取器 + 参数 + 缓存格式 + pandas 版本）"""
+        spec = json.dumps({'reader': reader, 'options': options, 'format': self.format,
+                           'pandas': pd.__version__},
+                          sort_keys=True, default=repr)
+        return hashlib.sha256(spec.encode()).hexdigest()[:16]
+    
+    def key(self, filepath: str, reader: str, options: Dict) -> str:
+        """缓存键"""
+        return f'{self.file_hash(filepath)[:32]}-{self.variant(reader, options)}'
+    
+    def path_of(self, key: str) -> Path:
+        return self.cache_dir / f'{key}.{self.format}'
+    
+    def meta(self, key: str) -> Optional[Dict]:
+        """缓存条目的元数据（来源、行数、dtype 优化报告等）"""
+        return self._read_index()['entries'].get(key)
+    
+    # ---------- 读写 ----------
+    
+    def get(self, key: str, columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        """命中时返回数据框（内存映射读取，只物化 columns），未命中返回 None"""
+        path = self.path_of(key)
+        if not path.exists():
+            return None
+        try:
+            if self.format == 'parquet':
+                schema = pa_parquet.read_schema(path, memory_map=True)
+            else:
+                table = pa_feather.read_table(path, memory_map=True)
+                schema = table.schema
+            if columns:
+                missing = [col for col in columns if col not in schema.names]
+                if missing:
+                    raise ValueError(f"列不存在: {missing}")
+            if self.format == 'parquet':
+                table = pa_parquet.read_table(path, columns=columns, memory_map=True,
+                                              use_pandas_metadata=True)
+            elif columns:
+                index_cols = [c for c in (schema.pandas_metadata or {}).get('index_columns', [])
+                              if isinstance(c, str)]
+                table = table.select(list(columns) + index_cols)
+            return table.to_pandas()
+        except (pa.ArrowException, OSError):
+            # 缓存文件损坏：删除后按未命中处理
+            path.unlink(missing_ok=True)
+            return None
+    
+    def put(self, key: str, df: pd.DataFrame, meta: Optional[Dict] = None) -> bool:
+        """
+        写入缓存（先写临时文件再原子替换）
+        
+        Returns:
+            bool: 是否写入；列名非字符串/重复或含 Arrow 无法表示的值时跳过
+        """
+        if isinstance(df.columns, pd.MultiIndex) or df.columns.has_duplicates \
+                or not all(isinstance(col, str) for col in df.columns):
+            return False
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=None)
+        except (pa.ArrowException, TypeError, ValueError):
+            return False
+        
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.path_of(key)
+        tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        try:
+            if self.format == 'parquet':
+                pa_parquet.write_table(table, tmp)
+            else:
+                pa_feather.write_feather(table, tmp, compression='uncompressed')
+            os.replace(tmp, path)
+        except (pa.ArrowException, OSError):
+            return False
+        finally:
+            tmp.unlink(missing_ok=True)
+        
+        meta = dict(meta or {})
+        meta.update({'format': self.format, 'rows': len(df), 'bytes': path.stat().st_size,
+                     'created': datetime.now().isoformat()})
+        index = self._read_index()
+        # 同一来源、同一读取方式的旧版本已失效
+        variant = key.split('-', 1)[1]
+        source = meta.get('source')
+        for old_key, old in list(index['entries'].items()):
+            if old_key != key and old_key.endswith(variant) and old.get('source') == source:
+                (self.cache_dir / f"{old_key}.{old.get('format', self.format)}").unlink(missing_ok=True)
+                del index['entries'][old_key]
+        index['entries'][key] = meta
+        # 只保留仍有缓存条目的源文件指纹
+        sources = {entry.get('source') for entry in index['entries'].values()}
+        index['files'] = {p: v for p, v in index['files'].items() if p in sources and os.path.exists(p)}
+        self._write_index(index)
+        return True
+    
+    def clear(self) -> int:
+        """删除全部缓存，返回删除的条目数"""
+        count = len(self._read_index()['entries'])
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        return count
+    
+    def stats(self) -> Dict:
+        """缓存统计"""
+        entries = self._read_index()['entries']
+        return {
+            'cache_dir': str(self.cache_dir),
+            'format': self.format,
+            'entries': len(entries),
+            'bytes': sum(entry.get('bytes', 0) for entry in entries.values()),
+        }
+
 
 class PandasSkill:
     """
@@ -31,6 +565,7 @@ class PandasSkill:
     - 数据转换
     - 统计分析
     - 数据导出
+    - 列式缓存与dtype优化
     """
     
     def __init__(self, config_path: Optional[str] = None):
@@ -43,6 +578,7 @@ class PandasSkill:
         self.config = self._load_config(config_path)
         self._setup_display()
         self.history = []
+        self._cache: Optional[DataFrameCache] = None
         
     def _load_config(self, config_path: Optional[str]) -> Dict:
         """加载配置文件"""
@@ -81,12 +617,68 @@ class PandasSkill:
     
     # ==================== 数据加载 ====================
     
-    def load_csv(self, filepath: str, **kwargs) -> pd.DataFrame:
+    @property
+    def cache(self) -> Optional[DataFrameCache]:
+        """列式缓存（按配置 cache_dir / cache_format 创建，未安装 pyarrow 时为 None）"""
+        if self._cache is None and PYARROW_AVAILABLE:
+            self._cache = DataFrameCache(self.config.get('cache_dir', DEFAULT_CACHE_DIR),
+                                         self.config.get('cache_format', DEFAULT_CACHE_FORMAT))
+        return self._cache
+    
+    def _cached_load(self, reader: str, filepath: str, load: Callable[[], pd.DataFrame],
+                     options: Dict, columns: Optional[List[str]], use_cache: Optional[bool],
+                     optimize: Optional[bool], details: Optional[Dict] = None) -> pd.DataFrame:
+        """
+        经列式缓存加载：命中时内存映射读取所需列，未命中时解析源文件并写入缓存
+        
+        缓存保存完整数据框（optimize 时为优化后的dtype），列投影在读取时进行，
+        因此同一份缓存可服务不同的 columns。读取参数含函数时不缓存。
+        """
+        if use_cache is None:
+            use_cache = self.config.get('cache_enabled', False)
+        if optimize is None:
+            optimize = self.config.get('optimize_dtypes', False)
+        start = time.perf_counter()
+        cache = self.cache if use_cache else None
+        status = 'off' if cache is None else 'miss'
+        if cache is not None and _has_callable(options):
+            cache, status = None, 'skip'
+        report = None
+        df = None
+        
+        if cache is not None:
+            key = cache.key(filepath, reader, {**options, 'optimize': bool(optimize)})
+            df = cache.get(key, columns)
+            if df is not None:
+                status = 'hit'
+                report = (cache.meta(key) or {}).get('optimize')
+        if df is None:
+            df = load()
+            if optimize:
+                df, report = _optimize_dtypes(df)
+            if cache is not None and not cache.put(key, df, {'source': os.path.abspath(filepath),
+                                                             'reader': reader, 'optimize': report}):
+                status = 'skip'
+            df = _select_columns(df, columns)
+        
+        log = {'filepath': filepath, **(details or {}), 'rows': len(df), 'cache': status,
+               'seconds': round(time.perf_counter() - start, 4)}
+        if report:
+            log['memory_saved'] = report['saved_bytes']
+        self._log_operation(f'load_{reader}', log)
+        return df
+    
+    def load_csv(self, filepath: str, columns: Optional[List[str]] = None,
+                 use_cache: Optional[bool] = None, optimize: Optional[bool] = None,
+                 **kwargs) -> pd.DataFrame:
         """
         从CSV文件加载数据
         
         Args:
             filepath: CSV文件路径
+            columns: 只返回这些列（命中缓存时只物化这些列）
+            use_cache: 是否使用列式缓存，默认取配置 cache_enabled（默认关闭）
+            optimize: 是否压缩dtype（见 optimize_dtypes），默认取配置 optimize_dtypes
             **kwargs: 传递给pd.read_csv的额外参数
             
         Returns:
@@ -94,49 +686,75 @@ class PandasSkill:
         """
         encoding = kwargs.pop('encoding', self.config.get('default_encoding', 'utf-8'))
         try:
-            df = pd.read_csv(filepath, encoding=encoding, **kwargs)
-            self._log_operation('load_csv', {'filepath': filepath, 'rows': len(df)})
-            return df
+            return self._cached_load(
+                'csv', filepath, lambda: pd.read_csv(filepath, encoding=encoding, **kwargs),
+                {'encoding': encoding, **kwargs}, columns, use_cache, optimize)
         except Exception as e:
             raise ValueError(f"无法加载CSV文件 {filepath}: {e}")
     
-    def load_excel(self, filepath: str, sheet_name: Union[str, int] = 0, **kwargs) -> pd.DataFrame:
+    def load_excel(self, filepath: str, sheet_name: Union[str, int] = 0,
+                   columns: Optional[List[str]] = None, use_cache: Optional[bool] = None,
+                   optimize: Optional[bool] = None, **kwargs) -> pd.DataFrame:
         """
         从Excel文件加载数据
         
         Args:
             filepath: Excel文件路径
-            sheet_name: 工作表名称或索引
+            sheet_name: 工作表名称或索引（None/列表时返回字典，不经过缓存）
+            columns: 只返回这些列（命中缓存时只物化这些列）
+            use_cache: 是否使用列式缓存，默认取配置 cache_enabled（默认关闭）
+            optimize: 是否压缩dtype，默认取配置 optimize_dtypes
             **kwargs: 传递给pd.read_excel的额外参数
             
         Returns:
             pd.DataFrame: 加载的数据框
         """
         try:
-            df = pd.read_excel(filepath, sheet_name=sheet_name, **kwargs)
-            self._log_operation('load_excel', {'filepath': filepath, 'sheet': sheet_name, 'rows': len(df)})
-            return df
+            if not isinstance(sheet_name, (str, int)):
+                df = pd.read_excel(filepath, sheet_name=sheet_name, **kwargs)
+                self._log_operation('load_excel', {'filepath': filepath, 'sheet': sheet_name,
+                                                   'rows': {name: len(sheet) for name, sheet in df.items()}})
+                return df
+            return self._cached_load(
+                'excel', filepath, lambda: pd.read_excel(filepath, sheet_name=sheet_name, **kwargs),
+                {'sheet_name': sheet_name, **kwargs}, columns, use_cache, optimize,
+                details={'sheet': sheet_name})
         except Exception as e:
             raise ValueError(f"无法加载Excel文件 {filepath}: {e}")
     
-    def load_json(self, filepath: str, **kwargs) -> pd.DataFrame:
+    def load_json(self, filepath: str, columns: Optional[List[str]] = None,
+                  use_cache: Optional[bool] = None, optimize: Optional[bool] = None,
+                  **kwargs) -> pd.DataFrame:
         """
         从JSON文件加载数据
         
         Args:
             filepath: JSON文件路径
+            columns: 只返回这些列（命中缓存时只物化这些列）
+            use_cache: 是否使用列式缓存，默认取配置 cache_enabled（默认关闭）
+            optimize: 是否压缩dtype，默认取配置 optimize_dtypes
             **kwargs: 传递给pd.read_json的额外参数
             
         Returns:
             pd.DataFrame: 加载的数据框
         """
         try:
-            df = pd.read_json(filepath, **kwargs)
-            self._log_operation('load_json', {'filepath': filepath, 'rows': len(df)})
-            return df
+            return self._cached_load('json', filepath, lambda: pd.read_json(filepath, **kwargs),
+                                     kwargs, columns, use_cache, optimize)
         except Exception as e:
             raise ValueError(f"无法加载JSON文件 {filepath}: {e}")
     
+    def clear_cache(self) -> int:
+        """
+        清空列式缓存
+        
+        Returns:
+            int: 删除的缓存条目数
+        """
+        count = self.cache.clear() if self.cache is not None else 0
+        self._log_operation('clear_cache', {'entries': count})
+        return count
+    
     def load_sql(self, query: str, connection, **kwargs) -> pd.DataFrame:
         """
         从SQL数据库加载数据
@@ -479,8 +1097,185 @@ class PandasSkill:
         self._log_operation('value_counts', {'column': column})
         return result
     
+    # ==================== 分块（Out-of-core）模式 ====================
+    
+    def iter_chunks(self, source: Union[str, Iterable[pd.DataFrame]],
+                    chunksize: Optional[int] = None,
+                    usecols: Optional[List[str]] = None,
+                    engine: str = 'pandas', **kwargs) -> Iterator[pd.DataFrame]:
+        """
+        逐块读取CSV（或透传DataFrame迭代器），内存只保留单个分块
+        
+        Args:
+            source: CSV文件路径，或DataFrame的可迭代对象（如 read_sql 的分块结果）
+            chunksize: 每块行数，默认取配置 chunk_size
+            usecols: 只读取这些列
+            engine: 'pandas'（read_csv chunksize）或 'pyarrow'（流式 record batch）
+            **kwargs: 传递给pd.read_csv的额外参数
+            
+        Returns:
+            Iterator[pd.DataFrame]: 分块迭代器
+        """
+        if not isinstance(source, (str, Path)):
+            for chunk in source:
+                yield chunk[usecols] if usecols else chunk
+            return
+        
+        chunksize = chunksize or self.config.get('chunk_size', DEFAULT_CHUNK_SIZE)
+        if engine == 'pyarrow':
+            if not PYARROW_AVAILABLE:
+                raise ImportError("engine='pyarrow' 需要安装 pyarrow: pip install pyarrow")
+            # 空字段按缺失值处理，与 read_csv 的 NaN 语义一致
+            convert_options = pa_csv.ConvertOptions(strings_can_be_null=True)
+            if usecols:
+                convert_options.include_columns = usecols
+            reader = pa_csv.open_csv(
+                str(source),
+                read_options=pa_csv.ReadOptions(encoding=kwargs.get('encoding', 'utf8')),
+                convert_options=convert_options)
+            for batch in reader:
+                yield batch.to_pandas()
+            return
+        
+        encoding = kwargs.pop('encoding', self.config.get('default_encoding', 'utf-8'))
+        try:
+            reader = pd.read_csv(source, encoding=encoding, chunksize=chunksize, usecols=usecols, **kwargs)
+        except Exception as e:
+            raise ValueError(f"无法加载CSV文件 {source}: {e}")
+        with reader:
+            yield from reader
+    
+    def _run_chunked(self, aggregator: ChunkedAggregator, source, chunksize: Optional[int],
+                     engine: str, first: Optional[pd.DataFrame] = None,
+                     chunks: Optional[Iterator[pd.DataFrame]] = None, **kwargs) -> pd.DataFrame:
+        if chunks is None:
+            chunks = self.iter_chunks(source, chunksize, aggregator.columns if aggregator.grouped else None,
+                                      engine, **kwargs)
+        if first is not None:
+            aggregator.update(first)
+        for chunk in chunks:
+            aggregator.update(chunk)
+        return aggregator.result()
+    
+    def group_and_aggregate_chunked(self, source: Union[str, Iterable[pd.DataFrame]],
+                                    by: Union[str, List[str]],
+                                    agg: Dict[str, Union[str, List[str]]],
+                                    chunksize: Optional[int] = None,
+                                    memory_budget_mb: Optional[float] = None,
+                                    spill_dir: Optional[str] = None,
+                                    engine: str = 'pandas', **kwargs) -> pd.DataFrame:
+        """
+        分块分组聚合，适用于超出内存的CSV
+        
+        Args:
+            source: CSV文件路径或DataFrame分块迭代器
+            by: 分组列
+            agg: 聚合规则字典，支持 sum/count/mean/var/std/min/max/size/median/q<NN>
+            chunksize: 每块行数
+            memory_budget_mb: 分组中间状态内存预算，超出后溢写磁盘
+            spill_dir: 溢写目录（默认系统临时目录，结束后删除溢写文件）
+            engine: 'pandas' 或 'pyarrow'
+            **kwargs: 传递给pd.read_csv的额外参数
+            
+        Returns:
+            pd.DataFrame: 聚合结果（与 group_and_aggregate 结构一致，分位数为近似值）
+        """
+        budget = memory_budget_mb or self.config.get('memory_budget_mb', DEFAULT_MEMORY_BUDGET_MB)
+        aggregator = ChunkedAggregator(by, agg, memory_budget_mb=budget, spill_dir=spill_dir)
+        result = self._run_chunked(aggregator, source, chunksize, engine, **kwargs)
+        self._log_operation('group_and_aggregate_chunked', {
+            'by': by, 'agg': agg, 'rows': aggregator.rows, 'groups': len(result),
+            'spills': aggregator._spills})
+        return result
+    
+    def value_counts_chunked(self, source: Union[str, Iterable[pd.DataFrame]], column: str,
+                             normalize: bool = False, chunksize: Optional[int] = None,
+                             memory_budget_mb: Optional[float] = None,
+                             engine: str = 'pandas', **kwargs) -> pd.Series:
+        """
+        分块统计唯一值出现次数
+        
+        Args:
+            source: CSV文件路径或DataFrame分块迭代器
+            column: 列名
+            normalize: 是否返回比例
+            chunksize: 每块行数
+            memory_budget_mb: 中间状态内存预算
+            engine: 'pandas' 或 'pyarrow'
+            
+        Returns:
+            pd.Series: 计数结果（降序）
+        """
+        budget = memory_budget_mb or self.config.get('memory_budget_mb', DEFAULT_MEMORY_BUDGET_MB)
+        aggregator = ChunkedAggregator(column, {column: 'size'}, memory_budget_mb=budget)
+        counts = self._run_chunked(aggregator, source, chunksize, engine, **kwargs)[column]
+        counts = counts.sort_values(ascending=False, kind='stable')
+        counts.name = 'proportion' if normalize else 'count'
+        if normalize:
+            counts = counts / counts.sum()
+        self._log_operation('value_counts_chunked', {'column': column, 'rows': aggregator.rows})
+        return counts
+    
+    def describe_chunked(self, source: Union[str, Iterable[pd.DataFrame]],
+                         columns: Optional[List[str]] = None,
+                         chunksize: Optional[int] = None,
+                         engine: str = 'pandas', **kwargs) -> pd.DataFrame:
+        """
+        分块计算数值列的描述性统计（分位数为近似值）
+        
+        Args:
+            source: CSV文件路径或DataFrame分块迭代器
+            columns: 要统计的数值列，默认为首个分块中的全部数值列
+            chunksize: 每块行数
+            engine: 'pandas' 或 'pyarrow'
+            
+        Returns:
+            pd.DataFrame: 与 describe() 相同布局的统计摘要
+        """
+        chunks = self.iter_chunks(source, chunksize, columns, engine, **kwargs)
+        first = next(chunks, None)
+        if first is None:
+            return pd.DataFrame()
+        columns = columns or list(first.select_dtypes(include=[np.number]).columns)
+        labels = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+        if first.empty or not columns:
+            # 仅有表头或没有数值列：返回与 describe() 同布局的空统计（count 为 0）
+            empty = pd.DataFrame(np.nan, index=labels, columns=columns, dtype=float)
+            empty.loc['count'] = 0.0
+            self._log_operation('describe_chunked', {'columns': len(columns), 'rows': 0})
+            return empty
+        stats = ['count', 'mean', 'std', 'min', 'q25', 'q50', 'q75', 'max']
+        aggregator = ChunkedAggregator(None, {col: stats for col in columns})
+        result = self._run_chunked(aggregator, source, chunksize, engine, first=first[columns],
+                                   chunks=(chunk[columns] for chunk in chunks))
+        result = result.iloc[0].unstack(0).reindex(index=stats, columns=columns)
+        result.index = labels
+        self._log_operation('describe_chunked', {'columns': len(columns), 'rows': aggregator.rows})
+        return result.astype(float)
+    
     # ==================== 工具方法 ====================
     
+    def optimize_dtypes(self, df: pd.DataFrame, categorical_max_ratio: float = CATEGORICAL_MAX_RATIO,
+                        lossy_floats: bool = False) -> pd.DataFrame:
+        """
+        压缩数据框内存占用
+        
+        整数向下转型为最小的有符号类型；float64 仅在转为 float32 无精度损失时转换
+        （lossy_floats=True 时总是转换）；唯一值占比不超过 categorical_max_ratio 的
+        字符串列转为 category。节省的内存记录在操作历史的 saved_bytes / saved_pct 中。
+        
+        Args:
+            df: 输入数据框
+            categorical_max_ratio: 字符串列转 category 的最大唯一值占比
+            lossy_floats: 是否允许有精度损失的 float32 转换
+            
+        Returns:
+            pd.DataFrame: dtype 优化后的数据框
+        """
+        result, report = _optimize_dtypes(df, categorical_max_ratio, lossy_floats)
+        self._log_operation('optimize_dtypes', report)
+        return result
+    
     def get_info(self, df: pd.DataFrame) -> Dict:
         """
         获取数据框信息
@@ -12,7 +12,7 @@ import tempfile
 import shutil
 from pathlib import Path
 
-from main import PandasSkill, quick_load, quick_save
+from main import PYARROW_AVAILABLE, ChunkedAggregator, PandasSkill, quick_load, quick_save
 
 
 class TestPandasSkill(unittest.TestCase):
@@ -285,6 +285,240 @@ class TestEdgeCases(unittest.TestCase):
         self.assertTrue(corr.empty)
 
 
+class TestChunkedMode(unittest.TestCase):
+    """分块（Out-of-core）模式测试"""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.skill = PandasSkill()
+        cls.test_dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(0)
+        n = 5000
+        cls.df = pd.DataFrame({
+            'g': rng.integers(0, 200, n),
+            'h': rng.choice(['a', 'b', 'c'], n),
+            'x': rng.normal(10, 3, n),
+            'y': rng.integers(0, 100, n),
+        })
+        cls.df.loc[rng.choice(n, 100, replace=False), 'x'] = np.nan
+        cls.csv_path = os.path.join(cls.test_dir, 'big.csv')
+        cls.df.to_csv(cls.csv_path, index=False)
+    
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.test_dir, ignore_errors=True)
+    
+    def _assert_matches_pandas(self, result):
+        agg = {'x': ['sum', 'count', 'mean', 'var', 'std', 'min', 'max']}
+        expected = self.df.groupby(['g', 'h']).agg(agg)
+        self.assertTrue(result.index.equals(expected.index))
+        for stat in agg['x']:
+            np.testing.assert_allclose(result[('x', stat)].to_numpy(float),
+                                       expected[('x', stat)].to_numpy(float), rtol=1e-9)
+    
+    def test_group_and_aggregate_chunked(self):
+        """测试分块分组聚合与内存结果一致"""
+        result = self.skill.group_and_aggregate_chunked(
+            self.csv_path, ['g', 'h'],
+            {'x': ['sum', 'count', 'mean', 'var', 'std', 'min', 'max']}, chunksize=700)
+        self._assert_matches_pandas(result)
+        self.assertEqual(self.skill.history[-1]['details']['spills'], 0)
+    
+    def test_group_and_aggregate_spill(self):
+        """测试超出内存预算时溢写磁盘且结果不变"""
+        spill_root = os.path.join(self.test_dir, 'spill')
+        result = self.skill.group_and_aggregate_chunked(
+            self.csv_path, ['g', 'h'],
+            {'x': ['sum', 'count', 'mean', 'var', 'std', 'min', 'max']},
+            chunksize=700, memory_budget_mb=0.001, spill_dir=spill_root)
+        self._assert_matches_pandas(result)
+        self.assertGreater(self.skill.history[-1]['details']['spills'], 0)
+        self.assertEqual(os.listdir(spill_root), [])
+
+    def test_spill_with_key_dtype_drift(self):
+        """测试分组键在不同分块中被推断为 int64 / float64 时溢写结果不重复"""
+        path = os.path.join(self.test_dir, 'drift.csv')
+        # 前 8 块（一次合并后溢写）为 int64；最后一块含 NaN 键，被推断为 float64
+        keys = list(range(50)) * 8 + list(range(49)) + [np.nan]
+        pd.DataFrame({'k': pd.array(keys, dtype='Int64'), 'v': 1.0}).to_csv(path, index=False)
+        result = self.skill.group_and_aggregate_chunked(path, 'k', {'v': 'sum'}, chunksize=50,
+                                                        memory_budget_mb=0.0001)
+        self.assertGreater(self.skill.history[-1]['details']['spills'], 0)
+        self.assertEqual(len(result), 50)
+        self.assertEqual(result['v'].sum(), 449)
+
+    def test_approximate_median(self):
+        """测试样本不超过上限时中位数精确"""
+        result = self.skill.group_and_aggregate_chunked(self.csv_path, 'h', {'y': 'median'}, chunksize=1000)
+        expected = self.df.groupby('h')['y'].median()
+        np.testing.assert_allclose(result['y'].to_numpy(float), expected.to_numpy(float))
+    
+    def test_value_counts_chunked(self):
+        """测试分块唯一值计数"""
+        result = self.skill.value_counts_chunked(self.csv_path, 'h', chunksize=600)
+        expected = self.df['h'].value_counts()
+        self.assertDictEqual(result.to_dict(), expected.to_dict())
+        proportions = self.skill.value_counts_chunked(self.csv_path, 'h', normalize=True)
+        self.assertAlmostEqual(proportions.sum(), 1.0)
+    
+    def test_describe_chunked(self):
+        """测试分块描述统计"""
+        result = self.skill.describe_chunked(self.csv_path, columns=['x', 'y'], chunksize=800)
+        expected = self.df[['x', 'y']].describe()
+        self.assertListEqual(list(result.index), list(expected.index))
+        for row in ['count', 'mean', 'std', 'min', 'max']:
+            np.testing.assert_allclose(result.loc[row].to_numpy(float), expected.loc[row].to_numpy(float))
+    
+    def test_describe_chunked_without_numeric_rows(self):
+        """测试无数值列或仅有表头时返回空统计"""
+        text_path = os.path.join(self.test_dir, 'text.csv')
+        pd.DataFrame({'a': ['x', 'y'], 'b': ['z', 'w']}).to_csv(text_path, index=False)
+        result = self.skill.describe_chunked(text_path, chunksize=1)
+        self.assertEqual(result.shape, (8, 0))
+        self.assertEqual(list(result.index)[4:7], ['25%', '50%', '75%'])
+
+        header_path = os.path.join(self.test_dir, 'header.csv')
+        with open(header_path, 'w') as f:
+            f.write('x,y\n')
+        result = self.skill.describe_chunked(header_path, columns=['x'], chunksize=1)
+        self.assertEqual(result.loc['count', 'x'], 0)
+        self.assertTrue(result.loc['mean':, 'x'].isna().all())
+
+    def test_dataframe_iterator_source(self):
+        """测试DataFrame迭代器作为数据源"""
+        chunks = (self.df.iloc[i:i + 1000] for i in range(0, len(self.df), 1000))
+        result = self.skill.group_and_aggregate_chunked(chunks, 'h', {'x': 'sum'})
+        expected = self.df.groupby('h').agg({'x': 'sum'})
+        np.testing.assert_allclose(result['x'].to_numpy(float), expected['x'].to_numpy(float))
+    
+    def test_unsupported_stat(self):
+        """测试不支持的聚合函数"""
+        with self.assertRaises(ValueError):
+            ChunkedAggregator('h', {'x': 'nunique'})
+
+
+@unittest.skipUnless(PYARROW_AVAILABLE, "需要 pyarrow")
+class TestColumnarCache(unittest.TestCase):
+    """列式缓存与dtype优化测试"""
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.skill = PandasSkill()
+        self.skill.config.update(cache_enabled=True, cache_dir=os.path.join(self.test_dir, 'cache'))
+        n = 1000
+        self.df = pd.DataFrame({
+            'id': np.arange(n),
+            'city': np.array(['Beijing', 'Shanghai', 'Shenzhen', 'Hangzhou'])[np.arange(n) % 4],
+            'score': np.arange(n) * 0.37,
+            'level': (np.arange(n) % 5).astype(float),
+        })
+        self.csv_path = os.path.join(self.test_dir, 'data.csv')
+        self.df.to_csv(self.csv_path, index=False)
+    
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+    
+    def _last_cache_status(self):
+        return self.skill.history[-1]['details']['cache']
+    
+    def test_miss_then_hit(self):
+        """测试首次加载写入缓存，再次加载命中且数据一致"""
+        first = self.skill.load_csv(self.csv_path)
+        self.assertEqual(self._last_cache_status(), 'miss')
+        second = self.skill.load_csv(self.csv_path)
+        self.assertEqual(self._last_cache_status(), 'hit')
+        pd.testing.assert_frame_equal(first, second)
+        self.assertEqual(self.skill.cache.stats()['entries'], 1)
+    
+    def test_column_projection(self):
+        """测试命中缓存时的列投影"""
+        self.skill.load_csv(self.csv_path)
+        df = self.skill.load_csv(self.csv_path, columns=['score', 'id'])
+        self.assertEqual(self._last_cache_status(), 'hit')
+        self.assertListEqual(list(df.columns), ['score', 'id'])
+        with self.assertRaises(ValueError):
+            self.skill.load_csv(self.csv_path, columns=['missing'])
+    
+    def test_invalidated_by_source_change(self):
+        """测试源文件变化后缓存失效且旧版本被清理"""
+        self.skill.load_csv(self.csv_path)
+        self.df.iloc[:10].to_csv(self.csv_path, index=False)
+        df = self.skill.load_csv(self.csv_path)
+        self.assertEqual(self._last_cache_status(), 'miss')
+        self.assertEqual(len(df), 10)
+        self.assertEqual(self.skill.cache.stats()['entries'], 1)
+    
+    def test_read_options_in_key(self):
+        """测试读取参数不同时使用不同的缓存条目"""
+        self.skill.load_csv(self.csv_path)
+        df = self.skill.load_csv(self.csv_path, nrows=5)
+        self.assertEqual(self._last_cache_status(), 'miss')
+        self.assertEqual(len(df), 5)
+    
+    def test_disabled_by_default(self):
+        """测试默认配置不启用缓存"""
+        skill = PandasSkill()
+        skill.config['cache_dir'] = os.path.join(self.test_dir, 'default-cache')
+        skill.load_csv(self.csv_path)
+        self.assertEqual(skill.history[-1]['details']['cache'], 'off')
+        self.assertFalse(os.path.exists(skill.config['cache_dir']))
+    
+    def test_callable_options_skip_cache(self):
+        """测试读取参数含函数时跳过缓存，不产生新文件"""
+        for _ in range(3):
+            df = self.skill.load_csv(self.csv_path, converters={'city': lambda v: v.lower()})
+            self.assertEqual(self._last_cache_status(), 'skip')
+        self.assertEqual(df['city'].iloc[0], 'beijing')
+        self.assertEqual(self.skill.cache.stats()['entries'], 0)
+        self.skill.load_csv(self.csv_path, dtype={'city': str})
+        self.skill.load_csv(self.csv_path, dtype={'city': str})
+        self.assertEqual(self._last_cache_status(), 'hit')
+    
+    def test_stale_file_records_pruned(self):
+        """测试已删除源文件的指纹记录被清理"""
+        other = os.path.join(self.test_dir, 'other.csv')
+        self.df.to_csv(other, index=False)
+        self.skill.load_csv(other)
+        os.remove(other)
+        self.skill.load_csv(self.csv_path)
+        files = self.skill.cache._read_index()['files']
+        self.assertListEqual(list(files), [os.path.abspath(self.csv_path)])
+    
+    def test_use_cache_disabled(self):
+        """测试关闭缓存"""
+        self.skill.load_csv(self.csv_path, use_cache=False)
+        self.assertEqual(self._last_cache_status(), 'off')
+        self.assertFalse(os.path.exists(self.skill.config['cache_dir']))
+    
+    def test_optimize_dtypes(self):
+        """测试dtype优化及内存报告"""
+        df = self.skill.optimize_dtypes(self.df)
+        report = self.skill.history[-1]['details']
+        self.assertEqual(df['id'].dtype, np.int16)
+        self.assertIsInstance(df['city'].dtype, pd.CategoricalDtype)
+        self.assertEqual(df['level'].dtype, np.float32)
+        self.assertEqual(df['score'].dtype, np.float64)  # 转 float32 会损失精度
+        self.assertGreater(report['saved_bytes'], 0)
+        pd.testing.assert_frame_equal(df.astype(self.df.dtypes.to_dict()), self.df)
+    
+    def test_optimized_load_cached(self):
+        """测试优化后的dtype随缓存保存，命中时仍报告节省的内存"""
+        self.skill.load_csv(self.csv_path, optimize=True)
+        df = self.skill.load_csv(self.csv_path, optimize=True)
+        details = self.skill.history[-1]['details']
+        self.assertEqual(details['cache'], 'hit')
+        self.assertGreater(details['memory_saved'], 0)
+        self.assertIsInstance(df['city'].dtype, pd.CategoricalDtype)
+        self.assertEqual(df['id'].dtype, np.int16)
+    
+    def test_clear_cache(self):
+        """测试清空缓存"""
+        self.skill.load_csv(self.csv_path)
+        self.assertEqual(self.skill.clear_cache(), 1)
+        self.skill.load_csv(self.csv_path)
+        self.assertEqual(self._last_cache_status(), 'miss')
+
+
 def run_tests():
     """运行所有测试"""
     loader = unittest.TestLoader()
@@ -292,6 +526,8 @@ def run_tests():
     
     suite.addTests(loader.loadTestsFromTestCase(TestPandasSkill))
     suite.addTests(loader.loadTestsFromTestCase(TestEdgeCases))
+    suite.addTests(loader.loadTestsFromTestCase(TestChunkedMode))
+    suite.addTests(loader.loadTestsFromTestCase(TestColumnarCache))
     
     runner = unittest.TextTestRunner(verbosity=2)
     result = runner.run(suite)
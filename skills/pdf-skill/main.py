@@ -13,9 +13,13 @@ Version: 1.0.0
 
 import os
 import argparse
+import hashlib
 import json
+import sqlite3
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Tuple, Optional, Union, Dict, Any
+from typing import List, Tuple, Optional, Union, Dict, Any, Iterator, Callable
 
 # Import PDF libraries with graceful fallback
 try:
@@ -39,6 +43,119 @@ except ImportError:
     PYMUPDF_AVAILABLE = False
 
 
+# Page-parallel engine settings
+PARALLEL_MIN_PAGES = 32      # below this, extract_text stays in-process
+MAX_SHARD_PAGES = 50         # pages per worker task (bounds per-task memory and result size)
+SHARDS_PER_WORKER = 4        # aim for this many shards per worker for load balancing
+MAX_RENDER_WORKERS = 4       # rendered pixmaps are large; cap concurrent renders
+
+# Text cache / full-text index settings
+DEFAULT_INDEX_PATH = os.path.join(os.path.expanduser("~"), ".cache", "pdf-skill", "index.db")
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def _page_count(file_path: str, password: Optional[str] = None) -> int:
+    """Number of pages, opening the document only long enough to read it."""
+    if PDFPLUMBER_AVAILABLE:
+        with pdfplumber.open(file_path, password=password) as pdf:
+            return len(pdf.pages)
+    reader = PdfReader(file_path)
+    if reader.is_encrypted and password:
+        reader.decrypt(password)
+    return len(reader.pages)
+
+
+def _extract_page_texts(file_path: str, page_numbers: List[int],
+                        password: Optional[str] = None) -> List[Tuple[int, str]]:
+    """
+    Worker task: open the document independently and extract the given pages.
+    
+    Page caches are flushed after each page so memory stays bounded per page.
+    
+    Returns:
+        List of (page_number, text) pairs; text is '' for pages without text
+    """
+    results = []
+    if PDFPLUMBER_AVAILABLE:
+        with pdfplumber.open(file_path, password=password) as pdf:
+            total = len(pdf.pages)
+            for num in page_numbers:
+                if 1 <= num <= total:
+                    page = pdf.pages[num - 1]
+                    results.append((num, page.extract_text() or ""))
+                    # pdfplumber keeps parsed layout objects on the page
+                    if hasattr(page, "close"):
+                        page.close()
+                    elif hasattr(page, "flush_cache"):
+                        page.flush_cache()
+    else:
+        reader = PdfReader(file_path)
+        if reader.is_encrypted and password:
+            reader.decrypt(password)
+        total = len(reader.pages)
+        for num in page_numbers:
+            if 1 <= num <= total:
+                results.append((num, reader.pages[num - 1].extract_text() or ""))
+    return results
+
+
+def _render_pages(file_path: str, page_numbers: List[int], output_dir: str,
+                  dpi: int, fmt: str, password: Optional[str] = None) -> List[str]:
+    """Worker task: render the given pages with PyMuPDF, one pixmap alive at a time."""
+    doc = fitz.open(file_path)
+    if doc.needs_pass and password:
+        doc.authenticate(password)
+    base_name = Path(file_path).stem
+    zoom = dpi / 72  # 72 is the default PDF DPI
+    mat = fitz.Matrix(zoom, zoom)
+    output_files = []
+    try:
+        for num in page_numbers:
+            if 1 <= num <= len(doc):
+                pix = doc.load_page(num - 1).get_pixmap(matrix=mat)
+                out_path = os.path.join(output_dir, f"{base_name}_page_{num}.{fmt}")
+                pix.save(out_path)
+                pix = None
+                output_files.append(out_path)
+    finally:
+        doc.close()
+    return output_files
+
+
+def _shard(page_numbers: List[int], workers: int) -> List[List[int]]:
+    """Split pages into contiguous shards, several per worker."""
+    size = -(-len(page_numbers) // (workers * SHARDS_PER_WORKER)) if page_numbers else 1
+    size = max(1, min(size, MAX_SHARD_PAGES))
+    return [page_numbers[i:i + size] for i in range(0, len(page_numbers), size)]
+
+
+def _run_sharded(task: Callable, shards: List[List[int]], args: tuple, workers: int) -> Iterator[Any]:
+    """
+    Run task(file_path, shard, *rest) over shards in a process pool.
+    
+    Results are yielded in shard order; at most 2 * workers shards are in
+    flight, so out-of-order results never pile up.
+    """
+    file_path, *rest = args
+    if workers <= 1 or len(shards) <= 1:
+        for shard in shards:
+            yield task(file_path, shard, *rest)
+        return
+    with ProcessPoolExecutor(max_workers=min(workers, len(shards))) as pool:
+        pending = deque()
+        shard_iter = iter(shards)
+        for shard in shard_iter:
+            pending.append(pool.submit(task, file_path, shard, *rest))
+            if len(pending) >= workers * 2:
+                break
+        while pending:
+            result = pending.popleft().result()
+            shard = next(shard_iter, None)
+            if shard is not None:
+                pending.append(pool.submit(task, file_path, shard, *rest))
+            yield result
+
+
 class PDFProcessor:
     """
     A comprehensive PDF processing class that handles various PDF operations.
@@ -52,16 +169,20 @@ class PDFProcessor:
     - Retrieving PDF metadata
     """
     
-    def __init__(self, password: Optional[str] = None, verbose: bool = False):
+    def __init__(self, password: Optional[str] = None, verbose: bool = False,
+                 cache_path: Optional[str] = None):
         """
         Initialize the PDFProcessor.
         
         Args:
             password: Password for encrypted PDF documents
             verbose: Enable verbose logging
+            cache_path: Optional PDFTextIndex database; extract_text reuses cached page text
         """
         self.password = password
         self.verbose = verbose
+        self.cache_path = cache_path
+        self._text_index = None
         if not PYPDF2_AVAILABLE and not PDFPLUMBER_AVAILABLE:
             raise ImportError("At least one PDF library is required. "
                             "Please install: pip install PyPDF2 pdfplumber")
@@ -103,38 +224,110 @@ class PDFProcessor:
                     raise ValueError("PDF encrypted. Provide password.")
             return reader
     
-    def extract_text(self, file_path: str, page_numbers: Optional[List[int]] = None) -> str:
+    @property
+    def text_index(self) -> Optional["PDFTextIndex"]:
+        """The PDFTextIndex behind cache_path, opened on first use."""
+        if self._text_index is None and self.cache_path:
+            self._text_index = PDFTextIndex(self.cache_path)
+        return self._text_index
+    
+    def _page_list(self, file_path: str, page_numbers: Optional[List[int]]) -> List[int]:
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"PDF not found: {file_path}")
+        total = _page_count(file_path, self.password)
+        pages = page_numbers or range(1, total + 1)
+        return [num for num in pages if 1 <= num <= total]
+    
+    def iter_page_text(self, file_path: str, page_numbers: Optional[List[int]] = None,
+                       workers: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+        """
+        Yield (page_number, text) in page order, sharding pages across processes.
+        
+        Each worker opens the document independently; only the shards in
+        flight are held in memory.
+        
+        Args:
+            file_path: Path to the PDF file
+            page_numbers: Optional list of page numbers to extract (1-indexed)
+            workers: Worker processes (CPU count if None, 1 = in-process)
+        """
+        pages = self._page_list(file_path, page_numbers)
+        workers = workers or os.cpu_count() or 1
+        self._log(f"Extracting {len(pages)} pages with {workers} worker(s): {file_path}")
+        for results in _run_sharded(_extract_page_texts, _shard(pages, workers),
+                                    (file_path, self.password), workers):
+            yield from results
+    
+    def _extract_workers(self, file_path: str, page_numbers: Optional[List[int]] = None,
+                         workers: Optional[int] = None) -> Optional[int]:
+        """Explicit workers as given; otherwise in-process below PARALLEL_MIN_PAGES pages."""
+        if workers is not None:
+            return workers
+        pages = len(page_numbers) if page_numbers else _page_count(file_path, self.password)
+        return 1 if pages < PARALLEL_MIN_PAGES else None
+    
+    def extract_text(self, file_path: str, page_numbers: Optional[List[int]] = None,
+                     workers: Optional[int] = None) -> str:
         """
         Extract text from a PDF file.
         
         Args:
             file_path: Path to the PDF file
             page_numbers: Optional list of page numbers to extract (1-indexed)
+            workers: Worker processes; small documents (< PARALLEL_MIN_PAGES) run in-process
             
         Returns:
             Extracted text as string
         """
         self._log(f"Extracting: {file_path}")
-        text_parts = []
-        
-        if PDFPLUMBER_AVAILABLE:
-            with pdfplumber.open(file_path) as pdf:
-                pages = page_numbers or range(1, len(pdf.pages) + 1)
-                for num in pages:
-                    if 1 <= num <= len(pdf.pages):
-                        txt = pdf.pages[num - 1].extract_text()
-                        if txt:
-                            text_parts.append(f"--- Page {num} ---\n{txt}")
-        else:
-            reader = PdfReader(file_path)
-            pages = page_numbers or range(1, len(reader.pages) + 1)
-            for num in pages:
-                if 1 <= num <= len(reader.pages):
-                    txt = reader.pages[num - 1].extract_text()
-                    if txt:
-                        text_parts.append(f"--- Page {num} ---\n{txt}")
+        if self.text_index is not None:
+            pages = self.text_index.page_texts(file_path, self, workers)
+            if page_numbers:
+                pages = [(num, pages[num - 1]) for num in page_numbers if 1 <= num <= len(pages)]
+            else:
+                pages = list(enumerate(pages, 1))
+            return "\n\n".join(f"--- Page {num} ---\n{txt}" for num, txt in pages if txt)
+        workers = self._extract_workers(file_path, page_numbers, workers)
+        text_parts = [f"--- Page {num} ---\n{txt}"
+                      for num, txt in self.iter_page_text(file_path, page_numbers, workers) if txt]
         return "\n\n".join(text_parts)
     
+    def extract_text_stream(self, file_path: str, output_path: Optional[str] = None,
+                            callback: Optional[Callable[[int, str], None]] = None,
+                            page_numbers: Optional[List[int]] = None,
+                            workers: Optional[int] = None) -> int:
+        """
+        Extract text page by page to an NDJSON file and/or a callback.
+        
+        Each NDJSON line is {"page": n, "text": "..."}; nothing is joined in memory.
+        
+        Args:
+            file_path: Path to the PDF file
+            output_path: Optional NDJSON output path
+            callback: Optional callback(page_number, text) per page
+            page_numbers: Optional list of page numbers (1-indexed)
+            workers: Worker processes (CPU count if None)
+            
+        Returns:
+            Number of pages processed
+        """
+        out = None
+        if output_path:
+            os.makedirs(os.path.dirname(os.path.abspath(output_path)) or '.', exist_ok=True)
+            out = open(output_path, 'w', encoding='utf-8')
+        count = 0
+        try:
+            for num, txt in self.iter_page_text(file_path, page_numbers, workers):
+                if out:
+                    out.write(json.dumps({"page": num, "text": txt}, ensure_ascii=False) + "\n")
+                if callback:
+                    callback(num, txt)
+                count += 1
+        finally:
+            if out:
+                out.close()
+        return count
+    
     def merge_pdfs(self, input_dir: str, output_path: str, sort_by: str = "filename") -> str:
         """
         Merge multiple PDF files into one.
@@ -254,7 +447,8 @@ class PDFProcessor:
         self._log(f"Saved: {output_path}")
         return output_path
     
-    def pdf_to_images(self, file_path: str, output_dir: str, dpi: int = 200, fmt: str = "png") -> List[str]:
+    def pdf_to_images(self, file_path: str, output_dir: str, dpi: int = 200, fmt: str = "png",
+                      workers: Optional[int] = None) -> List[str]:
         """
         Convert PDF pages to images.
         
@@ -263,6 +457,7 @@ class PDFProcessor:
             output_dir: Directory for output images
             dpi: Resolution in dots per inch
             fmt: Image format (png, jpg, jpeg, tiff)
+            workers: Concurrent render processes (default min(CPU count, MAX_RENDER_WORKERS))
             
         Returns:
             List of output image paths
@@ -272,21 +467,16 @@ class PDFProcessor:
             raise ImportError("Install pymupdf for image conversion: pip install pymupdf")
         
         os.makedirs(output_dir, exist_ok=True)
-        doc = fitz.open(file_path)
-        base_name = Path(file_path).stem
-        output_files = []
+        with fitz.open(file_path) as doc:
+            pages = list(range(1, len(doc) + 1))
+        workers = workers or min(os.cpu_count() or 1, MAX_RENDER_WORKERS)
         
-        for i in range(len(doc)):
-            page = doc.load_page(i)
-            zoom = dpi / 72  # 72 is the default PDF DPI
-            mat = fitz.Matrix(zoom, zoom)
-            pix = page.get_pixmap(matrix=mat)
-            out_name = f"{base_name}_page_{i + 1}.{fmt}"
-            out_path = os.path.join(output_dir, out_name)
-            pix.save(out_path)
-            output_files.append(out_path)
-            self._log(f"Created: {out_name}")
-        doc.close()
+        output_files = []
+        for paths in _run_sharded(_render_pages, _shard(pages, workers),
+                                  (file_path, output_dir, dpi, fmt, self.password), workers):
+            for path in paths:
+                self._log(f"Created: {os.path.basename(path)}")
+            output_files.extend(paths)
         return output_files
     
     def get_info(self, file_path: str) -> Dict[str, Any]:
@@ -310,7 +500,8 @@ class PDFProcessor:
             "metadata": {k: str(v) for k, v in info.items()} if info else {}
         }
     
-    def save_text(self, file_path: str, output_path: str, page_numbers: Optional[List[int]] = None) -> str:
+    def save_text(self, file_path: str, output_path: str, page_numbers: Optional[List[int]] = None,
+                  workers: Optional[int] = None) -> str:
         """
         Extract text and save to file.
         
@@ -318,17 +509,214 @@ class PDFProcessor:
             file_path: Path to the PDF file
             output_path: Path for the output text file
             page_numbers: Optional list of page numbers
+            workers: Worker processes for extraction
             
         Returns:
             Path to the output file
         """
-        text = self.extract_text(file_path, page_numbers)
+        text = self.extract_text(file_path, page_numbers, workers)
         os.makedirs(os.path.dirname(os.path.abspath(output_path)) or '.', exist_ok=True)
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(text)
         return output_path
 
 
+class PDFTextIndex:
+    """
+    Persistent per-page text cache and full-text index over a PDF corpus.
+    
+    Page text is stored once per file content (SHA-256), so renamed or copied
+    files are never re-parsed. Documents are tracked by path with size/mtime,
+    which lets unchanged files be skipped without hashing. Search uses an
+    SQLite FTS5 table (external content over the page text) ranked by bm25.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS docs (
+            path TEXT PRIMARY KEY,
+            sha256 TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            pages INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS docs_sha256 ON docs(sha256);
+        CREATE TABLE IF NOT EXISTS page_text (
+            id INTEGER PRIMARY KEY,
+            sha256 TEXT NOT NULL,
+            page INTEGER NOT NULL,
+            text TEXT NOT NULL,
+            UNIQUE (sha256, page)
+        );
+        CREATE VIRTUAL TABLE IF NOT EXISTS page_fts USING fts5(
+            text, content='page_text', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+        );
+        CREATE TRIGGER IF NOT EXISTS page_text_ai AFTER INSERT ON page_text BEGIN
+            INSERT INTO page_fts(rowid, text) VALUES (new.id, new.text);
+        END;
+        CREATE TRIGGER IF NOT EXISTS page_text_ad AFTER DELETE ON page_text BEGIN
+            INSERT INTO page_fts(page_fts, rowid, text) VALUES ('delete', old.id, old.text);
+        END;
+    """
+    
+    def __init__(self, db_path: str = DEFAULT_INDEX_PATH):
+        """
+        Open (or create) the index database.
+        
+        Args:
+            db_path: SQLite database path, or ':memory:'
+        """
+        self.db_path = db_path
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    @staticmethod
+    def file_hash(file_path: str) -> str:
+        """SHA-256 of a file, read in blocks."""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    def _cached_hash(self, path: str, st: os.stat_result) -> Optional[str]:
+        row = self.conn.execute(
+            "SELECT sha256 FROM docs WHERE path = ? AND size = ? AND mtime_ns = ?",
+            (path, st.st_size, st.st_mtime_ns)).fetchone()
+        return row[0] if row else None
+    
+    def _has_text(self, sha256: str) -> bool:
+        return self.conn.execute(
+            "SELECT 1 FROM page_text WHERE sha256 = ? LIMIT 1", (sha256,)).fetchone() is not None
+    
+    def add(self, file_path: str, processor: "PDFProcessor", workers: Optional[int] = None) -> bool:
+        """
+        Index a PDF if it is new or changed.
+        
+        Args:
+            file_path: Path to the PDF file
+            processor: PDFProcessor used to extract text on a cache miss
+            workers: Worker processes for extraction; small documents
+                (< PARALLEL_MIN_PAGES) run in-process when None
+            
+        Returns:
+            True if text had to be extracted, False if the cache was reused
+        """
+        path = os.path.abspath(file_path)
+        st = os.stat(path)
+        if self._cached_hash(path, st):
+            return False
+        
+        sha256 = self.file_hash(path)
+        extracted = not self._has_text(sha256)
+        if extracted:
+            workers = processor._extract_workers(path, workers=workers)
+        with self.conn:
+            if extracted:
+                # Empty pages are stored too so page numbering can be rebuilt from the cache
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO page_text (sha256, page, text) VALUES (?, ?, ?)",
+                    ((sha256, num, txt) for num, txt in processor.iter_page_text(path, workers=workers)))
+            pages = self.conn.execute(
+                "SELECT COUNT(*) FROM page_text WHERE sha256 = ?", (sha256,)).fetchone()[0]
+            self.conn.execute(
+                "INSERT OR REPLACE INTO docs (path, sha256, size, mtime_ns, pages) VALUES (?, ?, ?, ?, ?)",
+                (path, sha256, st.st_size, st.st_mtime_ns, pages))
+        return extracted
+    
+    def add_directory(self, directory: str, processor: "PDFProcessor", recursive: bool = True,
+                      workers: Optional[int] = None) -> Dict[str, int]:
+        """
+        Incrementally index every PDF under a directory.
+        
+        Returns:
+            Counts of 'extracted', 'cached' and 'failed' files
+        """
+        pattern = "**/*.pdf" if recursive else "*.pdf"
+        stats = {"extracted": 0, "cached": 0, "failed": 0}
+        for pdf in sorted(Path(directory).glob(pattern)):
+            try:
+                stats["extracted" if self.add(str(pdf), processor, workers) else "cached"] += 1
+            except Exception as e:
+                processor._log(f"Skipping {pdf}: {e}")
+                stats["failed"] += 1
+        return stats
+    
+    def page_texts(self, file_path: str, processor: "PDFProcessor",
+                   workers: Optional[int] = None) -> List[str]:
+        """
+        All page texts of a document (index 0 is page 1), extracting on a cache miss.
+        """
+        self.add(file_path, processor, workers)
+        path = os.path.abspath(file_path)
+        rows = self.conn.execute(
+            "SELECT t.text FROM docs d JOIN page_text t ON t.sha256 = d.sha256 "
+            "WHERE d.path = ? ORDER BY t.page", (path,))
+        return [row[0] for row in rows]
+    
+    def prune(self) -> Dict[str, int]:
+        """
+        Drop documents whose files are gone and page text no document references.
+        
+        Returns:
+            Counts of removed 'docs' and 'pages'
+        """
+        missing = [(path,) for (path,) in self.conn.execute("SELECT path FROM docs")
+                   if not os.path.exists(path)]
+        with self.conn:
+            self.conn.executemany("DELETE FROM docs WHERE path = ?", missing)
+            pages = self.conn.execute(
+                "DELETE FROM page_text WHERE sha256 NOT IN (SELECT sha256 FROM docs)").rowcount
+        return {"docs": len(missing), "pages": pages}
+    
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Ranked full-text search over all indexed pages.
+        
+        Args:
+            query: FTS5 query (plain words, "phrases", AND/OR/NOT, prefix*);
+                   falls back to a plain all-terms match if the syntax is invalid
+            limit: Maximum number of hits
+            
+        Returns:
+            List of hits with path, page, score (lower is better) and snippet
+        """
+        sql = (
+            "SELECT d.path, t.page, bm25(page_fts) AS score, "
+            "snippet(page_fts, 0, '[', ']', '...', 12) "
+            "FROM page_fts JOIN page_text t ON t.id = page_fts.rowid "
+            "JOIN docs d ON d.sha256 = t.sha256 "
+            "WHERE page_fts MATCH ? ORDER BY score LIMIT ?"
+        )
+        try:
+            rows = self.conn.execute(sql, (query, limit)).fetchall()
+        except sqlite3.OperationalError:
+            quoted = " ".join('"{}"'.format(term.replace('"', '""')) for term in query.split())
+            rows = self.conn.execute(sql, (quoted, limit)).fetchall() if quoted else []
+        return [{"path": path, "page": page, "score": round(score, 4), "snippet": snippet}
+                for path, page, score, snippet in rows]
+    
+    def stats(self) -> Dict[str, int]:
+        """Document, distinct-content and page counts."""
+        docs, contents = self.conn.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT sha256) FROM docs").fetchone()
+        pages = self.conn.execute("SELECT COUNT(*) FROM page_text").fetchone()[0]
+        return {"docs": docs, "contents": contents, "pages": pages}
+
+
 def main():
     """Command-line interface for PDF Processor."""
     parser = argparse.ArgumentParser(
@@ -336,17 +724,21 @@ def main():
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""Examples:
   %(prog)s --action extract_text --input doc.pdf --output text.txt
+  %(prog)s --action extract_text --input big.pdf --output pages.ndjson --workers 8
   %(prog)s --action merge --input ./pdfs/ --output merged.pdf
   %(prog)s --action split --input doc.pdf --output ./pages/
   %(prog)s --action extract_pages --input doc.pdf --pages "1-5,10" --output extract.pdf
   %(prog)s --action pdf_to_images --input doc.pdf --output ./images/ --dpi 300
-  %(prog)s --action info --input doc.pdf"""
+  %(prog)s --action info --input doc.pdf
+  %(prog)s --action index --input ./archive/
+  %(prog)s --action search --query "invoice AND 2024" --limit 10"""
     )
     
     parser.add_argument('--action', required=True,
-                        choices=['extract_text', 'merge', 'split', 'extract_pages', 'pdf_to_images', 'info'],
+                        choices=['extract_text', 'merge', 'split', 'extract_pages', 'pdf_to_images', 'info',
+                                 'index', 'search'],
                         help='Operation to perform')
-    parser.add_argument('--input', required=True, help='Input file or directory')
+    parser.add_argument('--input', help='Input file or directory')
     parser.add_argument('--output', help='Output file or directory')
     parser.add_argument('--pages', help='Page ranges (e.g., "1-5,10,15-20")')
     parser.add_argument('--password', help='PDF password')
@@ -355,17 +747,46 @@ def main():
                         help='Image format (default: png)')
     parser.add_argument('--merge_strategy', default='filename', choices=['filename', 'modified_time'],
                         help='Merge sorting strategy (default: filename)')
+    parser.add_argument('--workers', type=int, help='Worker processes for page-parallel extraction/rendering')
+    parser.add_argument('--index', default=DEFAULT_INDEX_PATH,
+                        help=f'Text cache / search index database (default: {DEFAULT_INDEX_PATH})')
+    parser.add_argument('--cache', action='store_true', help='Reuse cached page text for extract_text')
+    parser.add_argument('--query', help='Full-text query for search')
+    parser.add_argument('--limit', type=int, default=20, help='Maximum search hits (default: 20)')
     parser.add_argument('-v', '--verbose', action='store_true', help='Enable verbose output')
     parser.add_argument('--version', action='version', version='%(prog)s 1.0.0')
     
     args = parser.parse_args()
-    processor = PDFProcessor(password=args.password, verbose=args.verbose)
+    if args.action == 'search' and not args.query:
+        parser.error('--query required for search')
+    if args.action != 'search' and not args.input:
+        parser.error('--input required')
+    processor = PDFProcessor(password=args.password, verbose=args.verbose,
+                             cache_path=args.index if args.cache else None)
     
     try:
-        if args.action == 'extract_text':
+        if args.action == 'index':
+            with PDFTextIndex(args.index) as index:
+                if os.path.isdir(args.input):
+                    stats = index.add_directory(args.input, processor, workers=args.workers)
+                else:
+                    stats = {"extracted": int(index.add(args.input, processor, args.workers))}
+                stats.update(removed=index.prune(), totals=index.stats())
+            print(json.dumps(stats, indent=2))
+        
+        elif args.action == 'search':
+            with PDFTextIndex(args.index) as index:
+                hits = index.search(args.query, args.limit)
+            print(json.dumps(hits, indent=2, ensure_ascii=False))
+        
+        elif args.action == 'extract_text':
             out = args.output or args.input.replace('.pdf', '.txt')
-            processor.save_text(args.input, out)
-            print(f"Text saved: {out}")
+            if out.endswith(('.ndjson', '.jsonl')):
+                count = processor.extract_text_stream(args.input, out, workers=args.workers)
+                print(f"Text saved: {out} ({count} pages)")
+            else:
+                processor.save_text(args.input, out, workers=args.workers)
+                print(f"Text saved: {out}")
         
         elif args.action == 'merge':
             out = args.output or 'merged.pdf'
@@ -387,7 +808,7 @@ def main():
         
         elif args.action == 'pdf_to_images':
             out = args.output or './pdf_images/'
-            files = processor.pdf_to_images(args.input, out, dpi=args.dpi, fmt=args.format)
+            files = processor.pdf_to_images(args.input, out, dpi=args.dpi, fmt=args.format, workers=args.workers)
             print(f"Created {len(files)} images: {out}")
         
         elif args.action == 'info':
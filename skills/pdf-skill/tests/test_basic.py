@@ -13,11 +13,12 @@ import unittest
 import tempfile
 import shutil
 from pathlib import Path
+from unittest.mock import patch
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from main import PDFProcessor
+from main import PDFProcessor, PDFTextIndex, _shard, _run_sharded
 
 # Try to import PyPDF2 for test setup
 try:
@@ -222,6 +223,136 @@ class TestPDFProcessor(unittest.TestCase):
             self.assertIsInstance(content, str)
 
 
+    def test_extract_text_parallel_matches_serial(self):
+        """Test that sharded multi-process extraction gives identical output."""
+        serial = self.processor.extract_text(self.test_pdf_path, workers=1)
+        parallel = self.processor.extract_text(self.test_pdf_path, workers=2)
+        self.assertEqual(serial, parallel)
+        
+        pages = [num for num, _ in self.processor.iter_page_text(self.test_pdf_path, [4, 2], workers=2)]
+        self.assertEqual(pages, [4, 2])
+    
+    def test_extract_text_stream(self):
+        """Test NDJSON streaming extraction."""
+        import json
+        output_path = os.path.join(self.test_dir, "pages.ndjson")
+        seen = []
+        count = self.processor.extract_text_stream(
+            self.test_pdf_path, output_path, callback=lambda num, txt: seen.append(num), workers=2)
+        
+        self.assertEqual(count, 5)
+        self.assertEqual(seen, [1, 2, 3, 4, 5])
+        with open(output_path, 'r', encoding='utf-8') as f:
+            rows = [json.loads(line) for line in f]
+        self.assertEqual([row["page"] for row in rows], [1, 2, 3, 4, 5])
+        self.assertIn("page 3", rows[2]["text"])
+
+
+def _echo_shard(file_path, shard, suffix):
+    """Module-level task so it can be pickled into worker processes."""
+    return [f"{file_path}:{num}{suffix}" for num in shard]
+
+
+class TestPageSharding(unittest.TestCase):
+    """Tests for the page-parallel sharding helpers."""
+    
+    def test_shard_covers_pages_in_order(self):
+        """Test that shards are contiguous and cover every page once."""
+        pages = list(range(1, 1001))
+        shards = _shard(pages, 4)
+        self.assertEqual([num for shard in shards for num in shard], pages)
+        self.assertTrue(all(len(shard) <= 50 for shard in shards))
+        self.assertEqual(_shard([], 4), [])
+    
+    def test_run_sharded_preserves_order(self):
+        """Test that pooled results come back in shard order."""
+        shards = _shard(list(range(1, 41)), 2)
+        results = list(_run_sharded(_echo_shard, shards, ("doc", "!"), 2))
+        self.assertEqual(results, [_echo_shard("doc", shard, "!") for shard in shards])
+
+
+class _FakeProcessor:
+    """Stands in for PDFProcessor: page text is derived from the file content."""
+    
+    def __init__(self):
+        self.extracted = []
+    
+    def _extract_workers(self, file_path, page_numbers=None, workers=None):
+        return workers
+    
+    def iter_page_text(self, file_path, workers=None):
+        self.extracted.append(file_path)
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for num, line in enumerate(f.read().splitlines(), 1):
+                yield num, line
+    
+    def _log(self, msg):
+        pass
+
+
+class TestPDFTextIndex(unittest.TestCase):
+    """Tests for the persistent page-text cache and full-text index."""
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.index = PDFTextIndex(os.path.join(self.test_dir, "index.db"))
+        self.processor = _FakeProcessor()
+    
+    def tearDown(self):
+        self.index.close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+    
+    def _write(self, name, pages):
+        path = os.path.join(self.test_dir, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(pages))
+        return path
+    
+    def test_incremental_add(self):
+        """Test that unchanged files and duplicate content are not re-extracted."""
+        a = self._write("a.pdf", ["quarterly invoice summary", "", "payment terms"])
+        self._write("copy.pdf", ["quarterly invoice summary", "", "payment terms"])
+        
+        stats = self.index.add_directory(self.test_dir, self.processor)
+        self.assertEqual(stats, {"extracted": 1, "cached": 1, "failed": 0})
+        stats = self.index.add_directory(self.test_dir, self.processor)
+        self.assertEqual(stats, {"extracted": 0, "cached": 2, "failed": 0})
+        self.assertEqual(len(self.processor.extracted), 1)
+        self.assertEqual(self.index.page_texts(a, self.processor),
+                         ["quarterly invoice summary", "", "payment terms"])
+    
+    def test_search_ranked_hits(self):
+        """Test ranked page hits, snippets and invalid query fallback."""
+        self._write("a.pdf", ["invoice invoice invoice", "nothing here"])
+        self._write("b.pdf", ["an invoice among many other words on this page"])
+        self.index.add_directory(self.test_dir, self.processor)
+        
+        hits = self.index.search("invoice")
+        self.assertEqual([(os.path.basename(h["path"]), h["page"]) for h in hits],
+                         [("a.pdf", 1), ("b.pdf", 1)])
+        self.assertIn("[invoice]", hits[0]["snippet"])
+        self.assertEqual(len(self.index.search('"invoice')), 2)
+    
+    def test_small_document_extracted_in_process(self):
+        """Test a cache miss on a short document does not start a process pool."""
+        path = self._write("short.pdf", ["one page"])
+        processor = PDFProcessor()
+        processor._text_index = self.index
+        with patch("main._page_count", return_value=1), \
+                patch.object(PDFProcessor, "iter_page_text", return_value=iter([(1, "one page")])) as mock_iter:
+            self.assertIn("one page", processor.extract_text(path))
+        self.assertEqual(mock_iter.call_args.kwargs["workers"], 1)
+    
+    def test_prune_removed_files(self):
+        """Test that deleted files drop out of the index."""
+        path = self._write("gone.pdf", ["temporary text"])
+        self.index.add(path, self.processor)
+        os.remove(path)
+        
+        self.assertEqual(self.index.prune(), {"docs": 1, "pages": 1})
+        self.assertEqual(self.index.search("temporary"), [])
+
+
 class TestPageRangeParsing(unittest.TestCase):
     """Dedicated tests for page range parsing edge cases."""
     
@@ -295,6 +426,8 @@ def create_test_suite():
     suite = unittest.TestSuite()
     
     suite.addTests(loader.loadTestsFromTestCase(TestPDFProcessor))
+    suite.addTests(loader.loadTestsFromTestCase(TestPageSharding))
+    suite.addTests(loader.loadTestsFromTestCase(TestPDFTextIndex))
     suite.addTests(loader.loadTestsFromTestCase(TestPageRangeParsing))
     suite.addTests(loader.loadTestsFromTestCase(TestErrorHandling))
     suite.addTests(loader.loadTestsFromTestCase(TestCommandLineInterface))
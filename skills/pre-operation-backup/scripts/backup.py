@@ -2,17 +2,30 @@
 """
 Pre-Operation Backup - 敏感操作前自动备份
 在执行危险操作前创建系统快照
+
+快照采用内容寻址存储: 每个文件按 SHA-256 只存一份 (objects/),
+快照目录为 manifest.json + 指向对象的硬链接 (不支持时退化为 reflink/复制)。
 """
 
 import argparse
+import fnmatch
+import hashlib
 import json
 import os
 import shutil
+import stat
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional
 
+MANIFEST_FILE = "manifest.json"
+SNAPSHOT_INFO_FILE = "snapshot-info.json"
+HASH_CHUNK_SIZE = 1024 * 1024
+RESTORE_WORKERS = 8
+EXCLUDE_PATTERNS = ['__pycache__', '*.pyc', '.git', 'node_modules', 'cache', 'logs', 'temp']
+
 
 class PreOperationBackup:
     """操作前备份管理器"""
@@ -22,10 +35,16 @@ class PreOperationBackup:
         self.backup_root = Path("D:/kimi/Backups/pre-operation")
         self.config_file = self.kimi_home / "config" / "pre-op-backup.json"
         self.log_file = self.backup_root / "operations.log"
+        self.objects_dir = self.backup_root / "objects"
         
         # 确保目录存在
         self.backup_root.mkdir(parents=True, exist_ok=True)
         
+        # 当前快照的 manifest 与上一版 manifest 的索引 (按源路径)
+        self._manifest = None
+        self._previous = {}
+        self._stats = {"linked": 0, "stored": 0, "hashed": 0}
+        
         # 默认配置
         self.config = self._load_config()
     
@@ -82,13 +101,27 @@ class PreOperationBackup:
         
         print(f"[INFO] Creating {level} snapshot: {snapshot_name}")
         
+        self._manifest = {"version": 1, "roots": [], "files": {}}
+        self._previous = self._load_previous_index()
+        self._stats = {"linked": 0, "stored": 0, "hashed": 0}
+        
         # 根据级别备份不同内容
-        if level == "light":
-            self._backup_light(snapshot_dir)
-        elif level == "standard":
-            self._backup_standard(snapshot_dir)
-        else:  # full
-            self._backup_full(snapshot_dir)
+        try:
+            if level == "light":
+                self._backup_light(snapshot_dir)
+            elif level == "standard":
+                self._backup_standard(snapshot_dir)
+            else:  # full
+                self._backup_full(snapshot_dir)
+            
+            with open(snapshot_dir / MANIFEST_FILE, 'w', encoding='utf-8') as f:
+                json.dump(self._manifest, f, ensure_ascii=False)
+        finally:
+            self._manifest = None
+            self._previous = {}
+        
+        print(f"  [CAS] {self._stats['linked']} unchanged, {self._stats['stored']} new objects, "
+              f"{self._stats['hashed']} files hashed")
         
         # 保存快照信息
         snapshot_info = {
@@ -99,7 +132,7 @@ class PreOperationBackup:
             "path": str(snapshot_dir)
         }
         
-        with open(snapshot_dir / "snapshot-info.json", 'w', encoding='utf-8') as f:
+        with open(snapshot_dir / SNAPSHOT_INFO_FILE, 'w', encoding='utf-8') as f:
             json.dump(snapshot_info, f, indent=2, ensure_ascii=False)
         
         # 记录日志
@@ -127,7 +160,7 @@ class PreOperationBackup:
             if src.exists():
                 dst = snapshot_dir / subdir / src.name
                 dst.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(src, dst)
+                self._store_file(src, dst, snapshot_dir)
                 print(f"    [OK] {src.name}")
     
     def _backup_standard(self, snapshot_dir: Path):
@@ -154,6 +187,7 @@ class PreOperationBackup:
                 dst.parent.mkdir(parents=True, exist_ok=True)
                 
                 if src.is_dir():
+                    self._add_root(src, dst, snapshot_dir, patterns=patterns)
                     if patterns:
                         # 只备份匹配的文件
                         dst.mkdir(parents=True, exist_ok=True)
@@ -162,11 +196,11 @@ class PreOperationBackup:
                                 rel_path = f.relative_to(src)
                                 dst_file = dst / rel_path
                                 dst_file.parent.mkdir(parents=True, exist_ok=True)
-                                shutil.copy2(f, dst_file)
+                                self._store_file(f, dst_file, snapshot_dir)
                     else:
-                        shutil.copytree(src, dst, dirs_exist_ok=True)
+                        self._store_tree(src, dst, snapshot_dir)
                 else:
-                    shutil.copy2(src, dst)
+                    self._store_file(src, dst, snapshot_dir)
                 
                 print(f"    [OK] {src.name}")
     
@@ -193,29 +227,213 @@ class PreOperationBackup:
                 
                 if src.is_dir():
                     # 使用robocopy风格的复制
-                    self._copy_tree_with_exclude(src, dst)
+                    self._add_root(src, dst, snapshot_dir, exclude=EXCLUDE_PATTERNS)
+                    self._copy_tree_with_exclude(src, dst, snapshot_dir)
                 else:
-                    shutil.copy2(src, dst)
+                    self._store_file(src, dst, snapshot_dir)
                 
                 print(f"    [OK] {item}")
     
-    def _copy_tree_with_exclude(self, src: Path, dst: Path):
+    def _copy_tree_with_exclude(self, src: Path, dst: Path, snapshot_dir: Path):
         """复制目录，排除缓存文件"""
-        exclude_patterns = ['__pycache__', '*.pyc', '.git', 'node_modules', 'cache', 'logs', 'temp']
-        
+        self._store_tree(src, dst, snapshot_dir, exclude=EXCLUDE_PATTERNS)
+    
+    def _store_tree(self, src: Path, dst: Path, snapshot_dir: Path, exclude: List[str] = None):
+        """递归存储目录 (对象库 + 硬链接)"""
         dst.mkdir(parents=True, exist_ok=True)
         
         for item in src.iterdir():
             # 检查是否在排除列表
-            if any(pattern in str(item) for pattern in exclude_patterns):
+            if exclude and self._is_excluded(item, exclude):
                 continue
             
             dst_item = dst / item.name
             
             if item.is_dir():
-                self._copy_tree_with_exclude(item, dst_item)
+                self._store_tree(item, dst_item, snapshot_dir, exclude)
             else:
-                shutil.copy2(item, dst_item)
+                self._store_file(item, dst_item, snapshot_dir)
+    
+    @staticmethod
+    def _is_excluded(path: Path, exclude: List[str]) -> bool:
+        """排除规则 (与原 robocopy 风格一致: 路径包含关键字或匹配通配符)"""
+        return any(pattern in str(path) or fnmatch.fnmatch(path.name, pattern) for pattern in exclude)
+    
+    def _add_root(self, src: Path, dst: Path, snapshot_dir: Path, patterns: List[str] = None,
+                  exclude: List[str] = None):
+        """记录快照覆盖的目录 (用于 diff 中识别新增文件)"""
+        if self._manifest is None:
+            return
+        self._manifest["roots"].append({
+            "path": self._home_relative(src),
+            "snapshot_path": dst.relative_to(snapshot_dir).as_posix(),
+            "patterns": patterns,
+            "exclude": exclude
+        })
+    
+    def _home_relative(self, path: Path) -> str:
+        """源路径相对 .kimi 目录的位置 (不在其下则返回绝对路径)"""
+        try:
+            return path.relative_to(self.kimi_home).as_posix()
+        except ValueError:
+            return str(path)
+    
+    # ------------------------------------------------------------------
+    # 内容寻址对象库
+    # ------------------------------------------------------------------
+    
+    def _object_path(self, digest: str) -> Path:
+        """对象路径: objects/ab/cdef..."""
+        return self.objects_dir / digest[:2] / digest[2:]
+    
+    @staticmethod
+    def _hash_file(path: Path) -> str:
+        """计算文件 SHA-256"""
+        h = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                h.update(chunk)
+        return h.hexdigest()
+    
+    def _ingest(self, src: Path) -> str:
+        """读取一次源文件: 边写临时对象边计算哈希，内容已存在则丢弃临时文件"""
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.objects_dir / f".tmp-{os.getpid()}-{id(src)}"
+        h = hashlib.sha256()
+        with open(src, 'rb') as fin, open(tmp, 'wb') as fout:
+            for chunk in iter(lambda: fin.read(HASH_CHUNK_SIZE), b""):
+                h.update(chunk)
+                fout.write(chunk)
+        shutil.copystat(src, tmp)
+        digest = h.hexdigest()
+        obj = self._object_path(digest)
+        if obj.exists():
+            tmp.unlink()
+        else:
+            obj.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp, obj)
+            # 对象被多个快照共享，设为只读防止经由硬链接被修改
+            os.chmod(obj, stat.S_IREAD)
+            self._stats["stored"] += 1
+        return digest
+    
+    @staticmethod
+    def _reflink(src: Path, dst: Path) -> bool:
+        """尝试 reflink (Linux FICLONE)，失败返回 False"""
+        try:
+            import fcntl
+        except ImportError:
+            return False
+        FICLONE = 0x40049409
+        try:
+            with open(src, 'rb') as fin, open(dst, 'wb') as fout:
+                fcntl.ioctl(fout.fileno(), FICLONE, fin.fileno())
+            return True
+        except OSError:
+            if dst.exists():
+                dst.unlink()
+            return False
+    
+    def _materialize(self, obj: Path, dst: Path):
+        """将对象放到快照路径: 硬链接 > reflink > 复制"""
+        if dst.exists():
+            dst.unlink()
+        try:
+            os.link(obj, dst)
+        except OSError:
+            # 跨盘 / 文件系统不支持 / 链接数超限
+            if not self._reflink(obj, dst):
+                shutil.copy2(obj, dst)
+    
+    def _store_file(self, src: Path, dst: Path, snapshot_dir: Path):
+        """存储单个文件: size/mtime 未变则复用上一版 manifest 的哈希，不读内容"""
+        st = src.stat()
+        key = str(src)
+        prev = self._previous.get(key)
+        digest = None
+        if prev and prev["size"] == st.st_size and prev["mtime_ns"] == st.st_mtime_ns:
+            if self._object_path(prev["hash"]).exists():
+                digest = prev["hash"]
+                self._stats["linked"] += 1
+        if digest is None:
+            digest = self._ingest(src)
+            self._stats["hashed"] += 1
+        
+        self._materialize(self._object_path(digest), dst)
+        
+        if self._manifest is not None:
+            self._manifest["files"][dst.relative_to(snapshot_dir).as_posix()] = {
+                "src": key,
+                "path": self._home_relative(src),
+                "hash": digest,
+                "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+                "mode": stat.S_IMODE(st.st_mode)
+            }
+    
+    def _load_manifest(self, snapshot_dir: Path) -> Optional[Dict]:
+        """读取快照 manifest (旧版快照没有则返回 None)"""
+        manifest_file = snapshot_dir / MANIFEST_FILE
+        if not manifest_file.exists():
+            return None
+        try:
+            with open(manifest_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _load_previous_index(self) -> Dict[str, Dict]:
+        """合并各级别最新快照的 manifest，按源路径索引 (新的覆盖旧的)"""
+        latest = {}
+        for snapshot_dir in self.backup_root.iterdir():
+            if not snapshot_dir.is_dir() or not (snapshot_dir / MANIFEST_FILE).exists():
+                continue
+            level = next((lv for lv in ("light", "standard", "full") if f"-{lv}" in snapshot_dir.name), None)
+            mtime = snapshot_dir.stat().st_mtime
+            if level and (level not in latest or mtime > latest[level][0]):
+                latest[level] = (mtime, snapshot_dir)
+        
+        index = {}
+        for _, snapshot_dir in sorted(latest.values(), key=lambda x: x[0]):
+            manifest = self._load_manifest(snapshot_dir)
+            if manifest:
+                for entry in manifest.get("files", {}).values():
+                    index[entry["src"]] = entry
+        return index
+    
+    def _gc_objects(self) -> int:
+        """回收不再被任何快照 manifest 引用的对象"""
+        if not self.objects_dir.exists():
+            return 0
+        
+        referenced = set()
+        for snapshot_dir in self.backup_root.iterdir():
+            if snapshot_dir.is_dir() and snapshot_dir != self.objects_dir:
+                manifest = self._load_manifest(snapshot_dir)
+                if manifest:
+                    referenced.update(e["hash"] for e in manifest.get("files", {}).values())
+        
+        removed = 0
+        for bucket in self.objects_dir.iterdir():
+            if not bucket.is_dir():
+                continue
+            for obj in bucket.iterdir():
+                if bucket.name + obj.name not in referenced:
+                    try:
+                        os.chmod(obj, stat.S_IREAD | stat.S_IWRITE)
+                        obj.unlink()
+                        removed += 1
+                    except OSError:
+                        pass
+        return removed
+    
+    @staticmethod
+    def _remove_tree(path: Path):
+        """删除目录 (处理只读硬链接)"""
+        def on_error(func, target, _exc):
+            os.chmod(target, stat.S_IREAD | stat.S_IWRITE)
+            func(target)
+        shutil.rmtree(path, onerror=on_error)
     
     def _cleanup_old_snapshots(self, level: str):
         """清理旧快照"""
@@ -225,7 +443,8 @@ class PreOperationBackup:
         # 获取该级别的所有快照
         snapshots = []
         for snapshot_dir in self.backup_root.iterdir():
-            if snapshot_dir.is_dir() and f"-{level}-" in snapshot_dir.name:
+            if snapshot_dir.is_dir() and (f"-{level}-" in snapshot_dir.name
+                                          or snapshot_dir.name.endswith(f"-{level}")):
                 try:
                     mtime = datetime.fromtimestamp(snapshot_dir.stat().st_mtime)
                     snapshots.append((snapshot_dir, mtime))
@@ -235,12 +454,19 @@ class PreOperationBackup:
         # 按时间排序，保留最新的
         snapshots.sort(key=lambda x: x[1], reverse=True)
         
+        removed_snapshots = 0
         for snapshot_dir, _ in snapshots[max_count:]:
             try:
-                shutil.rmtree(snapshot_dir)
+                self._remove_tree(snapshot_dir)
+                removed_snapshots += 1
                 print(f"  [CLEANUP] Removed old snapshot: {snapshot_dir.name}")
             except:
                 pass
+        
+        if removed_snapshots:
+            removed_objects = self._gc_objects()
+            if removed_objects:
+                print(f"  [GC] Removed {removed_objects} unreferenced objects")
     
     def _log_operation(self, message: str):
         """记录操作日志"""
@@ -265,8 +491,12 @@ class PreOperationBackup:
                         if level and info.get("level") != level:
                             continue
                         
-                        # 计算大小
-                        size = sum(f.stat().st_size for f in snapshot_dir.rglob("*") if f.is_file())
+                        # 计算大小 (逻辑大小; 对象库中的内容在快照间共享)
+                        manifest = self._load_manifest(snapshot_dir)
+                        if manifest:
+                            size = sum(e["size"] for e in manifest.get("files", {}).values())
+                        else:
+                            size = sum(f.stat().st_size for f in snapshot_dir.rglob("*") if f.is_file())
                         info["size_mb"] = round(size / 1024 / 1024, 2)
                         
                         snapshots.append(info)
@@ -277,33 +507,193 @@ class PreOperationBackup:
         snapshots.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
         return snapshots
     
-    def restore_snapshot(self, snapshot_name: str = None, target_path: str = None):
-        """恢复快照"""
+    def _resolve_snapshot(self, snapshot_name: str = None) -> Optional[Path]:
+        """按名称定位快照 (默认最新)"""
         if not snapshot_name:
-            # 使用最新的快照
             snapshots = self.list_snapshots()
             if not snapshots:
                 print("[ERROR] No snapshots found")
-                return False
-            
-            snapshot = snapshots[0]
-            snapshot_name = snapshot["name"]
+                return None
+            snapshot_name = snapshots[0]["name"]
         
         snapshot_dir = self.backup_root / snapshot_name
         if not snapshot_dir.exists():
             print(f"[ERROR] Snapshot not found: {snapshot_name}")
+            return None
+        return snapshot_dir
+    
+    def _live_path(self, rel: str, restore_target: Path) -> Path:
+        """manifest 中的路径对应的现场路径"""
+        return Path(rel) if os.path.isabs(rel) else restore_target / rel
+    
+    def diff_snapshot(self, snapshot_name: str = None, target_path: str = None,
+                      workers: int = RESTORE_WORKERS) -> Optional[Dict]:
+        """
+        对比快照与现场文件
+        
+        size/mtime 与 manifest 一致的文件视为未变 (使用缓存哈希)，
+        仅对 size 相同但 mtime 变化的文件重新计算哈希。
+        
+        Returns:
+            {"added": [...], "removed": [...], "modified": [...], "unchanged": n}
+            路径相对 .kimi 目录; 旧版快照 (无 manifest) 返回 None
+        """
+        snapshot_dir = self._resolve_snapshot(snapshot_name)
+        if snapshot_dir is None:
+            return None
+        manifest = self._load_manifest(snapshot_dir)
+        if manifest is None:
+            return None
+        
+        restore_target = Path(target_path) if target_path else self.kimi_home
+        entries = {e["path"]: e for e in manifest.get("files", {}).values()}
+        
+        removed, modified, to_hash = [], [], []
+        unchanged = 0
+        for rel, entry in entries.items():
+            live = self._live_path(rel, restore_target)
+            try:
+                st = live.stat()
+            except FileNotFoundError:
+                removed.append(rel)
+                continue
+            if st.st_size != entry["size"]:
+                modified.append(rel)
+            elif "mode" in entry and stat.S_IMODE(st.st_mode) != entry["mode"]:
+                modified.append(rel)
+            elif st.st_mtime_ns == entry["mtime_ns"]:
+                unchanged += 1
+            else:
+                to_hash.append(rel)
+        
+        def changed(rel):
+            return self._hash_file(self._live_path(rel, restore_target)) != entries[rel]["hash"]
+        
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            for rel, is_changed in zip(to_hash, executor.map(changed, to_hash)):
+                if is_changed:
+                    modified.append(rel)
+                else:
+                    unchanged += 1
+        
+        # 快照覆盖的目录中多出来的文件
+        added = []
+        for root in manifest.get("roots", []):
+            live_root = self._live_path(root["path"], restore_target)
+            if not live_root.is_dir():
+                continue
+            for pattern in root.get("patterns") or ["*"]:
+                for f in live_root.rglob(pattern):
+                    if not f.is_file():
+                        continue
+                    if root.get("exclude") and self._is_excluded(f, root["exclude"]):
+                        continue
+                    rel = (Path(root["path"]) / f.relative_to(live_root)).as_posix()
+                    if rel not in entries:
+                        added.append(rel)
+        
+        return {
+            "snapshot": snapshot_dir.name,
+            "added": sorted(set(added)),
+            "removed": sorted(removed),
+            "modified": sorted(modified),
+            "unchanged": unchanged
+        }
+    
+    @staticmethod
+    def _unfrozen_mode(path: Path) -> int:
+        """快照中的文件是只读的; 没有记录原权限时保留其余位并恢复属主可写"""
+        return stat.S_IMODE(path.stat().st_mode) | stat.S_IREAD | stat.S_IWRITE
+    
+    def _restore_file(self, src: Path, dst: Path, mode: Optional[int] = None):
+        """从对象恢复单个文件 (先写临时文件再替换)，按 manifest 记录的权限恢复"""
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dst.with_name(f".{dst.name}.restore-tmp")
+        shutil.copy2(src, tmp)
+        os.chmod(tmp, self._unfrozen_mode(tmp) if mode is None else mode)
+        os.replace(tmp, dst)
+    
+    def restore_snapshot(self, snapshot_name: str = None, target_path: str = None,
+                         dry_run: bool = False, workers: int = RESTORE_WORKERS,
+                         prune: bool = True):
+        """
+        恢复快照
+        
+        有 manifest 的快照只恢复有差异的文件 (并行复制)，耗时与损坏范围成正比;
+        prune=True 时删除快照覆盖目录中新增的文件 (与整目录替换的旧行为一致)。
+        旧版快照按整目录复制恢复。
+        """
+        snapshot_dir = self._resolve_snapshot(snapshot_name)
+        if snapshot_dir is None:
             return False
+        snapshot_name = snapshot_dir.name
+        restore_target = Path(target_path) if target_path else self.kimi_home
         
-        print(f"[INFO] Restoring snapshot: {snapshot_name}")
+        manifest = self._load_manifest(snapshot_dir)
+        if manifest is None:
+            if dry_run:
+                print(f"[ERROR] Snapshot has no manifest, dry-run not supported: {snapshot_name}")
+                return False
+            return self._restore_full_copy(snapshot_dir, restore_target)
+        
+        diff = self.diff_snapshot(snapshot_name, target_path, workers)
+        to_copy = diff["modified"] + diff["removed"]
+        to_delete = diff["added"] if prune else []
+        
+        print(f"[INFO] {'Dry run: ' if dry_run else ''}Restoring snapshot: {snapshot_name}")
+        print(f"  modified: {len(diff['modified'])}, removed: {len(diff['removed'])}, "
+              f"added: {len(diff['added'])}, unchanged: {diff['unchanged']}")
+        
+        if dry_run:
+            for rel in diff["modified"]:
+                print(f"  M {rel}")
+            for rel in diff["removed"]:
+                print(f"  + {rel}  (restore missing)")
+            for rel in diff["added"]:
+                print(f"  {'-' if prune else '?'} {rel}  ({'delete' if prune else 'keep'} added)")
+            return True
+        
+        if not to_copy and not to_delete:
+            print(f"[OK] Nothing to restore, live tree matches snapshot")
+            return True
         
         # 先创建当前状态的快照（以防万一）
         self.create_snapshot("light", "pre-restore-safety")
         
-        # 恢复文件
-        restore_target = Path(target_path) if target_path else self.kimi_home
+        sources = {e["path"]: (snapshot_dir / rel, e.get("mode"))
+                   for rel, e in manifest["files"].items()}
+        
+        def restore(rel):
+            src, mode = sources[rel]
+            self._restore_file(src, self._live_path(rel, restore_target), mode)
+            return rel
+        
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            for rel in executor.map(restore, to_copy):
+                print(f"  [OK] Restored: {rel}")
+        
+        for rel in to_delete:
+            try:
+                self._live_path(rel, restore_target).unlink()
+                print(f"  [OK] Removed: {rel}")
+            except OSError as e:
+                print(f"  [WARN] Could not remove {rel}: {e}")
+        
+        self._log_operation(f"RESTORED: {snapshot_name} to {restore_target} "
+                            f"({len(to_copy)} restored, {len(to_delete)} removed)")
+        print(f"[OK] Snapshot restored: {snapshot_name}")
+        return True
+    
+    def _restore_full_copy(self, snapshot_dir: Path, restore_target: Path) -> bool:
+        """旧版快照: 整目录复制恢复"""
+        snapshot_name = snapshot_dir.name
+        print(f"[INFO] Restoring snapshot: {snapshot_name}")
+        
+        # 先创建当前状态的快照（以防万一）
+        self.create_snapshot("light", "pre-restore-safety")
         
         for item in snapshot_dir.iterdir():
-            if item.name == "snapshot-info.json":
+            if item.name in (SNAPSHOT_INFO_FILE, MANIFEST_FILE):
                 continue
             
             dst = restore_target / item.name
@@ -312,8 +702,12 @@ class PreOperationBackup:
                 if dst.exists():
                     shutil.rmtree(dst)
                 shutil.copytree(item, dst)
+                for restored in dst.rglob("*"):
+                    if restored.is_file():
+                        os.chmod(restored, self._unfrozen_mode(restored))
             else:
                 shutil.copy2(item, dst)
+                os.chmod(dst, self._unfrozen_mode(dst))
             
             print(f"  [OK] Restored: {item.name}")
         
@@ -366,6 +760,15 @@ def main():
     restore_parser = subparsers.add_parser('restore', help='Restore from snapshot')
     restore_parser.add_argument('--name', help='Snapshot name')
     restore_parser.add_argument('--path', help='Target restore path')
+    restore_parser.add_argument('--dry-run', action='store_true', help='List changes without restoring')
+    restore_parser.add_argument('--workers', type=int, default=RESTORE_WORKERS, help='Parallel copy threads')
+    restore_parser.add_argument('--keep-added', action='store_true',
+                                help='Keep files added since the snapshot')
+    
+    # diff command
+    diff_parser = subparsers.add_parser('diff', help='Compare snapshot with live files')
+    diff_parser.add_argument('--name', help='Snapshot name')
+    diff_parser.add_argument('--path', help='Live tree path')
     
     # check command
     check_parser = subparsers.add_parser('check', help='Check if operation is dangerous')
@@ -401,7 +804,19 @@ def main():
             print(f"{name:<50} {level:<10} {size:<10} {time:<20}")
     
     elif args.command == 'restore':
-        backup.restore_snapshot(args.name, args.path)
+        ok = backup.restore_snapshot(args.name, args.path, dry_run=args.dry_run,
+                                     workers=args.workers, prune=not args.keep_added)
+        sys.exit(0 if ok else 1)
+    
+    elif args.command == 'diff':
+        diff = backup.diff_snapshot(args.name, args.path)
+        if diff is None:
+            print("[ERROR] Snapshot has no manifest (created before content-addressed storage)")
+            sys.exit(1)
+        print(f"\nDiff against {diff['snapshot']} ({diff['unchanged']} unchanged):\n")
+        for key, mark in (("modified", "M"), ("removed", "D"), ("added", "A")):
+            for rel in diff[key]:
+                print(f"  {mark} {rel}")
     
     elif args.command == 'check':
         is_dangerous = backup.check_dangerous_operation(args.operation)
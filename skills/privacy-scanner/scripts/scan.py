@@ -6,10 +6,108 @@ Based on Exodus Privacy and GDPR patterns
 
 import argparse
 import json
+import os
 import re
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, Iterator, List, Set
+
+CHUNK_SIZE = 4 * 1024 * 1024   # bytes read per chunk
+OVERLAP = 256                  # longer than any PII match; carried into the next chunk
+MAX_IN_FLIGHT_PER_WORKER = 4   # bounded submission so huge trees never queue every path
+
+
+def luhn_valid(digits: bytes) -> bool:
+    """Luhn checksum over an ASCII digit string"""
+    total = 0
+    for i, ch in enumerate(reversed(digits)):
+        d = ch - 48
+        if i % 2:
+            d *= 2
+            if d > 9:
+                d -= 9
+        total += d
+    return total % 10 == 0
+
+
+def _compile_pii(patterns: Dict[str, str]):
+    """All PII patterns as one alternation with a named group per type (bytes)"""
+    return re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern in patterns.items()).encode())
+
+
+def scan_stream(stream, regex, chunk_size: int = CHUNK_SIZE) -> Dict[str, Dict]:
+    """
+    Single pass over a binary stream in fixed-size chunks.
+
+    Matches starting in the last OVERLAP bytes of a chunk, or running into its
+    end, are deferred to the next chunk so nothing is split or counted twice.
+    One byte of context is kept in front of the carry so \\b still sees it.
+    """
+    counts: Dict[str, Dict] = {}
+    buf = b''
+    pos = 0
+    final = False
+    while not final:
+        chunk = stream.read(chunk_size)
+        final = not chunk
+        buf += chunk
+        cut = len(buf) - OVERLAP
+        last_end = pos
+        deferred = None
+        for m in regex.finditer(buf, pos):
+            if not final and (m.start() >= cut or m.end() >= len(buf)):
+                deferred = m.start()
+                break
+            pii_type = m.lastgroup
+            text = m.group()
+            if pii_type == 'credit_card' and not luhn_valid(bytes(c for c in text if 48 <= c <= 57)):
+                last_end = m.end()
+                continue
+            entry = counts.get(pii_type)
+            if entry is None:
+                counts[pii_type] = {'count': 1, 'sample': text.decode('utf-8', 'ignore')}
+            else:
+                entry['count'] += 1
+            last_end = m.end()
+        if final:
+            break
+        keep = max(last_end, cut if deferred is None else min(deferred, cut))
+        if keep > 0:
+            buf = buf[keep - 1:]
+            pos = 1
+        else:
+            pos = 0  # nothing consumed yet (e.g. a match deferred at offset 0): rescan from the start
+    return counts
+
+
+def _scan_path(filepath: str, chunk_size: int = CHUNK_SIZE) -> Dict:
+    """Worker entry point: scan one file, return per-type findings"""
+    findings = []
+    try:
+        with open(filepath, 'rb') as f:
+            counts = scan_stream(f, _PII_REGEX, chunk_size)
+        for pii_type in PrivacyScanner.PII_PATTERNS:
+            if pii_type in counts:
+                findings.append({'type': pii_type, **counts[pii_type]})
+    except Exception as e:
+        findings.append({'error': str(e)})
+    return {'file': filepath, 'findings': findings}
+
+
+def _iter_files(path: Path, recursive: bool) -> Iterator[str]:
+    """Single walk of the tree, yielding regular files"""
+    if not recursive:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_file():
+                    yield entry.path
+        return
+    for root, _, files in os.walk(path):
+        for name in files:
+            full = os.path.join(root, name)
+            if os.path.isfile(full):
+                yield full
 
 
 class PrivacyScanner:
@@ -28,53 +126,61 @@ class PrivacyScanner:
         'doubleclick.net',
     ]
 
-    def __init__(self):
+    def __init__(self, chunk_size: int = CHUNK_SIZE):
         self.findings: List[Dict] = []
         self.risk_score = 0
+        self.chunk_size = chunk_size
+
+    def _score(self, result: Dict) -> None:
+        for finding in result['findings']:
+            self.risk_score += finding.get('count', 0) * 10
 
     def scan_file(self, filepath: str) -> Dict:
-        """Scan a file for PII"""
+        """Scan a file for PII (streamed in chunks, credit cards Luhn-checked)"""
         path = Path(filepath)
         if not path.exists():
             return {'error': f'File not found: {filepath}'}
 
-        findings = []
-        try:
-            content = path.read_text(encoding='utf-8', errors='ignore')
-            for pii_type, pattern in self.PII_PATTERNS.items():
-                matches = re.findall(pattern, content)
-                if matches:
-                    findings.append({
-                        'type': pii_type,
-                        'count': len(matches),
-                        'sample': matches[0] if matches else None
-                    })
-                    self.risk_score += len(matches) * 10
-        except Exception as e:
-            findings.append({'error': str(e)})
-
-        return {
-            'file': filepath,
-            'findings': findings
-        }
+        result = _scan_path(filepath, self.chunk_size)
+        self._score(result)
+        return result
 
-    def scan_directory(self, directory: str, recursive: bool = False) -> Dict:
-        """Scan directory for privacy issues"""
+    def scan_directory(self, directory: str, recursive: bool = False, workers: int = None) -> Dict:
+        """Scan directory for privacy issues, spreading files across a process pool"""
         path = Path(directory)
         if not path.exists():
             return {'error': f'Directory not found: {directory}'}
 
+        workers = workers or os.cpu_count() or 1
         results = []
-        pattern = '**/*' if recursive else '*'
-        for file_path in path.glob(pattern):
-            if file_path.is_file():
-                result = self.scan_file(str(file_path))
-                if result.get('findings'):
-                    results.append(result)
-
+        files_scanned = 0
+
+        def collect(result):
+            self._score(result)
+            if result['findings']:
+                results.append(result)
+
+        if workers == 1:
+            for filepath in _iter_files(path, recursive):
+                files_scanned += 1
+                collect(_scan_path(filepath, self.chunk_size))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = set()
+                for filepath in _iter_files(path, recursive):
+                    files_scanned += 1
+                    pending.add(pool.submit(_scan_path, filepath, self.chunk_size))
+                    if len(pending) >= workers * MAX_IN_FLIGHT_PER_WORKER:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            collect(future.result())
+                for future in pending:
+                    collect(future.result())
+
+        results.sort(key=lambda r: r['file'])
         return {
             'directory': directory,
-            'files_scanned': len(list(path.glob(pattern))),
+            'files_scanned': files_scanned,
             'results': results,
             'total_risk_score': self.risk_score
         }
@@ -96,20 +202,25 @@ class PrivacyScanner:
         return json.dumps(report, indent=2)
 
 
+_PII_REGEX = _compile_pii(PrivacyScanner.PII_PATTERNS)
+
+
 def main():
     parser = argparse.ArgumentParser(description='Privacy Scanner')
     parser.add_argument('--path', required=True, help='File or directory to scan')
     parser.add_argument('--recursive', action='store_true', help='Scan recursively')
     parser.add_argument('--output', help='Output file')
+    parser.add_argument('--workers', type=int, help='Worker processes for directory scans (default: CPU count)')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Bytes read per chunk')
     args = parser.parse_args()
 
-    scanner = PrivacyScanner()
+    scanner = PrivacyScanner(chunk_size=args.chunk_size)
     path = Path(args.path)
 
     if path.is_file():
         result = scanner.scan_file(args.path)
     else:
-        result = scanner.scan_directory(args.path, args.recursive)
+        result = scanner.scan_directory(args.path, args.recursive, args.workers)
 
     print(json.dumps(result, indent=2))
 
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Tests for privacy-scanner
+"""
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from scan import OVERLAP, PrivacyScanner, _PII_REGEX, scan_stream
+
+
+class TestScanStream(unittest.TestCase):
+    """Chunked scanning must match a whole-buffer scan for any chunk size."""
+
+    def test_match_at_offset_zero_of_short_file(self):
+        """PII at byte 0 of a file shorter than OVERLAP is found"""
+        data = b'alice@example.com\n'
+        self.assertLess(len(data), OVERLAP)
+        counts = scan_stream(io.BytesIO(data), _PII_REGEX)
+        self.assertEqual(counts['email']['count'], 1)
+
+    def test_card_at_offset_zero(self):
+        """A Luhn-valid card at the start of the stream is counted"""
+        counts = scan_stream(io.BytesIO(b'4111 1111 1111 1111 is card'), _PII_REGEX)
+        self.assertEqual(counts['credit_card']['count'], 1)
+
+    def test_chunk_size_independent(self):
+        """Every chunk size gives the same counts as a single read"""
+        data = b''.join(b'4111 1111 1111 1111 bob%d@example.com 123-45-6789 555-123-4567\n' % i
+                        for i in range(200))
+        expected = scan_stream(io.BytesIO(data), _PII_REGEX, chunk_size=len(data) + 1)
+        self.assertEqual(expected['credit_card']['count'], 200)
+        for chunk_size in (1, 7, 64, 1000):
+            counts = scan_stream(io.BytesIO(data), _PII_REGEX, chunk_size=chunk_size)
+            self.assertEqual({k: v['count'] for k, v in counts.items()},
+                             {k: v['count'] for k, v in expected.items()}, chunk_size)
+
+
+class TestPrivacyScanner(unittest.TestCase):
+
+    def test_scan_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'pii.txt')
+            with open(path, 'w') as f:
+                f.write('alice@example.com\n')
+            result = PrivacyScanner().scan_file(path)
+            self.assertEqual(result['findings'][0]['type'], 'email')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,8 +5,13 @@ Scikit-Learn Skill - Machine Learning Tool
 
 import os
 import json
+import math
+import time
+import shutil
 import logging
 import pickle
+import tempfile
+import warnings
 from typing import Optional, Union, List, Dict, Any, Tuple
 from pathlib import Path
 import numpy as np
@@ -15,6 +20,358 @@ import numpy as np
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 逐次减半搜索参数
+DEFAULT_HALVING_FACTOR = 3      # 每轮保留 1/factor 的候选，资源扩大 factor 倍
+DEFAULT_N_CANDIDATES = 64       # 非网格空间的默认采样数
+EARLY_STOP_MIN_FOLDS = 2        # 至少完成几折后才允许提前淘汰
+EARLY_STOP_Z = 2.0              # 乐观上界 = 当前均值 + z * 折间合并标准差
+MIN_SAMPLES_PER_FOLD = 20       # n_samples 资源的默认最小值 = 该值 * 折数
+
+
+def _take(data: Any, indices: np.ndarray) -> Any:
+    """按行索引取子集（兼容 numpy / pandas / 稀疏矩阵）"""
+    if hasattr(data, "iloc"):
+        return data.iloc[indices]
+    return data[indices]
+
+
+def _fit_and_score(estimator: Any, params: Dict[str, Any], X: Any, y: Any,
+                   train: np.ndarray, test: np.ndarray, scorer: Any) -> Tuple[float, float]:
+    """拟合单个 (候选, 折)，返回 (得分, 耗时秒)；拟合失败得分为 nan"""
+    from sklearn.base import clone
+    
+    start = time.perf_counter()
+    try:
+        model = clone(estimator).set_params(**params)
+        model.fit(_take(X, train), _take(y, train))
+        score = float(scorer(model, _take(X, test), _take(y, test)))
+    except Exception as e:
+        logger.debug(f"Candidate {params} failed: {e}")
+        score = float("nan")
+    return score, time.perf_counter() - start
+
+
+def sample_candidates(
+    param_space: Dict[str, Any],
+    n_candidates: Optional[int] = None,
+    sampler: str = "auto",
+    random_state: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    从参数空间生成候选参数组合
+    
+    Args:
+        param_space: 参数空间，值为候选列表或 scipy.stats 分布
+        n_candidates: 候选数量（grid 且为 None 时取完整网格）
+        sampler: grid / random / sobol（拟随机，覆盖更均匀）/ auto
+        random_state: 随机种子
+        
+    Returns:
+        去重后的候选参数列表
+    """
+    from sklearn.model_selection import ParameterGrid, ParameterSampler
+    
+    discrete = all(isinstance(v, (list, tuple)) for v in param_space.values())
+    if sampler == "auto":
+        full = len(ParameterGrid(param_space)) if discrete else None
+        sampler = "grid" if discrete and (n_candidates is None or n_candidates >= full) else "sobol"
+    if sampler != "grid" and n_candidates is None:
+        n_candidates = DEFAULT_N_CANDIDATES
+    
+    if sampler == "grid":
+        if not discrete:
+            raise ValueError("Grid sampler requires list values for every parameter")
+        candidates = list(ParameterGrid(param_space))
+        if n_candidates is not None and n_candidates < len(candidates):
+            rng = np.random.default_rng(random_state)
+            candidates = [candidates[i] for i in sorted(rng.choice(len(candidates), n_candidates, replace=False))]
+    elif sampler == "random":
+        candidates = list(ParameterSampler(param_space, n_candidates, random_state=random_state))
+    elif sampler == "sobol":
+        from scipy.stats import qmc, rv_discrete
+        
+        names = sorted(param_space)
+        with warnings.catch_warnings():
+            # 非 2 的幂样本数时 Sobol 会提示均衡性下降，这里可以接受
+            warnings.simplefilter("ignore")
+            points = qmc.Sobol(len(names), scramble=True, seed=random_state).random(n_candidates)
+        rng = np.random.default_rng(random_state)
+        candidates = []
+        for point in points:
+            params = {}
+            for name, u in zip(names, point):
+                space = param_space[name]
+                if isinstance(space, (list, tuple)):
+                    params[name] = space[min(int(u * len(space)), len(space) - 1)]
+                elif hasattr(space, "ppf"):
+                    value = space.ppf(u)
+                    discrete_dist = isinstance(getattr(space, "dist", None), rv_discrete)
+                    params[name] = int(value) if discrete_dist else float(value)
+                else:
+                    params[name] = space.rvs(random_state=rng)
+            candidates.append(params)
+    else:
+        raise ValueError(f"Unknown sampler: {sampler}")
+    
+    unique = {}
+    for params in candidates:
+        unique.setdefault(repr(sorted(params.items())), params)
+    return list(unique.values())
+
+
+class SuccessiveHalvingSearch:
+    """
+    逐次减半 / Hyperband 超参数搜索
+    
+    每一轮用较小的资源（训练样本数，或 n_estimators / max_iter 等参数）评估所有候选，
+    只把前 1/factor 晋级到资源扩大 factor 倍的下一轮，最后一轮使用完整资源。
+    轮内逐折评估，明显无望进入前 1/factor 的候选提前淘汰，不再拟合剩余折。
+    传入 Pipeline 时为预处理步骤启用 memory 缓存，参数相同的变换在不同候选之间复用。
+    """
+    
+    def __init__(
+        self,
+        estimator: Any,
+        param_space: Dict[str, Any],
+        n_candidates: Optional[int] = None,
+        sampler: str = "auto",
+        resource: str = "n_samples",
+        max_resource: Optional[int] = None,
+        min_resource: Optional[int] = None,
+        factor: int = DEFAULT_HALVING_FACTOR,
+        hyperband: bool = False,
+        cv: Any = 5,
+        scoring: Optional[str] = None,
+        early_stopping: bool = True,
+        cache_transforms: bool = False,
+        refit: bool = True,
+        n_jobs: Optional[int] = None,
+        random_state: Optional[int] = None
+    ):
+        """
+        Args:
+            estimator: 模型或 Pipeline
+            param_space: 参数空间（列表或 scipy.stats 分布）
+            n_candidates: 候选数量（hyperband 时由各 bracket 自动决定）
+            sampler: grid / random / sobol / auto
+            resource: 'n_samples' 或估计器的整数参数名（如 'n_estimators'）
+            max_resource: 最大资源，n_samples 时默认全部样本
+            min_resource: 最小资源
+            factor: 淘汰比例与资源增长倍数
+            hyperband: 是否运行 Hyperband（多个起始资源不同的逐次减半 bracket）
+            cv: 折数或交叉验证生成器
+            scoring: 评分指标
+            early_stopping: 是否在轮内逐折淘汰无望候选
+            cache_transforms: Pipeline 是否缓存预处理结果（默认关闭，仅在变换耗时且被多个候选共享时开启）
+            refit: 是否用最佳参数和完整资源在全部数据上重新拟合
+            n_jobs: 并行任务数
+            random_state: 随机种子
+        """
+        if factor < 2:
+            raise ValueError("factor must be >= 2")
+        if resource != "n_samples" and max_resource is None:
+            raise ValueError(f"max_resource is required when resource='{resource}'")
+        self.estimator = estimator
+        self.param_space = param_space
+        self.n_candidates = n_candidates
+        self.sampler = sampler
+        self.resource = resource
+        self.max_resource = max_resource
+        self.min_resource = min_resource
+        self.factor = factor
+        self.hyperband = hyperband
+        self.cv = cv
+        self.scoring = scoring
+        self.early_stopping = early_stopping
+        self.cache_transforms = cache_transforms
+        self.refit = refit
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+    
+    # ---------- 资源 ----------
+    
+    def _resource_bounds(self, X: Any, y: Any, n_splits: int) -> Tuple[int, int]:
+        from sklearn.base import is_classifier
+        
+        if self.resource != "n_samples":
+            max_r = int(self.max_resource)
+            min_r = self.min_resource or max(1, max_r // self.factor ** 3)
+            return int(min_r), max_r
+        max_r = min(int(self.max_resource or len(y)), len(y))
+        min_r = self.min_resource
+        if min_r is None:
+            min_r = MIN_SAMPLES_PER_FOLD * n_splits
+            if is_classifier(self.estimator):
+                min_r = max(min_r, 2 * n_splits * len(np.unique(y)))
+        return int(min(min_r, max_r)), max_r
+    
+    def _brackets(self, min_r: int, max_r: int) -> List[Tuple[int, int]]:
+        """返回 [(候选数, 轮数)]，单次逐次减半时候选数为 None（使用 n_candidates）"""
+        s_max = int(math.floor(math.log(max_r / min_r, self.factor) + 1e-9)) if max_r > min_r else 0
+        if not self.hyperband:
+            return [(None, s_max + 1)]
+        return [(int(math.ceil((s_max + 1) / (s + 1) * self.factor ** s)), s + 1)
+                for s in range(s_max, -1, -1)]
+    
+    def _shares_transforms(self, pipeline: Any) -> bool:
+        """
+        是否有候选共享相同的预处理参数（搜索包含最终估计器的参数）。
+        每个候选的变换参数都不同时缓存只有哈希与落盘开销。
+        """
+        final_step = pipeline.steps[-1][0]
+        return any(name.split("__", 1)[0] == final_step for name in self.param_space)
+    
+    def _full_fold_seconds(self, max_r: int) -> float:
+        """完整资源下平均每折耗时（来自最后一轮，该轮不使用变换缓存）"""
+        final = [r for r in self.results_ if r["resource"] == max_r]
+        folds = sum(r["n_folds"] for r in final)
+        return sum(r["fit_time"] for r in final) / folds if folds else 0.0
+    
+    # ---------- 评估 ----------
+    
+    def _run_rung(self, estimator, candidates, resource, X, y, perm, n_keep, scorer, parallel):
+        from sklearn.base import is_classifier
+        from sklearn.model_selection import check_cv
+        from joblib import delayed
+        
+        if self.resource == "n_samples":
+            rows = perm[:resource]
+            X_r, y_r, extra = _take(X, rows), _take(y, rows), {}
+        else:
+            X_r, y_r, extra = X, y, {self.resource: int(resource)}
+        splits = list(check_cv(self.cv, y_r, classifier=is_classifier(estimator)).split(X_r, y_r))
+        
+        scores = {i: [] for i in range(len(candidates))}
+        seconds = {i: [] for i in range(len(candidates))}
+        alive = list(range(len(candidates)))
+        pruned = set()
+        for k, (train, test) in enumerate(splits):
+            out = parallel(delayed(_fit_and_score)(estimator, {**candidates[i], **extra},
+                                                   X_r, y_r, train, test, scorer)
+                           for i in alive)
+            for i, (score, elapsed) in zip(alive, out):
+                scores[i].append(score)
+                seconds[i].append(elapsed)
+                self.fit_seconds_ += elapsed
+                self.n_fits_ += 1
+            
+            failed = [i for i in alive if np.isnan(scores[i][-1])]
+            alive = [i for i in alive if i not in failed]
+            pruned.update(failed)
+            done = k + 1
+            if self.early_stopping and EARLY_STOP_MIN_FOLDS <= done < len(splits) and len(alive) > n_keep:
+                means = {i: float(np.mean(scores[i])) for i in alive}
+                threshold = sorted(means.values(), reverse=True)[n_keep - 1]
+                pooled_sd = float(np.mean([np.std(scores[i]) for i in alive]))
+                hopeless = [i for i in alive if means[i] + EARLY_STOP_Z * pooled_sd < threshold]
+                alive = [i for i in alive if i not in hopeless]
+                pruned.update(hopeless)
+                self.n_pruned_ += len(hopeless)
+        
+        results = []
+        for i, params in enumerate(candidates):
+            fold_scores = np.array(scores[i], dtype=float)
+            results.append({
+                "params": params,
+                "resource": int(resource),
+                "mean_score": float(np.nanmean(fold_scores)) if np.isfinite(fold_scores).any() else float("nan"),
+                "std_score": float(np.nanstd(fold_scores)) if np.isfinite(fold_scores).any() else float("nan"),
+                "n_folds": len(fold_scores),
+                "fit_time": float(sum(seconds[i])),
+                "pruned": i in pruned,
+            })
+        survivors = sorted(alive, key=lambda i: results[i]["mean_score"], reverse=True)
+        return results, [candidates[i] for i in survivors[:n_keep]]
+    
+    def fit(self, X: Any, y: Any) -> "SuccessiveHalvingSearch":
+        """运行搜索"""
+        from sklearn.base import clone
+        from sklearn.metrics import check_scoring
+        from sklearn.model_selection import ParameterGrid, check_cv
+        from sklearn.pipeline import Pipeline
+        from joblib import Parallel
+        
+        start = time.perf_counter()
+        X = np.asarray(X) if isinstance(X, list) else X
+        y = np.asarray(y) if not hasattr(y, "iloc") else y
+        n_splits = check_cv(self.cv).get_n_splits()
+        min_r, max_r = self._resource_bounds(X, y, n_splits)
+        self.fit_seconds_ = 0.0
+        self.n_fits_ = 0
+        self.n_pruned_ = 0
+        self.results_: List[Dict[str, Any]] = []
+        
+        estimator = clone(self.estimator)
+        cached = estimator
+        cache_dir = None
+        if self.cache_transforms and isinstance(estimator, Pipeline) and estimator.memory is None \
+                and self._shares_transforms(estimator):
+            # 只在前几轮缓存：最后一轮候选很少、数据最大，缓存的哈希与落盘开销得不偿失，
+            # 并且不缓存的耗时才能用来估算完整网格的成本
+            cache_dir = tempfile.mkdtemp(prefix="sklearn-skill-cache-")
+            cached = clone(estimator).set_params(memory=cache_dir)
+        scorer = check_scoring(estimator, scoring=self.scoring)
+        perm = np.random.default_rng(self.random_state).permutation(len(y))
+        
+        n_candidates_total = 0
+        try:
+            with Parallel(n_jobs=self.n_jobs) as parallel:
+                for b, (n_bracket, n_rungs) in enumerate(self._brackets(min_r, max_r)):
+                    seed = None if self.random_state is None else self.random_state + b
+                    candidates = sample_candidates(self.param_space, n_bracket or self.n_candidates,
+                                                   self.sampler, seed)
+                    n_candidates_total += len(candidates)
+                    n_rungs = min(n_rungs, max(1, int(math.ceil(math.log(max(len(candidates), 1),
+                                                                         self.factor))) + 1))
+                    for rung in range(n_rungs):
+                        resource = max(min_r, int(round(max_r / self.factor ** (n_rungs - 1 - rung))))
+                        last = rung == n_rungs - 1
+                        n_keep = 1 if last else max(1, int(math.ceil(len(candidates) / self.factor)))
+                        logger.info(f"Bracket {b} rung {rung}: {len(candidates)} candidates, "
+                                    f"{self.resource}={resource}")
+                        results, candidates = self._run_rung(estimator if resource == max_r else cached,
+                                                             candidates, resource, X, y,
+                                                             perm, n_keep, scorer, parallel)
+                        for record in results:
+                            record.update(bracket=b, rung=rung)
+                        self.results_.extend(results)
+                        if not candidates:
+                            break
+        finally:
+            if cache_dir:
+                shutil.rmtree(cache_dir, ignore_errors=True)
+        
+        finals = [r for r in self.results_
+                  if r["resource"] == max_r and not r["pruned"] and np.isfinite(r["mean_score"])]
+        if not finals:
+            raise RuntimeError("All candidates failed to fit")
+        best = max(finals, key=lambda r: r["mean_score"])
+        self.best_params_ = dict(best["params"])
+        if self.resource != "n_samples":
+            self.best_params_[self.resource] = max_r
+        self.best_score_ = best["mean_score"]
+        self.best_estimator_ = None
+        if self.refit:
+            self.best_estimator_ = clone(self.estimator).set_params(**self.best_params_).fit(X, y)
+        
+        # 相对完整网格（每个候选都以完整资源做全部折）的估算耗时
+        discrete = all(isinstance(v, (list, tuple)) for v in self.param_space.values())
+        full_candidates = len(ParameterGrid(self.param_space)) if discrete else n_candidates_total
+        per_fold = self._full_fold_seconds(max_r)
+        full_seconds = full_candidates * n_splits * per_fold
+        self.report_ = {
+            "elapsed_seconds": round(time.perf_counter() - start, 3),
+            "fit_seconds": round(self.fit_seconds_, 3),
+            "n_fits": self.n_fits_,
+            "n_pruned_early": self.n_pruned_,
+            "full_grid_candidates": full_candidates,
+            "full_grid_fits": full_candidates * n_splits,
+            "estimated_full_grid_seconds": round(full_seconds, 3),
+            "estimated_time_saved_seconds": round(full_seconds - self.fit_seconds_, 3),
+            "estimated_speedup": round(full_seconds / self.fit_seconds_, 2) if self.fit_seconds_ else None,
+        }
+        return self
+
 
 class SklearnSkill:
     """Scikit-Learn机器学习技能"""
@@ -376,6 +733,85 @@ class SklearnSkill:
         logger.info(f"Grid search completed: best_score={results['best_score']:.4f}")
         return results
     
+    def halving_search(
+        self,
+        model: Any,
+        param_space: Dict[str, Any],
+        X: np.ndarray,
+        y: np.ndarray,
+        n_candidates: Optional[int] = None,
+        sampler: str = "auto",
+        resource: str = "n_samples",
+        max_resource: Optional[int] = None,
+        min_resource: Optional[int] = None,
+        hyperband: bool = False,
+        cv: Optional[int] = None,
+        scoring: Optional[str] = None,
+        early_stopping: bool = True,
+        cache_transforms: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """
+        逐次减半 / Hyperband 超参数搜索（大数据集上替代 grid_search）
+        
+        Args:
+            model: 模型实例或 Pipeline
+            param_space: 参数空间，值为候选列表或 scipy.stats 分布
+            X: 特征矩阵
+            y: 标签向量
+            n_candidates: 候选数量，默认完整网格或 64 个采样点
+            sampler: grid / random / sobol / auto
+            resource: 'n_samples'（按训练样本数分配预算）或整数参数名如 'n_estimators'
+            max_resource: 最大资源
+            min_resource: 最小资源
+            hyperband: 是否运行 Hyperband
+            cv: 折数
+            scoring: 评分指标
+            early_stopping: 是否逐折淘汰无望候选
+            cache_transforms: 是否缓存 Pipeline 变换，默认取配置
+            
+        Returns:
+            最佳参数、得分、各轮评估记录以及相对完整网格的耗时估算
+        """
+        search_config = self.config.get("search", {})
+        if cache_transforms is None:
+            cache_transforms = search_config.get("cache_transforms", False)
+        
+        search = SuccessiveHalvingSearch(
+            model,
+            param_space,
+            n_candidates=n_candidates,
+            sampler=sampler,
+            resource=resource,
+            max_resource=max_resource,
+            min_resource=min_resource,
+            factor=search_config.get("factor", DEFAULT_HALVING_FACTOR),
+            hyperband=hyperband,
+            cv=cv or self.cv_folds,
+            scoring=scoring,
+            early_stopping=early_stopping,
+            cache_transforms=cache_transforms,
+            n_jobs=self.n_jobs,
+            random_state=self.random_state
+        )
+        search.fit(X, y)
+        
+        results = {
+            "best_params": search.best_params_,
+            "best_score": float(search.best_score_),
+            "best_estimator": search.best_estimator_,
+            "cv_results": search.results_,
+            "time_report": search.report_
+        }
+        
+        report = search.report_
+        logger.info(
+            f"Halving search completed: best_score={results['best_score']:.4f}, "
+            f"{report['n_fits']} fits vs {report['full_grid_fits']} for the full grid, "
+            f"estimated {report['estimated_time_saved_seconds']:.1f}s saved "
+            f"({report['estimated_speedup']}x)"
+        )
+        return results
+    
     def preprocess_data(
         self,
         X: np.ndarray,
@@ -4,6 +4,7 @@ Scikit-Learn Skill - 测试模块
 
 import unittest
 import os
+import json
 import tempfile
 import numpy as np
 from unittest.mock import patch, MagicMock
@@ -11,7 +12,7 @@ from unittest.mock import patch, MagicMock
 # 导入被测试模块
 import sys
 sys.path.insert(0, os.path.dirname(__file__))
-from main import SklearnSkill, create_skill
+from main import SklearnSkill, SuccessiveHalvingSearch, create_skill, sample_candidates
 
 
 class TestSklearnSkill(unittest.TestCase):
@@ -234,6 +235,108 @@ class TestIntegration(unittest.TestCase):
             self.assertLessEqual(metrics["accuracy"], 1)
 
 
+class TestHalvingSearch(unittest.TestCase):
+    """逐次减半搜索测试"""
+    
+    def setUp(self):
+        """测试前准备"""
+        from sklearn.datasets import make_classification
+        self.temp_dir = tempfile.mkdtemp()
+        self.X, self.y = make_classification(600, 8, n_informative=4, random_state=0)
+        self.config_path = os.path.join(self.temp_dir, "config.json")
+        with open(self.config_path, 'w') as f:
+            json.dump({"random_state": 0, "n_jobs": 1, "model_path": self.temp_dir}, f)
+    
+    def tearDown(self):
+        """测试后清理"""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_sample_candidates_grid(self):
+        """测试网格候选"""
+        space = {"a": [1, 2, 3], "b": ["x", "y"]}
+        self.assertEqual(len(sample_candidates(space)), 6)
+        self.assertEqual(len(sample_candidates(space, n_candidates=4, sampler="grid", random_state=0)), 4)
+    
+    def test_sample_candidates_sobol(self):
+        """测试拟随机采样（离散分布取整数，列表取元素）"""
+        from scipy.stats import loguniform, randint
+        space = {"C": loguniform(1e-3, 1e2), "k": randint(1, 10), "kernel": ["rbf", "linear"]}
+        candidates = sample_candidates(space, n_candidates=16, sampler="sobol", random_state=0)
+        self.assertEqual(len(candidates), 16)
+        for params in candidates:
+            self.assertTrue(1e-3 <= params["C"] <= 1e2)
+            self.assertIsInstance(params["k"], int)
+            self.assertIn(params["kernel"], ["rbf", "linear"])
+        with self.assertRaises(ValueError):
+            sample_candidates(space, sampler="grid")
+    
+    def test_halving_search(self):
+        """测试逐次减半搜索结果与耗时报告"""
+        from sklearn.linear_model import LogisticRegression
+        skill = SklearnSkill(self.config_path)
+        results = skill.halving_search(LogisticRegression(max_iter=200),
+                                       {"C": [1e-4, 1e-3, 0.01, 0.1, 1, 10]}, self.X, self.y, cv=3)
+        
+        self.assertIn(results["best_params"]["C"], [0.01, 0.1, 1, 10])
+        self.assertGreater(results["best_score"], 0.7)
+        self.assertTrue(hasattr(results["best_estimator"], "predict"))
+        report = results["time_report"]
+        self.assertEqual(report["full_grid_fits"], 18)
+        self.assertIn("estimated_time_saved_seconds", report)
+        resources = {r["resource"] for r in results["cv_results"]}
+        self.assertGreater(len(resources), 1)
+        self.assertEqual(max(resources), len(self.y))
+    
+    def test_parameter_resource(self):
+        """测试以估计器参数作为资源"""
+        from sklearn.ensemble import RandomForestClassifier
+        search = SuccessiveHalvingSearch(RandomForestClassifier(random_state=0), {"max_depth": [2, 4, 8]},
+                                         resource="n_estimators", max_resource=27, min_resource=3,
+                                         cv=3, random_state=0).fit(self.X, self.y)
+        self.assertEqual(search.best_params_["n_estimators"], 27)
+        self.assertEqual(search.best_estimator_.n_estimators, 27)
+        with self.assertRaises(ValueError):
+            SuccessiveHalvingSearch(RandomForestClassifier(), {}, resource="n_estimators")
+    
+    def test_early_stopping(self):
+        """测试逐折淘汰明显无望的候选"""
+        from sklearn.dummy import DummyClassifier
+        from sklearn.pipeline import Pipeline
+        from sklearn.tree import DecisionTreeClassifier
+        pipe = Pipeline([("model", DecisionTreeClassifier(random_state=0))])
+        space = {"model": [DummyClassifier(strategy="constant", constant=0)] +
+                 [DecisionTreeClassifier(max_depth=d, random_state=0) for d in (3, 5, 7)]}
+        search = SuccessiveHalvingSearch(pipe, space, cv=5, min_resource=600,
+                                         random_state=0).fit(self.X, self.y)
+        dummy = [r for r in search.results_ if isinstance(r["params"]["model"], DummyClassifier)]
+        self.assertTrue(dummy[0]["pruned"])
+        self.assertLess(dummy[0]["n_folds"], 5)
+        self.assertGreater(search.report_["n_pruned_early"], 0)
+    
+    def test_hyperband(self):
+        """测试Hyperband多个bracket"""
+        from scipy.stats import loguniform
+        from sklearn.linear_model import LogisticRegression
+        search = SuccessiveHalvingSearch(LogisticRegression(max_iter=200), {"C": loguniform(1e-3, 10)},
+                                         hyperband=True, min_resource=100, cv=3,
+                                         random_state=0).fit(self.X, self.y)
+        self.assertGreater(len({r["bracket"] for r in search.results_}), 1)
+        self.assertGreater(search.best_score_, 0.7)
+    
+    def test_transform_cache_detection(self):
+        """测试只在候选共享预处理参数时启用变换缓存"""
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.pipeline import Pipeline
+        from sklearn.preprocessing import StandardScaler
+        pipe = Pipeline([("scaler", StandardScaler()), ("clf", LogisticRegression())])
+        shared = SuccessiveHalvingSearch(pipe, {"clf__C": [0.1, 1]})
+        unique = SuccessiveHalvingSearch(pipe, {"scaler__with_mean": [True, False]})
+        self.assertTrue(shared._shares_transforms(pipe))
+        self.assertFalse(unique._shares_transforms(pipe))
+        self.assertFalse(shared.cache_transforms)
+
+
 def run_tests():
     """运行所有测试"""
     loader = unittest.TestLoader()
@@ -241,6 +344,7 @@ def run_tests():
     
     suite.addTests(loader.loadTestsFromTestCase(TestSklearnSkill))
     suite.addTests(loader.loadTestsFromTestCase(TestIntegration))
+    suite.addTests(loader.loadTestsFromTestCase(TestHalvingSearch))
     
     runner = unittest.TextTestRunner(verbosity=2)
     result = runner.run(suite)
@@ -9,9 +9,33 @@ import csv
 import json
 import os
 import shutil
+import sqlite3
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from itertools import chain, islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+# Bulk load defaults
+BULK_BATCH_SIZE = 50000
+TYPE_SAMPLE_SIZE = 1000
+EXPORT_FETCH_SIZE = 10000
+MERGE_BATCH_SIZE = 100000
+MERGE_PROGRESS_TABLE = '_merge_progress'
+MERGE_POLICIES = {
+    'skip': 'INSERT',                  # skip tables that already exist in target
+    'abort': 'INSERT',                 # fail on the first conflicting row
+    'ignore': 'INSERT OR IGNORE',      # keep target row
+    'replace': 'INSERT OR REPLACE',    # overwrite target row
+}
+BULK_PRAGMAS = {
+    'journal_mode': 'MEMORY',
+    'synchronous': 'OFF',
+    'cache_size': -262144,  # 256 MB (negative = KiB)
+    'temp_store': 'MEMORY',
+}
 
 
 class SQLiteSkill:
@@ -143,33 +167,78 @@ class SQLiteSkill:
         """Check database integrity"""
         return self.execute_query("PRAGMA integrity_check")
     
-    def export_to_csv(self, table_or_query: str, output_file: str, is_query: bool = False):
-        """Export to CSV"""
-        if is_query:
-            results = self.execute_query(table_or_query)
+    def iter_query(self, query: str, params: tuple = None,
+                   fetch_size: int = EXPORT_FETCH_SIZE) -> Tuple[List[str], Iterator[tuple]]:
+        """Execute query and return (columns, row iterator) without materialising results"""
+        cursor = self.conn.cursor()
+        cursor.arraysize = fetch_size
+        if params:
+            cursor.execute(query, params)
         else:
-            results = self.execute_query(f"SELECT * FROM {table_or_query}")
+            cursor.execute(query)
+        columns = [d[0] for d in cursor.description] if cursor.description else []
+        
+        def rows():
+            try:
+                while True:
+                    batch = cursor.fetchmany()
+                    if not batch:
+                        break
+                    for row in batch:
+                        yield tuple(row)
+            finally:
+                cursor.close()
         
-        if not results:
+        return columns, rows()
+    
+    def _export_source(self, table_or_query: str, is_query: bool):
+        """Resolve export source into a streaming query"""
+        if is_query:
+            return self.iter_query(table_or_query)
+        return self.iter_query(f'SELECT * FROM "{table_or_query}"')
+    
+    def export_to_csv(self, table_or_query: str, output_file: str, is_query: bool = False):
+        """Export to CSV (streams rows, constant memory)"""
+        columns, rows = self._export_source(table_or_query, is_query)
+        first = next(rows, None)
+        if first is None:
             print("No data to export")
             return
         
+        count = 0
         with open(output_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=results[0].keys())
-            writer.writeheader()
-            writer.writerows(results)
-        print(f"Exported {len(results)} rows to {output_file}")
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for batch in _batched(chain([first], rows), EXPORT_FETCH_SIZE):
+                writer.writerows(batch)
+                count += len(batch)
+        print(f"Exported {count} rows to {output_file}")
     
     def export_to_json(self, table_or_query: str, output_file: str, is_query: bool = False):
-        """Export to JSON"""
-        if is_query:
-            results = self.execute_query(table_or_query)
-        else:
-            results = self.execute_query(f"SELECT * FROM {table_or_query}")
+        """Export to JSON array (streams rows, constant memory)"""
+        columns, rows = self._export_source(table_or_query, is_query)
         
+        count = 0
         with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2)
-        print(f"Exported {len(results)} rows to {output_file}")
+            f.write('[')
+            for row in rows:
+                f.write(',\n  ' if count else '\n  ')
+                f.write(json.dumps(dict(zip(columns, row))))
+                count += 1
+            f.write('\n]\n' if count else ']\n')
+        print(f"Exported {count} rows to {output_file}")
+    
+    def export_to_ndjson(self, table_or_query: str, output_file: str, is_query: bool = False):
+        """Export to newline-delimited JSON, one object per row"""
+        columns, rows = self._export_source(table_or_query, is_query)
+        
+        count = 0
+        dumps = json.dumps
+        with open(output_file, 'w', encoding='utf-8') as f:
+            for batch in _batched(rows, EXPORT_FETCH_SIZE):
+                f.write(''.join(dumps(dict(zip(columns, row))) + '\n' for row in batch))
+                count += len(batch)
+        print(f"Exported {count} rows to {output_file}")
     
     def export_to_sql(self, table_name: str, output_file: str):
         """Export to SQL INSERT statements"""
@@ -190,39 +259,88 @@ class SQLiteSkill:
                     elif isinstance(v, (int, float)):
                         values.append(str(v))
                     else:
-                        values.append(f"'{str(v).replace(\"'\", \"''\")}'")
+                        escaped = str(v).replace("'", "''")
+                        values.append(f"'{escaped}'")
                 
                 f.write(f"INSERT INTO {table_name} ({columns}) VALUES ({', '.join(values)});\n")
         
         print(f"Exported to {output_file}")
     
-    def import_from_csv(self, csv_file: str, table_name: str = None):
-        """Import from CSV file"""
-        with open(csv_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
+    @contextmanager
+    def bulk_pragmas(self, **overrides):
+        """Temporarily apply load-tuned PRAGMAs, restoring previous values on exit"""
+        settings = dict(BULK_PRAGMAS, **overrides)
+        self.conn.commit()
+        previous = {}
+        for name in settings:
+            row = self.conn.execute(f"PRAGMA {name}").fetchone()
+            previous[name] = row[0] if row else None
+        try:
+            for name, value in settings.items():
+                self.conn.execute(f"PRAGMA {name} = {value}")
+            yield
+        finally:
+            self.conn.commit()
+            for name, value in previous.items():
+                if value is not None:
+                    self.conn.execute(f"PRAGMA {name} = {value}")
+    
+    def import_from_csv(self, csv_file: str, table_name: str = None,
+                        infer_types: bool = False, batch_size: int = BULK_BATCH_SIZE,
+                        empty_as_null: bool = False) -> int:
+        """Import from CSV file (streaming, see bulk_import_csv)"""
+        return self.bulk_import_csv(csv_file, table_name, infer_types=infer_types,
+                                    batch_size=batch_size, empty_as_null=empty_as_null)
+    
+    def bulk_import_csv(self, csv_file: str, table_name: str = None,
+                        infer_types: bool = True, batch_size: int = BULK_BATCH_SIZE,
+                        sample_size: int = TYPE_SAMPLE_SIZE, delimiter: str = ',',
+                        empty_as_null: bool = False) -> int:
+        """Stream a CSV into a table with chunked executemany in one transaction.
         
-        if not rows:
-            print("No data to import")
-            return
+        Column types are inferred from the first ``sample_size`` rows when
+        the table is created. Memory use is bounded by ``batch_size`` rows.
+        Empty fields are stored as '' unless ``empty_as_null`` is set.
+        Returns the number of rows imported.
+        """
+        table_name = table_name or os.path.splitext(os.path.basename(csv_file))[0]
         
-        # Auto-create table if not exists
-        if table_name:
-            columns = list(rows[0].keys())
-            col_defs = ', '.join([f'"{col}" TEXT' for col in columns])
+        with open(csv_file, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f, delimiter=delimiter)
+            columns = next(reader, None)
+            if not columns:
+                print("No data to import")
+                return 0
             
-            create_sql = f'CREATE TABLE IF NOT EXISTS "{table_name}" ({col_defs})'
-            self.execute_command(create_sql)
+            sample = list(islice(reader, sample_size))
+            if not sample:
+                print("No data to import")
+                return 0
+            types = infer_column_types(sample) if infer_types else ['TEXT'] * len(columns)
             
-            # Insert data
-            placeholders = ', '.join(['?' for _ in columns])
-            insert_sql = f'INSERT INTO "{table_name}" ({', '.join(columns)}) VALUES ({placeholders})'
+            col_defs = ', '.join(f'{_quote_ident(col)} {col_type}' for col, col_type in zip(columns, types))
+            col_list = ', '.join(_quote_ident(col) for col in columns)
+            placeholders = ', '.join('?' for _ in columns)
+            insert_sql = f'INSERT INTO {_quote_ident(table_name)} ({col_list}) VALUES ({placeholders})'
             
-            for row in rows:
-                self.cursor.execute(insert_sql, tuple(row.values()))
-            self.conn.commit()
+            rows = chain(sample, reader)
+            if empty_as_null:
+                rows = ([v if v != '' else None for v in row] for row in rows)
             
-            print(f"Imported {len(rows)} rows into {table_name}")
+            count = 0
+            with self.bulk_pragmas():
+                try:
+                    self.conn.execute(f'CREATE TABLE IF NOT EXISTS {_quote_ident(table_name)} ({col_defs})')
+                    for batch in _batched(rows, batch_size):
+                        self.conn.executemany(insert_sql, batch)
+                        count += len(batch)
+                    self.conn.commit()
+                except Exception:
+                    self.conn.rollback()
+                    raise
+        
+        print(f"Imported {count} rows into {table_name}")
+        return count
     
     def backup(self, output_path: str):
         """Backup database file"""
@@ -242,6 +360,48 @@ class SQLiteSkill:
         return self.execute_query(query)
 
 
+def _quote_ident(name: str) -> str:
+    """Quote an SQL identifier"""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _batched(iterable, size: int) -> Iterator[list]:
+    """Yield lists of up to ``size`` items"""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def infer_column_types(sample: List[List[str]]) -> List[str]:
+    """Infer SQLite column types (INTEGER/REAL/TEXT) from sample CSV rows"""
+    width = max(len(row) for row in sample)
+    types = []
+    for i in range(width):
+        col_type = 'INTEGER'
+        seen = False
+        for row in sample:
+            value = row[i] if i < len(row) else ''
+            if value == '':
+                continue
+            seen = True
+            if col_type == 'INTEGER':
+                try:
+                    int(value)
+                    continue
+                except ValueError:
+                    col_type = 'REAL'
+            try:
+                float(value)
+            except ValueError:
+                col_type = 'TEXT'
+                break
+        types.append(col_type if seen else 'TEXT')
+    return types
+
+
 def format_table(data: List[Dict]) -> str:
     """Format results as ASCII table"""
     if not data:
@@ -295,13 +455,16 @@ def main():
     export_parser = subparsers.add_parser('export', help='Export table/query')
     export_parser.add_argument('source', help='Table name or SQL query')
     export_parser.add_argument('--output', '-o', required=True, help='Output file')
-    export_parser.add_argument('--format', choices=['csv', 'json', 'sql'], default='csv')
+    export_parser.add_argument('--format', choices=['csv', 'json', 'ndjson', 'sql'], default='csv')
     export_parser.add_argument('--query', action='store_true', help='Source is SQL query')
     
     # Import command
     import_parser = subparsers.add_parser('import', help='Import from CSV')
     import_parser.add_argument('file', help='CSV file path')
     import_parser.add_argument('--table', '-t', help='Target table name')
+    import_parser.add_argument('--infer-types', action='store_true', help='Infer column types from a sample')
+    import_parser.add_argument('--batch-size', type=int, default=BULK_BATCH_SIZE, help='Rows per executemany batch')
+    import_parser.add_argument('--empty-as-null', action='store_true', help="Store empty fields as NULL instead of ''")
     
     # Vacuum command
     subparsers.add_parser('vacuum', help='Optimize database')
@@ -313,6 +476,15 @@ def main():
     backup_parser = subparsers.add_parser('backup', help='Backup database')
     backup_parser.add_argument('output', help='Output file path')
     
+    # Merge command
+    merge_parser = subparsers.add_parser('merge', help='Merge source databases into --database')
+    merge_parser.add_argument('sources', nargs='+', help='Source database files')
+    merge_parser.add_argument('--tables', nargs='+', help='Tables to merge (default: all)')
+    merge_parser.add_argument('--conflict', choices=list(MERGE_POLICIES), default='abort',
+                              help='Conflict policy')
+    merge_parser.add_argument('--batch-size', type=int, default=MERGE_BATCH_SIZE, help='Rows per transaction')
+    merge_parser.add_argument('--workers', type=int, default=1, help='Tables merged in parallel')
+    
     # Pragma command
     pragma_parser = subparsers.add_parser('pragma', help='Execute PRAGMA')
     pragma_parser.add_argument('command', help='PRAGMA command')
@@ -323,6 +495,16 @@ def main():
         parser.print_help()
         return
     
+    if args.command == 'merge':
+        if not args.database:
+            print("Error: --database (merge target) is required")
+            sys.exit(1)
+        result = merge_shards(args.sources, args.database, tables=args.tables,
+                              conflict=args.conflict, batch_size=args.batch_size,
+                              workers=args.workers)
+        print(f"Merged {result['rows']} rows from {result['sources']} database(s)")
+        return
+    
     # Initialize skill
     skill = SQLiteSkill(
         database_path=args.database,
@@ -366,6 +548,8 @@ def main():
                 skill.export_to_csv(args.source, args.output, args.query)
             elif args.format == 'json':
                 skill.export_to_json(args.source, args.output, args.query)
+            elif args.format == 'ndjson':
+                skill.export_to_ndjson(args.source, args.output, args.query)
             else:  # sql
                 if args.query:
                     print("SQL export only supports table names, not queries")
@@ -373,7 +557,8 @@ def main():
                     skill.export_to_sql(args.source, args.output)
         
         elif args.command == 'import':
-            skill.import_from_csv(args.file, args.table)
+            skill.import_from_csv(args.file, args.table, args.infer_types, args.batch_size,
+                                  args.empty_as_null)
         
         elif args.command == 'vacuum':
             skill.vacuum()
@@ -485,15 +670,77 @@ def search_columns(skill: SQLiteSkill, search_term: str) -> List[Dict]:
     return matches
 
 
-def copy_table(skill: SQLiteSkill, source_table: str, target_table: str):
+def _has_rowid(conn, schema: str, table: str) -> bool:
+    """Check whether a table has a rowid (i.e. is not WITHOUT ROWID)"""
+    try:
+        conn.execute(f'SELECT rowid FROM {schema}.{_quote_ident(table)} LIMIT 1')
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def _copy_rows(conn, src_schema: str, src_table: str, dst_table: str, columns: List[str],
+               insert_verb: str = 'INSERT', batch_size: int = MERGE_BATCH_SIZE,
+               start_rowid: Optional[int] = None, on_batch=None) -> int:
+    """Copy rows with INSERT ... SELECT in rowid-ranged batches, one transaction each.
+    
+    ``on_batch(last_rowid, rows)`` runs inside each batch transaction so progress
+    markers commit atomically with the rows they describe. Returns rows copied.
+    """
+    col_list = ', '.join(_quote_ident(c) for c in columns)
+    source = f'{src_schema}.{_quote_ident(src_table)}'
+    insert_head = f'{insert_verb} INTO main.{_quote_ident(dst_table)} ({col_list}) SELECT {col_list} FROM {source}'
+    copied = 0
+    
+    if not _has_rowid(conn, src_schema, src_table):
+        if not conn.in_transaction:
+            conn.execute('BEGIN IMMEDIATE')
+        try:
+            copied = conn.execute(insert_head).rowcount
+            if on_batch:
+                on_batch(None, copied)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return copied
+    
+    # rowids may be zero or negative, so the first batch has no lower bound
+    last_rowid = start_rowid
+    while True:
+        lower, bounds = ('rowid > ? AND ', (last_rowid,)) if last_rowid is not None else ('', ())
+        upper = conn.execute(
+            f'SELECT MAX(rowid) FROM (SELECT rowid FROM {source} WHERE {lower}1 ORDER BY rowid LIMIT ?)',
+            bounds + (batch_size,)
+        ).fetchone()[0]
+        if upper is None:
+            return copied
+        if not conn.in_transaction:
+            conn.execute('BEGIN IMMEDIATE')
+        try:
+            batch_rows = conn.execute(f'{insert_head} WHERE {lower}rowid <= ?',
+                                      bounds + (upper,)).rowcount
+            if on_batch:
+                on_batch(upper, batch_rows)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        copied += batch_rows
+        last_rowid = upper
+
+
+def copy_table(skill: SQLiteSkill, source_table: str, target_table: str,
+               batch_size: int = MERGE_BATCH_SIZE):
     """Copy table structure and data"""
     ddl = skill.get_ddl(source_table)
     new_ddl = ddl.replace(source_table, target_table, 1)
     
     skill.execute_command(new_ddl)
-    skill.execute_command(f"INSERT INTO {target_table} SELECT * FROM {source_table}")
+    columns = [col['name'] for col in skill.get_schema(source_table)]
+    _copy_rows(skill.conn, 'main', source_table, target_table, columns, batch_size=batch_size)
     
-    # Copy indexes
+    # Copy indexes (after the data, which is faster than maintaining them per row)
     indexes = skill.get_indexes(source_table)
     for idx in indexes:
         idx_name = idx['name']
@@ -510,44 +757,232 @@ def copy_table(skill: SQLiteSkill, source_table: str, target_table: str):
     print(f"Table {source_table} copied to {target_table}")
 
 
-def merge_databases(source_db: str, target_db: str, tables: List[str] = None):
-    """Merge tables from source database into target"""
-    source_skill = SQLiteSkill(database_path=source_db)
-    target_skill = SQLiteSkill(database_path=target_db)
-    
-    if not source_skill.connect() or not target_skill.connect():
-        print("Failed to connect to databases")
-        return
-    
+def _merge_connection(target_db: str, source_db: str, timeout: float = 60.0):
+    """Open target with WAL + busy timeout and ATTACH source as ``src``"""
+    conn = sqlite3.connect(target_db, timeout=timeout, isolation_level=None,
+                           check_same_thread=False)
+    conn.execute('PRAGMA journal_mode = WAL')
+    conn.execute('PRAGMA synchronous = NORMAL')
+    conn.execute('PRAGMA cache_size = -65536')
+    conn.execute('ATTACH DATABASE ? AS src', (source_db,))
+    return conn
+
+
+def _journal_mode(db_path: str) -> str:
+    """Current journal mode of a database file"""
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        return conn.execute('PRAGMA journal_mode').fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _set_journal_mode(db_path: str, mode: str):
+    """Switch a database file back to ``mode`` (WAL persists across connections)"""
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        if conn.execute('PRAGMA journal_mode').fetchone()[0] != mode:
+            conn.execute(f'PRAGMA journal_mode = {mode}')
+    finally:
+        conn.close()
+
+
+def _ensure_merge_progress(conn):
+    """Create the resume-marker table"""
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS {MERGE_PROGRESS_TABLE} (
+            source TEXT NOT NULL,
+            tbl TEXT NOT NULL,
+            last_rowid INTEGER,
+            rows INTEGER NOT NULL DEFAULT 0,
+            done INTEGER NOT NULL DEFAULT 0,
+            create_indexes INTEGER NOT NULL DEFAULT 0,
+            updated_at TEXT,
+            PRIMARY KEY (source, tbl)
+        )
+    ''')
+    # Marker tables left by an interrupted merge from before create_indexes existed
+    columns = {r[1] for r in conn.execute(f'PRAGMA table_info({MERGE_PROGRESS_TABLE})')}
+    if 'create_indexes' not in columns:
+        conn.execute(f'ALTER TABLE {MERGE_PROGRESS_TABLE} '
+                     'ADD COLUMN create_indexes INTEGER NOT NULL DEFAULT 0')
+
+
+def _clear_merge_progress(target_db: str, source_dbs: List[str]):
+    """Forget finished sources; drop the marker table once nothing is in flight"""
+    conn = sqlite3.connect(target_db, isolation_level=None)
+    try:
+        conn.executemany(f'DELETE FROM {MERGE_PROGRESS_TABLE} WHERE source = ?',
+                         [(os.path.abspath(db),) for db in source_dbs])
+        if conn.execute(f'SELECT COUNT(*) FROM {MERGE_PROGRESS_TABLE}').fetchone()[0] == 0:
+            conn.execute(f'DROP TABLE {MERGE_PROGRESS_TABLE}')
+    finally:
+        conn.close()
+
+
+def _merge_table(source_db: str, target_db: str, table: str, conflict: str,
+                 batch_size: int) -> Dict[str, Any]:
+    """Merge one table from source into target on its own connection"""
+    source_key = os.path.abspath(source_db)
+    conn = _merge_connection(target_db, source_db)
     try:
-        tables_to_merge = tables or source_skill.get_tables()
+        progress = conn.execute(
+            f'SELECT last_rowid, rows, done, create_indexes FROM {MERGE_PROGRESS_TABLE} '
+            'WHERE source = ? AND tbl = ?',
+            (source_key, table)
+        ).fetchone()
+        if progress and progress[2]:
+            return {'table': table, 'status': 'already_merged', 'rows': progress[1]}
         
-        for table in tables_to_merge:
-            # Check if table exists in target
-            if table in target_skill.get_tables():
-                print(f"Table {table} already exists in target, skipping")
-                continue
-            
-            # Copy table
-            ddl = source_skill.get_ddl(table)
-            target_skill.execute_command(ddl)
-            
-            # Copy data
-            data = source_skill.execute_query(f"SELECT * FROM {table}")
-            if data:
-                columns = ', '.join(data[0].keys())
-                placeholders = ', '.join(['?' for _ in data[0].keys()])
-                insert_sql = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
-                
-                for row in data:
-                    target_skill.cursor.execute(insert_sql, tuple(row.values()))
-                target_skill.conn.commit()
-            
-            print(f"Copied table {table} ({len(data)} rows)")
-    
+        exists = conn.execute(
+            "SELECT 1 FROM main.sqlite_master WHERE type='table' AND name=?", (table,)
+        ).fetchone() is not None
+        if exists and conflict == 'skip' and not progress:
+            return {'table': table, 'status': 'skipped', 'rows': 0}
+        
+        # Indexes are built after the bulk copy, only for tables this merge created.
+        # The flag is stored with the CREATE so a resumed merge still builds them.
+        create_indexes = bool(progress and progress[3])
+        if not exists:
+            ddl = conn.execute(
+                "SELECT sql FROM src.sqlite_master WHERE type='table' AND name=?", (table,)
+            ).fetchone()
+            if not ddl:
+                return {'table': table, 'status': 'missing', 'rows': 0}
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.execute(ddl[0])
+                conn.execute(
+                    f'''INSERT INTO {MERGE_PROGRESS_TABLE} (source, tbl, create_indexes, updated_at)
+                        VALUES (?, ?, 1, ?)
+                        ON CONFLICT (source, tbl) DO UPDATE SET create_indexes = 1''',
+                    (source_key, table, datetime.now().isoformat())
+                )
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            create_indexes = True
+        
+        src_cols = [r[1] for r in conn.execute(f'PRAGMA src.table_info({_quote_ident(table)})')]
+        dst_cols = {r[1] for r in conn.execute(f'PRAGMA main.table_info({_quote_ident(table)})')}
+        columns = [c for c in src_cols if c in dst_cols]
+        
+        start_rowid = progress[0] if progress else None
+        
+        def mark(last_rowid, batch_rows):
+            # Runs inside the batch transaction, so the marker never runs ahead of the data
+            conn.execute(
+                f'''INSERT INTO {MERGE_PROGRESS_TABLE} (source, tbl, last_rowid, rows, updated_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT (source, tbl) DO UPDATE SET
+                        last_rowid = excluded.last_rowid,
+                        rows = rows + excluded.rows,
+                        updated_at = excluded.updated_at''',
+                (source_key, table, last_rowid, batch_rows, datetime.now().isoformat())
+            )
+        
+        rows = _copy_rows(conn, 'src', table, table, columns,
+                          insert_verb=MERGE_POLICIES[conflict], batch_size=batch_size,
+                          start_rowid=start_rowid, on_batch=mark)
+        
+        if create_indexes:
+            for (idx_sql,) in conn.execute(
+                "SELECT sql FROM src.sqlite_master WHERE type='index' AND tbl_name=? AND sql IS NOT NULL",
+                (table,)
+            ).fetchall():
+                conn.execute(idx_sql.replace('INDEX', 'INDEX IF NOT EXISTS', 1))
+        
+        conn.execute(
+            f'''INSERT INTO {MERGE_PROGRESS_TABLE} (source, tbl, done, updated_at)
+                VALUES (?, ?, 1, ?)
+                ON CONFLICT (source, tbl) DO UPDATE SET
+                    done = 1, updated_at = excluded.updated_at''',
+            (source_key, table, datetime.now().isoformat())
+        )
+        return {'table': table, 'status': 'merged', 'rows': rows}
+    finally:
+        conn.close()
+
+
+def merge_databases(source_db: str, target_db: str, tables: List[str] = None,
+                    conflict: str = 'skip', batch_size: int = MERGE_BATCH_SIZE,
+                    workers: int = 1, keep_progress: bool = False) -> Dict[str, Any]:
+    """Merge tables from source database into target.
+    
+    Runs inside SQLite via ATTACH DATABASE + INSERT ... SELECT in batched
+    transactions. ``conflict`` is one of 'skip' (skip tables already in the
+    target), 'abort', 'ignore' or 'replace' (row-level conflict handling).
+    Progress is recorded in ``_merge_progress`` so an interrupted merge
+    resumes where it stopped; the markers are removed once the merge
+    completes unless ``keep_progress`` is set. The target runs in WAL mode
+    during the merge and gets its previous journal mode back afterwards
+    (an interrupted merge leaves it in WAL). With ``workers > 1`` tables are merged on
+    separate connections; the target still admits one writer at a time, so
+    this mainly overlaps source reads with target writes.
+    """
+    if conflict not in MERGE_POLICIES:
+        raise ValueError(f"conflict must be one of {list(MERGE_POLICIES)}")
+    
+    journal_mode = _journal_mode(target_db)
+    conn = _merge_connection(target_db, source_db)
+    try:
+        _ensure_merge_progress(conn)
+        tables_to_merge = tables or [
+            r[0] for r in conn.execute(
+                "SELECT name FROM src.sqlite_master WHERE type='table' "
+                "AND name NOT LIKE 'sqlite_%' AND name != ? ORDER BY name",
+                (MERGE_PROGRESS_TABLE,)
+            )
+        ]
     finally:
-        source_skill.close()
-        target_skill.close()
+        conn.close()
+    
+    def run(table):
+        return _merge_table(source_db, target_db, table, conflict, batch_size)
+    
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(run, tables_to_merge))
+    else:
+        results = [run(table) for table in tables_to_merge]
+    
+    if not keep_progress:
+        _clear_merge_progress(target_db, [source_db])
+    _set_journal_mode(target_db, journal_mode)
+    
+    for result in results:
+        if result['status'] == 'skipped':
+            print(f"Table {result['table']} already exists in target, skipping")
+        elif result['status'] == 'merged':
+            print(f"Copied table {result['table']} ({result['rows']} rows)")
+    
+    return {
+        'source': source_db,
+        'tables': results,
+        'rows': sum(r['rows'] for r in results if r['status'] == 'merged')
+    }
+
+
+def merge_shards(source_dbs: List[str], target_db: str, **kwargs) -> Dict[str, Any]:
+    """Consolidate many shard databases into target (resumable, see merge_databases).
+    
+    Defaults to ``conflict='abort'``: shards created independently usually
+    reuse the same ids, so colliding rows raise instead of being dropped.
+    Pass 'ignore' or 'replace' when the overlap is intended.
+    """
+    kwargs.setdefault('conflict', 'abort')
+    keep_progress = kwargs.pop('keep_progress', False)
+    # Keep per-shard markers until every shard is in, so a resumed run skips finished shards
+    results = [merge_databases(source_db, target_db, keep_progress=True, **kwargs)
+               for source_db in source_dbs]
+    if not keep_progress:
+        _clear_merge_progress(target_db, source_dbs)
+    return {
+        'sources': len(results),
+        'rows': sum(r['rows'] for r in results),
+        'results': results
+    }
 
 
 # =============================================================================
@@ -6,13 +6,16 @@ Tests all major functionality of the sqlite-skill
 
 import json
 import os
+import shutil
+import sqlite3
 import sys
 import tempfile
 import unittest
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from main import SQLiteSkill, format_table
+from main import (SQLiteSkill, format_table, infer_column_types, merge_databases,
+                  merge_shards, MERGE_PROGRESS_TABLE)
 
 
 class TestSQLiteSkill(unittest.TestCase):
@@ -209,6 +212,203 @@ class TestFileDatabase(unittest.TestCase):
         os.unlink(backup_path)
 
 
+class TestBulkTransfer(unittest.TestCase):
+    """Tests for streaming bulk import and export"""
+    
+    def setUp(self):
+        """Create a CSV file and an in-memory database"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.temp_dir, 'events.csv')
+        with open(self.csv_path, 'w', newline='') as f:
+            f.write('id,score,label\n')
+            for i in range(2500):
+                f.write(f'{i},{i * 0.5},item{i}\n')
+            f.write('2500,,\n')
+        self.skill = SQLiteSkill(memory=True)
+        self.skill.connect()
+    
+    def tearDown(self):
+        """Clean up"""
+        self.skill.close()
+        shutil.rmtree(self.temp_dir)
+    
+    def test_infer_column_types(self):
+        """Test type inference from sample rows"""
+        sample = [['1', '1.5', 'a', ''], ['2', '2', 'b', '']]
+        self.assertEqual(infer_column_types(sample), ['INTEGER', 'REAL', 'TEXT', 'TEXT'])
+    
+    def test_bulk_import_batches(self):
+        """Test chunked import with inferred types and NULLs"""
+        count = self.skill.bulk_import_csv(self.csv_path, 'events', batch_size=1000, sample_size=100,
+                                           empty_as_null=True)
+        self.assertEqual(count, 2501)
+        
+        schema = {col['name']: col['type'] for col in self.skill.get_schema('events')}
+        self.assertEqual(schema, {'id': 'INTEGER', 'score': 'REAL', 'label': 'TEXT'})
+        result = self.skill.execute_query("SELECT SUM(id) AS total, COUNT(label) AS labels FROM events")
+        self.assertEqual(result[0]['total'], sum(range(2501)))
+        self.assertEqual(result[0]['labels'], 2500)
+    
+    def test_bulk_import_keeps_empty_strings_by_default(self):
+        """Test empty fields are stored as '' unless empty_as_null is set"""
+        self.skill.bulk_import_csv(self.csv_path, 'events')
+        result = self.skill.execute_query("SELECT COUNT(*) AS n FROM events WHERE label = ''")
+        self.assertEqual(result[0]['n'], 1)
+    
+    def test_bulk_import_restores_pragmas(self):
+        """Test load PRAGMAs are reverted after import"""
+        before = self.skill.execute_pragma('synchronous')[0]['synchronous']
+        self.skill.bulk_import_csv(self.csv_path, 'events')
+        after = self.skill.execute_pragma('synchronous')[0]['synchronous']
+        self.assertEqual(before, after)
+    
+    def test_export_ndjson_roundtrip(self):
+        """Test streaming NDJSON export"""
+        self.skill.bulk_import_csv(self.csv_path, 'events', empty_as_null=True)
+        output = os.path.join(self.temp_dir, 'events.ndjson')
+        self.skill.export_to_ndjson('events', output)
+        
+        with open(output) as f:
+            lines = f.readlines()
+        self.assertEqual(len(lines), 2501)
+        self.assertEqual(json.loads(lines[1]), {'id': 1, 'score': 0.5, 'label': 'item1'})
+        self.assertIsNone(json.loads(lines[-1])['label'])
+    
+    def test_export_csv_streaming(self):
+        """Test streaming CSV export of a query"""
+        self.skill.bulk_import_csv(self.csv_path, 'events')
+        output = os.path.join(self.temp_dir, 'out.csv')
+        self.skill.export_to_csv('SELECT id, label FROM events WHERE id < 3', output, is_query=True)
+        
+        with open(output) as f:
+            self.assertEqual(f.read().splitlines(), ['id,label', '0,item0', '1,item1', '2,item2'])
+
+
+class TestMergeEngine(unittest.TestCase):
+    """Tests for ATTACH-based merge engine"""
+    
+    def setUp(self):
+        """Create shard databases"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.target = os.path.join(self.temp_dir, 'target.db')
+        self.shards = []
+        for n in range(3):
+            path = os.path.join(self.temp_dir, f'shard{n}.db')
+            skill = SQLiteSkill(database_path=path)
+            skill.connect()
+            skill.execute_command("CREATE TABLE items (id INTEGER PRIMARY KEY, shard INTEGER, name TEXT)")
+            skill.execute_command("CREATE INDEX idx_items_name ON items(name)")
+            skill.cursor.executemany(
+                "INSERT INTO items VALUES (?, ?, ?)",
+                [(n * 1000 + i, n, f'item{i}') for i in range(250)]
+            )
+            skill.execute_command("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT) WITHOUT ROWID")
+            skill.execute_command("INSERT INTO meta VALUES ('version', ?)", (str(n),))
+            skill.close()
+            self.shards.append(path)
+    
+    def tearDown(self):
+        """Clean up"""
+        shutil.rmtree(self.temp_dir)
+    
+    def _query(self, sql):
+        skill = SQLiteSkill(database_path=self.target)
+        skill.connect()
+        try:
+            return skill.execute_query(sql)
+        finally:
+            skill.close()
+    
+    def test_merge_creates_tables_and_indexes(self):
+        """Test merge into empty target copies data and indexes"""
+        result = merge_databases(self.shards[0], self.target, batch_size=100)
+        self.assertEqual(result['rows'], 251)
+        self.assertEqual(self._query("SELECT COUNT(*) AS n FROM items")[0]['n'], 250)
+        indexes = [r['name'] for r in self._query("PRAGMA index_list(items)")]
+        self.assertIn('idx_items_name', indexes)
+    
+    def test_merge_skip_policy_keeps_existing_table(self):
+        """Test default policy skips tables already present"""
+        merge_databases(self.shards[0], self.target)
+        result = merge_databases(self.shards[1], self.target)
+        self.assertEqual(result['rows'], 0)
+        self.assertEqual(self._query("SELECT COUNT(*) AS n FROM items")[0]['n'], 250)
+    
+    def test_merge_shards_parallel(self):
+        """Test consolidating shards with conflict policy and workers"""
+        result = merge_shards(self.shards, self.target, conflict='replace', workers=2, batch_size=64)
+        self.assertEqual(result['sources'], 3)
+        self.assertEqual(self._query("SELECT COUNT(*) AS n FROM items")[0]['n'], 750)
+        self.assertEqual(self._query("SELECT value FROM meta")[0]['value'], '2')
+    
+    def test_merge_resumes_from_marker(self):
+        """Test an interrupted merge continues after the last committed batch"""
+        skill = SQLiteSkill(database_path=self.target)
+        skill.connect()
+        skill.execute_command("CREATE TABLE items (id INTEGER PRIMARY KEY, shard INTEGER, name TEXT)")
+        skill.execute_command("INSERT INTO items VALUES (0, 0, 'item0')")
+        skill.execute_command(f"""CREATE TABLE {MERGE_PROGRESS_TABLE} (
+            source TEXT NOT NULL, tbl TEXT NOT NULL, last_rowid INTEGER,
+            rows INTEGER NOT NULL DEFAULT 0, done INTEGER NOT NULL DEFAULT 0,
+            updated_at TEXT, PRIMARY KEY (source, tbl))""")
+        skill.execute_command(f"INSERT INTO {MERGE_PROGRESS_TABLE} (source, tbl, last_rowid, rows) VALUES (?, 'items', 0, 1)",
+                              (os.path.abspath(self.shards[0]),))
+        skill.close()
+        
+        result = merge_databases(self.shards[0], self.target, tables=['items'], conflict='abort',
+                                 keep_progress=True)
+        self.assertEqual(result['rows'], 249)
+        self.assertEqual(self._query(f"SELECT rows, done FROM {MERGE_PROGRESS_TABLE}")[0], {'rows': 250, 'done': 1})
+        
+        again = merge_databases(self.shards[0], self.target, tables=['items'], conflict='abort')
+        self.assertEqual(again['tables'][0]['status'], 'already_merged')
+        self.assertFalse(self._has_progress_table())
+    
+    def _has_progress_table(self):
+        return bool(self._query(
+            f"SELECT name FROM sqlite_master WHERE type='table' AND name='{MERGE_PROGRESS_TABLE}'"))
+    
+    def test_merge_removes_progress_table(self):
+        """Test markers are dropped once a merge (or every shard) completes"""
+        merge_databases(self.shards[0], self.target)
+        self.assertFalse(self._has_progress_table())
+        merge_shards(self.shards, os.path.join(self.temp_dir, 'all.db'), conflict='replace')
+        self.target = os.path.join(self.temp_dir, 'all.db')
+        self.assertFalse(self._has_progress_table())
+    
+    def test_merge_shards_aborts_on_colliding_rows(self):
+        """Test shards sharing primary keys fail by default instead of dropping rows"""
+        with self.assertRaises(sqlite3.IntegrityError):
+            merge_shards(self.shards, self.target, tables=['meta'])
+    
+    def test_merge_shards_keep_progress_and_journal_mode(self):
+        """Test keep_progress is honoured and the target's journal mode is restored"""
+        merge_shards(self.shards, self.target, tables=['items'], keep_progress=True)
+        self.assertTrue(self._has_progress_table())
+        merge_shards(self.shards, self.target, tables=['items'])
+        self.assertFalse(self._has_progress_table())
+        self.assertEqual(self._query("PRAGMA journal_mode")[0]['journal_mode'], 'delete')
+    
+    def test_resumed_merge_creates_indexes(self):
+        """Test indexes are still built when the merge that created the table was interrupted"""
+        skill = SQLiteSkill(database_path=self.target)
+        skill.connect()
+        skill.execute_command("CREATE TABLE items (id INTEGER PRIMARY KEY, shard INTEGER, name TEXT)")
+        skill.execute_command("INSERT INTO items VALUES (0, 0, 'item0')")
+        skill.execute_command(f"""CREATE TABLE {MERGE_PROGRESS_TABLE} (
+            source TEXT NOT NULL, tbl TEXT NOT NULL, last_rowid INTEGER,
+            rows INTEGER NOT NULL DEFAULT 0, done INTEGER NOT NULL DEFAULT 0,
+            create_indexes INTEGER NOT NULL DEFAULT 0, updated_at TEXT, PRIMARY KEY (source, tbl))""")
+        skill.execute_command(f"INSERT INTO {MERGE_PROGRESS_TABLE} (source, tbl, last_rowid, rows, create_indexes) "
+                              "VALUES (?, 'items', 0, 1, 1)", (os.path.abspath(self.shards[0]),))
+        skill.close()
+        
+        result = merge_databases(self.shards[0], self.target, tables=['items'], conflict='abort')
+        self.assertEqual(result['rows'], 249)
+        indexes = [r['name'] for r in self._query("PRAGMA index_list(items)")]
+        self.assertIn('idx_items_name', indexes)
+
+
 class TestFormatTable(unittest.TestCase):
     """Test table formatting"""
     
@@ -242,6 +442,8 @@ def run_tests():
     
     suite.addTests(loader.loadTestsFromTestCase(TestSQLiteSkill))
     suite.addTests(loader.loadTestsFromTestCase(TestFileDatabase))
+    suite.addTests(loader.loadTestsFromTestCase(TestBulkTransfer))
+    suite.addTests(loader.loadTestsFromTestCase(TestMergeEngine))
     suite.addTests(loader.loadTestsFromTestCase(TestFormatTable))
     
     runner = unittest.TextTestRunner(verbosity=2)
@@ -31,6 +31,9 @@ THRESHOLDS = {
     "critical": 95     # > 87% - 紧急
 }
 
+# get_memory_status reports "danger" (and spawning stops) from the warning bound upwards
+DANGER_PERCENT = THRESHOLDS["warning"]
+
 MAX_AGENTS_PER_CORE = 1
 MAX_CONCURRENT_AGENTS = 12  # 16核 - 4核预留 = 12核可用
 HISTORY_LENGTH = 100  # Keep last 100 readings
@@ -38,12 +41,21 @@ HISTORY_LENGTH = 100  # Keep last 100 readings
 # Per-agent resource limit
 MAX_AGENT_MEMORY_GB = 2  # 每个 Agent 最多 2GB
 
+# Forecasting (趋势预测)
+FORECAST_WINDOW = 30              # Samples used for regression
+EWMA_ALPHA = 0.3                  # Level smoothing factor
+EWMA_BETA = 0.2                   # Slope smoothing factor
+PREDICTION_HORIZON_SECONDS = 900  # Warn if danger is projected within 15 min
+AGENT_LIFETIME_SECONDS = 1800     # Default expected agent lifetime (30 min)
+RSS_TOP_N = 5                     # Processes shown in growth attribution
+
 # State files
 STATE_DIR = Path("D:/kimi/memory/system-monitor")
 STATE_DIR.mkdir(parents=True, exist_ok=True)
 CIRCUIT_FILE = STATE_DIR / "circuit_breaker.json"
 HEALTH_FILE = STATE_DIR / "health_status.json"
 HISTORY_FILE = STATE_DIR / "resource_history.json"
+RSS_FILE = STATE_DIR / "process_rss.json"
 
 
 class CircuitBreaker:
@@ -193,21 +205,194 @@ class ResourceHistory:
             return "DECREASING"
         return "STABLE"
     
-    def predict_critical(self):
-        """Predict if system will hit critical memory soon."""
-        if len(self.memory_history) < 20:
+    def get_series(self, window=FORECAST_WINDOW):
+        """Get recent memory readings as (seconds, percent) pairs."""
+        series = []
+        for r in list(self.memory_history)[-window:]:
+            try:
+                series.append((datetime.fromisoformat(r["time"]).timestamp(), float(r["value"])))
+            except (KeyError, TypeError, ValueError):
+                continue
+        return series
+    
+    def forecast(self, threshold=DANGER_PERCENT, window=FORECAST_WINDOW):
+        """Forecast memory usage and time until threshold is crossed."""
+        return MemoryForecaster(self.get_series(window)).forecast(threshold)
+    
+    def predict_critical(self, horizon=PREDICTION_HORIZON_SECONDS):
+        """Predict if system will hit danger memory within the horizon."""
+        forecast = self.forecast()
+        if forecast["samples"] < MemoryForecaster.MIN_SAMPLES:
             return False, "insufficient_data"
         
-        recent = list(self.memory_history)[-20:]
-        values = [r["value"] for r in recent]
+        eta = forecast["time_to_threshold"]
+        if eta is not None and eta <= horizon:
+            if eta == 0:
+                return True, f"above_threshold (current: {forecast['current']:.1f}%)"
+            return True, (f"trending_up {forecast['slope_per_min']:+.2f}%/min, "
+                          f"{forecast['threshold']}% in ~{eta / 60:.0f} min "
+                          f"(current: {forecast['current']:.1f}%)")
+        return False, forecast["trend"]
+
+
+class MemoryForecaster:
+    """Forecast memory usage from timestamped readings.
+    
+    Combines an ordinary least-squares line over the window (stable, slow)
+    with Holt's double exponential smoothing (fast to react).  The steeper
+    of the two slopes is used so forecasts err on the side of caution.
+    """
+    
+    MIN_SAMPLES = 5
+    
+    def __init__(self, series, alpha=EWMA_ALPHA, beta=EWMA_BETA):
+        self.series = sorted(series)
+        self.alpha = alpha
+        self.beta = beta
+    
+    def linear(self):
+        """Least-squares fit. Returns (slope per second, intercept at last sample, r2)."""
+        n = len(self.series)
+        t0 = self.series[-1][0]
+        xs = [t - t0 for t, _ in self.series]
+        ys = [v for _, v in self.series]
+        mean_x = sum(xs) / n
+        mean_y = sum(ys) / n
+        sxx = sum((x - mean_x) ** 2 for x in xs)
+        syy = sum((y - mean_y) ** 2 for y in ys)
+        sxy = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+        if sxx == 0:
+            return 0.0, ys[-1], 0.0
+        slope = sxy / sxx
+        intercept = mean_y - slope * mean_x
+        r2 = (sxy * sxy) / (sxx * syy) if syy > 0 else 1.0
+        return slope, intercept, r2
+    
+    def ewma(self):
+        """Holt's linear smoothing on irregular timestamps. Returns (level, slope per second)."""
+        (t_prev, level), trend = self.series[0], 0.0
+        for t, value in self.series[1:]:
+            dt = t - t_prev
+            if dt <= 0:
+                continue
+            prev_level = level
+            level = self.alpha * value + (1 - self.alpha) * (level + trend * dt)
+            trend = self.beta * (level - prev_level) / dt + (1 - self.beta) * trend
+            t_prev = t
+        return level, trend
+    
+    def forecast(self, threshold):
+        """Summarise both models and estimate seconds until threshold."""
+        result = {
+            "samples": len(self.series),
+            "threshold": threshold,
+            "current": self.series[-1][1] if self.series else None,
+            "slope_per_min": 0.0,
+            "time_to_threshold": None,
+            "trend": "INSUFFICIENT_DATA",
+        }
+        if len(self.series) < self.MIN_SAMPLES:
+            return result
         
-        # Check if consistently increasing
-        trend = self.get_trend(10)
-        current = values[-1]
+        lin_slope, lin_level, r2 = self.linear()
+        ewma_level, ewma_slope = self.ewma()
+        slope = max(lin_slope, ewma_slope)
+        level = max(lin_level, ewma_level, result["current"])
         
-        if trend == "INCREASING" and current > 70:
-            return True, f"trending_up (current: {current:.1f}%)"
-        return False, trend
+        result.update({
+            "level": round(level, 2),
+            "slope_per_min": round(slope * 60, 3),
+            "linear": {"slope_per_min": round(lin_slope * 60, 3), "r2": round(r2, 3)},
+            "ewma": {"level": round(ewma_level, 2), "slope_per_min": round(ewma_slope * 60, 3)},
+            "time_to_threshold": self.time_to(threshold, level, slope),
+            "trend": self.classify(lin_slope, r2),
+        })
+        return result
+    
+    def project(self, seconds):
+        """Project memory percent `seconds` ahead (never below the current level)."""
+        if len(self.series) < self.MIN_SAMPLES:
+            return self.series[-1][1] if self.series else None
+        lin_slope, lin_level, _ = self.linear()
+        ewma_level, ewma_slope = self.ewma()
+        level = max(lin_level, ewma_level, self.series[-1][1])
+        return level + max(lin_slope, ewma_slope, 0.0) * seconds
+    
+    @staticmethod
+    def time_to(threshold, level, slope):
+        """Seconds until level reaches threshold at slope (None if never)."""
+        if level >= threshold:
+            return 0
+        if slope <= 0:
+            return None
+        return int((threshold - level) / slope)
+    
+    @staticmethod
+    def classify(slope, r2, min_rate_per_min=0.1, min_r2=0.5):
+        """Classify a fitted slope; weak fits count as stable to avoid flapping."""
+        if r2 < min_r2 or abs(slope * 60) < min_rate_per_min:
+            return "STABLE"
+        return "INCREASING" if slope > 0 else "DECREASING"
+
+
+class ProcessRSSTracker:
+    """Attribute memory growth to processes by diffing RSS snapshots."""
+    
+    def __init__(self):
+        self.previous = {}
+        self.load()
+    
+    def load(self):
+        """Load last RSS snapshot from file."""
+        if RSS_FILE.exists():
+            try:
+                self.previous = json.loads(RSS_FILE.read_text())
+            except:
+                self.previous = {}
+    
+    def save(self, snapshot):
+        """Save RSS snapshot to file."""
+        RSS_FILE.write_text(json.dumps(snapshot))
+        self.previous = snapshot
+    
+    def sample(self, top_n=RSS_TOP_N):
+        """Take a snapshot and return the fastest-growing processes."""
+        now = time.time()
+        snapshot = {}
+        for proc in psutil.process_iter(['pid', 'name', 'memory_info']):
+            try:
+                mem = proc.info['memory_info']
+                if mem is None:
+                    continue
+                snapshot[str(proc.info['pid'])] = {
+                    "name": proc.info['name'] or "?",
+                    "rss": mem.rss,
+                    "time": now
+                }
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        
+        growth = []
+        for pid, cur in snapshot.items():
+            prev = self.previous.get(pid)
+            # PIDs get reused, so only compare like with like
+            if not prev or prev.get("name") != cur["name"]:
+                continue
+            elapsed = cur["time"] - prev["time"]
+            if elapsed <= 0:
+                continue
+            delta = cur["rss"] - prev["rss"]
+            growth.append({
+                "pid": int(pid),
+                "name": cur["name"],
+                "rss_mb": round(cur["rss"] / (1024**2), 1),
+                "delta_mb": round(delta / (1024**2), 1),
+                "rate_mb_per_min": round(delta / (1024**2) / elapsed * 60, 2)
+            })
+        
+        self.save(snapshot)
+        growth.sort(key=lambda g: g["rate_mb_per_min"], reverse=True)
+        return [g for g in growth if g["rate_mb_per_min"] > 0][:top_n]
 
 
 class HealthChecker:
@@ -285,6 +470,7 @@ class HealthChecker:
 circuit_breaker = CircuitBreaker()
 resource_history = ResourceHistory()
 health_checker = HealthChecker()
+rss_tracker = ProcessRSSTracker()
 
 
 def get_system_info():
@@ -376,7 +562,7 @@ def show_status():
     reserve = info['system_reserve']
     
     # Get trend
-    trend = resource_history.get_trend()
+    trend = resource_history.forecast()["trend"]
     will_be_critical, prediction_reason = resource_history.predict_critical()
     
     # Get circuit breaker status
@@ -429,8 +615,38 @@ def show_status():
     print(f"=================================\n")
 
 
-def check_can_spawn():
-    """Check if it's safe to spawn a new subagent with system reserve consideration."""
+def project_spawn_headroom(info, lifetime=AGENT_LIFETIME_SECONDS, agent_memory_gb=MAX_AGENT_MEMORY_GB):
+    """Project memory usage at the end of a new agent's lifetime.
+    
+    Returns the projected percent of total memory (trend-extrapolated usage
+    plus the agent's own footprint) and the headroom left before danger.
+    """
+    total_gb = info['memory']['total_gb']
+    current = info['memory']['percent']
+    forecaster = MemoryForecaster(resource_history.get_series())
+    trended = forecaster.project(lifetime)
+    if trended is None:
+        trended = current
+    trended = max(trended, current)
+    agent_percent = agent_memory_gb / total_gb * 100 if total_gb > 0 else 100
+    projected = trended + agent_percent
+    return {
+        "lifetime_seconds": lifetime,
+        "current_percent": round(current, 1),
+        "trend_percent": round(trended, 1),
+        "agent_percent": round(agent_percent, 1),
+        "projected_percent": round(projected, 1),
+        "headroom_percent": round(DANGER_PERCENT - projected, 1),
+        "forecast_samples": len(forecaster.series)
+    }
+
+
+def check_can_spawn(lifetime=AGENT_LIFETIME_SECONDS, agent_memory_gb=MAX_AGENT_MEMORY_GB):
+    """Check if it's safe to spawn a new subagent with system reserve consideration.
+    
+    Memory admission uses the projected usage over the agent's expected
+    lifetime rather than the instantaneous percentage.
+    """
     # Check circuit breaker first
     if not circuit_breaker.can_execute():
         print(f"\n[CIRCUIT BREAKER] Blocking spawn request")
@@ -442,6 +658,8 @@ def check_can_spawn():
     memory_status = info["memory"]["status"]
     current_agents = get_current_agent_count()
     max_agents = info["cpu"]["max_agents"]
+    projection = project_spawn_headroom(info, lifetime, agent_memory_gb)
+    projected_status = get_memory_status(projection["projected_percent"])
     
     # System reserve info
     reserve = info['system_reserve']
@@ -455,19 +673,26 @@ def check_can_spawn():
     print(f"Memory: {info['memory']['percent']}% ({info['memory']['used_gb']}/{info['memory']['total_gb']} GB)")
     print(f"        Reserved: {reserve['memory_gb']} GB | Available for Agents: {mem_available} GB")
     print(f"Status: {memory_status[1]} {memory_status[0].upper()}")
+    print(f"Projected ({lifetime // 60} min, +{agent_memory_gb} GB agent): "
+          f"{projection['projected_percent']}% {projected_status[1]} "
+          f"(trend {projection['trend_percent']}% + agent {projection['agent_percent']}%)")
     print(f"Agents: {current_agents}/{max_agents} (max based on available cores)")
     print(f"========================\n")
     
-    # Check memory - CRITICAL: Must not exceed system reserve
-    if memory_status[0] in ["danger", "critical"]:
-        print(f"[X] CANNOT SPAWN: System memory usage too high ({info['memory']['percent']}%)")
-        print(f"   System reserve ({reserve['memory_gb']} GB) may be compromised!")
-        print(f"   Windows system may become unresponsive!")
+    # Check memory - CRITICAL: Must not exceed system reserve during the agent's lifetime
+    if projected_status[0] in ["danger", "critical"]:
+        print(f"[X] CANNOT SPAWN: Projected memory usage too high ({projection['projected_percent']}%)")
+        print(f"   System reserve ({reserve['memory_gb']} GB) would be compromised within {lifetime // 60} min!")
+        growers = rss_tracker.sample()
+        if growers:
+            print(f"   Fastest growing processes:")
+            for g in growers:
+                print(f"     {g['name']} (pid {g['pid']}): {g['rss_mb']} MB, {g['rate_mb_per_min']:+.1f} MB/min")
         circuit_breaker.record_failure()
         return False
     
-    if memory_status[0] == "warning":
-        print(f"[!] WARNING: Memory at {info['memory']['percent']}%")
+    if projected_status[0] == "warning":
+        print(f"[!] WARNING: Memory projected at {projection['projected_percent']}%")
         print(f"    Approaching system reserve limit. Spawn with caution.")
     
     # Check CPU/concurrency
@@ -484,11 +709,43 @@ def check_can_spawn():
     
     print(f"[OK] OK TO SPAWN")
     print(f"   Can spawn {max_agents - current_agents} more agent(s)")
+    print(f"   Projected headroom: {projection['headroom_percent']}% below danger threshold")
     print(f"   System reserve protected: {reserve['cpu_cores']} cores, {reserve['memory_gb']} GB")
     circuit_breaker.record_success()
     return True
 
 
+def show_forecast(top_n=RSS_TOP_N):
+    """Show memory forecast and per-process RSS growth attribution."""
+    get_system_info()
+    forecast = resource_history.forecast()
+    growers = rss_tracker.sample(top_n)
+    
+    print(f"\n[FORECAST] Memory")
+    print(f"=================================")
+    print(f"Samples:   {forecast['samples']}")
+    if forecast["samples"] < MemoryForecaster.MIN_SAMPLES:
+        print(f"Not enough history yet (need {MemoryForecaster.MIN_SAMPLES} samples)")
+    else:
+        eta = forecast["time_to_threshold"]
+        print(f"Current:   {forecast['current']:.1f}%")
+        print(f"Linear:    {forecast['linear']['slope_per_min']:+.3f}%/min (r2={forecast['linear']['r2']})")
+        print(f"EWMA:      {forecast['ewma']['slope_per_min']:+.3f}%/min (level {forecast['ewma']['level']}%)")
+        print(f"Trend:     {forecast['trend']}")
+        if eta is None:
+            print(f"Danger:    not projected ({forecast['threshold']}%)")
+        else:
+            print(f"Danger:    {forecast['threshold']}% in ~{eta / 60:.1f} min")
+    print(f"")
+    print(f"[RSS GROWTH] Top {top_n} since last sample")
+    if not growers:
+        print(f"   No growth recorded (run again to compare snapshots)")
+    for g in growers:
+        print(f"   {g['name']:<24} pid {g['pid']:<7} {g['rss_mb']:>9.1f} MB  "
+              f"{g['delta_mb']:+8.1f} MB  {g['rate_mb_per_min']:+8.2f} MB/min")
+    print(f"=================================\n")
+
+
 def watch_resources(interval=5):
     """Continuously watch system resources."""
     print(f"\n[WATCH] Monitoring (every {interval}s)...")
@@ -525,7 +782,14 @@ def main():
     
     # Basic commands
     subparsers.add_parser('status', help='Show system status')
-    subparsers.add_parser('can-spawn', help='Check if safe to spawn subagent')
+    spawn_parser = subparsers.add_parser('can-spawn', help='Check if safe to spawn subagent')
+    spawn_parser.add_argument('--lifetime', '-l', type=int, default=AGENT_LIFETIME_SECONDS,
+                              help='Expected agent lifetime in seconds')
+    spawn_parser.add_argument('--agent-memory', '-m', type=float, default=MAX_AGENT_MEMORY_GB,
+                              help='Expected agent memory footprint in GB')
+    
+    forecast_parser = subparsers.add_parser('forecast', help='Forecast memory exhaustion')
+    forecast_parser.add_argument('--top', '-n', type=int, default=RSS_TOP_N)
     
     watch_parser = subparsers.add_parser('watch', help='Continuous monitoring')
     watch_parser.add_argument('--interval', '-i', type=int, default=5)
@@ -544,8 +808,10 @@ def main():
     if args.command == 'status':
         show_status()
     elif args.command == 'can-spawn':
-        can_spawn = check_can_spawn()
+        can_spawn = check_can_spawn(args.lifetime, args.agent_memory)
         sys.exit(0 if can_spawn else 1)
+    elif args.command == 'forecast':
+        show_forecast(args.top)
     elif args.command == 'watch':
         watch_resources(args.interval)
     elif args.command == 'circuit-status':
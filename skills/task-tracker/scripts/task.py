@@ -7,13 +7,16 @@ Usage: task.py <command> [options]
 import os
 import sys
 import json
+import sqlite3
 import argparse
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from collections import defaultdict
+from collections import defaultdict, deque
 
 TASKS_DIR = Path("D:/kimi/memory/tasks")
-TASKS_FILE = TASKS_DIR / "tasks.json"
+TASKS_FILE = TASKS_DIR / "tasks.json"  # legacy store, imported into tasks.db once
+TASKS_DB = TASKS_DIR / "tasks.db"
 WORKFLOWS_FILE = TASKS_DIR / "workflows.json"
 
 PRIORITY_ORDER = {"critical": 0, "high": 1, "medium": 2, "low": 3}
@@ -51,102 +54,436 @@ WORKFLOW_TEMPLATES = {
 }
 
 
+class TaskStore:
+    """
+    Indexed task store backed by SQLite (tasks.db).
+    
+    Dependencies are kept as an edge table with a reverse index, and every task
+    carries a pending_deps counter (number of unfinished dependencies). Status
+    changes only touch the direct dependents of the changed task, so blocking
+    and unblocking are incremental instead of a rescan of the whole board.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY,
+            title TEXT NOT NULL,
+            description TEXT,
+            priority TEXT NOT NULL,
+            priority_rank INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            tags TEXT NOT NULL DEFAULT '[]',
+            pending_deps INTEGER NOT NULL DEFAULT 0,
+            created TEXT NOT NULL,
+            updated TEXT NOT NULL,
+            completed TEXT,
+            estimated_hours REAL,
+            actual_hours REAL
+        );
+        CREATE INDEX IF NOT EXISTS tasks_queue ON tasks(status, priority_rank, created);
+        CREATE TABLE IF NOT EXISTS deps (
+            task_id INTEGER NOT NULL,
+            dep_id INTEGER NOT NULL,
+            PRIMARY KEY (task_id, dep_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS deps_reverse ON deps(dep_id, task_id);
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+    
+    COLUMNS = ('id', 'title', 'description', 'priority', 'status', 'tags', 'created', 'updated',
+               'completed', 'estimated_hours', 'actual_hours')
+    
+    def __init__(self, db_path=None, legacy_file=None):
+        self.db_path = Path(db_path or TASKS_DB)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(self.SCHEMA)
+        self._import_legacy(Path(legacy_file or TASKS_FILE))
+    
+    def close(self):
+        self.conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    @contextmanager
+    def transaction(self):
+        """Write transaction"""
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield self.conn
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+        else:
+            self.conn.execute('COMMIT')
+    
+    # --- loading ---------------------------------------------------------
+    
+    def _import_legacy(self, legacy_file):
+        """One-time import of tasks.json written by earlier versions"""
+        if self.conn.execute("SELECT 1 FROM meta WHERE key = 'legacy_imported'").fetchone():
+            return
+        tasks = []
+        if legacy_file.exists():
+            try:
+                tasks = json.loads(legacy_file.read_text(encoding='utf-8'))
+            except ValueError:
+                tasks = []
+        with self.transaction() as c:
+            for task in tasks:
+                c.execute(
+                    f"INSERT OR REPLACE INTO tasks ({', '.join(self.COLUMNS)}, priority_rank) "
+                    f"VALUES ({', '.join('?' * len(self.COLUMNS))}, ?)",
+                    (task['id'], task['title'], task.get('description', ''), task.get('priority', 'medium'),
+                     task.get('status', 'pending'), json.dumps(task.get('tags') or [], ensure_ascii=False),
+                     task.get('created') or datetime.now().isoformat(), task.get('updated') or datetime.now().isoformat(),
+                     task.get('completed'), task.get('estimated_hours'), task.get('actual_hours'),
+                     PRIORITY_ORDER.get(task.get('priority'), 99))
+                )
+                c.executemany("INSERT OR IGNORE INTO deps (task_id, dep_id) VALUES (?, ?)",
+                              [(task['id'], dep) for dep in task.get('depends_on') or []])
+            self._rebuild(c)
+            c.execute("INSERT INTO meta (key, value) VALUES ('legacy_imported', ?)", (datetime.now().isoformat(),))
+    
+    def _rebuild(self, c):
+        """Recompute all pending_deps counters and blocked states (full pass)"""
+        c.execute("""
+            UPDATE tasks SET pending_deps = (
+                SELECT COUNT(*) FROM deps d JOIN tasks t ON t.id = d.dep_id
+                WHERE d.task_id = tasks.id AND t.status != 'done'
+            )
+        """)
+        c.execute("UPDATE tasks SET status = 'blocked' WHERE status != 'done' AND pending_deps > 0")
+        c.execute("UPDATE tasks SET status = 'pending' WHERE status = 'blocked' AND pending_deps = 0")
+    
+    def _to_dict(self, row, deps=None, blocking=None):
+        task = dict(zip(self.COLUMNS, row))
+        task['tags'] = json.loads(task['tags'])
+        task['depends_on'] = deps or None
+        if blocking:
+            task['blocked_by'] = blocking
+        return task
+    
+    def _deps_for(self, ids):
+        """Dependencies and unfinished (blocking) dependencies for task ids"""
+        deps, blocking = defaultdict(list), defaultdict(list)
+        ids = list(ids)
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            rows = self.conn.execute(
+                f"SELECT d.task_id, d.dep_id, t.status FROM deps d LEFT JOIN tasks t ON t.id = d.dep_id "
+                f"WHERE d.task_id IN ({', '.join('?' * len(chunk))}) ORDER BY d.task_id, d.dep_id",
+                chunk
+            )
+            for task_id, dep_id, status in rows:
+                deps[task_id].append(dep_id)
+                if status is not None and status != 'done':
+                    blocking[task_id].append(dep_id)
+        return deps, blocking
+    
+    def _select(self, where='', params=(), order='', limit=None):
+        sql = f"SELECT {', '.join(self.COLUMNS)} FROM tasks {where} {order}"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        rows = self.conn.execute(sql, params).fetchall()
+        deps, blocking = self._deps_for(row[0] for row in rows)
+        return [self._to_dict(row, deps.get(row[0]), blocking.get(row[0])) for row in rows]
+    
+    def get(self, task_id):
+        """Task dict by id, or None"""
+        tasks = self._select("WHERE id = ?", (task_id,))
+        return tasks[0] if tasks else None
+    
+    def get_many(self, task_ids):
+        """Task dicts by id"""
+        task_ids = list(task_ids)
+        tasks = []
+        for i in range(0, len(task_ids), 500):
+            chunk = task_ids[i:i + 500]
+            tasks.extend(self._select(f"WHERE id IN ({', '.join('?' * len(chunk))})", chunk))
+        return {t['id']: t for t in tasks}
+    
+    def query(self, status=None, priority=None, tag=None):
+        """Tasks matching the filters, ordered by status then priority"""
+        clauses, params = [], []
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if priority:
+            clauses.append("priority = ?")
+            params.append(priority)
+        if tag:
+            clauses.append("tags LIKE ?")
+            params.append(f'%{json.dumps(tag, ensure_ascii=False)}%')
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        tasks = self._select(where, params)
+        if tag:
+            tasks = [t for t in tasks if tag in t['tags']]
+        tasks.sort(key=lambda t: (STATUS_ORDER.get(t['status'], 99), PRIORITY_ORDER.get(t['priority'], 99)))
+        return tasks
+    
+    def ready(self, statuses=('pending', 'in-progress'), limit=None):
+        """Ready tasks by priority then age, served from the queue index"""
+        marks = ', '.join('?' * len(statuses))
+        return self._select(f"WHERE status IN ({marks})", statuses, "ORDER BY priority_rank, created", limit)
+    
+    def count(self, statuses=None):
+        if statuses:
+            marks = ', '.join('?' * len(statuses))
+            return self.conn.execute(f"SELECT COUNT(*) FROM tasks WHERE status IN ({marks})", statuses).fetchone()[0]
+        return self.conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+    
+    def counts(self, column):
+        """Task count grouped by status or priority"""
+        if column not in ('status', 'priority'):
+            raise ValueError(column)
+        return dict(self.conn.execute(f"SELECT {column}, COUNT(*) FROM tasks GROUP BY {column}").fetchall())
+    
+    def all(self):
+        return self._select(order="ORDER BY id")
+    
+    # --- writes -----------------------------------------------------------
+    
+    def add(self, title, priority='medium', description='', tags=None, depends_on=None,
+            estimated_hours=None, c=None):
+        """Insert a task; it starts blocked if any dependency is unfinished (KeyError for unknown ones)"""
+        if c is None:
+            with self.transaction() as c:
+                return self.add(title, priority, description, tags, depends_on, estimated_hours, c)
+        
+        now = datetime.now().isoformat()
+        deps = sorted(set(depends_on or []))
+        pending = 0
+        if deps:
+            statuses = dict(c.execute(
+                f"SELECT id, status FROM tasks WHERE id IN ({', '.join('?' * len(deps))})", deps
+            ).fetchall())
+            for dep_id in deps:
+                if dep_id not in statuses:
+                    raise KeyError(dep_id)
+            pending = sum(1 for status in statuses.values() if status != 'done')
+        cur = c.execute(
+            "INSERT INTO tasks (title, description, priority, priority_rank, status, tags, pending_deps, "
+            "created, updated, estimated_hours) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (title, description, priority, PRIORITY_ORDER.get(priority, 99), 'blocked' if pending else 'pending',
+             json.dumps(tags or [], ensure_ascii=False), pending, now, now, estimated_hours)
+        )
+        task_id = cur.lastrowid
+        c.executemany("INSERT INTO deps (task_id, dep_id) VALUES (?, ?)", [(task_id, d) for d in deps])
+        return task_id
+    
+    def _propagate(self, c, task_id, was_done, now_done):
+        """Adjust direct dependents after task_id entered or left 'done'"""
+        if was_done == now_done:
+            return
+        dependents = "SELECT task_id FROM deps WHERE dep_id = ?"
+        if now_done:
+            c.execute(f"UPDATE tasks SET pending_deps = MAX(pending_deps - 1, 0) WHERE id IN ({dependents})", (task_id,))
+            c.execute(f"UPDATE tasks SET status = 'pending' WHERE id IN ({dependents}) "
+                      f"AND status = 'blocked' AND pending_deps = 0", (task_id,))
+        else:
+            c.execute(f"UPDATE tasks SET pending_deps = pending_deps + 1 WHERE id IN ({dependents})", (task_id,))
+            c.execute(f"UPDATE tasks SET status = 'blocked' WHERE id IN ({dependents}) AND status != 'done'",
+                      (task_id,))
+    
+    def update(self, task_id, status=None, **fields):
+        """Update fields and status of a task, propagating to dependents"""
+        with self.transaction() as c:
+            row = c.execute("SELECT status, pending_deps FROM tasks WHERE id = ?", (task_id,)).fetchone()
+            if row is None:
+                return False
+            old_status, pending = row
+            now = datetime.now().isoformat()
+            sets = {k: v for k, v in fields.items() if v is not None}
+            if 'priority' in sets:
+                sets['priority_rank'] = PRIORITY_ORDER.get(sets['priority'], 99)
+            if status:
+                if status != 'done':
+                    # Blocked is derived from unfinished dependencies
+                    status = 'blocked' if pending else ('pending' if status == 'blocked' else status)
+                sets['status'] = status
+                if status == 'done':
+                    sets['completed'] = now
+            sets['updated'] = now
+            c.execute(f"UPDATE tasks SET {', '.join(f'{k} = ?' for k in sets)} WHERE id = ?",
+                      (*sets.values(), task_id))
+            if status:
+                self._propagate(c, task_id, old_status == 'done', status == 'done')
+        return True
+    
+    def delete(self, task_id):
+        """Delete a task; dependents no longer wait on it"""
+        with self.transaction() as c:
+            row = c.execute("SELECT status FROM tasks WHERE id = ?", (task_id,)).fetchone()
+            if row is None:
+                return False
+            self._propagate(c, task_id, False, row[0] != 'done')
+            c.execute("DELETE FROM deps WHERE dep_id = ? OR task_id = ?", (task_id, task_id))
+            c.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+        return True
+    
+    def clear_done(self):
+        """Delete completed tasks; edges to them were already satisfied"""
+        with self.transaction() as c:
+            c.execute("DELETE FROM deps WHERE dep_id IN (SELECT id FROM tasks WHERE status = 'done') "
+                      "OR task_id IN (SELECT id FROM tasks WHERE status = 'done')")
+            return c.execute("DELETE FROM tasks WHERE status = 'done'").rowcount
+    
+    def add_dependencies(self, task_id, dep_ids):
+        """Make task_id depend on dep_ids, refusing unknown ids and edges that would close a cycle"""
+        with self.transaction() as c:
+            if not c.execute("SELECT 1 FROM tasks WHERE id = ?", (task_id,)).fetchone():
+                raise KeyError(task_id)
+            for dep_id in dep_ids:
+                dep = c.execute("SELECT status FROM tasks WHERE id = ?", (dep_id,)).fetchone()
+                if dep is None:
+                    raise KeyError(dep_id)
+                if dep_id == task_id or self._reaches(c, dep_id, task_id):
+                    raise ValueError(f"#{task_id} -> #{dep_id} would create a cycle")
+                added = c.execute("INSERT OR IGNORE INTO deps (task_id, dep_id) VALUES (?, ?)",
+                                  (task_id, dep_id)).rowcount
+                if added and dep[0] != 'done':
+                    c.execute("UPDATE tasks SET pending_deps = pending_deps + 1 WHERE id = ?", (task_id,))
+                    c.execute("UPDATE tasks SET status = 'blocked' WHERE id = ? AND status != 'done'", (task_id,))
+    
+    def _reaches(self, c, start, target):
+        """True if start (transitively) depends on target"""
+        return c.execute("""
+            WITH RECURSIVE upstream(id) AS (
+                SELECT ? UNION SELECT d.dep_id FROM deps d JOIN upstream u ON d.task_id = u.id
+            )
+            SELECT 1 FROM upstream WHERE id = ? LIMIT 1
+        """, (start, target)).fetchone() is not None
+    
+    # --- graph queries ----------------------------------------------------
+    
+    def _graph(self, include_done=False):
+        where = "" if include_done else "WHERE status != 'done'"
+        nodes = {tid: (hours, title) for tid, hours, title in
+                 self.conn.execute(f"SELECT id, estimated_hours, title FROM tasks {where}")}
+        edges = [(t, d) for t, d in self.conn.execute("SELECT task_id, dep_id FROM deps")
+                 if t in nodes and d in nodes]
+        return nodes, edges
+    
+    def topological_order(self, include_done=False, graph=None):
+        """Kahn's algorithm; returns (order, ids left in cycles)"""
+        nodes, edges = graph or self._graph(include_done)
+        indegree = {n: 0 for n in nodes}
+        dependents = defaultdict(list)
+        for task_id, dep_id in edges:
+            indegree[task_id] += 1
+            dependents[dep_id].append(task_id)
+        queue = deque(sorted(n for n, deg in indegree.items() if deg == 0))
+        order = []
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for nxt in dependents[node]:
+                indegree[nxt] -= 1
+                if indegree[nxt] == 0:
+                    queue.append(nxt)
+        return order, sorted(n for n, deg in indegree.items() if deg > 0)
+    
+    def find_cycles(self):
+        """Dependency cycles as lists of task ids"""
+        _, remaining = self.topological_order(include_done=True)
+        if not remaining:
+            return []
+        left = set(remaining)
+        deps = defaultdict(list)
+        for task_id, dep_id in self.conn.execute("SELECT task_id, dep_id FROM deps"):
+            if task_id in left and dep_id in left:
+                deps[task_id].append(dep_id)
+        cycles, seen = [], set()
+        for start in remaining:
+            if start in seen:
+                continue
+            path, index, node = [], {}, start
+            while node not in index and node not in seen:
+                index[node] = len(path)
+                path.append(node)
+                node = deps[node][0]
+            if node in index:
+                cycles.append(path[index[node]:])
+            seen.update(path)
+        return cycles
+    
+    def critical_path(self, target=None, default_hours=1.0):
+        """
+        Longest chain of unfinished tasks weighted by estimated_hours.
+        
+        Returns (task ids in execution order, total hours); with target, the
+        longest chain that ends at that task.
+        """
+        nodes, edges = self._graph()
+        order, _ = self.topological_order(graph=(nodes, edges))
+        deps = defaultdict(list)
+        for task_id, dep_id in edges:
+            deps[task_id].append(dep_id)
+        cost, prev = {}, {}
+        for node in order:
+            hours = nodes[node][0] or default_hours
+            best = max(deps[node], key=lambda d: cost.get(d, 0), default=None)
+            cost[node] = hours + (cost.get(best, 0) if best is not None else 0)
+            prev[node] = best
+        if not cost:
+            return [], 0.0
+        end = target if target is not None else max(cost, key=cost.get)
+        if end not in cost:
+            return [], 0.0
+        path = []
+        node = end
+        while node is not None:
+            path.append(node)
+            node = prev[node]
+        return path[::-1], cost[end]
+
+
 def ensure_storage():
     """Ensure task storage exists."""
     TASKS_DIR.mkdir(parents=True, exist_ok=True)
-    if not TASKS_FILE.exists():
-        save_tasks([])
     if not WORKFLOWS_FILE.exists():
         WORKFLOWS_FILE.write_text(json.dumps({}))
 
 
-def load_tasks():
-    """Load all tasks."""
+def open_store():
+    """Open the task store."""
     ensure_storage()
-    try:
-        with open(TASKS_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except:
-        return []
-
-
-def save_tasks(tasks):
-    """Save all tasks."""
-    with open(TASKS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(tasks, f, indent=2, ensure_ascii=False)
-
-
-def get_next_id(tasks):
-    """Get next task ID."""
-    if not tasks:
-        return 1
-    return max(t['id'] for t in tasks) + 1
-
-
-def check_dependencies(tasks, task_id):
-    """Check if task dependencies are satisfied."""
-    task = next((t for t in tasks if t['id'] == task_id), None)
-    if not task or not task.get('depends_on'):
-        return True, []
-    
-    blocking = []
-    for dep_id in task['depends_on']:
-        dep = next((t for t in tasks if t['id'] == dep_id), None)
-        if dep and dep['status'] != 'done':
-            blocking.append(dep_id)
-    
-    return len(blocking) == 0, blocking
+    return TaskStore()
 
 
-def update_blocked_status(tasks):
-    """Update blocked status for all tasks."""
-    for task in tasks:
-        if task['status'] == 'done':
-            continue
-        
-        can_run, blocking = check_dependencies(tasks, task['id'])
-        if task.get('depends_on') and not can_run:
-            task['status'] = 'blocked'
-            task['blocked_by'] = blocking
-        elif task['status'] == 'blocked' and can_run:
-            task['status'] = 'pending'
-            task.pop('blocked_by', None)
-    
-    return tasks
+def load_tasks():
+    """Load all tasks."""
+    with open_store() as store:
+        return store.all()
 
 
 def add_task(title, priority="medium", description="", tags=None, depends_on=None, estimated_hours=None):
     """Add a new task."""
-    tasks = load_tasks()
-    
     # Parse dependencies
     deps = None
     if depends_on:
         deps = [int(d.strip()) for d in depends_on.split(',')]
     
-    task = {
-        "id": get_next_id(tasks),
-        "title": title,
-        "description": description,
-        "priority": priority,
-        "status": "blocked" if deps else "pending",
-        "tags": tags or [],
-        "depends_on": deps,
-        "created": datetime.now().isoformat(),
-        "updated": datetime.now().isoformat(),
-        "completed": None,
-        "estimated_hours": estimated_hours,
-        "actual_hours": None
-    }
-    
-    tasks.append(task)
-    tasks = update_blocked_status(tasks)
-    save_tasks(tasks)
+    with open_store() as store:
+        try:
+            task = store.get(store.add(title, priority, description, tags, deps, estimated_hours))
+        except KeyError as e:
+            print(f"[X] Task #{e.args[0]} not found!")
+            return None
     
-    status_str = "blocked" if deps else "pending"
     print(f"[OK] Task #{task['id']} added: {title}")
     print(f"   Priority: {priority}")
-    print(f"   Status: {status_str}")
+    print(f"   Status: {task['status']}")
     if deps:
         print(f"   Depends on: {deps}")
     return task
@@ -154,19 +491,8 @@ def add_task(title, priority="medium", description="", tags=None, depends_on=Non
 
 def list_tasks(status=None, priority=None, tag=None, show_deps=False):
     """List tasks with optional filters."""
-    tasks = load_tasks()
-    tasks = update_blocked_status(tasks)
-    
-    # Filter
-    if status:
-        tasks = [t for t in tasks if t['status'] == status]
-    if priority:
-        tasks = [t for t in tasks if t['priority'] == priority]
-    if tag:
-        tasks = [t for t in tasks if tag in t.get('tags', [])]
-    
-    # Sort by priority and status
-    tasks.sort(key=lambda t: (STATUS_ORDER.get(t['status'], 99), PRIORITY_ORDER.get(t['priority'], 99)))
+    with open_store() as store:
+        tasks = store.query(status, priority, tag)
     
     if not tasks:
         print("No tasks found.")
@@ -204,39 +530,34 @@ def list_tasks(status=None, priority=None, tag=None, show_deps=False):
 
 def show_queue():
     """Show task queue (ready to work on, sorted by priority)."""
-    tasks = load_tasks()
-    tasks = update_blocked_status(tasks)
-    
-    # Get ready tasks (pending or in-progress, not blocked)
-    ready = [t for t in tasks if t['status'] in ['pending', 'in-progress']]
-    ready.sort(key=lambda t: (PRIORITY_ORDER.get(t['priority'], 99), t['created']))
+    with open_store() as store:
+        # Get ready tasks (pending or in-progress, not blocked)
+        total = store.count(('pending', 'in-progress'))
+        ready = store.ready(limit=10)
     
     if not ready:
         print("\n[Queue] No ready tasks. All done or blocked!\n")
         return
     
-    print(f"\n[Queue] {len(ready)} tasks ready\n")
+    print(f"\n[Queue] {total} tasks ready\n")
     print(f"{'#':<4} {'ID':<5} {'Priority':<10} {'Title'}")
     print("-" * 60)
     
-    for i, task in enumerate(ready[:10], 1):
+    for i, task in enumerate(ready, 1):
         p_icon = {"critical": "!!!", "high": "!", "medium": "-", "low": "v"}.get(task['priority'], "?")
         title = task['title'][:35] if len(task['title']) > 35 else task['title']
         status_icon = "●" if task['status'] == 'in-progress' else "○"
         print(f"{i:<4} {task['id']:<5} [{p_icon}] {status_icon} {title}")
     
-    if len(ready) > 10:
-        print(f"\n... and {len(ready) - 10} more")
+    if total > 10:
+        print(f"\n... and {total - 10} more")
     print()
 
 
 def start_next():
     """Start the next task from the queue."""
-    tasks = load_tasks()
-    tasks = update_blocked_status(tasks)
-    
-    ready = [t for t in tasks if t['status'] == 'pending']
-    ready.sort(key=lambda t: PRIORITY_ORDER.get(t['priority'], 99))
+    with open_store() as store:
+        ready = store.ready(statuses=('pending',), limit=1)
     
     if not ready:
         print("[INFO] No pending tasks available.")
@@ -249,40 +570,20 @@ def start_next():
 
 def update_task(task_id, status=None, priority=None, description=None, actual_hours=None):
     """Update a task."""
-    tasks = load_tasks()
-    tasks = update_blocked_status(tasks)
-    
-    task = next((t for t in tasks if t['id'] == task_id), None)
-    if not task:
-        print(f"[X] Task #{task_id} not found!")
-        return False
-    
-    if status:
+    with open_store() as store:
+        task = store.get(task_id)
+        if not task:
+            print(f"[X] Task #{task_id} not found!")
+            return False
+        
         # Check dependencies before allowing status change
-        if status == 'in-progress' and task.get('depends_on'):
-            can_run, blocking = check_dependencies(tasks, task_id)
-            if not can_run:
-                print(f"[X] Cannot start task #{task_id}")
-                print(f"   Blocked by: {blocking}")
-                return False
+        if status == 'in-progress' and task.get('blocked_by'):
+            print(f"[X] Cannot start task #{task_id}")
+            print(f"   Blocked by: {task['blocked_by']}")
+            return False
         
-        task['status'] = status
-        if status == 'done':
-            task['completed'] = datetime.now().isoformat()
-            task.pop('blocked_by', None)
-    
-    if priority:
-        task['priority'] = priority
-    if description:
-        task['description'] = description
-    if actual_hours:
-        task['actual_hours'] = actual_hours
-    
-    task['updated'] = datetime.now().isoformat()
-    
-    # Re-check all blocked tasks
-    tasks = update_blocked_status(tasks)
-    save_tasks(tasks)
+        store.update(task_id, status=status, priority=priority, description=description,
+                     actual_hours=actual_hours)
     
     print(f"[OK] Task #{task_id} updated")
     return True
@@ -290,17 +591,34 @@ def update_task(task_id, status=None, priority=None, description=None, actual_ho
 
 def delete_task(task_id):
     """Delete a task."""
-    tasks = load_tasks()
-    tasks = [t for t in tasks if t['id'] != task_id]
-    tasks = update_blocked_status(tasks)
-    save_tasks(tasks)
+    with open_store() as store:
+        store.delete(task_id)
     print(f"[OK] Task #{task_id} deleted")
 
 
+def add_dependency(task_id, depends_on):
+    """Add dependencies to an existing task."""
+    deps = [int(d.strip()) for d in depends_on.split(',')]
+    with open_store() as store:
+        try:
+            store.add_dependencies(task_id, deps)
+        except KeyError as e:
+            print(f"[X] Task #{e.args[0]} not found!")
+            return False
+        except ValueError as e:
+            print(f"[X] {e}")
+            return False
+        task = store.get(task_id)
+    
+    print(f"[OK] Task #{task_id} now depends on: {task['depends_on']}")
+    print(f"   Status: {task['status']}")
+    return True
+
+
 def show_task(task_id):
     """Show task details."""
-    tasks = load_tasks()
-    task = next((t for t in tasks if t['id'] == task_id), None)
+    with open_store() as store:
+        task = store.get(task_id)
     
     if not task:
         print(f"[X] Task #{task_id} not found!")
@@ -327,27 +645,21 @@ def show_task(task_id):
 
 def show_stats():
     """Show task statistics."""
-    tasks = load_tasks()
-    tasks = update_blocked_status(tasks)
-    
-    total = len(tasks)
-    by_status = defaultdict(int)
-    by_priority = defaultdict(int)
-    
-    for task in tasks:
-        by_status[task['status']] += 1
-        by_priority[task['priority']] += 1
+    with open_store() as store:
+        by_status = store.counts('status')
+        by_priority = store.counts('priority')
+    total = sum(by_status.values())
     
     print("\n[Statistics]\n")
     print(f"Total: {total}")
     print("\nBy Status:")
     for status, count in sorted(by_status.items(), key=lambda x: STATUS_ORDER.get(x[0], 99)):
-        bar = "█" * count
+        bar = "█" * min(count, 50)
         print(f"  {status:12} {bar} {count}")
     
     print("\nBy Priority:")
     for priority, count in sorted(by_priority.items(), key=lambda x: PRIORITY_ORDER.get(x[0], 99)):
-        bar = "█" * count
+        bar = "█" * min(count, 50)
         print(f"  {priority:12} {bar} {count}")
     
     done = by_status.get('done', 0)
@@ -365,30 +677,21 @@ def create_workflow(template_name, workflow_name):
         return
     
     template = WORKFLOW_TEMPLATES[template_name]
-    tasks = load_tasks()
     
     prev_id = None
     created_ids = []
     
-    for i, task_def in enumerate(template['tasks']):
-        task = {
-            "id": get_next_id(tasks),
-            "title": f"[{workflow_name}] {task_def['title']}",
-            "description": f"Part of workflow: {workflow_name}",
-            "priority": task_def['priority'],
-            "status": "blocked" if prev_id else "pending",
-            "tags": task_def.get('tags', []) + [workflow_name, template_name],
-            "depends_on": [prev_id] if prev_id else None,
-            "created": datetime.now().isoformat(),
-            "updated": datetime.now().isoformat(),
-            "completed": None
-        }
-        
-        tasks.append(task)
-        created_ids.append(task['id'])
-        prev_id = task['id']
-    
-    save_tasks(tasks)
+    with open_store() as store, store.transaction() as c:
+        for task_def in template['tasks']:
+            prev_id = store.add(
+                f"[{workflow_name}] {task_def['title']}",
+                task_def['priority'],
+                f"Part of workflow: {workflow_name}",
+                task_def.get('tags', []) + [workflow_name, template_name],
+                [prev_id] if prev_id else None,
+                c=c
+            )
+            created_ids.append(prev_id)
     
     print(f"[OK] Created workflow: {workflow_name}")
     print(f"   Template: {template_name}")
@@ -398,10 +701,8 @@ def create_workflow(template_name, workflow_name):
 
 def show_blocked():
     """Show all blocked tasks and why."""
-    tasks = load_tasks()
-    tasks = update_blocked_status(tasks)
-    
-    blocked = [t for t in tasks if t['status'] == 'blocked']
+    with open_store() as store:
+        blocked = store.query(status='blocked')
     
     if not blocked:
         print("\n[INFO] No blocked tasks.\n")
@@ -416,13 +717,43 @@ def show_blocked():
         print()
 
 
+def show_critical_path(target=None):
+    """Show the longest chain of unfinished work."""
+    with open_store() as store:
+        path, hours = store.critical_path(target)
+        tasks = store.get_many(path)
+    
+    if not path:
+        print("\n[INFO] No unfinished tasks on a path.\n")
+        return
+    
+    print(f"\n[Critical Path] {len(path)} tasks, {hours:.1f}h\n")
+    for i, task_id in enumerate(path, 1):
+        task = tasks[task_id]
+        est = f"{task['estimated_hours']}h" if task.get('estimated_hours') else "-"
+        print(f"  {i:<3} #{task_id:<6} {task['status']:<12} {est:<6} {task['title'][:40]}")
+    print()
+
+
+def show_cycles():
+    """Report circular dependencies."""
+    with open_store() as store:
+        cycles = store.find_cycles()
+    
+    if not cycles:
+        print("\n[OK] No dependency cycles.\n")
+        return
+    
+    print(f"\n[X] {len(cycles)} dependency cycle(s)\n")
+    for cycle in cycles:
+        print("  " + " -> ".join(f"#{t}" for t in cycle + cycle[:1]))
+    print()
+
+
 def clear_done():
     """Clear all completed tasks."""
-    tasks = load_tasks()
-    original_count = len(tasks)
-    tasks = [t for t in tasks if t['status'] != 'done']
-    removed = original_count - len(tasks)
-    save_tasks(tasks)
+    with open_store() as store:
+        removed = store.clear_done()
     print(f"[OK] Cleared {removed} completed tasks")
 
 
@@ -485,6 +816,16 @@ def main():
     # Clear command
     subparsers.add_parser('clear-done', help='Clear completed tasks')
     
+    # Dependency graph commands
+    depend_parser = subparsers.add_parser('depend', help='Add dependencies to a task')
+    depend_parser.add_argument('id', type=int, help='Task ID')
+    depend_parser.add_argument('--on', required=True, help='Task IDs it depends on (comma-separated)')
+    
+    path_parser = subparsers.add_parser('critical-path', help='Show longest chain of unfinished work')
+    path_parser.add_argument('--to', type=int, help='End the path at this task')
+    
+    subparsers.add_parser('cycles', help='Detect dependency cycles')
+    
     args = parser.parse_args()
     
     if args.command == 'add':
@@ -510,6 +851,12 @@ def main():
         show_blocked()
     elif args.command == 'clear-done':
         clear_done()
+    elif args.command == 'depend':
+        add_dependency(args.id, args.on)
+    elif args.command == 'critical-path':
+        show_critical_path(args.to)
+    elif args.command == 'cycles':
+        show_cycles()
     else:
         show_queue()
 
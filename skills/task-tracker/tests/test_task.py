@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests for task-tracker
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from task import TaskStore
+
+
+class TestTaskStore(unittest.TestCase):
+    """pending_deps must always equal the number of unfinished dependencies."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = TaskStore(os.path.join(self.temp_dir, 'tasks.db'),
+                               os.path.join(self.temp_dir, 'tasks.json'))
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def assertCountersConsistent(self):
+        """Compare every counter and blocked state with a full recount"""
+        rows = self.store.conn.execute("""
+            SELECT t.id, t.status, t.pending_deps,
+                   (SELECT COUNT(*) FROM deps d JOIN tasks u ON u.id = d.dep_id
+                    WHERE d.task_id = t.id AND u.status != 'done')
+            FROM tasks t
+        """).fetchall()
+        for task_id, status, counter, expected in rows:
+            self.assertEqual(counter, expected, f"pending_deps of #{task_id}")
+            if status != 'done':
+                self.assertEqual(status == 'blocked', expected > 0, f"status of #{task_id}")
+
+    def test_counters_across_add_complete_reopen_delete(self):
+        a = self.store.add('a')
+        b = self.store.add('b')
+        c = self.store.add('c', depends_on=[a, b])
+        self.assertEqual(self.store.get(c)['status'], 'blocked')
+        self.assertCountersConsistent()
+
+        self.store.update(a, status='done')
+        self.assertCountersConsistent()
+        self.store.update(b, status='done')
+        self.assertEqual(self.store.get(c)['status'], 'pending')
+        self.assertCountersConsistent()
+
+        self.store.update(a, status='pending')
+        self.assertEqual(self.store.get(c)['status'], 'blocked')
+        self.assertCountersConsistent()
+
+        self.store.delete(a)
+        self.assertEqual(self.store.get(c)['status'], 'pending')
+        self.assertCountersConsistent()
+
+    def test_add_dependencies_counts_only_new_unfinished_edges(self):
+        a = self.store.add('a')
+        b = self.store.add('b')
+        c = self.store.add('c')
+        self.store.update(b, status='done')
+        self.store.add_dependencies(c, [a, b])
+        self.store.add_dependencies(c, [a])
+        self.assertEqual(self.store.conn.execute(
+            "SELECT pending_deps FROM tasks WHERE id = ?", (c,)).fetchone()[0], 1)
+        self.assertCountersConsistent()
+
+    def test_unknown_dependency_rejected(self):
+        a = self.store.add('a')
+        with self.assertRaises(KeyError):
+            self.store.add_dependencies(a, [a + 1])
+        with self.assertRaises(KeyError):
+            self.store.add('b', depends_on=[a + 5])
+        self.assertEqual(self.store.get(a)['depends_on'], None)
+
+        b = self.store.add('b')
+        self.store.add_dependencies(a, [b])
+        self.assertEqual(self.store.get(a)['status'], 'blocked')
+        self.assertCountersConsistent()
+
+    def test_cycle_rejected(self):
+        a = self.store.add('a')
+        b = self.store.add('b', depends_on=[a])
+        c = self.store.add('c', depends_on=[b])
+        with self.assertRaises(ValueError):
+            self.store.add_dependencies(a, [c])
+        with self.assertRaises(ValueError):
+            self.store.add_dependencies(a, [a])
+        self.assertEqual(self.store.find_cycles(), [])
+        self.assertEqual(self.store.get(a)['status'], 'pending')
+        self.assertCountersConsistent()
+
+
+if __name__ == '__main__':
+    unittest.main()
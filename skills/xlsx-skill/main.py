@@ -12,21 +12,39 @@ import argparse
 import json
 import os
 import sys
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
 from openpyxl import Workbook, load_workbook
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
 from openpyxl.chart import BarChart, LineChart, PieChart, ScatterChart, Reference
-from openpyxl.utils import get_column_letter
+from openpyxl.utils import column_index_from_string, get_column_letter, range_boundaries
 from openpyxl.utils.dataframe import dataframe_to_rows
 
 
 class ExcelProcessor:
     """Main class for Excel file processing"""
 
-    def __init__(self, file_path: Optional[str] = None):
+    def __init__(self, file_path: Optional[str] = None,
+                 read_only: bool = False, write_only: bool = False):
+        """
+        Open or create a workbook.
+
+        read_only streams rows from disk (lazy, constant memory) and write_only
+        streams appended rows to a temp file; both skip openpyxl's cell model,
+        so formatting, formulas and charts need the default mode.
+        """
+        if read_only and write_only:
+            raise ValueError("read_only and write_only are mutually exclusive")
         self.file_path = file_path
-        self.workbook = None
-        if file_path and os.path.exists(file_path):
+        self.read_only = read_only
+        self.write_only = write_only
+        self._headers: Dict[str, List[Any]] = {}
+        if read_only:
+            if not (file_path and os.path.exists(file_path)):
+                raise FileNotFoundError(f"File not found: {file_path}")
+            self.workbook = load_workbook(file_path, read_only=True)
+        elif write_only:
+            self.workbook = Workbook(write_only=True)
+        elif file_path and os.path.exists(file_path):
             self.workbook = load_workbook(file_path)
         else:
             self.workbook = Workbook()
@@ -36,49 +54,88 @@ class ExcelProcessor:
         if sheet_name:
             if sheet_name in self.workbook.sheetnames:
                 return self.workbook[sheet_name]
+            if self.read_only:
+                raise KeyError(f"Worksheet {sheet_name} does not exist")
+            return self.workbook.create_sheet(sheet_name)
+        if self.write_only and not self.workbook.worksheets:
+            return self.workbook.create_sheet()
+        return self.workbook.active if not self.write_only else self.workbook.worksheets[-1]
+
+    def close(self) -> None:
+        """Release the file handle held by a read-only workbook"""
+        if self.read_only:
+            self.workbook.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def _column_positions(columns: Sequence[Union[str, int]],
+                          header_row: Optional[Sequence[Any]],
+                          first_col: int = 1) -> List[int]:
+        """
+        Resolve projected columns to 0-based positions within a row.
+
+        Columns may be header names, column letters ("C") or 1-based indexes.
+        """
+        positions = []
+        for col in columns:
+            if header_row is not None and col in header_row:
+                positions.append(list(header_row).index(col))
+            elif isinstance(col, int):
+                positions.append(col - first_col)
+            elif isinstance(col, str) and col.isalpha():
+                positions.append(column_index_from_string(col.upper()) - first_col)
             else:
-                return self.workbook.create_sheet(sheet_name)
-        return self.workbook.active
+                raise KeyError(f"Unknown column: {col}")
+        return positions
 
-    def read(self, sheet_name: Optional[str] = None, 
-             cell_range: Optional[str] = None,
-             headers: bool = True) -> List[Dict[str, Any]]:
-        """Read data from Excel file"""
-        sheet = self.get_sheet(sheet_name)
-        data = []
+    def iter_read(self, sheet_name: Optional[str] = None,
+                  cell_range: Optional[str] = None,
+                  headers: bool = True,
+                  columns: Optional[Sequence[Union[str, int]]] = None) -> Iterator[Union[Dict[str, Any], List[Any]]]:
+        """
+        Yield rows one at a time (dicts keyed by header, or lists).
 
+        With a read_only processor rows are parsed lazily from the file, so
+        memory stays flat regardless of sheet size. columns projects each row
+        onto the given header names, column letters or 1-based indexes.
+        """
+        sheet = self.get_sheet(sheet_name)
+        bounds = {}
         if cell_range:
-            # Parse range like "A1:D10"
-            cells = sheet[cell_range]
-            if headers:
-                header_row = [cell.value for cell in cells[0]]
-                for row in cells[1:]:
-                    row_data = {}
-                    for idx, cell in enumerate(row):
-                        if idx < len(header_row):
-                            row_data[header_row[idx]] = cell.value
-                    data.append(row_data)
+            min_col, min_row, max_col, max_row = range_boundaries(cell_range)
+            bounds = dict(min_col=min_col, min_row=min_row, max_col=max_col, max_row=max_row)
+        rows = sheet.iter_rows(values_only=True, **bounds)
+
+        header_row = None
+        if headers:
+            header_row = next(rows, None)
+            if header_row is None:
+                return
+        positions = None
+        if columns:
+            positions = self._column_positions(columns, header_row, bounds.get('min_col', 1))
+            if header_row is not None:
+                header_row = [header_row[pos] for pos in positions]
+
+        for row in rows:
+            if positions is not None:
+                row = [row[pos] if pos < len(row) else None for pos in positions]
+            if header_row is not None:
+                yield dict(zip(header_row, row))
             else:
-                for row in cells:
-                    data.append([cell.value for cell in row])
-        else:
-            # Read all data
-            rows = list(sheet.iter_rows(values_only=True))
-            if not rows:
-                return data
-
-            if headers:
-                header_row = rows[0]
-                for row in rows[1:]:
-                    row_data = {}
-                    for idx, value in enumerate(row):
-                        if idx < len(header_row):
-                            row_data[header_row[idx]] = value
-                    data.append(row_data)
-            else:
-                data = rows
+                yield list(row)
 
-        return data
+    def read(self, sheet_name: Optional[str] = None, 
+             cell_range: Optional[str] = None,
+             headers: bool = True,
+             columns: Optional[Sequence[Union[str, int]]] = None) -> List[Union[Dict[str, Any], List[Any]]]:
+        """Read data from Excel file"""
+        return list(self.iter_read(sheet_name, cell_range, headers, columns))
 
     def write(self, data: Union[List[Dict], List[List]], 
               sheet_name: Optional[str] = None,
@@ -100,33 +157,83 @@ class ExcelProcessor:
         elif headers and isinstance(data[0], dict):
             header_list = list(data[0].keys())
 
+        if self.write_only:
+            self._write_rows(sheet, data, header_list, start_row, start_col_idx)
+            return
+
         # Write headers
         current_row = start_row
         if header_list:
             for idx, header in enumerate(header_list):
-                col_letter = get_column_letter(start_col_idx + idx)
-                sheet[f'{col_letter}{current_row}'] = header
+                sheet.cell(row=current_row, column=start_col_idx + idx, value=header)
             current_row += 1
 
         # Write data
         for row_data in data:
-            if isinstance(row_data, dict):
-                for idx, key in enumerate(header_list):
-                    col_letter = get_column_letter(start_col_idx + idx)
-                    sheet[f'{col_letter}{current_row}'] = row_data.get(key)
-            else:
-                for idx, value in enumerate(row_data):
-                    col_letter = get_column_letter(start_col_idx + idx)
-                    sheet[f'{col_letter}{current_row}'] = value
+            values = [row_data.get(key) for key in header_list] if isinstance(row_data, dict) else row_data
+            for idx, value in enumerate(values):
+                sheet.cell(row=current_row, column=start_col_idx + idx, value=value)
             current_row += 1
 
         # Auto-adjust column widths
         self._auto_adjust_columns(sheet)
 
+    def _write_rows(self, sheet, data: Iterable[Union[Dict, List]], header_list: List[Any],
+                    start_row: int = 1, start_col_idx: int = 1) -> int:
+        """Append whole rows to a write-only sheet; returns the number of data rows"""
+        pad = [None] * (start_col_idx - 1)
+        for _ in range(start_row - 1):
+            sheet.append([])
+        if header_list:
+            sheet.append(pad + list(header_list))
+            self._headers[sheet.title] = list(header_list)
+        count = 0
+        for row_data in data:
+            if isinstance(row_data, dict):
+                sheet.append(pad + [row_data.get(key) for key in header_list])
+            else:
+                sheet.append(pad + list(row_data))
+            count += 1
+        return count
+
+    def write_stream(self, rows: Iterable[Union[Dict, List]],
+                     sheet_name: Optional[str] = None,
+                     headers: Optional[List[str]] = None) -> int:
+        """
+        Append rows from any iterable (generator, cursor, reader) without materializing it.
+
+        Dict rows use headers, or the keys of the first row. Returns the number of data rows.
+        """
+        sheet = self.get_sheet(sheet_name)
+        rows = iter(rows)
+        first = next(rows, None)
+        if first is None:
+            return 0
+        if headers is None and isinstance(first, dict):
+            headers = list(first.keys())
+
+        def chained():
+            yield first
+            yield from rows
+
+        if self.write_only:
+            return self._write_rows(sheet, chained(), headers or [])
+        count = 0
+        if headers:
+            sheet.append(list(headers))
+        for row_data in chained():
+            sheet.append([row_data.get(key) for key in headers] if isinstance(row_data, dict) else list(row_data))
+            count += 1
+        return count
+
     def append(self, data: Union[Dict, List], 
                sheet_name: Optional[str] = None) -> None:
         """Append a row to existing sheet"""
         sheet = self.get_sheet(sheet_name)
+        if self.write_only:
+            headers = self._headers.get(sheet.title, [])
+            sheet.append([data.get(h) for h in headers] if isinstance(data, dict) else list(data))
+            return
         next_row = sheet.max_row + 1
 
         if isinstance(data, dict):
@@ -142,42 +249,37 @@ class ExcelProcessor:
 
     def merge_files(self, files: List[str], output: str, 
                     merge_type: str = "append") -> None:
-        """Merge multiple Excel files"""
-        merged_wb = Workbook()
-        merged_wb.remove(merged_wb.active)  # Remove default sheet
-
-        if merge_type == "append":
-            # Stack files vertically
-            target_sheet = merged_wb.create_sheet("Merged")
-            current_row = 1
-            first_file = True
-
-            for file_path in files:
-                if not os.path.exists(file_path):
-                    continue
+        """
+        Merge multiple Excel files
 
-                wb = load_workbook(file_path)
-                for sheet_name in wb.sheetnames:
-                    sheet = wb[sheet_name]
-                    for row_idx, row in enumerate(sheet.iter_rows(values_only=True), 1):
-                        if not first_file and row_idx == 1:
-                            continue  # Skip headers for subsequent files
-                        for col_idx, value in enumerate(row, 1):
-                            target_sheet.cell(row=current_row, column=col_idx, value=value)
-                        current_row += 1
-                    first_file = False
-        else:
-            # Side by side
-            for file_path in files:
-                if not os.path.exists(file_path):
-                    continue
-                wb = load_workbook(file_path)
+        Inputs are streamed with read-only workbooks and whole rows are appended
+        to a write-only output, so memory does not grow with the number or size
+        of the inputs.
+        """
+        merged_wb = Workbook(write_only=True)
+        target_sheet = merged_wb.create_sheet("Merged") if merge_type == "append" else None
+        first_file = True
+
+        for file_path in files:
+            if not os.path.exists(file_path):
+                continue
+            wb = load_workbook(file_path, read_only=True)
+            try:
                 for sheet_name in wb.sheetnames:
-                    source_sheet = wb[sheet_name]
-                    target_sheet = merged_wb.create_sheet(title=f"{os.path.basename(file_path)}_{sheet_name}")
-                    for row_idx, row in enumerate(source_sheet.iter_rows(values_only=True), 1):
-                        for col_idx, value in enumerate(row, 1):
-                            target_sheet.cell(row=row_idx, column=col_idx, value=value)
+                    rows = wb[sheet_name].iter_rows(values_only=True)
+                    if merge_type == "append":
+                        # Stack files vertically, skipping headers after the first sheet
+                        if not first_file:
+                            next(rows, None)
+                        first_file = False
+                    else:
+                        # Side by side
+                        target_sheet = merged_wb.create_sheet(
+                            title=f"{os.path.basename(file_path)}_{sheet_name}")
+                    for row in rows:
+                        target_sheet.append(row)
+            finally:
+                wb.close()
 
         merged_wb.save(output)
 
@@ -311,6 +413,7 @@ def main():
         epilog="""
 Examples:
   python main.py read --input data.xlsx --sheet Sheet1
+  python main.py read --input big.xlsx --columns "name,C" --stream > rows.ndjson
   python main.py write --input data.xlsx --data '[{"name":"John","age":30}]'
   python main.py format --input data.xlsx --range A1:D10 --fill '{"color":"FFFF00"}'
   python main.py chart --input data.xlsx --chart_type bar --title "Sales Chart"
@@ -335,17 +438,27 @@ Examples:
     parser.add_argument('--formula', '-f', help='Excel formula')
     parser.add_argument('--cell', '-c', help='Cell reference for formula')
     parser.add_argument('--files', help='Comma-separated list of files for merge')
+    parser.add_argument('--columns', help='Comma-separated header names or column letters to read')
+    parser.add_argument('--stream', action='store_true',
+                        help='Print rows as NDJSON while reading instead of one JSON array')
 
     args = parser.parse_args()
 
-    processor = ExcelProcessor(args.input)
-
     try:
         if args.action == 'read':
-            data = processor.read(args.sheet, args.range, args.headers)
-            print(json.dumps(data, indent=2, ensure_ascii=False))
+            columns = args.columns.split(',') if args.columns else None
+            with ExcelProcessor(args.input, read_only=True) as reader:
+                rows = reader.iter_read(args.sheet, args.range, args.headers, columns)
+                if args.stream:
+                    for row in rows:
+                        print(json.dumps(row, ensure_ascii=False, default=str))
+                else:
+                    print(json.dumps(list(rows), indent=2, ensure_ascii=False, default=str))
+            return
+
+        processor = ExcelProcessor(args.input)
 
-        elif args.action == 'write':
+        if args.action == 'write':
             if not args.data:
                 print("Error: --data is required for write action", file=sys.stderr)
                 sys.exit(1)
@@ -188,6 +188,82 @@ class TestExcelProcessor(unittest.TestCase):
         self.assertEqual(result[1]["name"], "日本語テスト")
 
 
+class TestStreamingModes(unittest.TestCase):
+    """Test cases for read-only / write-only streaming"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test files"""
+        for name in os.listdir(self.temp_dir):
+            os.remove(os.path.join(self.temp_dir, name))
+        os.rmdir(self.temp_dir)
+
+    def _write_file(self, name, rows):
+        path = os.path.join(self.temp_dir, name)
+        writer = ExcelProcessor(write_only=True)
+        count = writer.write_stream(rows, "Data")
+        writer.save(path)
+        return path, count
+
+    def test_write_stream_and_iter_read(self):
+        """Test write-only generator input and lazy read-only output"""
+        path, count = self._write_file(
+            "big.xlsx", ({"id": i, "name": f"row{i}", "score": i * 2} for i in range(1000)))
+        self.assertEqual(count, 1000)
+
+        with ExcelProcessor(path, read_only=True) as reader:
+            rows = reader.iter_read("Data")
+            self.assertEqual(next(rows), {"id": 0, "name": "row0", "score": 0})
+            self.assertEqual(sum(1 for _ in rows), 999)
+
+    def test_column_projection(self):
+        """Test projecting by header name, column letter and index"""
+        path, _ = self._write_file("cols.xlsx", [{"a": 1, "b": 2, "c": 3}, {"a": 4, "b": 5, "c": 6}])
+
+        with ExcelProcessor(path, read_only=True) as reader:
+            self.assertEqual(reader.read("Data", columns=["c", "a"]), [{"c": 3, "a": 1}, {"c": 6, "a": 4}])
+            self.assertEqual(reader.read("Data", headers=False, columns=["B", 3]),
+                             [["b", "c"], [2, 3], [5, 6]])
+            self.assertEqual(reader.read("Data", "B1:C2", headers=False, columns=["C"]), [["c"], [3]])
+
+    def test_read_only_missing_sheet(self):
+        """Test that read-only mode does not create sheets"""
+        path, _ = self._write_file("one.xlsx", [[1, 2]])
+        with ExcelProcessor(path, read_only=True) as reader:
+            with self.assertRaises(KeyError):
+                reader.read("Missing")
+
+    def test_write_only_write_and_append(self):
+        """Test write() and append() against a write-only workbook"""
+        path = os.path.join(self.temp_dir, "wo.xlsx")
+        writer = ExcelProcessor(write_only=True)
+        writer.write([{"name": "John", "age": 30}], "People")
+        writer.append({"name": "Jane", "age": 25}, "People")
+        writer.save(path)
+
+        result = ExcelProcessor(path).read("People")
+        self.assertEqual(result, [{"name": "John", "age": 30}, {"name": "Jane", "age": 25}])
+
+    def test_merge_files_streaming(self):
+        """Test append and side-by-side merges"""
+        first, _ = self._write_file("m1.xlsx", [{"k": 1}, {"k": 2}])
+        second, _ = self._write_file("m2.xlsx", [{"k": 3}])
+        output = os.path.join(self.temp_dir, "merged.xlsx")
+
+        ExcelProcessor().merge_files([first, second, "missing.xlsx"], output)
+        merged = ExcelProcessor(output)
+        self.assertEqual(merged.workbook.sheetnames, ["Merged"])
+        self.assertEqual(merged.read("Merged"), [{"k": 1}, {"k": 2}, {"k": 3}])
+
+        ExcelProcessor().merge_files([first, second], output, merge_type="sheets")
+        merged = ExcelProcessor(output)
+        self.assertEqual(merged.workbook.sheetnames, ["m1.xlsx_Data", "m2.xlsx_Data"])
+        self.assertEqual(merged.read("m2.xlsx_Data"), [{"k": 3}])
+
+
 class TestCommandLine(unittest.TestCase):
     """Test cases for command line interface"""
 
@@ -244,6 +320,7 @@ def run_tests():
 
     # Add test classes
     suite.addTests(loader.loadTestsFromTestCase(TestExcelProcessor))
+    suite.addTests(loader.loadTestsFromTestCase(TestStreamingModes))
     suite.addTests(loader.loadTestsFromTestCase(TestCommandLine))
 
     # Run tests